@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Informe de clasificación LLM por lotes vs bloque a bloque.
+
+Clasifica los mismos bloques dos veces con LLMClient: una petición por bloque
+(classify_tipologia, la línea base) y LLM_BATCH_SIZE bloques por petición
+(classify_tipologia_batch). Para cada modo informa de peticiones, tokens de
+entrada/salida (usage devuelto por la API) y tiempo.
+
+La precisión del modo por lotes (% de bloques con la misma tipologia,
+diferencia media de confianza, bloques sin resultado) solo se mide frente a
+clasificaciones bloque a bloque de un modelo REAL:
+- con --base-url, frente a la pasada bloque a bloque de esta misma ejecución
+  (--save-reference la guarda en JSON);
+- con --base-url y --reference, frente a un JSON guardado antes (no se repite
+  ni se paga la pasada bloque a bloque).
+
+Sin --base-url arranca el servidor LLM falso local
+(tests/fixtures/fake_llm_server.py): sin tokens ni red, mide peticiones y
+tokens, pero no precisión (responde lo mismo en ambos modos por construcción).
+
+USO:
+    python infra/benchmark_llm_batch_classification.py [--blocks 60] [--batch-size 20]
+    python infra/benchmark_llm_batch_classification.py --file model.3dm [--limit 100]
+    OPENAI_API_KEY=sk-... python infra/benchmark_llm_batch_classification.py --base-url https://api.openai.com/v1 --save-reference ref.json
+    OPENAI_API_KEY=sk-... python infra/benchmark_llm_batch_classification.py --base-url https://api.openai.com/v1 --reference ref.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+from src.agent.constants import LLM_BATCH_SIZE  # noqa: E402
+
+
+class _SinLimite:
+    """Sin rate limiter: se miden peticiones y tokens, no esperas del bucket."""
+    enabled = False
+
+
+def synthetic_blocks(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        dims = [round(rng.uniform(0.3, 2.5), 3) for _ in range(3)]
+        yield {
+            "iso_code": f"SF-NAV-{'DKCI'[i % 4]}-{i:03d}",
+            "volume": round(dims[0] * dims[1] * dims[2] * rng.uniform(0.3, 0.9), 3),
+            "bbox": {"min": [0.0, 0.0, 0.0], "max": dims},
+            "vertices_count": rng.randint(200, 8000),
+        }
+
+
+def file_blocks(path: str, limit: int):
+    import rhino3dm
+    from src.agent.graph.nodes import _summarize_model_geometry
+
+    model = rhino3dm.File3dm.Read(path)
+    if model is None:
+        sys.exit(f"❌ No se pudo leer {path}")
+    summary = _summarize_model_geometry(model)
+    layers = [layer.Name for layer in model.Layers]
+    blocks = [
+        {"iso_code": idef.Name, "volume": summary["volume"], "bbox": summary["bbox"],
+         "vertices_count": summary["vertices_count"]}
+        for idef in list(model.InstanceDefinitions)[:limit]
+    ]
+    return blocks, layers
+
+
+def run(client, label, classify):
+    before = dict(client.usage)
+    start = time.perf_counter()
+    results = classify()
+    elapsed = time.perf_counter() - start
+    usage = {key: client.usage[key] - before.get(key, 0) for key in ("requests", "prompt_tokens", "completion_tokens")}
+    print(f"{label:<10} {usage['requests']:>9} {usage['prompt_tokens']:>14,} "
+          f"{usage['completion_tokens']:>13,} {elapsed:>8.2f}s")
+    return results, usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar clasificación LLM por lotes vs bloque a bloque")
+    parser.add_argument("--blocks", type=int, default=60, help="Bloques sintéticos")
+    parser.add_argument("--file", help="Fichero .3dm (usa sus InstanceDefinitions)")
+    parser.add_argument("--limit", type=int, default=100, help="Máximo de bloques del .3dm")
+    parser.add_argument("--batch-size", type=int, default=LLM_BATCH_SIZE)
+    parser.add_argument("--base-url", help="API compatible con OpenAI (por defecto: servidor falso local)")
+    parser.add_argument("--reference", help="JSON de clasificaciones bloque a bloque reales (no repite esa pasada)")
+    parser.add_argument("--save-reference", help="Guardar la pasada bloque a bloque en este JSON")
+    args = parser.parse_args()
+    if (args.reference or args.save_reference) and not args.base_url:
+        parser.error("--reference/--save-reference requieren --base-url: el servidor falso no es una referencia")
+
+    if args.file:
+        blocks, layers = file_blocks(args.file, args.limit)
+    else:
+        blocks, layers = list(synthetic_blocks(args.blocks)), ["SF-NAV-D", "SF-NAV-K", "SF-NAV-C", "SF-NAV-I"]
+
+    fake = None
+    if args.base_url:
+        os.environ["OPENAI_BASE_URL"] = args.base_url
+    else:
+        from fixtures.fake_llm_server import FakeLLMServer
+
+        fake = FakeLLMServer().start()
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+        print(f"ℹ️  Servidor LLM falso en {fake.base_url}\n")
+
+    from src.agent.graph.llm_client import LLMClient, LLMClassificationError
+
+    client = LLMClient(rate_limiter=_SinLimite())
+    print(f"{len(blocks)} bloques, lotes de {args.batch_size}\n")
+    print(f"{'modo':<10} {'peticiones':>9} {'tokens entrada':>14} {'tokens salida':>13} {'tiempo':>9}")
+    print("-" * 60)
+
+    def single():
+        results = []
+        for block in blocks:
+            try:
+                results.append(client.classify_tipologia(layers=layers, **block))
+            except LLMClassificationError:
+                results.append(None)
+        return results
+
+    def batched():
+        results = []
+        for start in range(0, len(blocks), args.batch_size):
+            chunk = blocks[start:start + args.batch_size]
+            try:
+                results.extend(client.classify_tipologia_batch(chunk, layers))
+            except LLMClassificationError:
+                results.extend([None] * len(chunk))
+        return results
+
+    try:
+        if args.reference:
+            reference = json.loads(Path(args.reference).read_text(encoding="utf-8"))
+            baseline = [reference.get(block["iso_code"]) for block in blocks]
+            single_usage = None
+            print(f"{'bloque':<10} referencia real {args.reference}")
+        else:
+            baseline, single_usage = run(client, "bloque", single)
+        batch, batch_usage = run(client, "lote", batched)
+    finally:
+        if fake:
+            fake.stop()
+
+    if args.save_reference:
+        Path(args.save_reference).write_text(json.dumps(
+            {block["iso_code"]: result for block, result in zip(blocks, baseline) if result},
+            ensure_ascii=False, indent=2, default=str,
+        ), encoding="utf-8")
+        print(f"\nReferencia bloque a bloque guardada en {args.save_reference}")
+
+    print()
+    if single_usage:
+        print(f"Peticiones:          {single_usage['requests'] / max(batch_usage['requests'], 1):.1f}x menos")
+        print(f"Tokens de entrada:   {single_usage['prompt_tokens'] / max(batch_usage['prompt_tokens'], 1):.1f}x menos")
+
+    missing = sum(result is None for result in batch)
+    if fake:
+        # El servidor falso clasifica por volumen en ambos modos: coincidir es trivial
+        print("Precisión:           no medida (servidor falso; usar --base-url con un modelo real)")
+    else:
+        pairs = [(b, s) for b, s in zip(batch, baseline) if b and s]
+        agreement = sum(b["tipologia"] == s["tipologia"] for b, s in pairs) / len(pairs) if pairs else 0.0
+        confidence_delta = sum(abs(b["confidence"] - s["confidence"]) for b, s in pairs) / len(pairs) if pairs else 0.0
+        print(f"Misma tipologia:     {agreement:.1%} de {len(pairs)} bloques con referencia real")
+        print(f"Δ confianza media:   {confidence_delta:.3f}")
+    print(f"Sin resultado:       {missing} bloques (se reclasifican bloque a bloque)")
+
+
+if __name__ == "__main__":
+    main()
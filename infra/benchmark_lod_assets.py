@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Informe de tamaño y tiempo de parseo de los assets LOD: OBJ vs GLB.
+
+Genera los niveles high/mid/low (LODDecimationService) de mallas sintéticas
+(icosferas desplazadas a coordenadas de obra) o de los bloques de un .3dm
+real, y para cada nivel compara el OBJ legacy (coordenadas absolutas en
+texto) con las variantes GLB de GLBExportService (float32, cuantizado y
+Draco si DracoPy está instalado): bytes, ahorro y tiempo de parseo.
+
+El parseo se mide con trimesh.load desde memoria en ambos formatos (proxy del
+coste en el navegador: texto → números en OBJ, copia de buffers en GLB).
+
+USO:
+    python infra/benchmark_lod_assets.py [--subdivisions 5 6 7] [--repeat 3]
+    python infra/benchmark_lod_assets.py --file model.3dm [--limit 5]
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import trimesh
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.constants import LOD_DECIMATION_TARGETS  # noqa: E402
+from src.agent.services.glb_export_service import DracoPy, GLBExportService  # noqa: E402
+from src.agent.services.lod_decimation_service import LODDecimationService  # noqa: E402
+
+# Desplazamiento típico de obra (mm): las coordenadas absolutas engordan el OBJ
+WORLD_OFFSET = (431_250.0, 4_582_730.0, 32_150.0)
+
+
+def synthetic_meshes(subdivisions: list[int]):
+    for level in subdivisions:
+        mesh = trimesh.creation.icosphere(subdivisions=level, radius=1000.0)
+        mesh.apply_translation(WORLD_OFFSET)
+        yield f"icosphere-{len(mesh.faces)}", mesh
+
+
+def file_meshes(path: str, limit: int):
+    import rhino3dm
+    from src.agent.tasks.geometry_processing import _extract_block_geometry
+
+    rhino_file = rhino3dm.File3dm.Read(path)
+    if rhino_file is None:
+        sys.exit(f"❌ No se pudo leer {path}")
+    for idef in list(rhino_file.InstanceDefinitions)[:limit]:
+        yield idef.Name, _extract_block_geometry(rhino_file, idef.Name, idef.Name).mesh
+
+
+def encoders() -> dict:
+    variants = {
+        "glb-f32": GLBExportService(quantize=False, normals=False, compression="none"),
+        "glb-q16": GLBExportService(quantize=True, normals=False, compression="none"),
+    }
+    if DracoPy is not None:
+        variants["glb-draco"] = GLBExportService(quantize=False, normals=False, compression="draco")
+    return variants
+
+
+def export_obj(mesh: trimesh.Trimesh) -> bytes:
+    buffer = io.BytesIO()
+    mesh.export(buffer, file_type="obj")
+    return buffer.getvalue()
+
+
+def best_parse_ms(data: bytes, file_type: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        trimesh.load(io.BytesIO(data), file_type=file_type)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar bytes/parseo de assets LOD OBJ vs GLB")
+    parser.add_argument("--subdivisions", type=int, nargs="+", default=[5, 6, 7])
+    parser.add_argument("--file", help="Fichero .3dm (usa sus InstanceDefinitions en vez de icosferas)")
+    parser.add_argument("--limit", type=int, default=5, help="Máximo de bloques del .3dm")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    targets = {level: LOD_DECIMATION_TARGETS[level] for level in ("mid", "low")}
+    meshes = file_meshes(args.file, args.limit) if args.file else synthetic_meshes(args.subdivisions)
+    variants = encoders()
+    if DracoPy is None:
+        print("ℹ️  DracoPy no instalado: se omite la variante glb-draco\n")
+
+    print(f"{'mesh':<24} {'lod':<5} {'faces':>7} {'format':<10} {'bytes':>10} "
+          f"{'saving':>7} {'parse ms':>9} {'speed-up':>9}")
+    print("-" * 88)
+    for name, mesh in meshes:
+        decimated, _ = LODDecimationService().generate(mesh, targets, name)
+        levels = {"high": mesh, **decimated}
+        bounds = mesh.bounds
+        origin = ((bounds[0] + bounds[1]) / 2).tolist()
+
+        for level, level_mesh in levels.items():
+            obj = export_obj(level_mesh)
+            obj_ms = best_parse_ms(obj, "obj", args.repeat)
+            rows = [("obj", obj, obj_ms)]
+            for label, service in variants.items():
+                glb = service.encode(level_mesh, origin=origin).data
+                rows.append((label, glb, best_parse_ms(glb, "glb", args.repeat)))
+
+            for i, (label, data, parse_ms) in enumerate(rows):
+                prefix = f"{name:<24} {level:<5} {len(level_mesh.faces):>7}" if i == 0 else " " * 38
+                saving = (1 - len(data) / len(obj)) * 100
+                print(f"{prefix} {label:<10} {len(data):>10,} {saving:>6.1f}% "
+                      f"{parse_ms:>9.2f} {obj_ms / parse_ms:>8.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
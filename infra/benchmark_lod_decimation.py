@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Informe de calidad/latencia de decimación LOD por modo (LODDecimationService).
+
+Ejecuta los modos sequential / cascade / parallel sobre mallas sintéticas
+(icosferas) o sobre los bloques de un .3dm real y muestra, por nivel
+(mid/low): caras obtenidas, origen (full/mid), latencia y desviación
+geométrica respecto a la malla original. Sirve para elegir
+LOD_DECIMATION_MODE por despliegue.
+
+USO:
+    python infra/benchmark_lod_decimation.py [--subdivisions 5 6 7]
+    python infra/benchmark_lod_decimation.py --file model.3dm [--limit 5]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import trimesh
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.constants import LOD_DECIMATION_MODES, LOD_DECIMATION_TARGETS  # noqa: E402
+from src.agent.services.lod_decimation_service import LODDecimationService  # noqa: E402
+
+
+def synthetic_meshes(subdivisions: list[int]):
+    for level in subdivisions:
+        mesh = trimesh.creation.icosphere(subdivisions=level, radius=1000.0)
+        yield f"icosphere-{len(mesh.faces)}", mesh
+
+
+def file_meshes(path: str, limit: int):
+    import rhino3dm
+    from src.agent.tasks.geometry_processing import _extract_block_geometry
+
+    rhino_file = rhino3dm.File3dm.Read(path)
+    if rhino_file is None:
+        sys.exit(f"❌ No se pudo leer {path}")
+    for idef in list(rhino_file.InstanceDefinitions)[:limit]:
+        yield idef.Name, _extract_block_geometry(rhino_file, idef.Name, idef.Name).mesh
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar modos de decimación LOD")
+    parser.add_argument("--subdivisions", type=int, nargs="+", default=[5, 6, 7])
+    parser.add_argument("--file", help="Fichero .3dm (usa sus InstanceDefinitions en vez de icosferas)")
+    parser.add_argument("--limit", type=int, default=5, help="Máximo de bloques del .3dm")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos para modo parallel (0 = CPUs)")
+    args = parser.parse_args()
+
+    targets = {level: LOD_DECIMATION_TARGETS[level] for level in ("mid", "low")}
+    meshes = file_meshes(args.file, args.limit) if args.file else synthetic_meshes(args.subdivisions)
+
+    print(f"{'mesh':<28} {'mode':<11} {'total ms':>9} {'level':<5} {'faces':>6} "
+          f"{'source':<6} {'lat ms':>8} {'dev mm':>8}")
+    print("-" * 90)
+    for name, mesh in meshes:
+        for mode in LOD_DECIMATION_MODES:
+            service = LODDecimationService(mode=mode, max_workers=args.workers)
+            start = time.perf_counter()
+            _, report = service.generate(mesh, targets, name)
+            total_ms = (time.perf_counter() - start) * 1000
+            for i, (level, entry) in enumerate(report.items()):
+                prefix = f"{name:<28} {mode:<11} {total_ms:>9.1f}" if i == 0 else " " * 50
+                print(f"{prefix} {level:<5} {entry['faces']:>6} {entry['source']:<6} "
+                      f"{entry['latency_ms']:>8.1f} {entry['deviation_mm']:>8.3f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: rhino3dm Mesh → NumPy conversion (geometry_processing).
+
+Compara la conversión legacy (listas Python por vértice/cara, como hacía
+_extract_and_merge_meshes) con la conversión bulk (_mesh_vertices_to_array +
+_mesh_faces_to_array) sobre mallas sintéticas de 10k, 100k y 1M caras
+(mitad quads, mitad triángulos).
+
+USO:
+    python infra/benchmark_mesh_conversion.py [--sizes 10000 100000 1000000] [--repeat 3]
+
+SALIDA:
+    Tabla con faces/s antes y después, y speed-up por tamaño.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import rhino3dm
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.tasks.geometry_processing import (  # noqa: E402
+    _mesh_vertices_to_array,
+    _mesh_faces_to_array,
+)
+
+
+def build_synthetic_mesh(target_faces: int) -> rhino3dm.Mesh:
+    """Grid mesh with ~target_faces rhino faces, alternating quads and triangles."""
+    cols = max(int(np.sqrt(target_faces)), 1)
+    rows = max(target_faces // cols, 1)
+    mesh = rhino3dm.Mesh()
+    for j in range(rows + 1):
+        for i in range(cols + 1):
+            mesh.Vertices.Add(float(i), float(j), float((i * j) % 7))
+    stride = cols + 1
+    for j in range(rows):
+        for i in range(cols):
+            a = j * stride + i
+            b, c, d = a + 1, a + stride + 1, a + stride
+            if (i + j) % 2:
+                mesh.Faces.AddFace(a, b, c, d)
+            else:
+                mesh.Faces.AddFace(a, b, c)
+    return mesh
+
+
+def legacy_convert(mesh: rhino3dm.Mesh) -> tuple[np.ndarray, np.ndarray]:
+    """Pre-vectorization conversion (per-vertex lists + per-face appends)."""
+    vertices = np.array([[v.X, v.Y, v.Z] for v in mesh.Vertices])
+    vertex_offset = 0
+    faces = []
+    for face in mesh.Faces:
+        if isinstance(face, tuple):
+            a, b, c, d = face
+            if c == d:
+                faces.append([a + vertex_offset, b + vertex_offset, c + vertex_offset])
+            else:
+                faces.append([a + vertex_offset, b + vertex_offset, c + vertex_offset])
+                faces.append([a + vertex_offset, c + vertex_offset, d + vertex_offset])
+    return vertices, np.array(faces)
+
+
+def bulk_convert(mesh: rhino3dm.Mesh) -> tuple[np.ndarray, np.ndarray]:
+    return _mesh_vertices_to_array(mesh.Vertices), _mesh_faces_to_array(mesh.Faces)
+
+
+def best_of(fn, mesh, repeat: int) -> tuple[float, tuple]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(mesh)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rhino3dm → NumPy mesh conversion")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'faces':>10} {'legacy faces/s':>16} {'bulk faces/s':>16} {'speed-up':>9}")
+    print("-" * 55)
+    for size in args.sizes:
+        mesh = build_synthetic_mesh(size)
+        n_faces = len(mesh.Faces)
+        t_legacy, (v_old, f_old) = best_of(legacy_convert, mesh, args.repeat)
+        t_bulk, (v_new, f_new) = best_of(bulk_convert, mesh, args.repeat)
+
+        # Both paths must produce identical arrays (same triangle order)
+        assert np.array_equal(v_old, v_new) and np.array_equal(f_old, f_new)
+
+        print(f"{n_faces:>10,} {n_faces / t_legacy:>16,.0f} {n_faces / t_bulk:>16,.0f} "
+              f"{t_legacy / t_bulk:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Script de Conversión LOD Masiva Local: reprocesamiento offline sin Celery
+
+Ejecuta el mismo pipeline que la tarea generate_file_lod_assets (extracción,
+caché LOD, decimación, codificación, instancing) sobre un directorio local o
+un prefijo de raw-uploads, un proceso por archivo .3dm y un worker por core.
+Pensado para ventanas de mantenimiento: sin broker, sin encolar una tarea por
+elemento y sin sondear task ids.
+
+- Los assets se suben a processed-geometry o, con --output-dir, se escriben
+  en un directorio local con las mismas claves (sincronizar después con el
+  bucket: las filas guardan ya las URLs públicas del bucket). Hasta entonces
+  esas URLs no existen: no se indexan en la caché LOD ni se programan los
+  tiles de escena; tras sincronizar, lanzar build_scene_tiles
+- Las filas se confirman en lotes de --commit-blocks bloques
+- Cada archivo confirmado se añade al manifiesto: si se interrumpe la
+  ejecución, volver a lanzar el mismo comando continúa donde se quedó
+
+USO:
+    python infra/bulk_convert_lod.py (--dir DIR | --prefix PREFIX) [opciones]
+
+OPCIONES:
+    --dir DIR             Directorio con los .3dm (espejo de raw-uploads: la ruta
+                          relativa es blocks.url_original, ver --key-prefix)
+    --key-prefix P        Prefijo a anteponer a las rutas relativas de --dir
+    --prefix PREFIX       Carpeta de raw-uploads con los .3dm (se descargan)
+    --output-dir DIR      Escribir assets en DIR en vez de processed-geometry
+    --public-url-base URL URL pública del bucket (default: la del cliente Supabase)
+    --workers N           Procesos (default: BULK_LOD_WORKERS, 0 = uno por core)
+    --commit-blocks N     Bloques por commit (default: BULK_LOD_COMMIT_BLOCKS)
+    --manifest PATH       Manifiesto de reanudación (default: BULK_LOD_MANIFEST)
+    --all                 Regenerar también bloques que ya tienen assets LOD
+    --limit N             Convertir solo los primeros N archivos
+
+REQUERIMIENTOS:
+    - SUPABASE_DATABASE_URL: PostgreSQL connection string
+    - SUPABASE_URL / SUPABASE_KEY: Storage (salvo --dir + --output-dir + --public-url-base)
+    - REDIS_URL (opcional): caché LOD compartida con los workers
+    - Las mismas variables LOD_* que el worker (mismos assets)
+
+CONTEXTO:
+    Motor: src/agent/tasks/bulk_lod_conversion.py
+    Pipeline compartido: src/agent/tasks/geometry_processing.py (_run_file_lods)
+"""
+import os
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent.constants import (  # noqa: E402
+    BULK_LOD_COMMIT_BLOCKS,
+    BULK_LOD_MANIFEST,
+    BULK_LOD_WORKERS,
+)
+from src.agent.tasks.bulk_lod_conversion import (  # noqa: E402
+    BulkProgress,
+    local_sources,
+    run_bulk_conversion,
+    storage_sources,
+)
+
+
+def load_configuration() -> str:
+    """Load environment variables (12-Factor App pattern)"""
+    project_root = Path(__file__).parent.parent
+    env_file = project_root / ".env"
+    load_dotenv(env_file)  # Silent if file doesn't exist
+
+    database_url = os.getenv("SUPABASE_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ ERROR: Database connection string not found")
+        print("   Missing environment variable: SUPABASE_DATABASE_URL or DATABASE_URL")
+        sys.exit(1)
+
+    # The pipeline connects through DATABASE_URL (geometry_processing.get_db_connection)
+    os.environ["DATABASE_URL"] = database_url
+    return database_url
+
+
+def print_progress(progress: BulkProgress) -> None:
+    """Línea de progreso: archivos, bloques, throughput y ETA"""
+    eta = progress.eta_seconds
+    eta_text = f"{eta / 60:.1f} min" if eta is not None else "--"
+    print(f"\r   [{progress.elapsed_seconds:.0f}s] archivos {progress.files_done}/{progress.files_total} | "
+          f"bloques {progress.blocks_done} (fallidos {progress.blocks_failed}, "
+          f"confirmados {progress.blocks_committed}) | "
+          f"{progress.blocks_per_second:.2f} bloques/s, {progress.faces_per_second / 1000:.0f}k caras/s | "
+          f"ETA {eta_text}", end="", flush=True)
+
+
+def main(argv=None):
+    """Main execution flow"""
+    parser = argparse.ArgumentParser(
+        description="Convertir localmente (todos los cores) los assets LOD de un lote de archivos .3dm"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="Directorio local con los .3dm (espejo de raw-uploads)")
+    source.add_argument("--prefix", help="Carpeta de raw-uploads con los .3dm")
+    parser.add_argument("--key-prefix", default="", help="Prefijo de blocks.url_original para --dir")
+    parser.add_argument("--output-dir", default=None, help="Escribir assets aquí en vez de processed-geometry")
+    parser.add_argument("--public-url-base", default=None,
+                        help="URL pública del bucket processed-geometry (default: la del cliente Supabase)")
+    parser.add_argument("--workers", type=int, default=BULK_LOD_WORKERS,
+                        help=f"Procesos en paralelo (default: {BULK_LOD_WORKERS}, 0 = uno por core)")
+    parser.add_argument("--commit-blocks", type=int, default=BULK_LOD_COMMIT_BLOCKS,
+                        help=f"Bloques por commit (default: {BULK_LOD_COMMIT_BLOCKS})")
+    parser.add_argument("--manifest", default=BULK_LOD_MANIFEST,
+                        help=f"Manifiesto de reanudación (default: {BULK_LOD_MANIFEST})")
+    parser.add_argument("--all", action="store_true",
+                        help="Regenerar también los bloques que ya tienen assets LOD")
+    parser.add_argument("--limit", type=int, default=None, help="Convertir solo los primeros N archivos")
+
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print(" 🏭 Bulk LOD Conversion (local)")
+    print("=" * 80)
+    print()
+
+    database_url = load_configuration()
+    print("✅ Configuración cargada:")
+    print(f"   Database: {database_url.split('@')[1] if '@' in database_url else 'configured'}")
+    print(f"   Salida: {args.output_dir or 'processed-geometry (Storage)'}")
+    print(f"   Manifiesto: {args.manifest}")
+    print()
+
+    if args.dir:
+        sources = local_sources(args.dir, key_prefix=args.key_prefix)
+    else:
+        print(f"🔍 Listando raw-uploads/{args.prefix}...")
+        sources = storage_sources(args.prefix)
+    if args.limit:
+        sources = sources[:args.limit]
+
+    if not sources:
+        print("🎉 No se encontraron archivos .3dm")
+        return
+    print(f"📂 {len(sources)} archivos .3dm encontrados")
+    print("   Ctrl+C para interrumpir: volver a ejecutar continúa desde el manifiesto")
+    print()
+
+    try:
+        summary = run_bulk_conversion(
+            sources,
+            manifest_path=args.manifest,
+            output_dir=args.output_dir,
+            public_url_base=args.public_url_base,
+            workers=args.workers,
+            commit_blocks=args.commit_blocks,
+            include_processed=args.all,
+            on_progress=print_progress,
+        )
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Conversión interrumpida (Ctrl+C)")
+        print(f"   Los archivos confirmados están en {args.manifest}; vuelve a ejecutar para continuar")
+        sys.exit(130)
+
+    print("\n")
+    print("=" * 80)
+    print("✅ Conversión LOD completada")
+    print("=" * 80)
+    print(f"   Archivos convertidos: {summary['files']} (ya hechos / sin pendientes: {summary['skipped_files']})")
+    print(f"   Bloques confirmados: {summary['committed']}")
+    print(f"   Tiempo: {summary['elapsed_seconds']}s")
+    if summary['failed']:
+        print(f"\n⚠️  {len(summary['failed'])} bloques fallaron:")
+        for block_id, error in list(summary['failed'].items())[:20]:
+            print(f"   - {block_id[:8]}: {error}")
+        print("   Los fallos transitorios se reintentan al volver a ejecutar")
+    if args.output_dir:
+        print(f"\n📦 Sincroniza {args.output_dir} con el bucket processed-geometry para publicar los assets")
+        print("   y después lanza build_scene_tiles (no se han programado los tiles de escena)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,59 @@
 #!/usr/bin/env python3
 """
-Script de Reprocesamiento LOD: US-015 Multi-Level LOD System
-
-Este script regenera assets LOD para elementos existentes que solo tienen low_poly_url.
-Tras implementar sistema LOD completo:
-- Backend ahora genera 3 niveles: high_poly (~7k tris), mid_poly (~2k tris), low_poly (~500 tris)
-- Base de datos tiene nuevas columnas: high_poly_url, mid_poly_url
-- Frontend usa 4 niveles: high (0-5m), mid (5-20m), low (20-50m), bbox (>50m)
+Script de Reprocesamiento LOD: reconstrucción selectiva de assets obsoletos
+
+Cada bloque guarda la versión del pipeline LOD y un hash de los parámetros de
+cada nivel (blocks.lod_build, migración 20261019000004). Tras cambiar la
+configuración LOD (tolerancias, targets, formato, compresión...) este script
+calcula qué bloques y qué niveles están obsoletos y reconstruye SOLO esos:
+- Cambiar LOD_LOW_ERROR_TOLERANCE_MM solo reconstruye low (+ contenedor)
+- Subir LOD_CACHE_VERSION reconstruye todos los niveles
+- Bloques sin sello (anteriores a la migración) o sin URL de algún nivel:
+  se reconstruyen los niveles que faltan / todos
+
+Los bloques obsoletos se agrupan por archivo .3dm (se parsea una vez por
+lote) en lotes de LOD_REBUILD_BATCH_BLOCKS, ordenados por coste estimado, y
+se encola una tarea agent.rebuild_lod_levels por lote. Ya NO se resetean las
+URLs: los assets actuales se siguen sirviendo hasta que el lote se confirma.
 
 USO:
-    python infra/reprocess_lod_assets.py [--dry-run] [--limit N]
+    python infra/reprocess_lod_assets.py [--dry-run] [--limit N] [--batch-blocks N]
 
 OPCIONES:
-    --dry-run    Mostrar elementos a reprocesar sin ejecutar
-    --limit N    Procesar solo los primeros N elementos (default: todos)
+    --dry-run         Mostrar el plan (niveles por bloque + coste estimado) sin ejecutar
+    --limit N         Planificar solo los primeros N elementos (default: todos)
+    --batch-blocks N  Máximo de bloques por tarea (default: LOD_REBUILD_BATCH_BLOCKS)
+    --no-monitor      Solo encolar y salir
+    --yes             Auto-confirmar sin prompt interactivo
 
 REQUERIMIENTOS:
     - CELERY_BROKER_URL: Redis connection string (para encolar tareas)
     - SUPABASE_DATABASE_URL: PostgreSQL connection string
+    - Las mismas variables LOD_* que el worker: el plan se calcula con la
+      configuración de este proceso (el worker vuelve a planificar cada lote
+      con la suya y registra las diferencias)
 
 PROCESO:
     1. Conecta a PostgreSQL (Supabase)
-    2. Busca elementos con url_original pero sin high_poly_url o mid_poly_url
-    3. Resetea low_poly_url = NULL (forzar regeneración con nuevo código)
-    4. Encola generate_low_poly_glb para cada elemento
-    5. Worker reprocesará generando los 3 niveles LOD
+    2. Lee los bloques con url_original y su sello lod_build
+    3. plan_lod_rebuild: niveles obsoletos por bloque, lotes por archivo, coste
+    4. Encola rebuild_lod_levels(file_key, {block_id: niveles}) por lote
 
 CONTEXTO:
-    User Story: US-015 (LOD System)
-    Migration: 20260311000001_lod_system_multi_level.sql
-    Fecha implementación: 2026-03-11
-    Archivos modificados:
-    - supabase/migrations/20260311000001_lod_system_multi_level.sql (DB schema)
-    - src/agent/constants.py (LOD_DECIMATION_TARGETS)
-    - src/agent/tasks/geometry_processing.py (_generate_lod_glbs, _update_block_lod_urls)
-    - src/frontend/src/components/Dashboard/ElementMesh.tsx (4-level LOD component)
+    Planner: src/agent/services/lod_rebuild_planner.py
+    Tarea: src/agent/tasks/geometry_processing.py (rebuild_lod_levels)
+    Modelo de coste: LOD_REBUILD_COST_MODEL (src/agent/constants.py), calibrar
+    con infra/benchmark_lod_decimation.py
 """
 import os
 import sys
 import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import List, Tuple
 from dotenv import load_dotenv
 
-# Add parent directory to path to import modules if needed
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     import psycopg2
@@ -63,6 +71,9 @@ except ImportError:
     print("   Or: docker compose run --rm backend pip install celery")
     sys.exit(1)
 
+from src.agent.constants import LOD_REBUILD_BATCH_BLOCKS, TASK_REBUILD_LOD_LEVELS  # noqa: E402
+from src.agent.services.lod_rebuild_planner import RebuildPlan, plan_lod_rebuild  # noqa: E402
+
 
 def load_configuration() -> Tuple[str, str]:
     """Load environment variables (12-Factor App pattern)"""
@@ -86,124 +97,91 @@ def load_configuration() -> Tuple[str, str]:
     return database_url, broker_url
 
 
-def find_elements_needing_lod(cursor, limit: int = None) -> Dict[str, str]:
+def fetch_lod_rows(cursor, limit: int = None) -> List[dict]:
     """
-    Encuentra elementos que necesitan regeneración LOD
-    
-    Criterios:
-    - Tienen url_original (archivo fuente disponible)
-    - Les falta al menos uno de los 3 niveles LOD (high/mid/low)
-    
+    Lee los bloques con archivo fuente y el estado de sus assets LOD
+
     Args:
         cursor: psycopg2 cursor
-        limit: Maximum number of elements to process (None = all)
-    
+        limit: Maximum number of elements to plan (None = all)
+
     Returns:
-        dict: {block_id: (url_original, iso_code)} para elementos a reprocesar
+        list: filas para plan_lod_rebuild
     """
-    print("🔍 Buscando elementos con LOD incompleto...")
+    print("🔍 Leyendo sellos LOD de los elementos...")
 
-    query = """
-    SELECT id, url_original, iso_code, low_poly_url, mid_poly_url, high_poly_url, material_type
+    columns = ("id", "iso_code", "url_original", "high_poly_url", "mid_poly_url", "low_poly_url", "lod_build")
+    query = f"""
+    SELECT {', '.join(columns)}
     FROM blocks
     WHERE url_original IS NOT NULL
-      AND (low_poly_url IS NULL OR mid_poly_url IS NULL OR high_poly_url IS NULL)
+      AND is_archived = false
+      AND status NOT IN ('uploaded', 'processing', 'rejected', 'error_processing')
     ORDER BY iso_code
     """
 
     if limit:
-        query += f" LIMIT {limit}"
+        query += f" LIMIT {int(limit)}"
 
     cursor.execute(query)
-    rows = cursor.fetchall()
-
-    if not rows:
-        print("✅ No hay elementos que requieran reprocesamiento LOD")
-        print("   Todos los elementos ya tienen high_poly_url y mid_poly_url")
-        return {}
+    return [dict(zip(columns, row), id=str(row[0])) for row in cursor.fetchall()]
 
-    print(f"\n📊 Encontrados {len(rows)} elementos con LOD incompleto:")
-    print(f"{'ISO Code':<15} {'ID':<10} {'Material':<12} {'LOD Status':<30}")
-    print("-" * 75)
 
-    elements_to_process = {}
-    
-    for row in rows:
-        block_id, url_original, iso_code, low_poly_url, mid_poly_url, high_poly_url, material_type = row
-        
-        # LOD status indicators
-        low_status = "✓" if low_poly_url else "✗"
-        mid_status = "✓" if mid_poly_url else "✗"
-        high_status = "✓" if high_poly_url else "✗"
-        lod_status = f"low:{low_status} mid:{mid_status} high:{high_status}"
-        
-        print(f"{iso_code:<15} {block_id[:8]:<10} {material_type or 'unknown':<12} {lod_status:<30}")
-        
-        elements_to_process[block_id] = (url_original, iso_code)
-
-    return elements_to_process
-
-
-def reset_lod_urls(cursor, block_ids: List[str]) -> None:
+def print_plan(plan: RebuildPlan, verbose: bool = True) -> None:
     """
-    Resetea low_poly_url = NULL para forzar regeneración completa LOD
-    
-    Esto fuerza al worker a regenerar los 3 niveles (high/mid/low) con el código nuevo
-    que genera múltiples GLBs en lugar de solo uno.
-    
+    Muestra los niveles obsoletos por bloque y el resumen con coste estimado
+
     Args:
-        cursor: psycopg2 cursor
-        block_ids: list of block UUIDs to reset
+        plan: resultado de plan_lod_rebuild
+        verbose: listar cada bloque (dry-run)
     """
-    print(f"\n🔄 Reseteando {len(block_ids)} elementos (low_poly_url → NULL)...")
-    print("   Esto forzará regeneración completa de high/mid/low GLBs")
-
-    placeholders = ",".join(["%s"] * len(block_ids))
-    query = f"""
-    UPDATE blocks
-    SET low_poly_url = NULL,
-        mid_poly_url = NULL,
-        high_poly_url = NULL
-    WHERE id IN ({placeholders})
+    summary = plan.summary()
+    if verbose and plan.blocks:
+        print(f"\n{'ISO Code':<15} {'ID':<10} {'Niveles obsoletos':<35} {'Coste (s)':>10}")
+        print("-" * 75)
+        for block in plan.blocks:
+            print(f"{block.iso_code:<15} {block.block_id[:8]:<10} {','.join(block.levels):<35} "
+                  f"{block.estimated_seconds:>10.1f}")
+
+    print("\n📊 Plan de reconstrucción:")
+    print(f"   Bloques obsoletos: {summary['stale_blocks']} (al día: {summary['up_to_date_blocks']})")
+    for level, count in summary['levels'].items():
+        print(f"   - {level:<10} {count} bloques")
+    print(f"   Lotes: {summary['batches']} en {summary['files']} archivos .3dm")
+    minutes = summary['estimated_worker_seconds'] / 60
+    print(f"   Coste estimado: {summary['estimated_worker_seconds']}s de worker (~{minutes:.1f} min)")
+
+
+def enqueue_rebuild_batches(celery_app: Celery, plan: RebuildPlan) -> List[str]:
     """
+    Encola una tarea rebuild_lod_levels por lote (más costosos primero)
 
-    cursor.execute(query, block_ids)
-    print(f"   ✅ {cursor.rowcount} registros actualizados")
-
-
-def enqueue_lod_generation_tasks(celery_app: Celery, elements: Dict[str, Tuple[str, str]]) -> List[str]:
-    """
-    Encola tareas de generación LOD para cada elemento
-    
     Args:
         celery_app: Celery application instance
-        elements: dict {block_id: (url_original, iso_code)}
-    
+        plan: resultado de plan_lod_rebuild
+
     Returns:
         list: Task IDs for monitoring
     """
-    print(f"\n🚀 Encolando {len(elements)} tareas de generación LOD...")
+    print(f"\n🚀 Encolando {len(plan.batches)} lotes de reconstrucción LOD...")
 
     task_ids = []
-    
-    for i, (block_id, (url_original, iso_code)) in enumerate(elements.items(), 1):
+
+    for i, batch in enumerate(plan.batches, 1):
         try:
-            # Send task to queue
-            # Task signature: generate_low_poly_glb(block_id: str)
-            # The task fetches url_original from DB internally
-            # Despite the name "low_poly", this task now generates all 3 LOD levels
-            # Task registered as "agent.generate_low_poly_glb" in worker (see celery logs)
+            # Task signature: rebuild_lod_levels(file_key: str, block_levels: {block_id: [levels]})
             result = celery_app.send_task(
-                "agent.generate_low_poly_glb",
-                args=[block_id],  # Only pass block_id, task fetches url_original from DB
+                TASK_REBUILD_LOD_LEVELS,
+                args=batch.task_args(),
                 queue="celery"  # Worker listens on "celery" queue
             )
-            
+
             task_ids.append(result.id)
-            print(f"   [{i}/{len(elements)}] {iso_code} ({block_id[:8]}): task_id={result.id[:8]}")
-            
+            print(f"   [{i}/{len(plan.batches)}] {Path(batch.file_key).name}: {len(batch.blocks)} bloques, "
+                  f"~{batch.estimated_seconds:.0f}s, task_id={result.id[:8]}")
+
         except Exception as e:
-            print(f"   ❌ Error encolando {iso_code}: {e}")
+            print(f"   ❌ Error encolando lote de {batch.file_key}: {e}")
 
     return task_ids
 
@@ -267,18 +245,24 @@ def monitor_task_progress(celery_app: Celery, task_ids: List[str], timeout: int
 def main():
     """Main execution flow"""
     parser = argparse.ArgumentParser(
-        description="Reprocesar elementos para generar assets LOD completos (high/mid/low)"
+        description="Reconstruir solo los niveles LOD obsoletos para la configuración actual"
     )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="Mostrar elementos a reprocesar sin ejecutar cambios"
+        help="Mostrar el plan y el coste estimado sin ejecutar cambios"
     )
     parser.add_argument(
         "--limit",
         type=int,
         default=None,
-        help="Procesar solo los primeros N elementos (default: todos)"
+        help="Planificar solo los primeros N elementos (default: todos)"
+    )
+    parser.add_argument(
+        "--batch-blocks",
+        type=int,
+        default=LOD_REBUILD_BATCH_BLOCKS,
+        help=f"Máximo de bloques por tarea (default: {LOD_REBUILD_BATCH_BLOCKS})"
     )
     parser.add_argument(
         "--no-monitor",
@@ -294,13 +278,13 @@ def main():
     args = parser.parse_args()
 
     print("=" * 80)
-    print(" 🎨 US-015: LOD Asset Reprocessing Script")
+    print(" 🎨 LOD Asset Selective Rebuild")
     print("=" * 80)
     print()
 
     # Load configuration
     database_url, broker_url = load_configuration()
-    print(f"✅ Configuración cargada:")
+    print("✅ Configuración cargada:")
     print(f"   Database: {database_url.split('@')[1] if '@' in database_url else 'configured'}")
     print(f"   Broker: {broker_url}")
     print()
@@ -315,54 +299,51 @@ def main():
         sys.exit(1)
 
     try:
-        # Find elements needing LOD reprocessing
-        elements = find_elements_needing_lod(cursor, limit=args.limit)
+        # Plan: stale levels per block, batches per .3dm file
+        rows = fetch_lod_rows(cursor, limit=args.limit)
+        plan = plan_lod_rebuild(rows, batch_blocks=args.batch_blocks)
 
-        if not elements:
-            print("\n🎉 No hay elementos para reprocesar. Sistema LOD completo.")
+        if not plan.batches:
+            print(f"\n🎉 Los {plan.up_to_date} elementos están al día con la configuración LOD actual.")
             return
 
+        print_plan(plan, verbose=args.dry_run)
+
         if args.dry_run:
-            print(f"\n🔍 DRY RUN: Se reprocesarían {len(elements)} elementos")
-            print("   Ejecuta sin --dry-run para aplicar cambios")
+            print(f"\n🔍 DRY RUN: Se reconstruirían {len(plan.blocks)} elementos")
+            print("   Ejecuta sin --dry-run para encolar los lotes")
             return
 
         # Confirm action
         if not args.yes:
-            print(f"\n⚠️  Esto reprocesará {len(elements)} elementos:")
-            print("   1. Resetear low_poly_url a NULL")
-            print("   2. Encolar tareas de generación LOD")
-            print("   3. Worker generará high/mid/low GLBs")
+            print(f"\n⚠️  Esto reconstruirá {len(plan.blocks)} elementos en {len(plan.batches)} lotes:")
+            print("   1. Encolar una tarea rebuild_lod_levels por lote")
+            print("   2. Worker regenerará solo los niveles obsoletos")
+            print("   3. Los assets actuales se sirven hasta que cada lote se confirma")
             response = input("\n¿Continuar? (yes/no): ").strip().lower()
 
             if response not in ["yes", "y"]:
                 print("❌ Operación cancelada por el usuario")
                 return
 
-        # Reset LOD URLs
-        reset_lod_urls(cursor, list(elements.keys()))
-        conn.commit()
-
         # Initialize Celery app
         celery_app = Celery("agent", broker=broker_url)
 
         # Enqueue tasks
-        task_ids = enqueue_lod_generation_tasks(celery_app, elements)
+        task_ids = enqueue_rebuild_batches(celery_app, plan)
 
         if task_ids and not args.no_monitor:
-            monitor_task_progress(celery_app, task_ids, timeout=600)
+            timeout = max(600, int(plan.estimated_seconds))
+            monitor_task_progress(celery_app, task_ids, timeout=timeout)
 
         print("\n" + "=" * 80)
-        print("✅ Reprocesamiento LOD iniciado")
+        print("✅ Reconstrucción LOD iniciada")
         print("=" * 80)
         print()
         print("📊 Para verificar resultados:")
         print("   1. Revisa logs del worker: docker compose logs agent-worker -f")
-        print("   2. Verifica DB (high_poly_url, mid_poly_url poblados)")
-        print("   3. Inspecciona Supabase Storage buckets:")
-        print("      - high-poly/ (~600-800KB GLB)")
-        print("      - mid-poly/  (~300-400KB GLB)")
-        print("      - low-poly/  (~150-200KB GLB)")
+        print("   2. Vuelve a ejecutar con --dry-run: los bloques reconstruidos aparecen al día")
+        print("   3. Verifica DB (lod_params_hash, lod_build actualizados)")
         print()
 
     finally:
@@ -92,7 +92,46 @@ celery_app.conf.update(
 # Import tasks AFTER celery_app is fully initialized to avoid circular imports
 # This registers the @celery_app.task decorated functions with the Celery instance
 try:
-    from tasks import file_validation, geometry_processing, embed_block  # noqa: F401
+    from tasks import file_validation, geometry_processing, embed_block, scene_tiles  # noqa: F401
 except ImportError:
     # In test/dev context with full module paths
-    from src.agent.tasks import file_validation, geometry_processing, embed_block  # noqa: F401
+    from src.agent.tasks import file_validation, geometry_processing, embed_block, scene_tiles  # noqa: F401
+
+# Worker-local .3dm cache: parsed File3dm models stay in the process between
+# tasks (every block of a file reuses them) until the process RSS goes above
+# MODEL_CACHE_MAX_RSS_MB, checked after each task.
+from celery.signals import task_postrun, worker_process_init, worker_process_shutdown
+
+try:
+    from services.model_cache_service import get_model_cache
+except ImportError:
+    from src.agent.services.model_cache_service import get_model_cache
+
+
+@task_postrun.connect
+def _trim_model_cache(**kwargs):
+    get_model_cache().trim()
+
+
+# Audit trail events of the graph nodes go through a background batched
+# writer per worker process (graph/events.py AuditEventWriter), flushed after
+# each task and when the process shuts down.
+try:
+    from graph.events import start_event_writer, flush_event_writer, stop_event_writer
+except ImportError:
+    from src.agent.graph.events import start_event_writer, flush_event_writer, stop_event_writer
+
+
+@worker_process_init.connect
+def _start_audit_event_writer(**kwargs):
+    start_event_writer()
+
+
+@task_postrun.connect
+def _flush_audit_events(**kwargs):
+    flush_event_writer()
+
+
+@worker_process_shutdown.connect
+def _stop_audit_event_writer(**kwargs):
+    stop_event_writer()
@@ -32,6 +32,70 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE_MB: int = 500
     TEMP_DIR: str = "/tmp/sf-pm-agent"
 
+    # Worker tunables (documented and re-exported in constants.py)
+    # Validation
+    VALIDATE_FILE_BATCH_BLOCKS: int = 50
+    VALIDATION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    VALIDATION_CACHE_LOCAL_ENTRIES: int = 4096
+
+    # Audit events
+    AUDIT_EVENT_WRITER: bool = True
+    AUDIT_EVENT_QUEUE_SIZE: int = 1000
+    AUDIT_EVENT_BATCH_SIZE: int = 100
+    AUDIT_EVENT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_EVENT_SPOOL_DIR: str = "/tmp/sf-pm-agent/audit-events"
+
+    # LOD generation
+    FILE_LOD_BATCH_BLOCKS: int = 25
+    LOD_TARGET_MODE: str = "adaptive"
+    LOD_MID_ERROR_TOLERANCE_MM: float = 2.0
+    LOD_LOW_ERROR_TOLERANCE_MM: float = 10.0
+    LOD_DECIMATION_MODE: str = "cascade"
+    LOD_DECIMATION_MAX_WORKERS: int = 0
+    VERTEX_CLUSTERING_MIN_FACES: int = 200000
+    LOD_ASSET_FORMAT: str = "glb"
+    LOD_GLB_QUANTIZE: bool = True
+    LOD_GLB_NORMALS: bool = False
+    LOD_GLB_COMPRESSION: str = "none"
+    LOD_UPLOAD_MAX_WORKERS: int = 8
+    LOD_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LOD_DECIMATION_CACHE_SIZE: int = 64
+    LOD_INSTANCING: bool = True
+    LOD_INSTANCING_MIN_INSTANCES: int = 2
+    LOD_CONTAINER: bool = False
+    LOD_REBUILD_BATCH_BLOCKS: int = 50
+    LOD_CHECKPOINTS: bool = True
+    LOD_CHECKPOINT_DIR: str = "/tmp/sf-pm-agent/lod-checkpoints"
+    LOD_CHECKPOINT_TTL_SECONDS: int = 86400
+
+    # Shared mesh pool and bulk conversion
+    SHARED_MESH_POOL_WORKERS: int = 0
+    SHARED_MESH_POOL_WORKER_MEMORY_MB: int = 1024
+    SHARED_MESH_POOL_SLOT_DIR: str = "/tmp/sf-pm-agent/mesh-pool-slots"
+    FILE_LOD_POOL_MIN_BLOCKS: int = 4
+    BULK_LOD_WORKERS: int = 0
+    BULK_LOD_COMMIT_BLOCKS: int = 200
+
+    # Scene tiles
+    SCENE_TILE_MAX_BLOCKS: int = 64
+    SCENE_TILE_HLOD_MAX_FACES: int = 20000
+    SCENE_TILES_BATCH_TILES: int = 25
+    SCENE_TILES_DOWNLOAD_WORKERS: int = 8
+
+    # Downloads and parsed-model cache
+    DOWNLOAD_MAX_PARALLEL_RANGES: int = 4
+    MODEL_CACHE_DIR: str = "/tmp/sf-pm-agent/model-cache"
+    MODEL_CACHE_DISK_BUDGET_MB: int = 2048
+    MODEL_CACHE_MAX_MODELS: int = 2
+    MODEL_CACHE_MAX_RSS_MB: int = 3072
+
+    # Classification
+    CLASSIFICATION_CACHE_ENABLED: bool = True
+    CLASSIFICATION_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LLM_BATCH_CLASSIFICATION: bool = True
+    LLM_BATCH_SIZE: int = 20
+    LLM_BATCH_TIMEOUT_SECONDS: int = 60
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -3,8 +3,17 @@ Agent Worker Constants
 
 Centralized configuration values for Celery worker and task execution.
 Following Clean Architecture pattern (separation from config.py which handles env vars).
+Tunables are read from the environment by Settings (config.py) and
+re-exported here under the same names.
 """
 
+try:
+    from config import settings  # When executed as worker from /app
+    if not hasattr(settings, 'FILE_LOD_BATCH_BLOCKS'):
+        raise ImportError("Wrong config module")  # backend config.py on the path
+except ImportError:
+    from src.agent.config import settings  # When imported as module in tests
+
 # Celery Worker Configuration
 CELERY_APP_NAME = "sf_pm_agent"
 
@@ -27,6 +36,14 @@ TASK_RETRY_DELAY_SECONDS = 30  # Base delay (exponential backoff applied in task
 TASK_HEALTH_CHECK = "agent.tasks.health_check"
 TASK_VALIDATE_FILE = "agent.tasks.validate_file"
 TASK_REGISTER_3DM_BLOCKS = "agent.tasks.register_3dm_blocks"
+# File-level validation: register_3dm_blocks enqueues one task per chunk of
+# VALIDATE_FILE_BATCH_BLOCKS blocks of a .3dm instead of one validate_file per
+# block. The file is downloaded, parsed and geometry-validated once per task;
+# only the per-block part of the graph (classification, report) runs per
+# block, and all reports/statuses are committed in one transaction. Sized so
+# a chunk's classifications fit TASK_SOFT_TIME_LIMIT_SECONDS.
+TASK_VALIDATE_FILE_BLOCKS = "agent.tasks.validate_file_blocks"
+VALIDATE_FILE_BATCH_BLOCKS = settings.VALIDATE_FILE_BATCH_BLOCKS
 # RAG: single-block embedding upsert. Auto-fired by validate_file after a
 # successful validation so The Archivist can find newly-ingested pieces
 # immediately (no manual backfill required for the demo flow).
@@ -55,6 +72,16 @@ GEOMETRY_ERROR_NULL = "Geometry is null or missing"
 GEOMETRY_ERROR_DEGENERATE_BBOX = "Bounding box is degenerate or invalid"
 GEOMETRY_ERROR_ZERO_VOLUME = "Solid geometry has zero or near-zero volume (< {min_volume} cubic units)"
 
+# Memoized geometry validation (services/validation_cache.py)
+# Results keyed by SHA-256 of the .3dm content + validator version + scope
+# (file-wide rules, or one block). Worker-local LRU tier in front of a
+# Redis tier shared by every worker.
+GEOMETRY_VALIDATOR_VERSION = 2  # Bump when GeometryValidator rules change (invalidates every entry)
+VALIDATION_CACHE_KEY_PREFIX = "geometry:validation:"
+VALIDATION_CACHE_STATS_KEY = "geometry:validation_cache_stats"
+VALIDATION_CACHE_TTL_SECONDS = settings.VALIDATION_CACHE_TTL_SECONDS  # 7 days
+VALIDATION_CACHE_LOCAL_ENTRIES = settings.VALIDATION_CACHE_LOCAL_ENTRIES
+
 # ===== T-1805-AGENT: LangGraph Audit Trail Events =====
 
 # Event types for LangGraph StateGraph node transitions
@@ -81,6 +108,20 @@ class EventType:
 # If >10 events accumulated, insert as single batch query
 EVENT_BUFFER_THRESHOLD = 10
 
+# Background audit event writer (graph/events.py AuditEventWriter)
+# Started in every Celery worker process: insert_event queues the event and
+# returns; a writer thread does one bulk insert every BATCH_SIZE events or
+# FLUSH_INTERVAL_SECONDS, and the queue is flushed after each task and at
+# worker shutdown. Every event is first appended to a journal segment in
+# SPOOL_DIR, so events of a crashed process (or of a failed flush) are
+# re-sent later instead of lost. Beyond QUEUE_SIZE queued events the
+# overflow is only kept in the journal (counted as 'overflowed').
+AUDIT_EVENT_WRITER = settings.AUDIT_EVENT_WRITER
+AUDIT_EVENT_QUEUE_SIZE = settings.AUDIT_EVENT_QUEUE_SIZE
+AUDIT_EVENT_BATCH_SIZE = settings.AUDIT_EVENT_BATCH_SIZE
+AUDIT_EVENT_FLUSH_INTERVAL_SECONDS = settings.AUDIT_EVENT_FLUSH_INTERVAL_SECONDS
+AUDIT_EVENT_SPOOL_DIR = settings.AUDIT_EVENT_SPOOL_DIR
+
 # State snapshot fields (lightweight, excludes heavy geometry_metadata)
 # Serialized to JSONB in events.state_snapshot column
 STATE_SNAPSHOT_FIELDS = [
@@ -94,6 +135,23 @@ STATE_SNAPSHOT_FIELDS = [
 
 # Task Names
 TASK_GENERATE_LOW_POLY_GLB = "agent.generate_low_poly_glb"
+# File-level variant: downloads + parses the shared .3dm ONCE and generates LODs
+# for every pending block of that file (per-block task stays as fallback)
+TASK_GENERATE_FILE_LOD_ASSETS = "agent.generate_file_lod_assets"
+
+# File-level scheduling (debounce): validate_file runs once per block, so the
+# first validated block of a file schedules the file task after this delay and
+# the rest of the file's blocks join that same run instead of enqueuing their own.
+FILE_LOD_SCHEDULE_DEBOUNCE_SECONDS = 30
+FILE_LOD_SCHEDULE_KEY_PREFIX = "geometry:file_lod_scheduled:"
+# A file run holds that key and claims its blocks (blocks.lod_claimed_by/at) until
+# it ends, so two runs never encode the same block; a claim older than the hard
+# time limit was left by a killed worker and can be taken over
+FILE_LOD_CLAIM_TTL_SECONDS = TASK_TIME_LIMIT_SECONDS
+# generate_file_lod_assets commits every FILE_LOD_BATCH_BLOCKS blocks, so a
+# large file that hits the task time limit keeps the chunks already written
+# (the continuation task only redoes the blocks still pending)
+FILE_LOD_BATCH_BLOCKS = settings.FILE_LOD_BATCH_BLOCKS
 
 # LOD System - Multi-Level Decimation Targets (US-015)
 # 3-level LOD + BBox proxy for optimal performance/quality balance
@@ -103,9 +161,47 @@ LOD_DECIMATION_TARGETS = {
     'low': 500,      # Low-poly: aggressive decimation (~400-600 faces, 20-50m viewing distance)
 }
 
+# Screen-space-error LOD targets (lod_face_targets)
+# - "adaptive": per-block mid/low targets from the bbox size and the geometric
+#               error tolerated at each level's viewing distance. A surface of
+#               size D tessellated with chord error e needs ~ D / e triangles
+#               (edge h = sqrt(8 R e), R ~ D / 2), hence
+#               target = LOD_SSE_FACES_PER_ERROR x bbox_diagonal_mm / tolerance_mm,
+#               clamped to [LOD_ADAPTIVE_MIN_FACES, LOD_ADAPTIVE_MAX_FACES[level]]
+# - "fixed":    LOD_DECIMATION_TARGETS for every block (legacy)
+LOD_TARGET_MODES = ("adaptive", "fixed")
+LOD_TARGET_MODE = settings.LOD_TARGET_MODE
+LOD_ERROR_TOLERANCE_MM = {
+    'mid': settings.LOD_MID_ERROR_TOLERANCE_MM,  # 5-20m viewing distance
+    'low': settings.LOD_LOW_ERROR_TOLERANCE_MM,  # 20-50m viewing distance
+}
+LOD_SSE_FACES_PER_ERROR = 1.8
+LOD_ADAPTIVE_MIN_FACES = 12  # A box: coarser than this is the bbox proxy's job
+LOD_ADAPTIVE_MAX_FACES = {
+    'mid': 8000,
+    'low': 2000,
+}
+
 # Legacy constant (deprecated - use LOD_DECIMATION_TARGETS['low'])
 DECIMATION_TARGET_FACES = LOD_DECIMATION_TARGETS['low']  # Backward compatibility
 
+# LOD Decimation Engine (LODDecimationService)
+# - "sequential": every level decimated from the full-resolution mesh (legacy)
+# - "cascade":    each level decimated from the previous one (low ← mid ← full),
+#                 so the expensive passes run on already-reduced meshes
+# - "parallel":   independent levels decimated concurrently in a process pool
+LOD_DECIMATION_MODES = ("sequential", "cascade", "parallel")
+LOD_DECIMATION_MODE = settings.LOD_DECIMATION_MODE
+# Process pool size for "parallel" mode (0 = one process per CPU core)
+LOD_DECIMATION_MAX_WORKERS = settings.LOD_DECIMATION_MAX_WORKERS
+# Vertex-clustering fallback (apply_vertex_clustering): inputs above this face
+# count skip quadric decimation, and it also runs whenever quadric fails, makes
+# no progress or overshoots the target. The level target is a hard ceiling.
+VERTEX_CLUSTERING_MIN_FACES = settings.VERTEX_CLUSTERING_MIN_FACES
+VERTEX_CLUSTERING_MAX_ITERATIONS = 16  # Grid-resolution search steps (one vectorised pass each)
+# Points sampled per surface for the deviation_mm of the decimation report
+LOD_DEVIATION_SAMPLES = 500
+
 MAX_ORIGINAL_FACES_WARNING = 100_000  # Log warning if geometry exceeds 100K faces (timeout risk)
 
 # File Size Limits (updated for LOD system)
@@ -123,6 +219,135 @@ LOD_PREFIXES = {
     'mid': 'mid-poly/',
     'low': 'low-poly/',
 }
+# LOD asset format (GLBExportService)
+# - "glb": binary glTF, local-origin positions (world offset in node.translation
+#          and returned separately), indexed triangles — default
+# - "obj": legacy text OBJ with absolute coordinates (backward compatibility)
+# The per-layer high-poly (OBJ + MTL, textura mode) is always OBJ.
+LOD_ASSET_FORMATS = ("glb", "obj")
+LOD_ASSET_FORMAT = settings.LOD_ASSET_FORMAT
+LOD_ASSET_CONTENT_TYPES = {
+    'glb': 'model/gltf-binary',
+    'obj': 'model/obj',
+    'mtl': 'model/mtl',
+    'sflc': 'application/octet-stream',
+}
+# Positions as int16 + node scale (KHR_mesh_quantization) instead of float32
+LOD_GLB_QUANTIZE = settings.LOD_GLB_QUANTIZE
+# Vertex normals in the GLB (viewer computes them when absent)
+LOD_GLB_NORMALS = settings.LOD_GLB_NORMALS
+# "none" | "draco" (KHR_draco_mesh_compression via the in-process DracoPy encoder)
+LOD_GLB_COMPRESSIONS = ("none", "draco")
+LOD_GLB_COMPRESSION = settings.LOD_GLB_COMPRESSION
+
+# LOD asset uploads (LODAssetUploader): in-memory assets uploaded concurrently
+# by a bounded thread pool, each object retried independently (upsert)
+LOD_UPLOAD_MAX_WORKERS = settings.LOD_UPLOAD_MAX_WORKERS
+LOD_UPLOAD_MAX_ATTEMPTS = 3
+LOD_UPLOAD_RETRY_BACKOFF_SECONDS = 0.5  # 0.5s, 1s between attempts
+
+# Content-addressed LOD reuse (geometry fingerprint)
+# Fingerprint = SHA-256 of the block's vertices (relative to the bbox center,
+# quantized to this step, scaled by the model unit) + triangle indices +
+# per-face layers. Redis indexes '<fingerprint>/<variant>' (palette + LOD
+# settings, no placement); LOD assets are stored under
+# '<prefix><fingerprint>/<variant>/<placement>.<ext>'.
+GEOMETRY_FINGERPRINT_QUANTUM_MM = 0.01
+LOD_CACHE_VERSION = 2  # Bump when LOD generation output changes (invalidates every entry)
+LOD_CACHE_KEY_PREFIX = "geometry:lod_cache:"
+# Entries expire so assets of deleted / rebuilt blocks stop being referenced
+LOD_CACHE_TTL_SECONDS = settings.LOD_CACHE_TTL_SECONDS
+LOD_CACHE_STATS_KEY = "geometry:lod_cache_stats"
+# In-process reuse of decimated levels for translated duplicates (entries per worker)
+LOD_DECIMATION_CACHE_SIZE = settings.LOD_DECIMATION_CACHE_SIZE
+
+# Intra-file parallelism (SharedMeshPool): the LOD encoding (decimation +
+# serialization) of a file's blocks runs in a billiard process pool fed through
+# shared memory. The budget is host-wide (every prefork child of the worker
+# shares it through lock files in SLOT_DIR): WORKERS slots of WORKER_MEMORY_MB,
+# each job holding array bytes x MEMORY_FACTOR worth of slots (at least one).
+# Files with fewer cache misses than FILE_LOD_POOL_MIN_BLOCKS stay in the task
+# process.
+SHARED_MESH_POOL_WORKERS = settings.SHARED_MESH_POOL_WORKERS  # 0 = one per CPU core
+SHARED_MESH_POOL_WORKER_MEMORY_MB = settings.SHARED_MESH_POOL_WORKER_MEMORY_MB
+SHARED_MESH_POOL_MEMORY_FACTOR = 8
+SHARED_MESH_POOL_SLOT_DIR = settings.SHARED_MESH_POOL_SLOT_DIR
+FILE_LOD_POOL_MIN_BLOCKS = settings.FILE_LOD_POOL_MIN_BLOCKS
+
+# GPU-instanced output (InstanceTable): blocks of a file with the same geometry
+# fingerprint share ONE local-frame mesh per LOD level, stored as
+# '<level prefix>instanced/<fingerprint>/<variant>.<ext>', plus a table of 4x4
+# placement matrices (one per InstanceReference) on every member block.
+# Groups with fewer placements than LOD_INSTANCING_MIN_INSTANCES are not instanced.
+LOD_INSTANCING = settings.LOD_INSTANCING
+LOD_INSTANCING_MIN_INSTANCES = settings.LOD_INSTANCING_MIN_INSTANCES
+INSTANCED_ASSET_PREFIX = "instanced/"
+
+# Hierarchical scene tiles (build_scene_tiles): the low-poly GLBs of every
+# render-ready block merged into one GLB per octree leaf, plus a 3D Tiles style
+# manifest (tileset) with per-tile bounds and the child hierarchy.
+# - The octree root is a power-of-two cube snapped to SCENE_TILE_GRID_MM, so
+#   adding or changing a block only changes the leaves on its path.
+# - Leaves hold at most SCENE_TILE_MAX_BLOCKS blocks (or stop at MAX_DEPTH).
+# - Internal tiles hold their children merged and simplified to at most
+#   SCENE_TILE_HLOD_MAX_FACES faces (HLOD, REPLACE refinement).
+# - Tiles are content-addressed ('tiles/<tileset>/<hash>.glb', hash over member
+#   ids and low-poly URLs, or over the children's hashes): a rebuild only
+#   re-merges tiles whose members changed, and deletes the superseded objects.
+# - The manifest is committed every SCENE_TILES_BATCH_TILES rebuilt tiles; a
+#   run stopped by the time limit enqueues a continuation for the rest.
+TASK_BUILD_SCENE_TILES = "agent.build_scene_tiles"
+SCENE_TILESET_NAME = "default"
+SCENE_TILES_PREFIX = "tiles/"
+SCENE_TILE_MAX_BLOCKS = settings.SCENE_TILE_MAX_BLOCKS
+SCENE_TILE_MAX_DEPTH = 12
+SCENE_TILE_GRID_MM = 1000.0
+SCENE_TILE_HLOD_MAX_FACES = settings.SCENE_TILE_HLOD_MAX_FACES
+SCENE_TILES_BATCH_TILES = settings.SCENE_TILES_BATCH_TILES
+SCENE_TILES_DOWNLOAD_WORKERS = settings.SCENE_TILES_DOWNLOAD_WORKERS
+# LOD runs schedule one debounced tileset rebuild (same pattern as file LODs)
+SCENE_TILES_SCHEDULE_DEBOUNCE_SECONDS = 60
+SCENE_TILES_SCHEDULE_KEY = "geometry:scene_tiles_scheduled"
+
+# Progressive LOD container (services/lod_container.py): the low, mid and high
+# assets of a block, coarse to fine, in ONE object with a byte-offset index, so a
+# viewer refines with HTTP range requests on a single CDN object. Written next to
+# the per-level files as '<prefix><asset id>.sflc'; its index is stored in
+# blocks.lod_container and served by the elements API. Off by default: it
+# stores every level a second time, so enable it once a client reads it.
+LOD_CONTAINER = settings.LOD_CONTAINER
+LOD_CONTAINER_FORMAT = "sflc"
+LOD_CONTAINER_PREFIX = "progressive/"
+
+# Versioned LOD outputs + selective rebuild (services/lod_rebuild_planner.py):
+# every block stores the pipeline version and a hash of the settings each level
+# depends on (blocks.lod_build). After a config change the planner lists the
+# stale levels per block and rebuild_lod_levels rebuilds only those, one task
+# per .3dm (parsed once) with at most LOD_REBUILD_BATCH_BLOCKS blocks.
+TASK_REBUILD_LOD_LEVELS = "agent.rebuild_lod_levels"
+LOD_REBUILD_BATCH_BLOCKS = settings.LOD_REBUILD_BATCH_BLOCKS
+# Dry-run cost model (worker seconds): per level (base, per 1000 original faces),
+# plus a fixed cost per block and per file (download + parse). Rough figures from
+# infra/benchmark_lod_decimation.py on a 4-core worker; recalibrate there.
+LOD_REBUILD_COST_MODEL = {
+    'file': 2.0,
+    'block': 0.05,
+    'high': (0.05, 0.004),
+    'mid': (0.05, 0.03),
+    'low': (0.05, 0.03),
+    'container': (0.02, 0.001),
+}
+LOD_REBUILD_DEFAULT_FACES = 20000  # Blocks stamped before face counts were recorded
+
+# Local bulk LOD conversion (tasks/bulk_lod_conversion.py, infra/bulk_convert_lod.py):
+# the generate_file_lod_assets pipeline run without the broker, one process per
+# .3dm across BULK_LOD_WORKERS cores. Rows are committed every
+# BULK_LOD_COMMIT_BLOCKS blocks; committed files are appended to the resume
+# manifest (BULK_LOD_MANIFEST, JSON lines) and skipped by the next run.
+BULK_LOD_WORKERS = settings.BULK_LOD_WORKERS  # 0 = one per CPU core
+BULK_LOD_COMMIT_BLOCKS = settings.BULK_LOD_COMMIT_BLOCKS
+BULK_LOD_MANIFEST = "bulk_lod_manifest.jsonl"
+
 # MTL companion files (per-face Rhino layer colors, generated for high-poly only)
 MATERIALS_PREFIX = 'materials/'
 # Legacy (deprecated - use LOD_PREFIXES['low'])
@@ -130,10 +355,42 @@ LOW_POLY_PREFIX = LOD_PREFIXES['low']
 
 RAW_UPLOADS_BUCKET = "raw-uploads"
 
+# Streaming .3dm download (StreamingDownloadService)
+# Bytes go straight from the socket to the destination file; the size limit
+# (MAX_3DM_FILE_SIZE_MB) is enforced while they arrive. Objects above the
+# threshold are fetched as parallel HTTP range requests, so peak memory is
+# ~ chunk size x parallel ranges regardless of file size.
+DOWNLOAD_CHUNK_SIZE_BYTES = 1024 * 1024  # 1 MiB socket reads
+DOWNLOAD_RANGE_SIZE_BYTES = 16 * 1024 * 1024  # 16 MiB per range request
+DOWNLOAD_MAX_PARALLEL_RANGES = settings.DOWNLOAD_MAX_PARALLEL_RANGES
+DOWNLOAD_PARALLEL_THRESHOLD_BYTES = 32 * 1024 * 1024  # Smaller objects: one streamed GET
+DOWNLOAD_RANGE_MAX_ATTEMPTS = 3  # Per range (a failed range is re-fetched alone)
+DOWNLOAD_SIGNED_URL_TTL_SECONDS = 600  # Signed storage URL used for the ranged GETs
+
+# Worker-local .3dm cache (ModelCacheService)
+# Disk tier: raw files keyed by storage key + size/ETag, LRU within a byte
+# budget, shared by the worker processes of a host. Parsed tier: File3dm
+# models per process, LRU by entry count; released when the process RSS
+# exceeds MODEL_CACHE_MAX_RSS_MB after a task (0 = never).
+MODEL_CACHE_DIR = settings.MODEL_CACHE_DIR
+MODEL_CACHE_DISK_BUDGET_MB = settings.MODEL_CACHE_DISK_BUDGET_MB
+MODEL_CACHE_MAX_MODELS = settings.MODEL_CACHE_MAX_MODELS
+MODEL_CACHE_MAX_RSS_MB = settings.MODEL_CACHE_MAX_RSS_MB
+MODEL_CACHE_STATS_KEY = "geometry:model_cache_stats"
+
 # Temp File Paths
 TEMP_DIR = "/tmp"  # Docker container temp directory
 
-# ===== Draco Compression (via gltf-pipeline CLI — mirrors POC export_gltf_draco.py) =====
+# Stage checkpoints of generate_low_poly_glb (StageCheckpoint): the extracted
+# geometry, the encoded LOD assets and a ledger of the uploaded objects are
+# kept on worker-local disk, keyed by block + LOD pipeline version, so a retry
+# resumes from the last completed stage. A first attempt always starts clean;
+# checkpoints are dropped once the block is committed or failed for good.
+LOD_CHECKPOINTS = settings.LOD_CHECKPOINTS
+LOD_CHECKPOINT_DIR = settings.LOD_CHECKPOINT_DIR
+LOD_CHECKPOINT_TTL_SECONDS = settings.LOD_CHECKPOINT_TTL_SECONDS
+
+# ===== Draco Compression (GLBExportService encoder; legacy gltf-pipeline CLI helper) =====
 DRACO_COMPRESSION_LEVEL = 7         # 0-10 scale (POC used 10; 7 = good quality/size balance)
 DRACO_QUANTIZE_POSITION_BITS = 14   # ~0.1mm precision at Sagrada Família scale (POC value)
 DRACO_QUANTIZE_NORMAL_BITS = 10
@@ -205,6 +462,66 @@ Classify now:"""
 # Prompt version selector (allows A/B testing or rollback)
 CLASSIFICATION_PROMPT_VERSION = "v1"
 
+# Classification result cache (graph/classification_cache.py)
+# LLM results keyed by a canonical fingerprint of the features sent to
+# classify_tipologia (bbox dimensions, volume, vertex count, layer names and
+# object counts, iso_code naming pattern) + model, temperature and prompt
+# version/text. A hit costs no LLM call and no rate limiter token; changing
+# the prompt or model misses naturally. Stored in Redis with a TTL.
+CLASSIFICATION_CACHE_ENABLED = settings.CLASSIFICATION_CACHE_ENABLED
+CLASSIFICATION_CACHE_KEY_PREFIX = "classification:cache:"
+CLASSIFICATION_CACHE_STATS_KEY = "classification:cache_stats"
+CLASSIFICATION_CACHE_TTL_SECONDS = settings.CLASSIFICATION_CACHE_TTL_SECONDS
+CLASSIFICATION_CACHE_SIGNIFICANT_DIGITS = 6  # Numeric features compared at this precision
+
+# Batched classification (LLMClient.classify_tipologia_batch)
+# validate_file_blocks classifies the blocks of a file LLM_BATCH_SIZE at a
+# time in ONE structured-output request: the prompt (categories, instructions,
+# layer list of the file) is sent once per batch instead of once per block,
+# so requests, rate limiter tokens and input tokens fall ~N-fold. Each block
+# gets its own result entry; blocks missing or invalid in the answer are
+# classified one by one by ClassifyTipologia (single-block prompt).
+LLM_BATCH_CLASSIFICATION = settings.LLM_BATCH_CLASSIFICATION
+LLM_BATCH_SIZE = settings.LLM_BATCH_SIZE
+LLM_BATCH_MAX_TOKENS_PER_BLOCK = 80  # One {id, tipologia, confidence, reasoning} entry
+# A batch answer is N times longer than a single one: scale with LLM_BATCH_SIZE
+LLM_BATCH_TIMEOUT_SECONDS = settings.LLM_BATCH_TIMEOUT_SECONDS
+
+CLASSIFICATION_BATCH_PROMPTS = {
+    "v1": """You are an expert architectural classifier for Sagrada Família construction elements.
+
+**Task:** Classify EACH architectural piece below. All of them are blocks of the same 3D model (.3dm file).
+
+**File Layers (shared by every block):** {layers}
+
+**Blocks (JSON, one object per block):**
+{blocks}
+
+**Classification Categories (tipologia):**
+1. **dovela**: Voussoir stone (trapezoidal block in arches/vaults, typically small volume <0.5 m³)
+2. **capitel**: Capital (decorative top of column, complex geometry, medium volume 0.3-2 m³)
+3. **columna**: Column (cylindrical/prismatic vertical support, large volume >2 m³, height >> width)
+4. **clave**: Keystone (central wedge in arch, distinctive trapezoidal shape, small volume <0.3 m³)
+5. **imposta**: Impost (transition element between column and arch, horizontal, medium volume 0.5-1.5 m³)
+6. **other**: Unknown/ambiguous category (use this if uncertain)
+
+**Instructions:**
+- Classify every block independently and return exactly one result per block "id".
+- BE CONSERVATIVE: If you are uncertain or the metadata is ambiguous, classify as "other" with low confidence.
+- DO NOT invent details not present in the metadata.
+- Provide confidence score (0.0-1.0): 0.0-0.5 = uncertain, 0.5-0.7 = moderate, 0.7-1.0 = high confidence.
+- Provide brief reasoning (max 100 characters) explaining your classification.
+
+**Output Format (JSON only, no markdown):**
+{{
+  "results": [
+    {{"id": "b0", "tipologia": "dovela", "confidence": 0.85, "reasoning": "Small trapezoidal volume typical of voussoir stones"}}
+  ]
+}}
+
+Classify now:"""
+}
+
 # Prompt Injection Prevention - Forbidden Patterns
 # Sanitize user strings (rhino_metadata, iso_code) to prevent prompt injection attacks
 FORBIDDEN_PATTERNS = [
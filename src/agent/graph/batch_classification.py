@@ -0,0 +1,128 @@
+"""
+Batched LLM classification of the blocks of one file.
+
+validate_file_blocks runs ClassifyTipologia once per block, i.e. one LLM
+request (and one rate limiter token) per block, each repeating the same
+prompt and layer list of the file. classify_blocks_batch classifies the
+blocks of the file up front, LLM_BATCH_SIZE per request
+(LLMClient.classify_tipologia_batch), and hands each result to the node
+through geometry_metadata["llm_classification"]:
+
+- blocks already in the classification cache are not sent
+- blocks with identical features (same fingerprint) are sent once
+- results are stored in the classification cache
+- a block without a result (missing/invalid entry, failed batch, open
+  circuit) is classified by the node as before (single-block prompt or
+  regex fallback)
+
+The confidence threshold is still applied by the node.
+"""
+
+from typing import Any, Dict, List
+
+import structlog
+
+from src.agent.constants import (
+    LLM_BATCH_CLASSIFICATION,
+    LLM_BATCH_SIZE,
+    CLASSIFICATION_CACHE_ENABLED,
+)
+from src.agent.graph.classification_cache import (
+    ClassificationCache,
+    classification_features,
+    classification_fingerprint,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+def classify_blocks_batch(
+    geometry_metadata: Dict[str, Any],
+    blocks: List[List[str]],
+    batch_size: int = LLM_BATCH_SIZE,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    LLM classification of the blocks of one file, N blocks per request.
+
+    Args:
+        geometry_metadata: Shared metadata from build_initial_geometry_metadata
+        blocks: [[block_id, iso_code], ...] of the file
+        batch_size: Blocks per LLM request
+
+    Returns:
+        {block_id: classify_tipologia result} for the blocks classified here
+        (blocks absent from the dict are left to ClassifyTipologia)
+    """
+    if not LLM_BATCH_CLASSIFICATION or batch_size < 2 or len(blocks) < 2:
+        return {}
+
+    from src.agent.graph.llm_client import get_llm_client
+    from src.agent.graph.circuit_breaker import get_circuit_breaker
+    from src.agent.graph.classification_helpers import sanitize_user_string
+    from infra.redis_client import get_redis_client
+
+    redis_client = get_redis_client()
+    circuit_breaker = get_circuit_breaker(redis_client)
+    classification_cache = ClassificationCache(redis_client if CLASSIFICATION_CACHE_ENABLED else None)
+
+    volume = geometry_metadata.get("volume", 0.0)
+    bbox = geometry_metadata.get("bbox", {})
+    layers = geometry_metadata.get("layers", [])
+    vertices_count = geometry_metadata.get("vertices_count", 0)
+
+    # Same iso_code + features ClassifyTipologia would send, grouped by fingerprint
+    results: Dict[str, Dict[str, Any]] = {}
+    pending: Dict[str, Dict[str, Any]] = {}
+    for block_id, iso_code in blocks:
+        iso_code = sanitize_user_string(iso_code or block_id)
+        features = classification_features(volume, bbox, layers, vertices_count, iso_code)
+        fingerprint = classification_fingerprint(features)
+        if fingerprint in pending:
+            pending[fingerprint]["block_ids"].append(block_id)
+            continue
+        cached = classification_cache.get(features)
+        if cached is not None:
+            results[block_id] = cached
+            continue
+        pending[fingerprint] = {"iso_code": iso_code, "features": features, "block_ids": [block_id]}
+
+    unique = list(pending.values())
+    requests = 0
+    for start in range(0, len(unique), batch_size):
+        if circuit_breaker.is_open():
+            logger.warning("batch_classification.circuit_open", remaining=len(unique) - start)
+            break
+        chunk = unique[start:start + batch_size]
+        try:
+            chunk_results = get_llm_client().classify_tipologia_batch(
+                [
+                    {"iso_code": item["iso_code"], "volume": volume, "bbox": bbox,
+                     "vertices_count": vertices_count}
+                    for item in chunk
+                ],
+                layers,
+            )
+            requests += 1
+        except Exception as e:
+            # Whole request lost: these blocks go through ClassifyTipologia
+            logger.error("batch_classification.request_failed", blocks=len(chunk),
+                         error=str(e), error_type=type(e).__name__)
+            circuit_breaker.record_failure()
+            continue
+        circuit_breaker.record_success()
+
+        for item, result in zip(chunk, chunk_results):
+            if result is None:
+                continue  # Partial failure: single-block classification in the node
+            classification_cache.put(item["features"], result)
+            for block_id in item["block_ids"]:
+                results[block_id] = dict(result)
+
+    logger.info(
+        "batch_classification.completed",
+        blocks=len(blocks),
+        unique=len(unique),
+        requests=requests,
+        classified=len(results),
+    )
+    return results
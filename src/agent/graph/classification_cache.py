@@ -0,0 +1,220 @@
+"""
+Classification Cache (Redis)
+
+ClassifyTipologia sent one LLM request per block, even when the features
+of the block were identical to an already classified one (repeated
+dovelas, re-uploads of the same file). LLM results are now cached under a
+canonical fingerprint of exactly the features classify_tipologia sends:
+
+- bbox dimensions (max - min, position independent) and volume, compared
+  at CLASSIFICATION_CACHE_SIGNIFICANT_DIGITS
+- vertex count
+- layers: sorted (name, object_count) pairs
+- naming pattern of the iso_code (trailing sequence number masked:
+  GLPER.B-PAE0720.0701 → GLPER.B-PAE0720.####)
+
+plus the model, temperature and prompt version + prompt texts (single and
+batch), so a new prompt or model never reuses old answers. A hit costs no LLM call and no
+rate limiter token.
+
+Entries expire after CLASSIFICATION_CACHE_TTL_SECONDS; invalidate() drops
+one fingerprint and invalidate_all() every entry. Hits, misses, stores and
+invalidations are counted per process and in the Redis hash
+CLASSIFICATION_CACHE_STATS_KEY. Without Redis the cache is bypassed.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import structlog
+
+from src.agent.constants import (
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    CLASSIFICATION_PROMPTS,
+    CLASSIFICATION_BATCH_PROMPTS,
+    CLASSIFICATION_PROMPT_VERSION,
+    CLASSIFICATION_CACHE_KEY_PREFIX,
+    CLASSIFICATION_CACHE_STATS_KEY,
+    CLASSIFICATION_CACHE_TTL_SECONDS,
+    CLASSIFICATION_CACHE_SIGNIFICANT_DIGITS,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Fields of a classify_tipologia result worth caching
+_RESULT_FIELDS = ("tipologia", "confidence", "reasoning", "classified_at")
+_TRAILING_SEQUENCE = re.compile(r"\d+$")
+
+_stats: Counter = Counter()
+
+
+def naming_pattern(iso_code: Optional[str]) -> str:
+    """iso_code with its trailing sequence number masked (one '#' per digit)."""
+    iso_code = iso_code or ""
+    return _TRAILING_SEQUENCE.sub(lambda match: "#" * len(match.group()), iso_code)
+
+
+def _number(value) -> Optional[str]:
+    try:
+        return f"{float(value):.{CLASSIFICATION_CACHE_SIGNIFICANT_DIGITS}g}"
+    except (TypeError, ValueError):
+        return None
+
+
+def _layer(layer) -> list:
+    """(name, object_count) of a LayerInfo, layer dict or plain layer name."""
+    if isinstance(layer, str):
+        return [layer, None]
+    if isinstance(layer, dict):
+        return [str(layer.get("name")), layer.get("object_count")]
+    return [str(getattr(layer, "name", layer)), getattr(layer, "object_count", None)]
+
+
+def classification_features(
+    volume: float,
+    bbox: Dict[str, Any],
+    layers: list,
+    vertices_count: int,
+    iso_code: str,
+) -> Dict[str, Any]:
+    """Canonical form of the classify_tipologia arguments (see module docstring)."""
+    bbox = bbox or {}
+    low, high = bbox.get("min") or [], bbox.get("max") or []
+    try:
+        dimensions = [_number(float(b) - float(a)) for a, b in zip(low, high)]
+    except (TypeError, ValueError):
+        dimensions = []
+    return {
+        "dimensions": dimensions,
+        "volume": _number(volume),
+        "vertices_count": int(vertices_count or 0),
+        "layers": sorted((_layer(layer) for layer in layers or []), key=lambda item: (item[0], str(item[1]))),
+        "naming_pattern": naming_pattern(iso_code),
+    }
+
+
+def prompt_signature() -> Dict[str, Any]:
+    """Model and prompt settings that change the LLM answer; part of every fingerprint."""
+    # Single-block and batch prompts yield interchangeable entries
+    prompt = CLASSIFICATION_PROMPTS[CLASSIFICATION_PROMPT_VERSION] + \
+        CLASSIFICATION_BATCH_PROMPTS.get(CLASSIFICATION_PROMPT_VERSION, "")
+    return {
+        "model": LLM_MODEL,
+        "temperature": LLM_TEMPERATURE,
+        "prompt_version": CLASSIFICATION_PROMPT_VERSION,
+        "prompt_sha256": hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16],
+    }
+
+
+def classification_fingerprint(features: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical features + prompt signature."""
+    payload = json.dumps({"features": features, "prompt": prompt_signature()}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ClassificationCache:
+    """
+    Redis cache of classify_tipologia results.
+
+    Usage:
+        cache = ClassificationCache(get_redis_client())
+        features = classification_features(volume, bbox, layers, vertices_count, iso_code)
+        result = cache.get(features)
+        if result is None:
+            result = llm_client.classify_tipologia(...)
+            cache.put(features, result)
+    """
+
+    def __init__(self, redis_client=None, ttl_seconds: int = CLASSIFICATION_CACHE_TTL_SECONDS):
+        """
+        Args:
+            redis_client: Redis client (from infra.redis_client); None bypasses the cache
+            ttl_seconds: Lifetime of an entry
+        """
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds
+
+    def key(self, features: Dict[str, Any]) -> str:
+        return f"{CLASSIFICATION_CACHE_KEY_PREFIX}{classification_fingerprint(features)}"
+
+    def get(self, features: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached classification of identical features, or None (miss / Redis unavailable)."""
+        if self.redis_client is None:
+            self._record("bypass")
+            return None
+        key = self.key(features)
+        try:
+            cached = self.redis_client.get(key)
+            result = json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning("classification_cache_lookup_failed", key=key, error=str(e))
+            result = None
+        if not isinstance(result, dict) or "tipologia" not in result:
+            self._record("miss")
+            return None
+        self._record("hit")
+        logger.info("classification_cache_hit", key=key, tipologia=result["tipologia"])
+        return result
+
+    def put(self, features: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Store a validated classify_tipologia result (expires after ttl_seconds)."""
+        if self.redis_client is None:
+            return
+        entry = {field: result[field] for field in _RESULT_FIELDS if field in result}
+        try:
+            self.redis_client.set(self.key(features), json.dumps(entry), ex=self.ttl_seconds)
+            self._record("store")
+        except Exception as e:
+            logger.warning("classification_cache_store_failed", error=str(e))
+
+    def invalidate(self, features: Dict[str, Any]) -> bool:
+        """Drop the entry of one set of features. Returns whether it existed."""
+        if self.redis_client is None:
+            return False
+        try:
+            removed = bool(self.redis_client.delete(self.key(features)))
+        except Exception as e:
+            logger.warning("classification_cache_invalidate_failed", error=str(e))
+            return False
+        if removed:
+            self._record("invalidated")
+        return removed
+
+    def invalidate_all(self) -> int:
+        """Drop every cached classification. Returns the number of entries removed."""
+        if self.redis_client is None:
+            return 0
+        removed = 0
+        try:
+            keys = list(self.redis_client.scan_iter(match=f"{CLASSIFICATION_CACHE_KEY_PREFIX}*", count=1000))
+            for start in range(0, len(keys), 1000):
+                removed += self.redis_client.delete(*keys[start:start + 1000])
+        except Exception as e:
+            logger.warning("classification_cache_invalidate_failed", error=str(e), removed=removed)
+        if removed:
+            self._record("invalidated", removed)
+        logger.info("classification_cache_invalidated", removed=removed)
+        return removed
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss/store/invalidated counters: fleet-wide from Redis, else this worker's."""
+        if self.redis_client is not None:
+            try:
+                return {event: int(count) for event, count in
+                        self.redis_client.hgetall(CLASSIFICATION_CACHE_STATS_KEY).items()}
+            except Exception as e:
+                logger.warning("classification_cache_stats_failed", error=str(e))
+        return dict(_stats)
+
+    def _record(self, event: str, amount: int = 1) -> None:
+        _stats[event] += amount
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.hincrby(CLASSIFICATION_CACHE_STATS_KEY, event, amount)
+        except Exception as e:
+            logger.warning("classification_cache_stats_failed", counter=event, error=str(e))
@@ -47,28 +47,72 @@ If batch INSERT fails:
     2. Attempt individual insert_event() for each buffered event
     3. Continue execution (best-effort, non-fatal)
 
+AuditEventWriter (Celery workers):
+==================================
+insert_event hands node events to the worker process's AuditEventWriter
+when one is running (started on worker_process_init): a bounded queue
+bulk-inserted by a background thread by size or time, flushed after every
+task and at worker shutdown. Unlike EventBuffer, events are journaled to
+local disk first, so a crash or a failed insert delays them but does not
+lose them (see AuditEventWriter).
+
 Author: AI Agent (T-1805-AGENT)
 Created: 2026-05-08
 """
 
+import json
+import os
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
 import structlog
-from typing import List, Optional
+from typing import Callable, List, Optional
 from contextlib import contextmanager
 
 try:
     from src.agent.graph.state import ValidationState
     from src.agent.graph.nodes import serialize_state_snapshot
-    from infra.supabase_client import get_supabase_client
-    from src.agent.constants import EVENT_BUFFER_THRESHOLD
+    from src.agent.constants import (
+        EVENT_BUFFER_THRESHOLD,
+        AUDIT_EVENT_WRITER,
+        AUDIT_EVENT_QUEUE_SIZE,
+        AUDIT_EVENT_BATCH_SIZE,
+        AUDIT_EVENT_FLUSH_INTERVAL_SECONDS,
+        AUDIT_EVENT_SPOOL_DIR,
+    )
 except ImportError:
     from graph.state import ValidationState
     from graph.nodes import serialize_state_snapshot
-    from agent.infra.supabase_client import get_supabase_client
-    from agent.constants import EVENT_BUFFER_THRESHOLD
+    from constants import (
+        EVENT_BUFFER_THRESHOLD,
+        AUDIT_EVENT_WRITER,
+        AUDIT_EVENT_QUEUE_SIZE,
+        AUDIT_EVENT_BATCH_SIZE,
+        AUDIT_EVENT_FLUSH_INTERVAL_SECONDS,
+        AUDIT_EVENT_SPOOL_DIR,
+    )
+
+try:
+    from infra.supabase_client import get_supabase_client
+except ModuleNotFoundError:
+    from src.agent.infra.supabase_client import get_supabase_client
 
 logger = structlog.get_logger()
 
 
+def _event_row(block_id: str, event_type: str, node_name: str, state: ValidationState) -> dict:
+    """events table row of a node transition (state reduced to its snapshot)."""
+    return {
+        "block_id": block_id,
+        "event_type": event_type,
+        "node_name": node_name,
+        "state_snapshot": serialize_state_snapshot(state),
+        "metadata": None  # Legacy field, not used by LangGraph
+    }
+
+
 class EventBuffer:
     """
     Context manager for batching LangGraph audit trail events.
@@ -158,18 +202,8 @@ class EventBuffer:
             >>> len(buffer.events)
             2
         """
-        # Serialize state snapshot
-        state_snapshot = serialize_state_snapshot(state)
-        
         # Add to buffer (not yet committed to DB)
-        event = {
-            "block_id": self.block_id,
-            "event_type": event_type,
-            "node_name": node_name,
-            "state_snapshot": state_snapshot,
-            "metadata": None  # Legacy field, not used by LangGraph
-        }
-        self.events.append(event)
+        self.events.append(_event_row(self.block_id, event_type, node_name, state))
         
         # Auto-flush if threshold reached (optimization: avoid giant buffers)
         if len(self.events) >= self.threshold:
@@ -259,3 +293,401 @@ class EventBuffer:
             # Rationale: Avoid re-inserting same events on next flush()
             self.events = []
             logger.debug("events.buffer_cleared", block_id=self.block_id)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AuditEventWriter: background batched writer (Celery worker processes)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_SEGMENT_SUFFIX = ".jsonl"   # journal segment being appended to
+_SEALED_SUFFIX = ".sealed"   # rotated segment, deleted once written to the DB
+_DEAD_LETTER_SUFFIX = ".dead"  # rows the database rejected, never re-sent
+
+_TRANSIENT_WRITE_ERRORS = (
+    "timeout", "timed out", "connection", "network", "rate limit",
+    "502", "503", "504", "temporary", "unavailable", "could not connect",
+)
+
+
+def _upsert_events(rows: List[dict]) -> None:
+    """One bulk write. Rows carry their own id: re-sending a segment is idempotent."""
+    get_supabase_client().table("events").upsert(rows, on_conflict="id", ignore_duplicates=True).execute()
+
+
+def _is_transient_write_error(exc: Exception) -> bool:
+    """True if a failed write may succeed as is later (retry the batch), False if the DB rejected it."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    message = str(exc).lower()
+    return any(pattern in message for pattern in _TRANSIENT_WRITE_ERRORS)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_segment(path: str) -> List[dict]:
+    """Events of a journal segment (a torn last line of a crashed process is skipped)."""
+    rows = []
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                logger.warning("events.writer.torn_line", path=path)
+    return rows
+
+
+class AuditEventWriter:
+    """
+    Background batched writer of audit trail events (one per worker process).
+
+    emit() appends the event to a journal segment on local disk and queues
+    it, without any DB round trip. A writer thread bulk-inserts the queue
+    every `batch_size` events or `flush_interval` seconds; each flush seals
+    the journal segment of the events it writes and deletes it once the
+    insert succeeded.
+
+    No event is silently lost:
+        - Queue full: the event is only kept in the journal ('overflowed');
+          the next flush writes the whole sealed segment.
+        - Failed insert (transient: connection, timeout, 5xx): the sealed
+          segment stays on disk and every later flush retries it
+          ('failed_flushes').
+        - Rejected insert (the database refuses a row for good, e.g. a
+          block_id that is not a UUID): the batch is split in halves until
+          the rejected rows are isolated; the others are written and the
+          rejected ones appended to this process's dead-letter file in the
+          spool dir ('poisoned'), so one bad row never blocks the spool.
+        - Crash: segments of dead processes (or of the previous process
+          with the same pid) are claimed and re-sent by the next writer
+          that starts or stops on the host.
+        - No journal (spool dir unwritable): failed batches go back to the
+          queue; events beyond its bound are counted as 'dropped' and
+          logged at ERROR.
+
+    Rows carry a client-side id (idempotent re-sends) and created_at set at
+    emit time, so timelines keep their order despite batching.
+
+    Usage:
+        writer = start_event_writer()      # worker_process_init
+        writer.emit(block_id, EventType.NODE_ENTERED, "ExtractGeometry", state)
+        flush_event_writer()               # task_postrun
+        stop_event_writer()                # worker_process_shutdown
+    """
+
+    def __init__(
+        self,
+        spool_dir: Optional[str] = AUDIT_EVENT_SPOOL_DIR,
+        queue_size: int = AUDIT_EVENT_QUEUE_SIZE,
+        batch_size: int = AUDIT_EVENT_BATCH_SIZE,
+        flush_interval: float = AUDIT_EVENT_FLUSH_INTERVAL_SECONDS,
+        write: Callable[[List[dict]], None] = _upsert_events,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.stats: Counter = Counter()
+        self._write = write
+        self._token = f"{self.pid}-{uuid.uuid4().hex[:8]}"
+        self._queue: List[dict] = []
+        self._lock = threading.Lock()        # queue + journal
+        self._flush_lock = threading.Lock()  # one flush at a time
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._segment_seq = 0
+        self._journal: Optional[int] = None
+        self._journal_path: Optional[str] = None
+        self._journal_overflow = False
+        self._backlog: List[str] = []  # sealed segments still to write
+
+        self.spool_dir = spool_dir
+        if spool_dir:
+            try:
+                os.makedirs(spool_dir, exist_ok=True)
+            except OSError as e:
+                logger.error("events.writer.spool_unavailable", spool_dir=spool_dir, error=str(e))
+                self.spool_dir = None
+
+    # ── Producer side (graph nodes) ──────────────────────────────────────────
+
+    def emit(self, block_id: str, event_type: str, node_name: str, state: ValidationState) -> None:
+        """Queue one event (journaled first). Never blocks on the database."""
+        row = _event_row(block_id, event_type, node_name, state)
+        row["id"] = str(uuid.uuid4())
+        row["created_at"] = datetime.now(timezone.utc).isoformat()
+        line = (json.dumps(row, default=str) + "\n").encode("utf-8")
+
+        with self._lock:
+            journaled = self._append_journal(line)
+            if len(self._queue) < self.queue_size:
+                self._queue.append(row)
+            elif journaled:
+                self._journal_overflow = True
+                self.stats["overflowed"] += 1
+            else:
+                self.stats["dropped"] += 1
+                logger.error("events.writer.event_dropped", block_id=block_id,
+                             event_type=event_type, node_name=node_name)
+                return
+            self.stats["emitted"] += 1
+            full = len(self._queue) >= self.batch_size
+
+        if full:
+            self._wake.set()
+
+    def _append_journal(self, line: bytes) -> bool:
+        """Append to the current segment (caller holds self._lock)."""
+        if not self.spool_dir:
+            return False
+        try:
+            if self._journal is None:
+                self._journal_path = os.path.join(
+                    self.spool_dir, f"{self._token}-{self._segment_seq}{_SEGMENT_SUFFIX}"
+                )
+                self._segment_seq += 1
+                self._journal = os.open(self._journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            os.write(self._journal, line)
+            return True
+        except OSError as e:
+            self.stats["journal_errors"] += 1
+            logger.warning("events.writer.journal_failed", path=self._journal_path, error=str(e))
+            return False
+
+    def _seal_journal(self) -> tuple:
+        """Rotate the current segment (caller holds self._lock). Returns (sealed path, overflowed)."""
+        if self._journal is None:
+            return None, False
+        path, overflowed = self._journal_path, self._journal_overflow
+        os.close(self._journal)
+        self._journal, self._journal_path, self._journal_overflow = None, None, False
+        sealed = path[:-len(_SEGMENT_SUFFIX)] + _SEALED_SUFFIX
+        try:
+            os.replace(path, sealed)
+        except OSError:
+            sealed = path
+        return sealed, overflowed
+
+    # ── Writer side ──────────────────────────────────────────────────────────
+
+    def flush(self) -> int:
+        """Bulk-insert the queued events now, then retry spooled segments.
+
+        Returns:
+            Number of events written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._queue = self._queue, []
+                segment, overflowed = self._seal_journal()
+
+            if overflowed:
+                # Overflowed events are only in the journal: write the whole segment
+                journaled = _read_segment(segment)
+                ids = {row["id"] for row in journaled}
+                rows = journaled + [row for row in rows if row["id"] not in ids]
+
+            written = 0
+            if rows:
+                written += self._write_batch(rows, segment) or 0
+            elif segment is not None:
+                _remove(segment)
+
+            for path in list(self._backlog):
+                if path == segment:
+                    continue
+                backlog_rows = _read_segment(path) if os.path.exists(path) else []
+                count = self._write_batch(backlog_rows, path)
+                if count is None:
+                    break  # database still unavailable: keep the rest for later
+                written += count
+            return written
+
+    def _write_batch(self, rows: List[dict], segment: Optional[str]) -> Optional[int]:
+        """Write `rows` (journaled in `segment`); rows written, or None if the write must be retried."""
+        try:
+            # One bulk insert per flush; only oversized spooled segments are chunked
+            step = max(self.queue_size, 1)
+            poisoned = []
+            for start in range(0, len(rows), step):
+                poisoned += self._write_isolating(rows[start:start + step])
+        except Exception as e:
+            self.stats["failed_flushes"] += 1
+            logger.warning("events.writer.flush_failed", event_count=len(rows),
+                           spooled=segment is not None, error=str(e), error_type=type(e).__name__)
+            if segment is not None:
+                if segment not in self._backlog:
+                    self._backlog.append(segment)
+            else:
+                self._requeue(rows)
+            return None
+
+        if poisoned:
+            self._dead_letter(poisoned)
+        written = len(rows) - len(poisoned)
+        self.stats["flushes"] += 1
+        self.stats["written"] += written
+        if segment is not None:
+            _remove(segment)
+            if segment in self._backlog:
+                self._backlog.remove(segment)
+        logger.info("events.writer.flushed", event_count=written)
+        return written
+
+    def _write_isolating(self, rows: List[dict]) -> List[tuple]:
+        """Write `rows`, halving a batch the database rejects until the bad rows are isolated.
+
+        Re-sends are idempotent (rows carry their id), so halves written
+        before a transient error are harmless when the batch is retried.
+
+        Returns:
+            [(row, error)] of the rows rejected on their own.
+
+        Raises:
+            The write error if it is transient (the caller keeps the batch).
+        """
+        try:
+            self._write(rows)
+            return []
+        except Exception as e:
+            if _is_transient_write_error(e):
+                raise
+            if len(rows) == 1:
+                return [(rows[0], e)]
+        middle = len(rows) // 2
+        return self._write_isolating(rows[:middle]) + self._write_isolating(rows[middle:])
+
+    def _dead_letter(self, poisoned: List[tuple]) -> None:
+        """Set rejected rows aside in the spool dir (never re-sent) and count them."""
+        self.stats["poisoned"] += len(poisoned)
+        path = os.path.join(self.spool_dir, f"{self._token}{_DEAD_LETTER_SUFFIX}") if self.spool_dir else None
+        if path is not None:
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    for row, error in poisoned:
+                        f.write(json.dumps({"error": str(error), "event": row}, default=str) + "\n")
+            except OSError as e:
+                logger.warning("events.writer.dead_letter_failed", path=path, error=str(e))
+                path = None
+        for row, error in poisoned:
+            logger.error("events.writer.event_poisoned", event_id=row.get("id"), block_id=row.get("block_id"),
+                         event_type=row.get("event_type"), node_name=row.get("node_name"),
+                         dead_letter=path, error=str(error))
+
+    def _requeue(self, rows: List[dict]) -> None:
+        """Put an unjournaled failed batch back in front of the queue, within its bound."""
+        with self._lock:
+            room = max(self.queue_size - len(self._queue), 0)
+            self._queue = rows[:room] + self._queue
+            dropped = len(rows) - min(room, len(rows))
+        if dropped:
+            self.stats["dropped"] += dropped
+            logger.error("events.writer.events_dropped", event_count=dropped, reason="queue_full_no_journal")
+
+    def recover(self) -> int:
+        """Claim the journal segments left by dead processes; the next flush sends them.
+
+        Returns:
+            Number of segments claimed.
+        """
+        if not self.spool_dir:
+            return 0
+        claimed = 0
+        for name in sorted(os.listdir(self.spool_dir)):
+            if not name.endswith((_SEGMENT_SUFFIX, _SEALED_SUFFIX)) or name.startswith(self._token + "-"):
+                continue
+            pid = name.split("-", 1)[0]
+            # Same pid, other token: the previous process of a restarted container
+            if not pid.isdigit() or (int(pid) != self.pid and _pid_alive(int(pid))):
+                continue
+            with self._lock:
+                target = os.path.join(self.spool_dir, f"{self._token}-{self._segment_seq}{_SEALED_SUFFIX}")
+                self._segment_seq += 1
+            try:
+                os.rename(os.path.join(self.spool_dir, name), target)
+            except OSError:
+                continue  # claimed by another process
+            self._backlog.append(target)
+            claimed += 1
+        if claimed:
+            self.stats["recovered_segments"] += claimed
+            logger.warning("events.writer.segments_recovered", segments=claimed)
+        return claimed
+
+    def start(self) -> "AuditEventWriter":
+        self.recover()
+        self._thread = threading.Thread(target=self._run, name="audit-event-writer", daemon=True)
+        self._thread.start()
+        logger.info("events.writer.started", batch_size=self.batch_size,
+                    queue_size=self.queue_size, flush_interval=self.flush_interval)
+        return self
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception("events.writer.loop_error", error=str(e))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the thread and flush what is left (unwritten segments stay spooled)."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.recover()
+        self.flush()
+        logger.info("events.writer.stopped", **dict(self.stats))
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_writer: Optional[AuditEventWriter] = None
+_writer_lock = threading.Lock()
+
+
+def start_event_writer(**kwargs) -> Optional[AuditEventWriter]:
+    """Start this process's writer (Celery worker_process_init); None if AUDIT_EVENT_WRITER is off."""
+    global _writer
+    if not AUDIT_EVENT_WRITER:
+        return None
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = AuditEventWriter(**kwargs).start()
+        return _writer
+
+
+def get_event_writer() -> Optional[AuditEventWriter]:
+    """The running writer of this process, or None (insert_event then writes inline)."""
+    writer = _writer
+    return writer if writer is not None and writer.pid == os.getpid() else None
+
+
+def flush_event_writer() -> int:
+    """Flush this process's writer (Celery task_postrun). Returns events written."""
+    writer = get_event_writer()
+    return writer.flush() if writer is not None else 0
+
+
+def stop_event_writer() -> None:
+    """Flush and stop this process's writer (Celery worker_process_shutdown)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = get_event_writer(), None
+    if writer is not None:
+        writer.stop()
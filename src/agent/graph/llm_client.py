@@ -8,6 +8,7 @@ Configured OpenAI client with:
 - Structured output parsing
 - Rate limiting (Token bucket algorithm, T-1810)
 - Concurrent request limiting (T-1810)
+- Batched classification: N blocks of a file per request
 
 T-1802-AGENT: LLM Classification Node
 T-1810-INFRA: OpenAI Rate Limiting (Client-Side)
@@ -15,7 +16,8 @@ T-1810-INFRA: OpenAI Rate Limiting (Client-Side)
 
 import json
 import os
-from typing import Dict, Any, Optional
+from collections import Counter
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 import structlog
@@ -40,7 +42,10 @@ from src.agent.constants import (
     LLM_RETRY_WAIT_EXPONENTIAL_MULTIPLIER,
     LLM_RETRY_WAIT_EXPONENTIAL_MAX,
     CLASSIFICATION_PROMPTS,
+    CLASSIFICATION_BATCH_PROMPTS,
     CLASSIFICATION_PROMPT_VERSION,
+    LLM_BATCH_MAX_TOKENS_PER_BLOCK,
+    LLM_BATCH_TIMEOUT_SECONDS,
     OPENAI_RATE_LIMIT_PER_MIN,
     OPENAI_MAX_CONCURRENT,
     OPENAI_RATE_LIMIT_BUCKET_SIZE,
@@ -116,6 +121,9 @@ class LLMClient:
         # JSON output parser
         self.parser = JsonOutputParser()
         
+        # Requests sent + prompt/completion tokens reported by the API
+        self.usage = Counter()
+        
         # T-1810: Initialize rate limiter.
         # The RateLimiterService lives in src/backend; it is reachable from the
         # backend test container ("services.*") and from local docker-compose
@@ -170,7 +178,7 @@ class LLMClient:
         retry=retry_if_exception_type((OpenAIError, APITimeoutError, RateLimitError)),
         reraise=True,
     )
-    def _call_llm(self, prompt: str) -> str:
+    def _call_llm(self, prompt: str, **overrides) -> str:
         """
         Internal method to call LLM with retry logic.
         
@@ -181,6 +189,7 @@ class LLMClient:
         
         Args:
             prompt: Formatted prompt string
+            **overrides: Per-request API parameters (e.g. max_tokens for a batch)
             
         Returns:
             Raw LLM response text (JSON string)
@@ -195,7 +204,8 @@ class LLMClient:
                 HumanMessage(content=prompt),
             ]
             
-            response = self.llm.invoke(messages)
+            response = self.llm.invoke(messages, **overrides)
+            self._record_usage(response)
             return response.content
             
         except APITimeoutError as e:
@@ -264,92 +274,17 @@ class LLMClient:
             vertices_count=vertices_count,
         )
         
-        # T-1810: Acquire rate limiter token (blocks until available or timeout)
-        if self.rate_limiter and self.rate_limiter.enabled:
-            token_acquired = self.rate_limiter.acquire_token(
-                timeout=OPENAI_RATE_LIMITER_TIMEOUT
-            )
-            
-            if not token_acquired:
-                logger.error(
-                    "rate_limiter_timeout",
-                    iso_code=iso_code,
-                    timeout_sec=OPENAI_RATE_LIMITER_TIMEOUT,
-                    message="Rate limiter timeout, should trigger fallback classification",
-                )
-                raise LLMClassificationError(
-                    f"Rate limiter timeout after {OPENAI_RATE_LIMITER_TIMEOUT}s. "
-                    "Consider using fallback classification or increasing timeout."
-                )
-        
-        # T-1810: Acquire concurrent slot (non-blocking check)
-        concurrent_slot_acquired = False
-        if self.rate_limiter and self.rate_limiter.enabled:
-            concurrent_slot_acquired = self.rate_limiter.acquire_concurrent_slot()
-            
-            if not concurrent_slot_acquired:
-                logger.warning(
-                    "concurrent_limit_reached",
-                    iso_code=iso_code,
-                    max_concurrent=OPENAI_MAX_CONCURRENT,
-                    message="Max concurrent LLM requests reached, should trigger fallback",
-                )
-                raise LLMClassificationError(
-                    f"Max concurrent LLM requests ({OPENAI_MAX_CONCURRENT}) reached. "
-                    "Consider using fallback classification."
-                )
+        # T-1810: Acquire rate limiter token + concurrent slot
+        concurrent_slot_acquired = self._acquire_rate_limit(iso_code=iso_code)
         
         try:
             # Call LLM with retry logic (Tenacity handles retries)
             raw_response = self._call_llm(prompt)
             
-            # Parse JSON response
-            try:
-                result = json.loads(raw_response)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    "llm_invalid_json",
-                    iso_code=iso_code,
-                    raw_response=raw_response[:200],  # Truncate for logging
-                    error=str(e),
-                )
-                raise LLMInvalidResponseError(
-                    f"LLM returned invalid JSON: {str(e)}"
-                ) from e
-            
-            # Validate schema (required fields)
-            required_fields = ["tipologia", "confidence", "reasoning"]
-            missing_fields = [f for f in required_fields if f not in result]
-            if missing_fields:
-                logger.error(
-                    "llm_missing_fields",
-                    iso_code=iso_code,
-                    missing=missing_fields,
-                    result=result,
-                )
-                raise LLMInvalidResponseError(
-                    f"LLM response missing fields: {missing_fields}"
-                )
-            
-            # Validate confidence is float in range [0.0, 1.0]
-            try:
-                confidence = float(result["confidence"])
-                if not (0.0 <= confidence <= 1.0):
-                    raise ValueError("Confidence must be between 0.0 and 1.0")
-                result["confidence"] = confidence
-            except (ValueError, TypeError) as e:
-                logger.error(
-                    "llm_invalid_confidence",
-                    iso_code=iso_code,
-                    confidence=result.get("confidence"),
-                    error=str(e),
-                )
-                raise LLMInvalidResponseError(
-                    f"Invalid confidence value: {result.get('confidence')}"
-                ) from e
-            
-            # Add metadata
-            result["classified_at"] = datetime.utcnow().isoformat() + "Z"
+            # Parse JSON response and validate schema
+            result = self._validate_classification(
+                self._parse_json(raw_response, iso_code=iso_code), iso_code=iso_code
+            )
             
             logger.info(
                 "llm_classify_success",
@@ -384,12 +319,231 @@ class LLMClient:
             ) from e
         finally:
             # T-1810: Always release concurrent slot (even on error)
-            if concurrent_slot_acquired and self.rate_limiter:
-                self.rate_limiter.release_concurrent_slot()
-                logger.debug(
-                    "concurrent_slot_released",
-                    iso_code=iso_code,
+            self._release_rate_limit(concurrent_slot_acquired, iso_code=iso_code)
+    
+    def classify_tipologia_batch(
+        self,
+        blocks: List[Dict[str, Any]],
+        layers: list,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify several blocks of the same file in ONE GPT-4 Turbo request.
+        
+        The file-level context (categories, instructions, layer list) is sent
+        once for the whole batch, and one rate limiter token + concurrent slot
+        covers it, so N blocks cost one request instead of N.
+        
+        Partial failures: each block has its own result entry ("id" b0..bN-1),
+        validated with the same rules as classify_tipologia. A missing,
+        duplicated or invalid entry only loses that block (None at its
+        position); the caller classifies it with classify_tipologia.
+        
+        Args:
+            blocks: [{"iso_code", "volume", "bbox", "vertices_count"}, ...]
+            layers: Layers of the file (shared by every block)
+            
+        Returns:
+            Results aligned with `blocks` (classify_tipologia schema, or None)
+            
+        Raises:
+            LLMClassificationError: If the request itself fails (rate limiter,
+                retries exhausted, unparseable answer)
+        """
+        if not blocks:
+            return []
+        
+        block_ids = [f"b{position}" for position in range(len(blocks))]
+        blocks_json = json.dumps([
+            {
+                "id": block_id,
+                "iso_code": block.get("iso_code"),
+                "volume": block.get("volume"),
+                "bbox": block.get("bbox"),
+                "vertices_count": block.get("vertices_count"),
+            }
+            for block_id, block in zip(block_ids, blocks)
+        ], ensure_ascii=False)
+        prompt = CLASSIFICATION_BATCH_PROMPTS[CLASSIFICATION_PROMPT_VERSION].format(
+            layers=layers,
+            blocks=blocks_json,
+        )
+        
+        logger.info("llm_classify_batch_request", blocks=len(blocks))
+        
+        concurrent_slot_acquired = self._acquire_rate_limit(batch_size=len(blocks))
+        
+        try:
+            raw_response = self._call_llm(
+                prompt,
+                max_tokens=LLM_BATCH_MAX_TOKENS_PER_BLOCK * len(blocks),
+                timeout=LLM_BATCH_TIMEOUT_SECONDS,
+            )
+            response = self._parse_json(raw_response, batch_size=len(blocks))
+            entries = response.get("results") if isinstance(response, dict) else None
+            if not isinstance(entries, list):
+                logger.error("llm_batch_missing_results", batch_size=len(blocks))
+                raise LLMInvalidResponseError("LLM batch response has no 'results' list")
+        except RetryError as e:
+            logger.error(
+                "llm_classify_batch_failed_after_retries",
+                batch_size=len(blocks),
+                attempts=LLM_RETRY_ATTEMPTS,
+                error=str(e.last_attempt.exception()),
+            )
+            raise LLMClassificationError(
+                f"LLM batch classification failed after {LLM_RETRY_ATTEMPTS} attempts"
+            ) from e
+        except (RateLimitError, APITimeoutError, OpenAIError) as e:
+            logger.error(
+                "llm_classify_batch_failed_openai_error",
+                batch_size=len(blocks),
+                error_type=type(e).__name__,
+                error=str(e),
+            )
+            raise LLMClassificationError(
+                f"LLM batch classification failed: {type(e).__name__}"
+            ) from e
+        finally:
+            self._release_rate_limit(concurrent_slot_acquired, batch_size=len(blocks))
+        
+        # Per-block results: keep the first valid entry of each known id
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            block_id = entry.get("id") if isinstance(entry, dict) else None
+            if block_id not in block_ids or block_id in by_id:
+                continue
+            iso_code = blocks[block_ids.index(block_id)].get("iso_code")
+            try:
+                by_id[block_id] = self._validate_classification(
+                    {key: value for key, value in entry.items() if key != "id"}, iso_code=iso_code
                 )
+            except LLMInvalidResponseError:
+                continue  # Logged by _validate_classification; block falls back
+        
+        results = [by_id.get(block_id) for block_id in block_ids]
+        missing = [blocks[position].get("iso_code") for position, result in enumerate(results) if result is None]
+        logger.info(
+            "llm_classify_batch_success",
+            blocks=len(blocks),
+            classified=len(blocks) - len(missing),
+            missing=missing,
+        )
+        return results
+    
+    def _acquire_rate_limit(self, **log_fields) -> bool:
+        """
+        T-1810: Acquire a rate limiter token (blocks until available or
+        timeout), then a concurrent slot (non-blocking check).
+        
+        Returns:
+            True if a concurrent slot was acquired (release it afterwards)
+            
+        Raises:
+            LLMClassificationError: On token timeout or concurrent limit
+        """
+        if not (self.rate_limiter and self.rate_limiter.enabled):
+            return False
+        
+        token_acquired = self.rate_limiter.acquire_token(
+            timeout=OPENAI_RATE_LIMITER_TIMEOUT
+        )
+        if not token_acquired:
+            logger.error(
+                "rate_limiter_timeout",
+                **log_fields,
+                timeout_sec=OPENAI_RATE_LIMITER_TIMEOUT,
+                message="Rate limiter timeout, should trigger fallback classification",
+            )
+            raise LLMClassificationError(
+                f"Rate limiter timeout after {OPENAI_RATE_LIMITER_TIMEOUT}s. "
+                "Consider using fallback classification or increasing timeout."
+            )
+        
+        if not self.rate_limiter.acquire_concurrent_slot():
+            logger.warning(
+                "concurrent_limit_reached",
+                **log_fields,
+                max_concurrent=OPENAI_MAX_CONCURRENT,
+                message="Max concurrent LLM requests reached, should trigger fallback",
+            )
+            raise LLMClassificationError(
+                f"Max concurrent LLM requests ({OPENAI_MAX_CONCURRENT}) reached. "
+                "Consider using fallback classification."
+            )
+        return True
+    
+    def _release_rate_limit(self, concurrent_slot_acquired: bool, **log_fields) -> None:
+        if concurrent_slot_acquired and self.rate_limiter:
+            self.rate_limiter.release_concurrent_slot()
+            logger.debug("concurrent_slot_released", **log_fields)
+    
+    def _parse_json(self, raw_response: str, **log_fields) -> Any:
+        try:
+            return json.loads(raw_response)
+        except json.JSONDecodeError as e:
+            logger.error(
+                "llm_invalid_json",
+                **log_fields,
+                raw_response=raw_response[:200],  # Truncate for logging
+                error=str(e),
+            )
+            raise LLMInvalidResponseError(
+                f"LLM returned invalid JSON: {str(e)}"
+            ) from e
+    
+    def _validate_classification(self, result: Any, iso_code: str = None) -> Dict[str, Any]:
+        """
+        Validate one classification against the schema
+        {tipologia, confidence in [0.0, 1.0], reasoning} and stamp classified_at.
+        
+        Raises:
+            LLMInvalidResponseError: If fields are missing or confidence is invalid
+        """
+        # Validate schema (required fields)
+        required_fields = ["tipologia", "confidence", "reasoning"]
+        if not isinstance(result, dict):
+            result = {}
+        missing_fields = [f for f in required_fields if f not in result]
+        if missing_fields:
+            logger.error(
+                "llm_missing_fields",
+                iso_code=iso_code,
+                missing=missing_fields,
+                result=result,
+            )
+            raise LLMInvalidResponseError(
+                f"LLM response missing fields: {missing_fields}"
+            )
+        
+        # Validate confidence is float in range [0.0, 1.0]
+        try:
+            confidence = float(result["confidence"])
+            if not (0.0 <= confidence <= 1.0):
+                raise ValueError("Confidence must be between 0.0 and 1.0")
+            result["confidence"] = confidence
+        except (ValueError, TypeError) as e:
+            logger.error(
+                "llm_invalid_confidence",
+                iso_code=iso_code,
+                confidence=result.get("confidence"),
+                error=str(e),
+            )
+            raise LLMInvalidResponseError(
+                f"Invalid confidence value: {result.get('confidence')}"
+            ) from e
+        
+        # Add metadata
+        result["classified_at"] = datetime.utcnow().isoformat() + "Z"
+        return result
+    
+    def _record_usage(self, response) -> None:
+        """Count requests and prompt/completion tokens (as reported by the API)."""
+        self.usage["requests"] += 1
+        metadata = getattr(response, "response_metadata", None)
+        token_usage = metadata.get("token_usage") if isinstance(metadata, dict) else None
+        if isinstance(token_usage, dict):
+            self.usage["prompt_tokens"] += token_usage.get("prompt_tokens") or 0
+            self.usage["completion_tokens"] += token_usage.get("completion_tokens") or 0
 
 
 # Singleton instance (reuse across calls to avoid reinitializing OpenAI client)
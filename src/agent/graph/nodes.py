@@ -236,6 +236,43 @@ def _append_to_errors(state: ValidationState, error_msg: str) -> list:
 # HELPER: build geometry_metadata from an already-downloaded .3dm (US-018 wiring)
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _summarize_model_geometry(model) -> Dict[str, Any]:
+    """
+    bbox / volume / vertex and face counts of every object of a File3dm.
+
+    Reads the per-object bboxes and counts of the shared object table index
+    (computed once per parsed file) instead of walking model.Objects again.
+    Falls back to the unit box when the model has no valid bbox.
+    """
+    try:
+        from src.agent.services.object_table_index import get_object_index
+    except ImportError:
+        from services.object_table_index import get_object_index
+
+    summary = {
+        "bbox": {"min": [0.0, 0.0, 0.0], "max": [1.0, 1.0, 1.0], "dimensions": [1.0, 1.0, 1.0]},
+        "volume": 0.0,
+        "vertices_count": 0,
+        "faces_count": 0,
+    }
+    if not (model and model.Objects):
+        return summary
+
+    index = get_object_index(model)
+    summary["vertices_count"] = int(index.vertex_count.sum())
+    summary["faces_count"] = int(index.face_count.sum())
+    bounds = index.bounds()
+    if bounds is not None:
+        dimensions = bounds[1] - bounds[0]
+        summary["bbox"] = {
+            "min": bounds[0].tolist(),
+            "max": bounds[1].tolist(),
+            "dimensions": dimensions.tolist(),
+        }
+        summary["volume"] = float(dimensions.prod())
+    return summary
+
+
 def build_initial_geometry_metadata(
     local_path: str,
     parse_result: Any,
@@ -264,47 +301,31 @@ def build_initial_geometry_metadata(
     Returns:
         geometry_metadata dict with the same keys node_extract_geometry returns
         (layers, bbox, volume, vertices_count, faces_count, rhino_model,
-        user_strings, file_exists_in_storage, has_mesh) plus iso_code.
+        user_strings, file_exists_in_storage, has_mesh) plus iso_code and
+        content_hash (SHA-256 of the file, key of the memoized validation).
     """
     try:
         import rhino3dm
     except ImportError:
         rhino3dm = None
-
-    bbox_dict = {"min": [0.0, 0.0, 0.0], "max": [1.0, 1.0, 1.0], "dimensions": [1.0, 1.0, 1.0]}
-    volume = 0.0
-    vertices_count = 0
-    faces_count = 0
-
-    model = rhino3dm.File3dm.Read(local_path) if rhino3dm else None
-
-    if model and model.Objects:
-        min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-        max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-
-        for obj in model.Objects:
-            if obj.Geometry:
-                obj_bbox = obj.Geometry.GetBoundingBox()
-                if obj_bbox.IsValid:
-                    min_x = min(min_x, obj_bbox.Min.X)
-                    min_y = min(min_y, obj_bbox.Min.Y)
-                    min_z = min(min_z, obj_bbox.Min.Z)
-                    max_x = max(max_x, obj_bbox.Max.X)
-                    max_y = max(max_y, obj_bbox.Max.Y)
-                    max_z = max(max_z, obj_bbox.Max.Z)
-
-                if hasattr(obj.Geometry, 'Vertices'):
-                    vertices_count += len(obj.Geometry.Vertices)
-                if hasattr(obj.Geometry, 'Faces'):
-                    faces_count += len(obj.Geometry.Faces)
-
-        if min_x != float('inf'):
-            bbox_dict = {
-                "min": [min_x, min_y, min_z],
-                "max": [max_x, max_y, max_z],
-                "dimensions": [max_x - min_x, max_y - min_y, max_z - min_z],
-            }
-            volume = (max_x - min_x) * (max_y - min_y) * (max_z - min_z)
+    try:
+        from src.agent.services.model_cache_service import get_model_cache
+        from src.agent.services.validation_cache import file_content_hash
+    except ImportError:
+        from services.model_cache_service import get_model_cache
+        from services.validation_cache import file_content_hash
+
+    # Same File3dm RhinoParserService.parse_file just read (worker model cache)
+    model = get_model_cache().read_model(local_path, rhino3dm.File3dm.Read) if rhino3dm else None
+    summary = _summarize_model_geometry(model)
+    bbox_dict = summary["bbox"]
+    volume = summary["volume"]
+    vertices_count = summary["vertices_count"]
+    faces_count = summary["faces_count"]
+    try:
+        content_hash = file_content_hash(local_path)
+    except OSError:
+        content_hash = None  # unreadable file: validation is not memoized
 
     return {
         "layers": parse_result.layers,
@@ -317,6 +338,7 @@ def build_initial_geometry_metadata(
         "file_exists_in_storage": True,
         "has_mesh": vertices_count > 0,
         "iso_code": iso_code,
+        "content_hash": content_hash,
     }
 
 
@@ -391,6 +413,10 @@ def insert_event(
     Grafana timeline visualization. Failures are logged as WARNING but do NOT
     block StateGraph execution (degradation graceful).
 
+    In Celery workers the event is handed to the process's AuditEventWriter
+    (graph/events.py): batched bulk inserts off the node's critical path.
+    Without a running writer (API, tests) it is inserted inline.
+
     Design patterns:
         - Best-effort: DB failures logged but non-fatal (graph continues)
         - Fire-and-forget: No return value, no exception propagation
@@ -439,6 +465,17 @@ def insert_event(
         # Logs: event.inserted block_id=GLPER.B-PAE0720.0701 node_name=ValidateNomenclature
     """
     try:
+        # Celery workers queue the event for the background writer
+        # (batched, journaled) instead of a round trip on the node's path
+        try:
+            from src.agent.graph.events import get_event_writer
+        except ImportError:
+            from graph.events import get_event_writer
+        writer = get_event_writer()
+        if writer is not None:
+            writer.emit(block_id, event_type, node_name, state)
+            return
+
         # Serialize lightweight state snapshot
         state_snapshot = serialize_state_snapshot(state)
         
@@ -528,6 +565,7 @@ def node_extract_geometry(state: ValidationState) -> Dict[str, Any]:
     import os
     from infra.supabase_client import get_supabase_client
     from src.agent.services.rhino_parser_service import RhinoParserService
+    from src.agent.services.model_cache_service import get_model_cache
     # STORAGE_BUCKET_RAW_UPLOADS is a backend constant. Bare `constants`
     # resolves to the agent's constants in the agent-worker (no such symbol);
     # only `src.backend.constants` resolves there. See memory-bank/decisions.md.
@@ -637,46 +675,16 @@ def node_extract_geometry(state: ValidationState) -> Dict[str, Any]:
                 "validation_path": _append_to_path(state, node_name),
             }
         
-        # Load rhino3dm model again for geometry extraction
+        # Reuse the model RhinoParserService just read for geometry extraction
         # (RhinoParserService extracts layers but not bbox/volume)
-        model = rhino3dm.File3dm.Read(temp_file_path) if rhino3dm else None
+        model = get_model_cache().read_model(temp_file_path, rhino3dm.File3dm.Read) if rhino3dm else None
         
-        # Extract bounding box and volume from model
-        bbox_dict = {"min": [0.0, 0.0, 0.0], "max": [1.0, 1.0, 1.0], "dimensions": [1.0, 1.0, 1.0]}
-        volume = 0.0
-        vertices_count = 0
-        faces_count = 0
-        
-        if model and model.Objects:
-            # Calculate bounding box from all objects
-            min_x, min_y, min_z = float('inf'), float('inf'), float('inf')
-            max_x, max_y, max_z = float('-inf'), float('-inf'), float('-inf')
-            
-            for obj in model.Objects:
-                if obj.Geometry:
-                    # rhino3dm GetBoundingBox() takes no arguments (unlike .NET Rhino API)
-                    obj_bbox = obj.Geometry.GetBoundingBox()
-                    if obj_bbox.IsValid:
-                        min_x = min(min_x, obj_bbox.Min.X)
-                        min_y = min(min_y, obj_bbox.Min.Y)
-                        min_z = min(min_z, obj_bbox.Min.Z)
-                        max_x = max(max_x, obj_bbox.Max.X)
-                        max_y = max(max_y, obj_bbox.Max.Y)
-                        max_z = max(max_z, obj_bbox.Max.Z)
-                    
-                    # Count vertices/faces if mesh
-                    if hasattr(obj.Geometry, 'Vertices'):
-                        vertices_count += len(obj.Geometry.Vertices)
-                    if hasattr(obj.Geometry, 'Faces'):
-                        faces_count += len(obj.Geometry.Faces)
-            
-            if min_x != float('inf'):
-                bbox_dict = {
-                    "min": [min_x, min_y, min_z],
-                    "max": [max_x, max_y, max_z],
-                    "dimensions": [max_x - min_x, max_y - min_y, max_z - min_z],
-                }
-                volume = (max_x - min_x) * (max_y - min_y) * (max_z - min_z)
+        # Bounding box and volume from the object table index of the model
+        summary = _summarize_model_geometry(model)
+        bbox_dict = summary["bbox"]
+        volume = summary["volume"]
+        vertices_count = summary["vertices_count"]
+        faces_count = summary["faces_count"]
         
         # Build comprehensive geometry_metadata
         geometry_metadata = {
@@ -767,7 +775,8 @@ def node_validate_geometry(state: ValidationState) -> Dict[str, Any]:
 
     Flow:
         1. Extract geometry_metadata.rhino_model from state (populated by ExtractGeometry)
-        2. Call GeometryValidator.validate_geometry(model)
+        2. Call GeometryValidator via validate_block_geometry (file-wide rules +
+           this block's instances / definition, memoized by file content hash)
         3. Update state with geometry_valid (bool) based on error count
 
     Args:
@@ -785,6 +794,7 @@ def node_validate_geometry(state: ValidationState) -> Dict[str, Any]:
         True
     """
     from src.agent.services.geometry_validator import GeometryValidator
+    from src.agent.services.validation_cache import validate_block_geometry
     
     node_name = "ValidateGeometry"
     block_id = state.get("block_id", "unknown")
@@ -805,9 +815,20 @@ def node_validate_geometry(state: ValidationState) -> Dict[str, Any]:
             "validation_path": _append_to_path(state, node_name),
         }
     
-    # Call GeometryValidator (US-002 service, UNCHANGED code)
-    validator = GeometryValidator()
-    errors = validator.validate_geometry(rhino_model)
+    # Callers that already validated the model may pre-populate the result
+    precomputed_errors = geometry_metadata.get("geometry_validation_errors")
+    if precomputed_errors is not None:
+        errors = list(precomputed_errors)
+    else:
+        # Scoped to this block's InstanceDefinition and memoized per file
+        # content: the file-wide rules run once for all the blocks of a file
+        validator = GeometryValidator()
+        errors = validate_block_geometry(
+            rhino_model,
+            geometry_metadata.get("content_hash"),
+            geometry_metadata.get("iso_code"),
+            validator,
+        )
     
     is_valid = len(errors) == 0
     
@@ -868,7 +889,8 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
         validate_llm_confidence,
         merge_llm_with_metadata,
     )
-    from src.agent.constants import CONFIDENCE_THRESHOLD
+    from src.agent.graph.classification_cache import ClassificationCache, classification_features
+    from src.agent.constants import CONFIDENCE_THRESHOLD, CLASSIFICATION_CACHE_ENABLED
     from infra.redis_client import get_redis_client
     
     node_name = "ClassifyTipologia"
@@ -892,9 +914,19 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
     # geometry_metadata; fall back to block_id for legacy/test callers.
     iso_code_source = geometry_metadata.get("iso_code") or block_id
     iso_code = sanitize_user_string(iso_code_source)
-    
-    # Check if Circuit Breaker is OPEN
-    if circuit_breaker.is_open():
+
+    # Classification cache: identical features (same prompt + model) reuse the
+    # stored LLM answer → no LLM call, no rate limiter token (re-ingested files).
+    # validate_file_blocks may already have classified the block in a batch
+    # request (graph/batch_classification.py).
+    classification_cache = ClassificationCache(redis_client if CLASSIFICATION_CACHE_ENABLED else None)
+    cache_features = classification_features(volume, bbox, layers, vertices_count, iso_code)
+    cached_result = geometry_metadata.get("llm_classification")
+    if cached_result is None:
+        cached_result = classification_cache.get(cache_features)
+
+    # Check if Circuit Breaker is OPEN (a cached answer needs no LLM)
+    if cached_result is None and circuit_breaker.is_open():
         logger.warning(
             "circuit_breaker_open_using_fallback",
             node=node_name,
@@ -935,16 +967,20 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
             "validation_path": _append_to_path(state, node_name),
         }
     
-    # Attempt LLM classification
+    # Attempt LLM classification (unless cached)
     try:
-        llm_client = get_llm_client()
-        llm_result = llm_client.classify_tipologia(
-            volume=volume,
-            bbox=bbox,
-            layers=layers,
-            vertices_count=vertices_count,
-            iso_code=iso_code,
-        )
+        if cached_result is not None:
+            llm_result = cached_result
+        else:
+            llm_client = get_llm_client()
+            llm_result = llm_client.classify_tipologia(
+                volume=volume,
+                bbox=bbox,
+                layers=layers,
+                vertices_count=vertices_count,
+                iso_code=iso_code,
+            )
+            classification_cache.put(cache_features, llm_result)
         
         # Validate confidence threshold
         confidence = llm_result.get("confidence", 0.0)
@@ -964,7 +1000,8 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
             circuit_breaker_tripped = False  # Not a Circuit Breaker event
             
             # Still record success in CB (LLM worked, just low confidence)
-            circuit_breaker.record_success()
+            if cached_result is None:
+                circuit_breaker.record_success()
         else:
             # LLM classification successful with high confidence
             semantic_data = merge_llm_with_metadata(llm_result, geometry_metadata)
@@ -972,7 +1009,8 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
             circuit_breaker_tripped = False
             
             # Record success in Circuit Breaker
-            circuit_breaker.record_success()
+            if cached_result is None:
+                circuit_breaker.record_success()
             
             logger.info(
                 "llm_classification_success",
@@ -980,6 +1018,7 @@ def node_classify_tipologia(state: ValidationState) -> Dict[str, Any]:
                 block_id=block_id,
                 tipologia=semantic_data["tipologia"],
                 confidence=confidence,
+                cached=cached_result is not None,
             )
         
     except Exception as e:
@@ -0,0 +1,46 @@
+"""
+Redis client for the agent worker.
+
+The worker always has Redis available because it is the Celery broker, so the
+client is built from settings.CELERY_BROKER_URL instead of a separate host
+setting. Mirrors the backend's infra/redis_client.py API (get_redis_client)
+so agent code can import it under the same module path in both contexts.
+"""
+from typing import Optional
+
+import redis
+import structlog
+
+try:
+    from config import settings
+except ModuleNotFoundError:
+    from src.agent.config import settings
+
+logger = structlog.get_logger()
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """Return a shared Redis client, or None if Redis is unreachable.
+
+    Graceful degradation: callers must treat None as "no shared state" and
+    fall back to their non-Redis behaviour.
+    """
+    global _client
+    if _client is None:
+        if not settings.CELERY_BROKER_URL:
+            return None
+        try:
+            client = redis.Redis.from_url(
+                settings.CELERY_BROKER_URL,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            client.ping()
+            _client = client
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            logger.warning("redis_client.unavailable", error=str(e))
+            return None
+    return _client
@@ -3,11 +3,25 @@ Agent Services Package
 
 Service layer for agent worker processes following Clean Architecture.
 Contains business logic for file processing, parsing, and database operations.
+
+Exports are resolved on first access: importing one service module
+(e.g. src.agent.services.lod_decimation_service) must not pull in the
+others, GeometryValidator in particular imports the backend schemas.
 """
 
-from .rhino_parser_service import RhinoParserService
-from .file_download_service import FileDownloadService
-from .db_service import DBService
-from .geometry_validator import GeometryValidator
+import importlib
+
+_EXPORTS = {
+    "RhinoParserService": ".rhino_parser_service",
+    "FileDownloadService": ".file_download_service",
+    "DBService": ".db_service",
+    "GeometryValidator": ".geometry_validator",
+}
 
 __all__ = ["RhinoParserService", "FileDownloadService", "DBService", "GeometryValidator"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -99,6 +99,33 @@ class DBService:
             )
             return False
 
+    @staticmethod
+    def build_validation_report(
+        is_valid: bool,
+        errors: list,
+        metadata: Dict[str, Any],
+        validated_by: str
+    ) -> Dict[str, Any]:
+        """
+        Build the blocks.validation_report JSON (also used by batched writers).
+
+        Args:
+            is_valid: Whether validation passed
+            errors: List of validation errors
+            metadata: Extracted metadata
+            validated_by: Worker identifier
+
+        Returns:
+            Validation report dict
+        """
+        return {
+            "is_valid": is_valid,
+            "errors": errors,
+            "metadata": metadata,
+            "validated_at": datetime.utcnow().isoformat() + "Z",
+            "validated_by": validated_by
+        }
+
     def save_validation_report(
         self,
         part_id: str,
@@ -123,14 +150,7 @@ class DBService:
         logger.info("db_service.save_validation_report", part_id=part_id, is_valid=is_valid)
 
         try:
-            # Build validation report JSON
-            validation_report = {
-                "is_valid": is_valid,
-                "errors": errors,
-                "metadata": metadata,
-                "validated_at": datetime.utcnow().isoformat() + "Z",
-                "validated_by": validated_by
-            }
+            validation_report = self.build_validation_report(is_valid, errors, metadata, validated_by)
 
             # Update blocks table
             result = self.supabase.table("blocks").update({
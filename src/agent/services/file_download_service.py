@@ -2,7 +2,9 @@
 File Download Service
 
 Handles downloading files from Supabase Storage (S3-compatible).
-Downloads .3dm files to temporary directory for processing.
+Downloads .3dm files into the worker's disk cache (ModelCacheService): every
+block of a file reuses one download, and misses are streamed to disk
+(StreamingDownloadService) so worker memory does not scale with file size.
 """
 
 import time
@@ -10,6 +12,14 @@ from pathlib import Path
 import structlog
 from infra.supabase_client import get_supabase_client
 
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.services.streaming_download_service import DownloadTooLargeError
+    from src.agent.services.model_cache_service import get_model_cache
+except ImportError:
+    from services.streaming_download_service import DownloadTooLargeError
+    from services.model_cache_service import get_model_cache
+
 logger = structlog.get_logger()
 
 # Storage bucket constant
@@ -38,11 +48,16 @@ class FileDownloadService:
 
     def download_from_s3(self, s3_key: str, task_id: str = None) -> tuple[bool, str, str]:
         """
-        Download file from S3 to temporary directory.
+        Download file from S3 into the worker's .3dm disk cache.
+
+        The returned path is a read-only cache entry named after the key, size
+        and ETag of the object (written with an atomic rename, so parallel
+        workers never see a partial file). cleanup_temp_file() leaves it to
+        the cache LRU.
 
         Args:
             s3_key: S3 key/path of the file (e.g., "uploads/file.3dm")
-            task_id: Optional Celery task ID to create unique temp filename (prevents race conditions)
+            task_id: Optional Celery task ID (logging only)
 
         Returns:
             Tuple of (success, local_path, error_message)
@@ -53,24 +68,23 @@ class FileDownloadService:
         logger.info("file_download.download_from_s3.started", s3_key=s3_key, task_id=task_id)
 
         try:
-            # Generate unique temp filename using task_id to avoid race conditions
-            filename = Path(s3_key).name
-            if task_id:
-                # Prefix filename with task_id for uniqueness across parallel workers
-                filename = f"{task_id}-{filename}"
-            local_path = self.temp_dir / filename
-
-            # Download from Supabase Storage with a short retry. A raised
+            # Fetch through the disk cache with a short retry. A raised
             # exception is a transient blip (incl. the storage3 spurious
-            # UnboundLocalError) → retry. `download()` returning None means the
-            # object genuinely does not exist → do NOT retry (permanent).
-            response = None
+            # UnboundLocalError) → retry. A missing object or one above
+            # MAX_3DM_FILE_SIZE_MB is permanent → do NOT retry.
+            model_cache = get_model_cache()
+            cached = None
             last_exc = None
             for attempt in range(1, DOWNLOAD_MAX_ATTEMPTS + 1):
                 try:
-                    response = self.supabase.storage.from_(STORAGE_BUCKET_RAW_UPLOADS).download(s3_key)
+                    cached = model_cache.fetch(self.supabase, s3_key, bucket=STORAGE_BUCKET_RAW_UPLOADS)
                     last_exc = None
                     break
+                except FileNotFoundError:
+                    break
+                except DownloadTooLargeError as e:
+                    logger.error("file_download.download_from_s3.too_large", s3_key=s3_key, error=str(e))
+                    return False, "", f"S3 download failed: {e}"
                 except Exception as e:  # noqa: BLE001 — intentionally broad: any error → retry
                     last_exc = e
                     logger.warning(
@@ -88,23 +102,20 @@ class FileDownloadService:
                 # validate_file classifies it transient and Celery-retries.
                 raise last_exc
 
-            if response is None:
+            if cached is None:
                 error_msg = f"S3 download failed: File not found for key {s3_key}"
                 logger.error("file_download.download_from_s3.not_found", s3_key=s3_key)
                 return False, "", error_msg
 
-            # Write to disk
-            with open(local_path, 'wb') as f:
-                f.write(response)
-
             logger.info(
                 "file_download.download_from_s3.success",
                 s3_key=s3_key,
-                local_path=str(local_path),
-                size_bytes=len(response)
+                local_path=cached.path,
+                size_bytes=cached.size,
+                cache_hit=cached.disk_hit
             )
 
-            return True, str(local_path), ""
+            return True, cached.path, ""
 
         except Exception as e:
             error_msg = f"S3 download error: {str(e)}"
@@ -115,10 +126,14 @@ class FileDownloadService:
         """
         Delete temporary file after processing.
 
+        Entries of the .3dm disk cache are kept (evicted by its LRU).
+
         Args:
             file_path: Path to temporary file
         """
         try:
+            if get_model_cache().owns(file_path):
+                return
             path = Path(file_path)
             if path.exists():
                 path.unlink()
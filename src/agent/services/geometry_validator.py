@@ -12,11 +12,16 @@ skipped — only top-level placed objects are checked:
 - Each placed instance has a non-degenerate bounding box
 - Each placed instance has non-zero volume
 
+validate_block scopes the per-instance checks to one block (the placed
+instances of its InstanceDefinition plus the definition's own geometry);
+validate_model_rules holds the file-wide rules. services/validation_cache.py
+memoizes both per file content.
+
 See memory-bank/decisions.md.
 """
 
 import structlog
-from typing import List
+from typing import List, Optional, Tuple
 
 try:
     import rhino3dm
@@ -33,6 +38,7 @@ try:
         GEOMETRY_ERROR_DEGENERATE_BBOX,
         GEOMETRY_ERROR_ZERO_VOLUME,
     )
+    from src.agent.services.object_table_index import get_object_index
 except ImportError:
     from constants import (
         GEOMETRY_CATEGORY_NAME,
@@ -42,6 +48,7 @@ except ImportError:
         GEOMETRY_ERROR_DEGENERATE_BBOX,
         GEOMETRY_ERROR_ZERO_VOLUME,
     )
+    from services.object_table_index import get_object_index
 
 # Import backend schema for validation errors.
 # ValidationErrorItem lives in src/backend/schemas.py. The bare `schemas`
@@ -105,13 +112,95 @@ class GeometryValidator:
             >>> len(errors)
             0
         """
-        errors = []
-
         # Defensive programming
         if model is None:
             logger.warning("geometry_validator.validate_geometry.none_input")
+            return []
+
+        errors, instances = self._check_model(model)
+        if not instances:
+            logger.info("geometry_validator.validate_geometry.completed",
+                        instances_checked=0, errors_found=len(errors))
             return errors
 
+        for obj in instances:
+            errors.extend(self._check_instance(obj))
+
+        logger.info("geometry_validator.validate_geometry.completed",
+                    instances_checked=len(instances),
+                    errors_found=len(errors))
+
+        return errors
+
+    def validate_model_rules(self, model) -> List[ValidationErrorItem]:
+        """
+        File-wide rules only (only block instances, at least one instance).
+
+        The result is the same for every block of the file, so callers
+        validating block by block run it once per file (see
+        services/validation_cache.py).
+        """
+        if model is None:
+            logger.warning("geometry_validator.validate_model_rules.none_input")
+            return []
+        errors, _ = self._check_model(model)
+        return errors
+
+    def validate_block(self, model, iso_code: str) -> Optional[List[ValidationErrorItem]]:
+        """
+        Per-block checks scoped to one InstanceDefinition.
+
+        Checks the placed instances of the block definition named `iso_code`
+        (same checks as validate_geometry) and the geometry inside the
+        definition (its object-id set: non-null and valid). File-wide rules
+        are NOT included (see validate_model_rules).
+
+        Returns:
+            List of ValidationErrorItem, or None if the model has no
+            InstanceDefinition named `iso_code` (the caller falls back to
+            validate_geometry).
+        """
+        if model is None or not iso_code:
+            return None
+        index = get_object_index(model)
+        idef_row = index.idef_by_name.get(iso_code)
+        if idef_row is None:
+            return None
+
+        errors = []
+        reference_rows = index.idef_reference_rows[idef_row]
+        for row in reference_rows:
+            errors.extend(self._check_instance(model.Objects[int(row)]))
+
+        # Geometry of the block itself (skipped by the file-wide pass)
+        object_rows = index.idef_object_rows[idef_row]
+        for row in object_rows:
+            obj = model.Objects[int(row)]
+            object_id = self._get_object_id(obj)
+            if obj.Geometry is None:
+                errors.append(ValidationErrorItem(
+                    category=GEOMETRY_CATEGORY_NAME,
+                    target=object_id,
+                    message=GEOMETRY_ERROR_NULL
+                ))
+            elif not obj.Geometry.IsValid:
+                errors.append(ValidationErrorItem(
+                    category=GEOMETRY_CATEGORY_NAME,
+                    target=object_id,
+                    message=GEOMETRY_ERROR_INVALID
+                ))
+
+        logger.info("geometry_validator.validate_block.completed",
+                    iso_code=iso_code,
+                    instances_checked=len(reference_rows),
+                    objects_checked=len(object_rows),
+                    errors_found=len(errors))
+        return errors
+
+    def _check_model(self, model) -> Tuple[List[ValidationErrorItem], list]:
+        """File-wide rules (1-2). Returns (errors, placed InstanceReference objects)."""
+        errors = []
+
         # A valid block .3dm must be composed EXCLUSIVELY of BLOCK INSTANCES
         # (InstanceReference) at the DOCUMENT level.
         #
@@ -173,54 +262,51 @@ class GeometryValidator:
                     "a valid block .3dm must contain at least one placed instance."
                 ),
             ))
-            logger.info("geometry_validator.validate_geometry.completed",
-                        instances_checked=0, errors_found=len(errors))
-            return errors
 
-        for obj in instances:
-            object_id = self._get_object_id(obj)
-            geom = obj.Geometry
+        return errors, instances
 
-            # Check 1: Invalid instance geometry
-            if not geom.IsValid:
-                errors.append(ValidationErrorItem(
-                    category=GEOMETRY_CATEGORY_NAME,
-                    target=object_id,
-                    message=GEOMETRY_ERROR_INVALID
-                ))
-                logger.debug("geometry_validator.validation_failed",
-                            object_id=object_id,
-                            failure_reason="invalid_geometry")
-
-            # Check 2: Degenerate bounding box of the placed instance
-            # rhino3dm GetBoundingBox() takes no arguments (unlike .NET Rhino API)
-            bbox = geom.GetBoundingBox()
-            if not bbox.IsValid:
-                errors.append(ValidationErrorItem(
-                    category=GEOMETRY_CATEGORY_NAME,
-                    target=object_id,
-                    message=GEOMETRY_ERROR_DEGENERATE_BBOX
-                ))
-                logger.debug("geometry_validator.validation_failed",
-                            object_id=object_id,
-                            failure_reason="degenerate_bbox")
-                continue  # cannot compute a meaningful volume without a bbox
-
-            # Check 3: Zero-volume placed instance
-            volume = (bbox.Max.X - bbox.Min.X) * (bbox.Max.Y - bbox.Min.Y) * (bbox.Max.Z - bbox.Min.Z)
-            if volume < MIN_VALID_VOLUME:
-                errors.append(ValidationErrorItem(
-                    category=GEOMETRY_CATEGORY_NAME,
-                    target=object_id,
-                    message=GEOMETRY_ERROR_ZERO_VOLUME.format(min_volume=MIN_VALID_VOLUME)
-                ))
-                logger.debug("geometry_validator.validation_failed",
-                            object_id=object_id,
-                            failure_reason="zero_volume",
-                            volume=volume)
+    def _check_instance(self, obj) -> List[ValidationErrorItem]:
+        """Checks 1-3 of one placed InstanceReference."""
+        errors = []
+        object_id = self._get_object_id(obj)
+        geom = obj.Geometry
 
-        logger.info("geometry_validator.validate_geometry.completed",
-                    instances_checked=len(instances),
-                    errors_found=len(errors))
+        # Check 1: Invalid instance geometry
+        if not geom.IsValid:
+            errors.append(ValidationErrorItem(
+                category=GEOMETRY_CATEGORY_NAME,
+                target=object_id,
+                message=GEOMETRY_ERROR_INVALID
+            ))
+            logger.debug("geometry_validator.validation_failed",
+                        object_id=object_id,
+                        failure_reason="invalid_geometry")
+
+        # Check 2: Degenerate bounding box of the placed instance
+        # rhino3dm GetBoundingBox() takes no arguments (unlike .NET Rhino API)
+        bbox = geom.GetBoundingBox()
+        if not bbox.IsValid:
+            errors.append(ValidationErrorItem(
+                category=GEOMETRY_CATEGORY_NAME,
+                target=object_id,
+                message=GEOMETRY_ERROR_DEGENERATE_BBOX
+            ))
+            logger.debug("geometry_validator.validation_failed",
+                        object_id=object_id,
+                        failure_reason="degenerate_bbox")
+            return errors  # cannot compute a meaningful volume without a bbox
+
+        # Check 3: Zero-volume placed instance
+        volume = (bbox.Max.X - bbox.Min.X) * (bbox.Max.Y - bbox.Min.Y) * (bbox.Max.Z - bbox.Min.Z)
+        if volume < MIN_VALID_VOLUME:
+            errors.append(ValidationErrorItem(
+                category=GEOMETRY_CATEGORY_NAME,
+                target=object_id,
+                message=GEOMETRY_ERROR_ZERO_VOLUME.format(min_volume=MIN_VALID_VOLUME)
+            ))
+            logger.debug("geometry_validator.validation_failed",
+                        object_id=object_id,
+                        failure_reason="zero_volume",
+                        volume=volume)
 
         return errors
@@ -0,0 +1,414 @@
+"""
+GLB Export Service
+
+Writes LOD meshes as binary glTF 2.0 (GLB) without going through trimesh's
+GLB exporter (which collapsed geometry in 4.0.5 / 4.11.3, see
+_serialize_lod_asset). The writer emits exactly what the Three.js viewer
+needs:
+
+- Local-origin positions: vertices are stored relative to a world origin
+  (bbox center of the block by default). The offset lives in the node
+  translation, so the loaded scene lands at the same absolute Rhino
+  coordinates as the legacy OBJ, and is also returned separately.
+- Positions as float32 or quantized int16 (KHR_mesh_quantization, uniform
+  node scale).
+- Indexed triangles (uint16 when possible, uint32 otherwise).
+- Optional vertex normals.
+- Optional Draco compression (KHR_draco_mesh_compression) through the
+  DracoPy encoder, loaded once per worker process instead of spawning a
+  gltf-pipeline subprocess per file.
+
+Coordinates stay in Rhino Z-up; the viewer applies the Z→Y rotation.
+"""
+
+import json
+import struct
+from dataclasses import dataclass, field
+
+import numpy as np
+import structlog
+import trimesh
+
+try:
+    import DracoPy
+except ImportError:
+    DracoPy = None  # In requirements.txt; without it LOD_GLB_COMPRESSION=draco writes plain GLB
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        LOD_GLB_QUANTIZE,
+        LOD_GLB_NORMALS,
+        LOD_GLB_COMPRESSIONS,
+        LOD_GLB_COMPRESSION,
+        DRACO_COMPRESSION_LEVEL,
+        DRACO_QUANTIZE_POSITION_BITS,
+    )
+except ImportError:
+    from constants import (
+        LOD_GLB_QUANTIZE,
+        LOD_GLB_NORMALS,
+        LOD_GLB_COMPRESSIONS,
+        LOD_GLB_COMPRESSION,
+        DRACO_COMPRESSION_LEVEL,
+        DRACO_QUANTIZE_POSITION_BITS,
+    )
+
+logger = structlog.get_logger()
+
+GLB_MAGIC = b"glTF"
+GLB_VERSION = 2
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+
+# glTF componentType / bufferView target codes
+_BYTE = 5120
+_SHORT = 5122
+_UNSIGNED_SHORT = 5123
+_UNSIGNED_INT = 5125
+_FLOAT = 5126
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+_INT16_RANGE = 32767
+
+
+@dataclass
+class GLBAsset:
+    """Encoded GLB plus the world offset its local positions are relative to."""
+    data: bytes
+    origin: list[float]
+    vertices: int
+    faces: int
+    quantized: bool
+    compression: str
+    extensions: list[str] = field(default_factory=list)
+
+    @property
+    def size_kb(self) -> int:
+        return len(self.data) // 1024
+
+
+def _pad4(data: bytes, pad: bytes = b"\x00") -> bytes:
+    return data + pad * (-len(data) % 4)
+
+
+class _BinaryBuffer:
+    """Accumulates 4-byte aligned bufferViews into the single GLB BIN chunk."""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.views: list[dict] = []
+        self.length = 0
+
+    def add(self, data: bytes, target: int | None = None, stride: int | None = None) -> int:
+        view = {"buffer": 0, "byteOffset": self.length, "byteLength": len(data)}
+        if target is not None:
+            view["target"] = target
+        if stride is not None:
+            view["byteStride"] = stride
+        padded = _pad4(data)
+        self.parts.append(padded)
+        self.length += len(padded)
+        self.views.append(view)
+        return len(self.views) - 1
+
+    def tobytes(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class GLBExportService:
+    """
+    Binary glTF writer for LOD meshes.
+
+    Usage:
+        asset = GLBExportService().encode(mesh, origin=block_center)
+        upload(asset.data)  # asset.origin -> world offset of the local positions
+    """
+
+    def __init__(
+        self,
+        quantize: bool = LOD_GLB_QUANTIZE,
+        normals: bool = LOD_GLB_NORMALS,
+        compression: str = LOD_GLB_COMPRESSION,
+    ):
+        if compression not in LOD_GLB_COMPRESSIONS:
+            raise ValueError(
+                f"Unknown GLB compression '{compression}' (expected one of {LOD_GLB_COMPRESSIONS})"
+            )
+        if compression == "draco" and DracoPy is None:
+            logger.warning("glb_export.draco_unavailable",
+                           message="DracoPy not installed, writing uncompressed GLB")
+            compression = "none"
+        self.quantize = quantize
+        self.normals = normals
+        self.compression = compression
+
+    def encode(self, mesh: trimesh.Trimesh, origin=None) -> GLBAsset:
+        """Encode `mesh` as GLB bytes.
+
+        Args:
+            mesh: Triangle mesh in absolute Rhino coordinates (mm, Z-up)
+            origin: World offset subtracted from the vertices (default: bbox
+                center). Pass the same origin for every LOD of a block so the
+                levels share one local frame.
+
+        Returns:
+            GLBAsset with the GLB bytes and the world origin
+        """
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        faces = np.asarray(mesh.faces, dtype=np.int64).reshape(-1, 3)
+        if origin is None:
+            origin = (vertices.min(axis=0) + vertices.max(axis=0)) / 2 if len(vertices) else np.zeros(3)
+        origin = np.asarray(origin, dtype=np.float64)
+        local = vertices - origin
+
+        buffer = _BinaryBuffer()
+        accessors: list[dict] = []
+        node: dict = {"mesh": 0, "translation": origin.tolist(), "extras": {"world_origin": origin.tolist()}}
+        extensions: list[str] = []
+
+        # Draco can't encode a mesh without triangles: plain GLB for empty levels
+        compression = self.compression if len(faces) else "none"
+        if compression == "draco":
+            primitive = self._encode_draco(local, faces, buffer, accessors)
+            extensions.append("KHR_draco_mesh_compression")
+            quantized = False
+        else:
+            primitive = {"attributes": {}, "mode": 4}
+            quantized = self.quantize and len(local) > 0
+            if quantized:
+                scale = self._add_quantized_positions(local, buffer, accessors)
+                node["scale"] = [scale, scale, scale]
+                extensions.append("KHR_mesh_quantization")
+            else:
+                self._add_float_positions(local, buffer, accessors)
+            primitive["attributes"]["POSITION"] = len(accessors) - 1
+
+            if self.normals and len(faces):
+                self._add_normals(mesh, quantized, buffer, accessors)
+                primitive["attributes"]["NORMAL"] = len(accessors) - 1
+
+            self._add_indices(faces, len(local), buffer, accessors)
+            primitive["indices"] = len(accessors) - 1
+
+        gltf = {
+            "asset": {"version": "2.0", "generator": "sf-pm-agent GLBExportService"},
+            "scene": 0,
+            "scenes": [{"nodes": [0]}],
+            "nodes": [node],
+            "meshes": [{"primitives": [primitive]}],
+            "accessors": accessors,
+            "bufferViews": buffer.views,
+            "buffers": [{"byteLength": buffer.length}],
+        }
+        if extensions:
+            gltf["extensionsUsed"] = extensions
+            gltf["extensionsRequired"] = extensions
+
+        data = self._pack(gltf, buffer.tobytes())
+        return GLBAsset(
+            data=data,
+            origin=origin.tolist(),
+            vertices=len(local),
+            faces=len(faces),
+            quantized=quantized,
+            compression=compression,
+            extensions=extensions,
+        )
+
+    @staticmethod
+    def decode(data: bytes) -> trimesh.Trimesh:
+        """Read a GLB written by encode() back as a mesh in absolute Rhino coordinates.
+
+        Undoes the node scale (quantized positions) and translation (origin);
+        normals are not read. Only the layout encode() emits is supported: one
+        node, one triangle primitive, float32 / int16 positions or Draco.
+
+        Raises:
+            ValueError: If `data` is not such a GLB
+        """
+        gltf, binary = GLBExportService._unpack(data)
+        node = gltf["nodes"][0]
+        primitive = gltf["meshes"][node.get("mesh", 0)]["primitives"][0]
+        views = gltf.get("bufferViews", [])
+
+        draco = primitive.get("extensions", {}).get("KHR_draco_mesh_compression")
+        if draco is not None:
+            if DracoPy is None:
+                raise ValueError("Draco-compressed GLB but DracoPy is not installed")
+            view = views[draco["bufferView"]]
+            start = view.get("byteOffset", 0)
+            decoded = DracoPy.decode(binary[start:start + view["byteLength"]])
+            local = np.asarray(decoded.points, dtype=np.float64).reshape(-1, 3)
+            faces = np.asarray(decoded.faces, dtype=np.int64).reshape(-1, 3)
+        else:
+            local = GLBExportService._read_accessor(
+                gltf, binary, primitive["attributes"]["POSITION"], components=3,
+            ).astype(np.float64)
+            faces = GLBExportService._read_accessor(
+                gltf, binary, primitive["indices"], components=1,
+            ).astype(np.int64).reshape(-1, 3)
+
+        scale = np.asarray(node.get("scale", [1.0, 1.0, 1.0]), dtype=np.float64)
+        translation = np.asarray(node.get("translation", [0.0, 0.0, 0.0]), dtype=np.float64)
+        return trimesh.Trimesh(vertices=local * scale + translation, faces=faces, process=False)
+
+    @staticmethod
+    def relocate(data: bytes, origin) -> bytes:
+        """The same GLB placed at another world origin (node translation only).
+
+        Local positions are untouched, so a translated copy of a block reuses
+        the encoded (quantized / Draco) geometry byte for byte.
+
+        Raises:
+            ValueError: If `data` is not a GLB written by encode()
+        """
+        gltf, binary = GLBExportService._unpack(data)
+        origin = np.asarray(origin, dtype=np.float64).tolist()
+        node = gltf["nodes"][0]
+        node["translation"] = origin
+        node.setdefault("extras", {})["world_origin"] = origin
+        return GLBExportService._pack(gltf, binary)
+
+    @staticmethod
+    def _unpack(data: bytes) -> tuple[dict, bytes]:
+        """(glTF JSON, BIN chunk) of a GLB."""
+        magic, version, length = struct.unpack_from("<4sII", data, 0)
+        if magic != GLB_MAGIC or version != GLB_VERSION:
+            raise ValueError("Not a glTF 2.0 binary")
+        json_length, json_type = struct.unpack_from("<II", data, 12)
+        if json_type != _CHUNK_JSON:
+            raise ValueError("GLB without a JSON chunk")
+        gltf = json.loads(data[20:20 + json_length])
+        binary = b""
+        offset = 20 + json_length
+        if offset + 8 <= length:
+            bin_length, bin_type = struct.unpack_from("<II", data, offset)
+            if bin_type == _CHUNK_BIN:
+                binary = data[offset + 8:offset + 8 + bin_length]
+        return gltf, binary
+
+    @staticmethod
+    def _read_accessor(gltf: dict, binary: bytes, index: int, components: int) -> np.ndarray:
+        """(count, components) array of accessor `index` (bufferView stride honoured)."""
+        accessor = gltf["accessors"][index]
+        view = gltf["bufferViews"][accessor["bufferView"]]
+        dtype = np.dtype({_BYTE: np.int8, _SHORT: np.int16, _UNSIGNED_SHORT: np.uint16,
+                          _UNSIGNED_INT: np.uint32, _FLOAT: np.float32}[accessor["componentType"]])
+        count = accessor["count"]
+        row_bytes = dtype.itemsize * components
+        stride = view.get("byteStride", row_bytes)
+        start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        rows = np.frombuffer(binary, dtype=np.uint8, count=stride * count, offset=start)
+        rows = rows.reshape(count, stride)[:, :row_bytes]
+        return np.ascontiguousarray(rows).view(dtype).reshape(count, components)
+
+    @staticmethod
+    def _add_float_positions(local, buffer, accessors) -> None:
+        positions = local.astype(np.float32)
+        view = buffer.add(positions.tobytes(), target=_ARRAY_BUFFER)
+        accessors.append({
+            "bufferView": view,
+            "componentType": _FLOAT,
+            "count": len(positions),
+            "type": "VEC3",
+            "min": positions.min(axis=0).tolist() if len(positions) else [0.0] * 3,
+            "max": positions.max(axis=0).tolist() if len(positions) else [0.0] * 3,
+        })
+
+    @staticmethod
+    def _add_quantized_positions(local, buffer, accessors) -> float:
+        """int16 positions (non-normalized) + uniform node scale.
+
+        Uniform scale keeps normals valid without re-scaling them; precision is
+        max_extent / 65534 (~0.03 mm on a 2 m block).
+        """
+        scale = float(np.abs(local).max()) / _INT16_RANGE or 1.0
+        quantized = np.rint(local / scale).astype(np.int16)
+        # Vertex attributes must be 4-byte aligned: pad VEC3 int16 to 8 bytes
+        padded = np.zeros((len(quantized), 4), dtype=np.int16)
+        padded[:, :3] = quantized
+        view = buffer.add(padded.tobytes(), target=_ARRAY_BUFFER, stride=8)
+        accessors.append({
+            "bufferView": view,
+            "componentType": _SHORT,
+            "count": len(quantized),
+            "type": "VEC3",
+            "min": quantized.min(axis=0).tolist(),
+            "max": quantized.max(axis=0).tolist(),
+        })
+        return scale
+
+    @staticmethod
+    def _add_normals(mesh, quantized, buffer, accessors) -> None:
+        normals = np.asarray(mesh.vertex_normals, dtype=np.float64)
+        if quantized:
+            packed = np.zeros((len(normals), 4), dtype=np.int8)
+            packed[:, :3] = np.rint(np.clip(normals, -1.0, 1.0) * 127)
+            view = buffer.add(packed.tobytes(), target=_ARRAY_BUFFER, stride=4)
+            accessors.append({"bufferView": view, "componentType": _BYTE, "normalized": True,
+                              "count": len(normals), "type": "VEC3"})
+        else:
+            view = buffer.add(normals.astype(np.float32).tobytes(), target=_ARRAY_BUFFER)
+            accessors.append({"bufferView": view, "componentType": _FLOAT,
+                              "count": len(normals), "type": "VEC3"})
+
+    @staticmethod
+    def _add_indices(faces, vertex_count, buffer, accessors) -> None:
+        wide = vertex_count > np.iinfo(np.uint16).max
+        indices = faces.astype(np.uint32 if wide else np.uint16).ravel()
+        view = buffer.add(indices.tobytes(), target=_ELEMENT_ARRAY_BUFFER)
+        accessors.append({
+            "bufferView": view,
+            "componentType": _UNSIGNED_INT if wide else _UNSIGNED_SHORT,
+            "count": len(indices),
+            "type": "SCALAR",
+        })
+
+    def _encode_draco(self, local, faces, buffer, accessors) -> dict:
+        """Draco-compressed primitive (KHR_draco_mesh_compression).
+
+        Accessors carry no bufferView: counts and bounds describe the decoded
+        mesh, so the encoded payload is decoded once to read them back.
+        """
+        encoded = DracoPy.encode(
+            local.astype(np.float32),
+            faces.astype(np.uint32),
+            quantization_bits=DRACO_QUANTIZE_POSITION_BITS,
+            compression_level=DRACO_COMPRESSION_LEVEL,
+        )
+        decoded = DracoPy.decode(encoded)
+        points = np.asarray(decoded.points, dtype=np.float32).reshape(-1, 3)
+        decoded_faces = np.asarray(decoded.faces).reshape(-1, 3)
+
+        view = buffer.add(bytes(encoded))
+        accessors.append({
+            "componentType": _FLOAT,
+            "count": len(points),
+            "type": "VEC3",
+            "min": points.min(axis=0).tolist(),
+            "max": points.max(axis=0).tolist(),
+        })
+        accessors.append({
+            "componentType": _UNSIGNED_INT if len(points) > np.iinfo(np.uint16).max else _UNSIGNED_SHORT,
+            "count": decoded_faces.size,
+            "type": "SCALAR",
+        })
+        return {
+            "attributes": {"POSITION": 0},
+            "indices": 1,
+            "mode": 4,
+            "extensions": {
+                "KHR_draco_mesh_compression": {"bufferView": view, "attributes": {"POSITION": 0}},
+            },
+        }
+
+    @staticmethod
+    def _pack(gltf: dict, binary: bytes) -> bytes:
+        json_chunk = _pad4(json.dumps(gltf, separators=(",", ":")).encode("utf-8"), b" ")
+        chunks = struct.pack("<II", len(json_chunk), _CHUNK_JSON) + json_chunk
+        if binary:
+            chunks += struct.pack("<II", len(binary), _CHUNK_BIN) + binary
+        header = struct.pack("<4sII", GLB_MAGIC, GLB_VERSION, 12 + len(chunks))
+        return header + chunks
@@ -0,0 +1,102 @@
+"""
+Instance Table
+
+Repeated pieces as GPU instances. A .3dm places the same geometry many
+times: one InstanceDefinition referenced by several InstanceReferences, or
+several InstanceDefinitions (blocks) with identical meshes at different
+positions. Baking each placement as standalone world-space geometry stores
+and uploads the same triangles over and over.
+
+Blocks whose geometry fingerprints match (same mesh up to a translation, see
+_geometry_fingerprint) form an InstanceGroup: ONE mesh in a local frame
+(centered on its bbox) plus a table of 4x4 placement matrices, one per
+InstanceReference of every member block. The viewer draws a group with a
+single instanced draw call.
+
+Matrices map local-frame vertices to Rhino world coordinates (mm, Z-up):
+    world = reference Xform @ Translation(block bbox center) @ local
+and are packed column-major (glTF / Three.js Matrix4.fromArray order).
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+IDENTITY = np.eye(4)
+
+_XFORM_FIELDS = [[f"M{row}{col}" for col in range(4)] for row in range(4)]
+
+
+def xform_matrix(xform) -> np.ndarray:
+    """rhino3dm Transform as a (4, 4) array; identity if it cannot be read."""
+    try:
+        values = [[getattr(xform, name) for name in row] for row in _XFORM_FIELDS]
+    except Exception:
+        return IDENTITY.copy()
+    if not all(isinstance(value, (int, float)) for row in values for value in row):
+        return IDENTITY.copy()
+    matrix = np.asarray(values, dtype=np.float64)
+    return matrix if np.isfinite(matrix).all() else IDENTITY.copy()
+
+
+def placement_matrices(reference_xforms: list, center) -> np.ndarray:
+    """(k, 4, 4) placements of a block centered at `center`, one per reference.
+
+    Without references the block is placed once, where its geometry is.
+    """
+    translation = IDENTITY.copy()
+    translation[:3, 3] = np.asarray(center, dtype=np.float64)
+    if not reference_xforms:
+        return translation[None]
+    return np.stack([xform_matrix(xform) @ translation for xform in reference_xforms])
+
+
+def pack_matrices(matrices: np.ndarray) -> list[list[float]]:
+    """Column-major 16-float rows (glTF / Three.js order), rounded to 1e-6."""
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    return np.round(matrices.transpose(0, 2, 1).reshape(-1, 16), 6).tolist()
+
+
+@dataclass
+class InstanceGroup:
+    """Blocks sharing one mesh, and the placements of each of them."""
+    fingerprint: str
+    matrices: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def block_ids(self) -> list[str]:
+        return list(self.matrices)
+
+    @property
+    def canonical_block(self) -> str:
+        """Block whose geometry (re-centered) becomes the shared mesh."""
+        return next(iter(self.matrices))
+
+    @property
+    def instance_count(self) -> int:
+        return sum(len(matrices) for matrices in self.matrices.values())
+
+
+class InstanceTable:
+    """
+    Groups the blocks of a file by geometry fingerprint.
+
+    Usage:
+        table = InstanceTable()
+        table.add(block_id, fingerprint, placement_matrices(xforms, center))
+        for group in table.groups(min_instances=2):
+            ...  # one shared mesh + group.matrices
+    """
+
+    def __init__(self):
+        self._groups: dict[str, InstanceGroup] = {}
+
+    def add(self, block_id: str, fingerprint: str | None, matrices: np.ndarray | None) -> None:
+        if not fingerprint or matrices is None or len(matrices) == 0:
+            return
+        group = self._groups.setdefault(fingerprint, InstanceGroup(fingerprint))
+        group.matrices[block_id] = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+    def groups(self, min_instances: int = 2) -> list[InstanceGroup]:
+        """Groups with at least `min_instances` placements (first-seen order)."""
+        return [group for group in self._groups.values() if group.instance_count >= min_instances]
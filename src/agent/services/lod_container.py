@@ -0,0 +1,106 @@
+"""
+LOD Container
+
+All LOD levels of an element in ONE storage object, addressable with HTTP
+range requests. The three per-level files make a client that refines from
+low to high open three objects; the container lets it fetch the coarse
+level with one range request and refine with further ranges of the same
+(CDN-cached) object.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    0   4s   magic b"SFLC"
+    4   u16  format version
+    6   u16  chunk count
+    8   u32  header length (preamble + JSON index + padding)
+    12  ...  JSON index: {"chunks": [{"level", "format", "offset", "length"}, ...]}
+    ... chunks in coarse-to-fine order (low, mid, high)
+
+Every chunk is a complete asset of its level (GLB, or OBJ for the per-layer
+high-poly), decodable without the others. The index is also returned to the
+caller so the elements API can advertise offsets without a header fetch.
+"""
+
+import json
+import struct
+
+CONTAINER_MAGIC = b"SFLC"
+CONTAINER_VERSION = 1
+CONTAINER_ALIGNMENT = 8
+CHUNK_ORDER = ("low", "mid", "high")
+
+_PREAMBLE = struct.Struct("<4sHHI")
+
+
+def _padding(length: int) -> int:
+    return -length % CONTAINER_ALIGNMENT
+
+
+def pack_lod_container(chunks: list[tuple[str, str, bytes]]) -> tuple[bytes, dict]:
+    """Container bytes and index for [(level, asset_format, data)].
+
+    Chunks are written in CHUNK_ORDER; levels outside it are ignored.
+
+    Returns:
+        (data, index) with index = {'version', 'size', 'header_length',
+        'levels': {level: {'offset', 'length', 'format'}}}
+    """
+    by_level = {level: (asset_format, data) for level, asset_format, data in chunks}
+    ordered = [(level, *by_level[level]) for level in CHUNK_ORDER if level in by_level]
+
+    # Offsets depend on the header length, which depends on the offsets'
+    # digits: lay out with a provisional header until the length settles.
+    header_length = 0
+    while True:
+        entries, offset = [], header_length
+        for level, asset_format, data in ordered:
+            entries.append({"level": level, "format": asset_format, "offset": offset, "length": len(data)})
+            offset += len(data) + _padding(len(data))
+        index_json = json.dumps({"chunks": entries}, separators=(",", ":")).encode("utf-8")
+        length = _PREAMBLE.size + len(index_json)
+        length += _padding(length)
+        if length == header_length:
+            break
+        header_length = length
+
+    parts = [_PREAMBLE.pack(CONTAINER_MAGIC, CONTAINER_VERSION, len(entries), header_length), index_json,
+             b" " * (header_length - _PREAMBLE.size - len(index_json))]
+    for _, _, data in ordered:
+        parts.append(data)
+        parts.append(b"\x00" * _padding(len(data)))
+    container = b"".join(parts)
+
+    return container, {
+        "version": CONTAINER_VERSION,
+        "size": len(container),
+        "header_length": header_length,
+        "levels": {e["level"]: {"offset": e["offset"], "length": e["length"], "format": e["format"]}
+                   for e in entries},
+    }
+
+
+def read_lod_container_index(data: bytes) -> list[dict]:
+    """Chunk entries of a container (only the header bytes are needed).
+
+    Raises:
+        ValueError: If `data` does not start with a container header
+    """
+    if len(data) < _PREAMBLE.size:
+        raise ValueError("Truncated LOD container header")
+    magic, version, count, header_length = _PREAMBLE.unpack_from(data, 0)
+    if magic != CONTAINER_MAGIC or version != CONTAINER_VERSION:
+        raise ValueError("Not an LOD container")
+    if len(data) < header_length:
+        raise ValueError("Truncated LOD container header")
+    chunks = json.loads(data[_PREAMBLE.size:header_length].decode("utf-8").rstrip())["chunks"]
+    if len(chunks) != count:
+        raise ValueError("Corrupt LOD container index")
+    return chunks
+
+
+def read_lod_chunk(data: bytes, level: str) -> tuple[str, bytes]:
+    """(asset_format, bytes) of one level of a container."""
+    for chunk in read_lod_container_index(data):
+        if chunk["level"] == level:
+            return chunk["format"], data[chunk["offset"]:chunk["offset"] + chunk["length"]]
+    raise KeyError(level)
@@ -0,0 +1,448 @@
+"""
+LOD Decimation Service
+
+Generates the decimated LOD levels (mid/low) of a block mesh and reports,
+per level, the achieved face count, latency and geometric deviation from the
+full-resolution mesh, so the decimation mode can be chosen per deployment.
+
+Modes (LOD_DECIMATION_MODE):
+- sequential: every level from the full-resolution mesh (legacy behaviour)
+- cascade:    low is derived from mid, mid from full
+- parallel:   independent levels run concurrently in a process pool
+
+Every level goes through decimate_to_target: quadric decimation, or the
+NumPy vertex-clustering simplifier (apply_vertex_clustering) when the input
+is too large for quadric, or quadric fails / makes no progress / overshoots.
+The level target is a hard face ceiling.
+
+Targets come from lod_face_targets: fixed LOD_DECIMATION_TARGETS, or
+(LOD_TARGET_MODE "adaptive") derived per block from its bbox size and the
+geometric error tolerated at each level (LOD_ERROR_TOLERANCE_MM).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import structlog
+import trimesh
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        LOD_DECIMATION_TARGETS,
+        LOD_TARGET_MODES,
+        LOD_TARGET_MODE,
+        LOD_ERROR_TOLERANCE_MM,
+        LOD_SSE_FACES_PER_ERROR,
+        LOD_ADAPTIVE_MIN_FACES,
+        LOD_ADAPTIVE_MAX_FACES,
+        LOD_DECIMATION_MODES,
+        LOD_DECIMATION_MODE,
+        LOD_DECIMATION_MAX_WORKERS,
+        VERTEX_CLUSTERING_MIN_FACES,
+        VERTEX_CLUSTERING_MAX_ITERATIONS,
+        LOD_DEVIATION_SAMPLES,
+    )
+    from src.agent.services.mesh_metrics import DEFAULT_UNIT_SCALE
+except ImportError:
+    from constants import (
+        LOD_DECIMATION_TARGETS,
+        LOD_TARGET_MODES,
+        LOD_TARGET_MODE,
+        LOD_ERROR_TOLERANCE_MM,
+        LOD_SSE_FACES_PER_ERROR,
+        LOD_ADAPTIVE_MIN_FACES,
+        LOD_ADAPTIVE_MAX_FACES,
+        LOD_DECIMATION_MODES,
+        LOD_DECIMATION_MODE,
+        LOD_DECIMATION_MAX_WORKERS,
+        VERTEX_CLUSTERING_MIN_FACES,
+        VERTEX_CLUSTERING_MAX_ITERATIONS,
+        LOD_DEVIATION_SAMPLES,
+    )
+    from services.mesh_metrics import DEFAULT_UNIT_SCALE
+
+logger = structlog.get_logger()
+
+# Shared process pool for "parallel" mode (created lazily, reused across blocks)
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+
+
+def apply_quadric_decimation(
+    mesh: trimesh.Trimesh,
+    target_faces: int,
+    block_id: str
+) -> tuple[trimesh.Trimesh, int]:
+    """Apply quadric decimation to reduce mesh complexity.
+
+    Uses trimesh's quadric decimation (fast-simplification backend) to reduce
+    face count while preserving overall shape. Skips decimation if mesh is
+    already below target. Falls back to original mesh if decimation fails.
+
+    Args:
+        mesh: Input trimesh mesh
+        target_faces: Target number of faces after decimation
+        block_id: UUID of the block (for logging)
+
+    Returns:
+        Tuple of (decimated_mesh, decimated_faces_count)
+    """
+    actual_faces = len(mesh.faces)
+
+    if actual_faces <= target_faces:
+        logger.info("decimation.skipped",
+                    block_id=block_id,
+                    faces=actual_faces,
+                    target=target_faces)
+        return mesh, actual_faces
+
+    logger.info("decimation.attempt",
+                block_id=block_id,
+                target=target_faces,
+                is_watertight=mesh.is_watertight,
+                is_volume=mesh.is_volume,
+                euler_number=mesh.euler_number)
+
+    try:
+        # face_count must be passed by keyword: the first positional argument
+        # of simplify_quadric_decimation is `percent` (0-1) in trimesh 4.x
+        decimated_mesh = mesh.simplify_quadric_decimation(face_count=target_faces)
+        decimated_faces_count = len(decimated_mesh.faces)
+
+        if decimated_faces_count == actual_faces:
+            logger.warning("decimation.failed",
+                           block_id=block_id,
+                           reason="Mesh geometry not suitable for quadric decimation")
+        else:
+            logger.info("decimation.success",
+                        block_id=block_id,
+                        original=actual_faces,
+                        decimated=decimated_faces_count)
+
+        return decimated_mesh, decimated_faces_count
+
+    except Exception as e:
+        logger.error("decimation.error", block_id=block_id, error=str(e))
+        # Fall back to non-decimated mesh
+        return mesh, actual_faces
+
+
+def lod_face_targets(
+    mesh: trimesh.Trimesh,
+    mode: str = LOD_TARGET_MODE,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> dict[str, int]:
+    """Mid/low face targets of a block: {'mid': int, 'low': int}.
+
+    "adaptive" sizes each level for a geometric error budget instead of a
+    fixed face count: a 5 cm ornament and a 2 m column drum get targets
+    proportional to their bbox diagonal, so the triangles of a whole scene
+    follow visible detail rather than piece count. The diagonal is converted
+    to mm with `unit_scale` (meters per model unit, see
+    mesh_metrics.model_unit_scale) before it is compared with the mm
+    tolerances, so a file modelled in meters gets the same targets.
+    """
+    if mode not in LOD_TARGET_MODES:
+        raise ValueError(f"Unknown LOD target mode '{mode}' (expected one of {LOD_TARGET_MODES})")
+    if mode == "fixed":
+        return {level: LOD_DECIMATION_TARGETS[level] for level in ('mid', 'low')}
+
+    bounds = np.asarray(mesh.bounds, dtype=np.float64)
+    diagonal = float(np.linalg.norm(bounds[1] - bounds[0])) * unit_scale * 1000
+    return {
+        level: int(np.clip(np.ceil(LOD_SSE_FACES_PER_ERROR * diagonal / tolerance),
+                           LOD_ADAPTIVE_MIN_FACES, LOD_ADAPTIVE_MAX_FACES[level]))
+        for level, tolerance in LOD_ERROR_TOLERANCE_MM.items()
+    }
+
+
+def _cluster_vertices(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    resolution: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge the vertices sharing a cell of a resolution^3 grid over the bbox.
+
+    Each cluster is replaced by the mean of its vertices; faces collapsed by
+    the merge (two corners in one cell) and duplicated faces are dropped.
+    """
+    lo = vertices.min(axis=0)
+    cell = max(float((vertices.max(axis=0) - lo).max()), 1e-9) / resolution
+    cells = np.minimum(((vertices - lo) / cell).astype(np.int64), resolution - 1)
+    keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+    _, cluster = np.unique(keys, return_inverse=True)
+    cluster = cluster.reshape(-1)
+
+    counts = np.bincount(cluster).astype(np.float64)
+    centroids = np.stack(
+        [np.bincount(cluster, weights=vertices[:, axis]) for axis in range(3)], axis=1
+    ) / counts[:, None]
+
+    clustered = cluster[faces]
+    keep = ((clustered[:, 0] != clustered[:, 1])
+            & (clustered[:, 1] != clustered[:, 2])
+            & (clustered[:, 0] != clustered[:, 2]))
+    clustered = clustered[keep]
+    # Same triangle reached from both sides of a thin wall, or from several
+    # source faces: keep the first occurrence (and its winding)
+    _, first = np.unique(np.sort(clustered, axis=1), axis=0, return_index=True)
+    clustered = clustered[np.sort(first)]
+
+    # Drop clusters no longer referenced by any face
+    used = np.unique(clustered)
+    remap = np.full(len(centroids), -1, dtype=np.int64)
+    remap[used] = np.arange(len(used))
+    return centroids[used], remap[clustered]
+
+
+def apply_vertex_clustering(
+    mesh: trimesh.Trimesh,
+    target_faces: int,
+    block_id: str
+) -> tuple[trimesh.Trimesh, int]:
+    """Grid vertex-clustering simplification with a hard face ceiling.
+
+    Searches the finest grid whose clustered mesh has at most `target_faces`
+    faces. Every step is one vectorised pass over the arrays, with at most
+    VERTEX_CLUSTERING_MAX_ITERATIONS steps, so the cost stays linear in the
+    input and never depends on the mesh being manifold (unlike quadric).
+
+    Args:
+        mesh: Input trimesh mesh
+        target_faces: Maximum number of faces of the result
+        block_id: UUID of the block (for logging)
+
+    Returns:
+        Tuple of (clustered_mesh, clustered_faces_count)
+    """
+    actual_faces = len(mesh.faces)
+    if actual_faces <= target_faces:
+        return mesh, actual_faces
+
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+
+    # Binary search on the grid resolution (faces grow ~ r^2 on surfaces, ~ r
+    # on slender pieces), keeping the finest grid under the ceiling
+    low, high = 1, min(max(2, 4 * target_faces), 2 ** 20)
+    best = (np.empty((0, 3)), np.empty((0, 3), dtype=np.int64))
+    for _ in range(VERTEX_CLUSTERING_MAX_ITERATIONS):
+        if low > high:
+            break
+        resolution = (low + high) // 2
+        out_vertices, out_faces = _cluster_vertices(vertices, faces, resolution)
+        if len(out_faces) <= target_faces:
+            if len(out_faces) >= len(best[1]):
+                best = (out_vertices, out_faces)
+            low = resolution + 1
+        else:
+            high = resolution - 1
+
+    clustered = trimesh.Trimesh(vertices=best[0], faces=best[1], process=False)
+    logger.info("decimation.vertex_clustering",
+                block_id=block_id,
+                original=actual_faces,
+                target=target_faces,
+                decimated=len(clustered.faces))
+    return clustered, len(clustered.faces)
+
+
+def decimate_to_target(
+    mesh: trimesh.Trimesh,
+    target_faces: int,
+    block_id: str
+) -> tuple[trimesh.Trimesh, int, str]:
+    """Reduce `mesh` to at most `target_faces` faces.
+
+    Quadric decimation first; vertex clustering when the input exceeds
+    VERTEX_CLUSTERING_MIN_FACES, or when quadric fails, makes no progress or
+    stays above the target (clustering then starts from the quadric result).
+
+    Returns:
+        Tuple of (decimated_mesh, faces_count, method) with method
+        'none' | 'quadric' | 'vertex_clustering' | 'quadric+vertex_clustering'
+    """
+    actual_faces = len(mesh.faces)
+    if actual_faces <= target_faces:
+        return mesh, actual_faces, 'none'
+
+    if actual_faces > VERTEX_CLUSTERING_MIN_FACES:
+        logger.info("decimation.quadric_skipped",
+                    block_id=block_id,
+                    faces=actual_faces,
+                    threshold=VERTEX_CLUSTERING_MIN_FACES)
+        decimated, faces = apply_vertex_clustering(mesh, target_faces, block_id)
+        return decimated, faces, 'vertex_clustering'
+
+    decimated, faces = apply_quadric_decimation(mesh, target_faces, block_id)
+    if faces <= target_faces:
+        return decimated, faces, 'quadric'
+
+    logger.warning("decimation.ceiling_exceeded",
+                   block_id=block_id,
+                   faces=faces,
+                   target=target_faces,
+                   fallback="vertex_clustering")
+    if faces < actual_faces:
+        decimated, faces = apply_vertex_clustering(decimated, target_faces, block_id)
+        return decimated, faces, 'quadric+vertex_clustering'
+    decimated, faces = apply_vertex_clustering(mesh, target_faces, block_id)
+    return decimated, faces, 'vertex_clustering'
+
+
+def surface_deviation(
+    reference: trimesh.Trimesh,
+    simplified: trimesh.Trimesh,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> float:
+    """Symmetric point-to-surface Hausdorff estimate between two meshes, in mm.
+
+    LOD_DEVIATION_SAMPLES points sampled on each surface are projected onto
+    the other one (trimesh.proximity.closest_point); the largest distance in
+    either direction is converted from model units with `unit_scale` (meters
+    per model unit, see mesh_metrics.model_unit_scale) and rounded to
+    1e-6 mm (closest_point float noise).
+    """
+    if len(reference.faces) == 0 or len(simplified.faces) == 0:
+        return 0.0
+    distance = max(_max_surface_distance(reference, simplified),
+                   _max_surface_distance(simplified, reference))
+    return round(distance * unit_scale * 1000, 6)
+
+
+def _max_surface_distance(source: trimesh.Trimesh, target: trimesh.Trimesh) -> float:
+    """Largest distance (model units) from points sampled on `source` to the surface of `target`."""
+    points, _ = trimesh.sample.sample_surface(source, LOD_DEVIATION_SAMPLES, seed=0)
+    _, distances, _ = trimesh.proximity.closest_point(target, points)
+    return float(distances.max())
+
+
+def _decimate_level_worker(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    target_faces: int,
+    block_id: str,
+) -> tuple[np.ndarray, np.ndarray, float, str]:
+    """Process-pool entry point: decimate raw arrays (top-level so it pickles).
+
+    Returns:
+        Tuple of (vertices, faces, elapsed_seconds, method)
+    """
+    start = time.perf_counter()
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    decimated, _, method = decimate_to_target(mesh, target_faces, block_id)
+    return (np.asarray(decimated.vertices), np.asarray(decimated.faces),
+            time.perf_counter() - start, method)
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool, (re)creating it for a new size."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != max_workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=max_workers)
+        _pool_workers = max_workers
+    return _pool
+
+
+class LODDecimationService:
+    """
+    Decimation engine for the mid/low LOD levels of a block.
+
+    Produces the decimated meshes plus a per-level quality/latency report:
+    {level: {target_faces, faces, source, method, latency_ms, deviation_mm, reduction_pct}}
+    """
+
+    def __init__(self, mode: str = LOD_DECIMATION_MODE, max_workers: int = LOD_DECIMATION_MAX_WORKERS):
+        if mode not in LOD_DECIMATION_MODES:
+            raise ValueError(f"Unknown LOD decimation mode '{mode}' (expected one of {LOD_DECIMATION_MODES})")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def generate(
+        self,
+        mesh: trimesh.Trimesh,
+        targets: dict[str, int],
+        block_id: str,
+        unit_scale: float = DEFAULT_UNIT_SCALE,
+    ) -> tuple[dict[str, trimesh.Trimesh], dict[str, dict]]:
+        """Decimate `mesh` to every level in `targets`.
+
+        Args:
+            mesh: Full-resolution merged mesh
+            targets: {level: target_faces}, e.g. {'mid': 2000, 'low': 500}
+            block_id: UUID of the block (for logging)
+            unit_scale: Meters per model unit of the mesh (deviation_mm)
+
+        Returns:
+            Tuple of ({level: decimated_mesh}, {level: report_entry})
+        """
+        # Finest level first: cascade feeds each level with the previous one
+        levels = sorted(targets, key=lambda level: targets[level], reverse=True)
+
+        if self.mode == "parallel" and len(levels) > 1:
+            try:
+                meshes, timings, sources, methods = self._run_parallel(mesh, targets, levels, block_id)
+            except (BrokenProcessPool, OSError, AssertionError) as e:
+                # e.g. pool cannot be started inside this worker process
+                logger.warning("lod_decimation.parallel_unavailable",
+                               block_id=block_id, error=str(e),
+                               message="Falling back to cascade mode")
+                meshes, timings, sources, methods = self._run_serial(mesh, targets, levels, block_id, cascade=True)
+        else:
+            meshes, timings, sources, methods = self._run_serial(
+                mesh, targets, levels, block_id, cascade=self.mode == "cascade"
+            )
+
+        original_faces = len(mesh.faces)
+        report = {}
+        for level in levels:
+            faces = len(meshes[level].faces)
+            report[level] = {
+                "target_faces": targets[level],
+                "faces": faces,
+                "source": sources[level],
+                "method": methods[level],
+                "latency_ms": round(timings[level] * 1000, 1),
+                "deviation_mm": round(surface_deviation(mesh, meshes[level], unit_scale), 3),
+                "reduction_pct": round((1 - faces / max(original_faces, 1)) * 100, 1),
+            }
+
+        logger.info("lod_decimation.report",
+                    block_id=block_id,
+                    mode=self.mode,
+                    original_faces=original_faces,
+                    report=report)
+        return meshes, report
+
+    def _run_serial(self, mesh, targets, levels, block_id, cascade: bool):
+        meshes, timings, sources, methods = {}, {}, {}, {}
+        source_mesh, source_name = mesh, "full"
+        for level in levels:
+            start = time.perf_counter()
+            decimated, _, methods[level] = decimate_to_target(source_mesh.copy(), targets[level], block_id)
+            timings[level] = time.perf_counter() - start
+            meshes[level], sources[level] = decimated, source_name
+            if cascade:
+                source_mesh, source_name = decimated, level
+        return meshes, timings, sources, methods
+
+    def _run_parallel(self, mesh, targets, levels, block_id):
+        pool = _get_pool(min(len(levels), self.max_workers))
+        vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+        futures = {
+            level: pool.submit(_decimate_level_worker, vertices, faces, targets[level], block_id)
+            for level in levels
+        }
+        meshes, timings, sources, methods = {}, {}, {}, {}
+        for level, future in futures.items():
+            out_vertices, out_faces, elapsed, methods[level] = future.result()
+            meshes[level] = trimesh.Trimesh(vertices=out_vertices, faces=out_faces, process=False)
+            timings[level] = elapsed
+            sources[level] = "full"
+        return meshes, timings, sources, methods
@@ -0,0 +1,257 @@
+"""
+LOD Rebuild Planner
+
+Selective rebuild of LOD assets after a configuration change. Every block's
+assets are stamped (blocks.lod_build) with the pipeline version and a hash
+of the settings each LOD level depends on. Most changes touch one level
+(e.g. the low-poly tolerance), so instead of resetting every block the
+planner compares the stored per-level hashes with the current ones and
+lists, per block, exactly the levels to rebuild:
+
+- high:      asset format + GLB encoding
+- mid / low: the above + that level's target settings, clustering
+             threshold and size budget (with its face floor); low also
+             depends on mid when levels are cascaded
+- container: any level that changes (chunks are repacked) + LOD_CONTAINER
+
+Stale blocks are grouped by source .3dm (one download + parse per file
+serves all its blocks), split into batches of at most
+LOD_REBUILD_BATCH_BLOCKS and ordered by estimated cost, longest first, so
+a worker pool finishes evenly. The cost model is linear in the original
+face count (LOD_REBUILD_COST_MODEL) and powers the dry-run estimate.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        LOD_CACHE_VERSION,
+        LOD_ASSET_FORMAT,
+        LOD_GLB_QUANTIZE,
+        LOD_GLB_NORMALS,
+        LOD_GLB_COMPRESSION,
+        LOD_DECIMATION_TARGETS,
+        LOD_TARGET_MODE,
+        LOD_ERROR_TOLERANCE_MM,
+        LOD_SSE_FACES_PER_ERROR,
+        LOD_ADAPTIVE_MIN_FACES,
+        LOD_ADAPTIVE_MAX_FACES,
+        LOD_DECIMATION_MODE,
+        VERTEX_CLUSTERING_MIN_FACES,
+        MAX_GLB_SIZE_KB,
+        LOD_CONTAINER,
+        LOD_REBUILD_BATCH_BLOCKS,
+        LOD_REBUILD_COST_MODEL,
+        LOD_REBUILD_DEFAULT_FACES,
+    )
+except ImportError:
+    from constants import (
+        LOD_CACHE_VERSION,
+        LOD_ASSET_FORMAT,
+        LOD_GLB_QUANTIZE,
+        LOD_GLB_NORMALS,
+        LOD_GLB_COMPRESSION,
+        LOD_DECIMATION_TARGETS,
+        LOD_TARGET_MODE,
+        LOD_ERROR_TOLERANCE_MM,
+        LOD_SSE_FACES_PER_ERROR,
+        LOD_ADAPTIVE_MIN_FACES,
+        LOD_ADAPTIVE_MAX_FACES,
+        LOD_DECIMATION_MODE,
+        VERTEX_CLUSTERING_MIN_FACES,
+        MAX_GLB_SIZE_KB,
+        LOD_CONTAINER,
+        LOD_REBUILD_BATCH_BLOCKS,
+        LOD_REBUILD_COST_MODEL,
+        LOD_REBUILD_DEFAULT_FACES,
+    )
+
+MESH_LEVELS = ("high", "mid", "low")
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _decimation_params(level: str) -> dict:
+    if LOD_TARGET_MODE == "fixed":
+        target = {'faces': LOD_DECIMATION_TARGETS[level]}
+    else:
+        target = {
+            'tolerance_mm': LOD_ERROR_TOLERANCE_MM[level],
+            'faces_per_error': LOD_SSE_FACES_PER_ERROR,
+            'max_faces': LOD_ADAPTIVE_MAX_FACES[level],
+        }
+    return {
+        'target_mode': LOD_TARGET_MODE,
+        'target': target,
+        'clustering_min_faces': VERTEX_CLUSTERING_MIN_FACES,
+        # Size budget: re-clustered down to min_faces, then the bbox proxy
+        'max_kb': MAX_GLB_SIZE_KB[level],
+        'min_faces': LOD_ADAPTIVE_MIN_FACES,
+    }
+
+
+def lod_level_params() -> dict[str, dict]:
+    """Current settings each LOD output depends on, per level.
+
+    The single source of both the rebuild stamps (lod_level_hashes) and the
+    LOD cache keys (geometry_processing._lod_pipeline_signature).
+    """
+    encoding = {
+        'version': LOD_CACHE_VERSION,
+        'format': LOD_ASSET_FORMAT,
+        'glb': [LOD_GLB_QUANTIZE, LOD_GLB_NORMALS, LOD_GLB_COMPRESSION],
+    }
+    mid = {**encoding, 'decimation': _decimation_params('mid')}
+    low = {**encoding, 'decimation': _decimation_params('low'), 'mode': LOD_DECIMATION_MODE}
+    if LOD_DECIMATION_MODE == "cascade":
+        low['source'] = mid['decimation']  # low is decimated from mid
+    params = {'high': encoding, 'mid': mid, 'low': low}
+    if LOD_CONTAINER:
+        params['container'] = {'levels': {level: _digest(params[level]) for level in MESH_LEVELS}}
+    return params
+
+
+def lod_level_hashes() -> dict[str, str]:
+    """{level: params hash} of the current configuration (stored in blocks.lod_build)."""
+    return {level: _digest(params) for level, params in lod_level_params().items()}
+
+
+def lod_params_hash(level_hashes: dict[str, str]) -> str:
+    """One hash over every level (blocks.lod_params_hash, indexed)."""
+    return _digest(level_hashes)
+
+
+def stale_levels(stored: dict | None, current: dict[str, str]) -> list[str]:
+    """Levels of a block whose stored hash differs from `current`.
+
+    Args:
+        stored: blocks.lod_build of the block (None: never stamped, all stale)
+        current: lod_level_hashes()
+    """
+    stored_levels = (stored or {}).get('levels') or {}
+    return [level for level in current if stored_levels.get(level) != current[level]]
+
+
+def estimate_rebuild_seconds(levels: list[str], original_faces: int | None) -> float:
+    """Worker seconds to rebuild `levels` of one block, excluding the per-file parse."""
+    faces = original_faces or LOD_REBUILD_DEFAULT_FACES
+    seconds = LOD_REBUILD_COST_MODEL['block']
+    for level in levels:
+        base, per_kface = LOD_REBUILD_COST_MODEL[level]
+        seconds += base + per_kface * faces / 1000
+    return seconds
+
+
+@dataclass
+class BlockRebuild:
+    """Stale levels of one block."""
+    block_id: str
+    iso_code: str
+    file_key: str
+    levels: list[str]
+    estimated_seconds: float
+
+
+@dataclass
+class RebuildBatch:
+    """Blocks of one .3dm rebuilt by one rebuild_lod_levels task."""
+    file_key: str
+    blocks: list[BlockRebuild]
+
+    @property
+    def estimated_seconds(self) -> float:
+        return LOD_REBUILD_COST_MODEL['file'] + sum(b.estimated_seconds for b in self.blocks)
+
+    def task_args(self) -> list:
+        return [self.file_key, {b.block_id: b.levels for b in self.blocks}]
+
+
+@dataclass
+class RebuildPlan:
+    """Output of plan_lod_rebuild."""
+    level_hashes: dict[str, str]
+    batches: list[RebuildBatch] = field(default_factory=list)
+    up_to_date: int = 0
+
+    @property
+    def blocks(self) -> list[BlockRebuild]:
+        return [block for batch in self.batches for block in batch.blocks]
+
+    @property
+    def level_counts(self) -> dict[str, int]:
+        counts = {level: 0 for level in self.level_hashes}
+        for block in self.blocks:
+            for level in block.levels:
+                counts[level] += 1
+        return counts
+
+    @property
+    def estimated_seconds(self) -> float:
+        return sum(batch.estimated_seconds for batch in self.batches)
+
+    def summary(self) -> dict:
+        return {
+            'stale_blocks': len(self.blocks),
+            'up_to_date_blocks': self.up_to_date,
+            'levels': self.level_counts,
+            'batches': len(self.batches),
+            'files': len({batch.file_key for batch in self.batches}),
+            'estimated_worker_seconds': round(self.estimated_seconds, 1),
+        }
+
+
+def plan_lod_rebuild(
+    rows: list[dict],
+    level_hashes: dict[str, str] | None = None,
+    batch_blocks: int = LOD_REBUILD_BATCH_BLOCKS,
+) -> RebuildPlan:
+    """Which blocks and levels are stale for the current configuration.
+
+    Args:
+        rows: Blocks with LOD assets: {'id', 'iso_code', 'url_original',
+            'lod_build', 'high_poly_url', 'mid_poly_url', 'low_poly_url'}
+        level_hashes: Target configuration (default: lod_level_hashes())
+        batch_blocks: Max blocks per rebuild task
+
+    Returns:
+        RebuildPlan with batches longest first. A level without a stored
+        URL is always stale.
+    """
+    level_hashes = level_hashes or lod_level_hashes()
+    plan = RebuildPlan(level_hashes=level_hashes)
+    by_file: dict[str, list[BlockRebuild]] = {}
+
+    for row in rows:
+        lod_build = row.get('lod_build')
+        if isinstance(lod_build, str):
+            lod_build = json.loads(lod_build)
+        levels = stale_levels(lod_build, level_hashes)
+        for level in MESH_LEVELS:
+            if not row.get(f'{level}_poly_url') and level not in levels:
+                levels.append(level)
+        if 'container' in level_hashes and levels and 'container' not in levels:
+            levels.append('container')  # chunks changed: repack
+        if not levels:
+            plan.up_to_date += 1
+            continue
+        levels = [level for level in level_hashes if level in levels]
+        original_faces = ((lod_build or {}).get('face_counts') or {}).get('original')
+        by_file.setdefault(row['url_original'], []).append(BlockRebuild(
+            block_id=str(row['id']),
+            iso_code=row['iso_code'],
+            file_key=row['url_original'],
+            levels=levels,
+            estimated_seconds=estimate_rebuild_seconds(levels, original_faces),
+        ))
+
+    for file_key, blocks in by_file.items():
+        blocks.sort(key=lambda b: b.estimated_seconds, reverse=True)
+        for start in range(0, len(blocks), max(batch_blocks, 1)):
+            plan.batches.append(RebuildBatch(file_key=file_key, blocks=blocks[start:start + batch_blocks]))
+    plan.batches.sort(key=lambda batch: batch.estimated_seconds, reverse=True)
+    return plan
@@ -0,0 +1,299 @@
+"""
+Model Cache Service
+
+Worker-local two-tier cache for .3dm files. Every block of an uploaded file
+used to trigger its own download of the same object (validate_file,
+generate_low_poly_glb) and its own File3dm.Read, sometimes twice in a row
+(RhinoParserService.parse_file + build_initial_geometry_metadata).
+
+- Disk tier: raw files under MODEL_CACHE_DIR, named after storage key +
+  size + ETag (a re-upload under the same key is a different entry). LRU by
+  file atime within MODEL_CACHE_DISK_BUDGET_MB; entries are written with an
+  atomic rename, so the prefork processes of a host share them safely.
+- Parsed tier: File3dm models of this process, keyed by the file identity
+  (device, inode, size, mtime), so a hard link of a cache entry hits too.
+  LRU within MODEL_CACHE_MAX_MODELS. Release hooks run whenever a model is
+  dropped; trim() drops every model once the process RSS is above
+  MODEL_CACHE_MAX_RSS_MB (called after each Celery task).
+
+Hits, misses, evictions and bytes saved are counted per process and in the
+Redis hash MODEL_CACHE_STATS_KEY (exported by the backend /metrics).
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import structlog
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        RAW_UPLOADS_BUCKET,
+        MODEL_CACHE_DIR,
+        MODEL_CACHE_DISK_BUDGET_MB,
+        MODEL_CACHE_MAX_MODELS,
+        MODEL_CACHE_MAX_RSS_MB,
+        MODEL_CACHE_STATS_KEY,
+    )
+    from src.agent.services.streaming_download_service import StreamingDownloadService
+except ImportError:
+    from constants import (
+        RAW_UPLOADS_BUCKET,
+        MODEL_CACHE_DIR,
+        MODEL_CACHE_DISK_BUDGET_MB,
+        MODEL_CACHE_MAX_MODELS,
+        MODEL_CACHE_MAX_RSS_MB,
+        MODEL_CACHE_STATS_KEY,
+    )
+    from services.streaming_download_service import StreamingDownloadService
+
+try:
+    from infra.redis_client import get_redis_client
+except ModuleNotFoundError:
+    from src.agent.infra.redis_client import get_redis_client
+
+logger = structlog.get_logger()
+
+_ENTRY_SUFFIX = ".3dm"
+_PARTIAL_SUFFIX = ".part"
+
+
+@dataclass
+class CachedFile:
+    """A raw .3dm in the disk tier. Owned by the cache: do not delete `path`."""
+    path: str
+    size: int
+    disk_hit: bool
+
+
+class ModelCacheService:
+    """
+    Two-tier (.3dm on disk / parsed File3dm in memory) worker cache.
+
+    Usage:
+        cache = get_model_cache()
+        cached = cache.fetch(supabase, "uploads/abc/model.3dm")
+        model = cache.read_model(cached.path, rhino3dm.File3dm.Read)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = MODEL_CACHE_DIR,
+        disk_budget_bytes: int = MODEL_CACHE_DISK_BUDGET_MB * 1024 * 1024,
+        max_models: int = MODEL_CACHE_MAX_MODELS,
+        max_rss_bytes: int = MODEL_CACHE_MAX_RSS_MB * 1024 * 1024,
+        downloader: StreamingDownloadService | None = None,
+    ):
+        self.cache_dir = cache_dir
+        self.disk_budget_bytes = disk_budget_bytes
+        self.max_models = max_models
+        self.max_rss_bytes = max_rss_bytes
+        self.downloader = downloader or StreamingDownloadService()
+        self.stats: Counter = Counter()
+        self._models: OrderedDict = OrderedDict()
+        self._release_hooks: list[Callable] = []
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # ── Disk tier ────────────────────────────────────────────────────────────
+
+    def fetch(self, supabase, storage_key: str, bucket: str = RAW_UPLOADS_BUCKET) -> CachedFile:
+        """Raw .3dm of a storage object, downloaded only on a miss."""
+        url = self.downloader.signed_url(supabase, bucket, storage_key)
+        return self.fetch_url(url, cache_id=f"{bucket}/{storage_key}")
+
+    def fetch_url(self, url: str, cache_id: str | None = None) -> CachedFile:
+        """Raw .3dm at `url`; `cache_id` names the object (default: the URL without query)."""
+        cache_id = cache_id or url.split("?")[0]
+        remote = self.downloader.stat(url)
+        if remote.size is None or remote.etag is None:
+            # Unversioned object (no size/ETag): never reused, still evicted by the LRU
+            name = uuid.uuid4().hex
+        else:
+            name = hashlib.sha256(f"{cache_id}\0{remote.size}\0{remote.etag}".encode("utf-8")).hexdigest()[:32]
+        path = os.path.join(self.cache_dir, name + _ENTRY_SUFFIX)
+
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = None
+        if size is not None and size == remote.size:
+            # LRU recency in atime: mtime is part of the parsed tier key
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+            self._record("disk_hit")
+            self._record("disk_bytes_saved", size)
+            logger.info("model_cache.disk_hit", cache_id=cache_id, size_bytes=size)
+            return CachedFile(path=path, size=size, disk_hit=True)
+
+        partial = f"{path}.{os.getpid()}.{threading.get_ident()}{_PARTIAL_SUFFIX}"
+        try:
+            size = self.downloader.download(url, partial, remote=remote)
+            os.replace(partial, path)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        self._record("disk_miss")
+        self._record("disk_bytes_downloaded", size)
+        logger.info("model_cache.disk_miss", cache_id=cache_id, size_bytes=size)
+        self._evict_disk(keep=path)
+        return CachedFile(path=path, size=size, disk_hit=False)
+
+    def materialize(self, cached: CachedFile, local_path: str) -> None:
+        """Expose a cache entry at `local_path` (hard link, copy across devices).
+
+        The caller owns `local_path` and may delete it; the entry stays cached.
+        """
+        if os.path.exists(local_path):
+            os.remove(local_path)
+        try:
+            os.link(cached.path, local_path)
+        except OSError:
+            shutil.copyfile(cached.path, local_path)
+
+    def owns(self, path: str) -> bool:
+        """Whether `path` is a disk tier entry (must not be deleted by callers)."""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.cache_dir)
+
+    def _evict_disk(self, keep: str) -> None:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue  # in-flight downloads of other processes
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_budget_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)  # open readers keep their inode until they close it
+            except OSError:
+                continue
+            total -= size
+            self._record("disk_evictions")
+            logger.info("model_cache.disk_evicted", path=path, size_bytes=size)
+
+    # ── Parsed tier ──────────────────────────────────────────────────────────
+
+    def read_model(self, path: str, loader: Callable):
+        """`loader(path)` (e.g. rhino3dm.File3dm.Read), memoized per file identity.
+
+        Files that cannot be stat'ed are read without caching; a failed read
+        (None) is not cached.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return loader(path)
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry[0] is loader:
+                self._models.move_to_end(key)
+                self._record("parsed_hit")
+                return entry[1]
+
+        model = loader(path)
+        self._record("parsed_miss")
+        if model is None or self.max_models <= 0:
+            return model
+
+        released = []
+        with self._lock:
+            self._models[key] = (loader, model)
+            while len(self._models) > self.max_models:
+                released.append(self._models.popitem(last=False))
+        for old_key, (_, old_model) in released:
+            self._release(old_key, old_model, reason="lru")
+        return model
+
+    def add_release_hook(self, hook: Callable) -> None:
+        """Register `hook(key, model)`, called whenever a parsed model is dropped."""
+        self._release_hooks.append(hook)
+
+    def release_models(self, reason: str = "manual") -> int:
+        """Drop every parsed model of this process. Returns how many were dropped."""
+        with self._lock:
+            released = list(self._models.items())
+            self._models.clear()
+        for key, (_, model) in released:
+            self._release(key, model, reason=reason)
+        return len(released)
+
+    def trim(self) -> int:
+        """Release parsed models if the process RSS is above the budget."""
+        if self.max_rss_bytes <= 0 or not self._models:
+            return 0
+        rss = _current_rss_bytes()
+        if rss <= self.max_rss_bytes:
+            return 0
+        logger.info("model_cache.trim", rss_mb=rss // (1024 * 1024),
+                    max_rss_mb=self.max_rss_bytes // (1024 * 1024))
+        return self.release_models(reason="memory")
+
+    def _release(self, key, model, reason: str) -> None:
+        self._record("parsed_released")
+        for hook in self._release_hooks:
+            try:
+                hook(key, model)
+            except Exception as e:
+                logger.warning("model_cache.release_hook_failed", error=str(e))
+        logger.info("model_cache.model_released", reason=reason)
+
+    # ── Metrics ──────────────────────────────────────────────────────────────
+
+    def _record(self, event: str, amount: int = 1) -> None:
+        self.stats[event] += amount
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            redis_client.hincrby(MODEL_CACHE_STATS_KEY, event, amount)
+        except Exception as e:
+            logger.warning("model_cache.stats_failed", counter=event, error=str(e))
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (Linux /proc), 0 when unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+_model_cache: ModelCacheService | None = None
+
+
+def get_model_cache() -> ModelCacheService:
+    """Process-wide ModelCacheService (created lazily, i.e. after the worker fork)."""
+    global _model_cache
+    if _model_cache is None:
+        _model_cache = ModelCacheService()
+    return _model_cache
+
+
+def get_model_cache_stats() -> dict[str, int]:
+    """Model cache counters: fleet-wide from Redis, else this process's."""
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            return {event: int(count) for event, count in redis_client.hgetall(MODEL_CACHE_STATS_KEY).items()}
+        except Exception as e:
+            logger.warning("model_cache.stats_failed", error=str(e))
+    return dict(get_model_cache().stats)
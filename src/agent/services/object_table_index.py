@@ -0,0 +1,251 @@
+"""
+Object Table Index
+
+Columnar view of the object table of a parsed File3dm. Hot paths used to
+rescan `model.Objects` with Python attribute access once per block (user
+strings, mesh extraction), once per layer (RhinoParserService layer counts)
+or once per InstanceDefinition. The index walks the table ONCE per model
+and keeps NumPy columns plus idef lookups, so those callers become lookups:
+
+- object_type, layer_index, is_idef_object, parent_idef (row of the
+  referenced InstanceDefinition, -1 if none) per object row
+- object ids (lowercase) → row
+- idef name / id → idef row, idef row → its object rows (GetObjectIds) and
+  → the InstanceReference rows that place it
+- per-object bbox and vertex/face counts, computed on first use
+
+Rows are positions in `model.Objects` (model.Objects[row]). Indexes are
+memoized per model (get_object_index) and rebuilt when the object count
+changes.
+"""
+
+import threading
+import weakref
+
+import numpy as np
+import structlog
+
+try:
+    import rhino3dm
+except ImportError:
+    rhino3dm = None
+
+logger = structlog.get_logger()
+
+
+def _object_type_int(object_type) -> int:
+    """rhino3dm ObjectType (enum, or plain int in unit-test mocks) as an int; 0 if unknown."""
+    if isinstance(object_type, int):
+        return object_type
+    if type(object_type).__module__.startswith('rhino3dm'):
+        return int(object_type)
+    return 0
+
+
+def object_type_code(name: str) -> int:
+    """rhino3dm.ObjectType.<name> as an int, resolved at call time (-1 if unknown)."""
+    object_type = getattr(rhino3dm.ObjectType, name, None)
+    if isinstance(object_type, int) or type(object_type).__module__.startswith('rhino3dm'):
+        return int(object_type)
+    return -1
+
+
+class ObjectTableIndex:
+    """
+    One linear pass over a File3dm object table.
+
+    Usage:
+        index = get_object_index(model)
+        rows = index.reference_rows(index.idef_by_name["GLPER.B-PAE0720.0102"])
+        obj = model.Objects[int(rows[0])]
+    """
+
+    def __init__(self, model):
+        objects = _as_list(getattr(model, 'Objects', None))
+        idefs = _as_list(getattr(model, 'InstanceDefinitions', None))
+
+        count = len(objects)
+        self.object_count = count
+        self.object_ids: list[str] = []
+        self.object_type = np.zeros(count, dtype=np.int64)
+        self.layer_index = np.full(count, -1, dtype=np.int32)
+        self.is_idef_object = np.zeros(count, dtype=bool)
+        self.parent_idef = np.full(count, -1, dtype=np.int32)
+
+        self.idef_names: list[str] = []
+        self.idef_ids: list[str] = []
+        self.idef_by_name: dict[str, int] = {}
+        self.idef_by_id: dict[str, int] = {}
+        for idef_row, idef in enumerate(idefs):
+            name, idef_id = idef.Name, str(idef.Id).lower()
+            self.idef_names.append(name)
+            self.idef_ids.append(idef_id)
+            self.idef_by_name.setdefault(name, idef_row)
+            self.idef_by_id.setdefault(idef_id, idef_row)
+
+        for row, obj in enumerate(objects):
+            object_id = ''
+            try:
+                attributes, geometry = obj.Attributes, obj.Geometry
+                object_id = str(attributes.Id).lower()
+                self.object_type[row] = _object_type_int(getattr(geometry, 'ObjectType', None))
+                layer = getattr(attributes, 'LayerIndex', -1)
+                self.layer_index[row] = layer if isinstance(layer, int) else -1
+                self.is_idef_object[row] = getattr(attributes, 'IsInstanceDefinitionObject', False) is True
+                parent_id = getattr(geometry, 'ParentIdefId', None)
+                if parent_id is not None:
+                    self.parent_idef[row] = self.idef_by_id.get(str(parent_id).lower(), -1)
+            except Exception as e:
+                logger.warning("object_table_index.object_error", row=row, error=str(e))
+            self.object_ids.append(object_id)
+
+        self.row_by_id: dict[str, int] = {}
+        for row, object_id in enumerate(self.object_ids):
+            if object_id:
+                self.row_by_id.setdefault(object_id, row)
+
+        # idef row → its object rows, in table order (GetObjectIds order is arbitrary)
+        self.idef_object_rows: list[np.ndarray] = []
+        for idef in idefs:
+            rows = [self.row_by_id.get(str(oid).lower(), -1) for oid in _as_list(idef.GetObjectIds())]
+            rows = np.unique(np.asarray(rows, dtype=np.int64))
+            self.idef_object_rows.append(rows[rows >= 0])
+
+        # idef row → InstanceReference rows (grouped with one stable sort)
+        is_reference = self.object_type == object_type_code('InstanceReference')
+        referenced = np.flatnonzero(is_reference & (self.parent_idef >= 0))
+        order = referenced[np.argsort(self.parent_idef[referenced], kind='stable')]
+        counts = np.bincount(self.parent_idef[referenced], minlength=len(idefs))
+        self.idef_reference_rows: list[np.ndarray] = np.split(order, np.cumsum(counts)[:-1]) if len(idefs) else []
+
+        self._model = _model_ref(model)
+        self._bbox: np.ndarray | None = None
+        self._bbox_valid: np.ndarray | None = None
+        self._vertex_count: np.ndarray | None = None
+        self._face_count: np.ndarray | None = None
+        self._lock = threading.Lock()
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def rows_of_type(self, name: str) -> np.ndarray:
+        """Rows whose geometry is rhino3dm.ObjectType.<name>."""
+        return np.flatnonzero(self.object_type == object_type_code(name))
+
+    def reference_rows(self, idef_row: int) -> np.ndarray:
+        """InstanceReference rows placing InstanceDefinition `idef_row` (table order)."""
+        return self.idef_reference_rows[idef_row]
+
+    def layer_object_counts(self, layer_count: int) -> np.ndarray:
+        """Number of objects per layer index 0..layer_count-1."""
+        layers = self.layer_index[(self.layer_index >= 0) & (self.layer_index < layer_count)]
+        return np.bincount(layers, minlength=layer_count)
+
+    # ── Geometry stats (lazy: not every caller needs them) ───────────────────
+
+    @property
+    def bbox(self) -> np.ndarray:
+        """(N, 2, 3) per-object [min, max]; rows with bbox_valid False are NaN."""
+        self._ensure_geometry_stats()
+        return self._bbox
+
+    @property
+    def bbox_valid(self) -> np.ndarray:
+        self._ensure_geometry_stats()
+        return self._bbox_valid
+
+    @property
+    def vertex_count(self) -> np.ndarray:
+        """len(Geometry.Vertices) per object (0 if the geometry has none)."""
+        self._ensure_geometry_stats()
+        return self._vertex_count
+
+    @property
+    def face_count(self) -> np.ndarray:
+        """len(Geometry.Faces) per object (0 if the geometry has none)."""
+        self._ensure_geometry_stats()
+        return self._face_count
+
+    def bounds(self, rows: np.ndarray | None = None) -> np.ndarray | None:
+        """Union [min, max] (2, 3) of the valid bboxes of `rows` (default: all), None if none."""
+        bbox = self.bbox
+        valid = self.bbox_valid
+        if rows is not None:
+            bbox, valid = bbox[rows], valid[rows]
+        if not valid.any():
+            return None
+        bbox = bbox[valid]
+        return np.stack([bbox[:, 0].min(axis=0), bbox[:, 1].max(axis=0)])
+
+    def _ensure_geometry_stats(self) -> None:
+        if self._bbox is not None:
+            return
+        with self._lock:
+            if self._bbox is not None:
+                return
+            model = self._model()
+            objects = _as_list(getattr(model, 'Objects', None))
+            count = self.object_count
+            bbox = np.full((count, 2, 3), np.nan, dtype=np.float64)
+            valid = np.zeros(count, dtype=bool)
+            vertex_count = np.zeros(count, dtype=np.int64)
+            face_count = np.zeros(count, dtype=np.int64)
+            for row, obj in enumerate(objects[:count]):
+                geometry = obj.Geometry
+                if not geometry:
+                    continue
+                # rhino3dm GetBoundingBox() takes no arguments (unlike .NET Rhino API)
+                obj_bbox = geometry.GetBoundingBox()
+                if obj_bbox.IsValid:
+                    bbox[row] = ((obj_bbox.Min.X, obj_bbox.Min.Y, obj_bbox.Min.Z),
+                                 (obj_bbox.Max.X, obj_bbox.Max.Y, obj_bbox.Max.Z))
+                    valid[row] = True
+                if hasattr(geometry, 'Vertices'):
+                    vertex_count[row] = len(geometry.Vertices)
+                if hasattr(geometry, 'Faces'):
+                    face_count[row] = len(geometry.Faces)
+            self._vertex_count, self._face_count = vertex_count, face_count
+            self._bbox_valid = valid
+            self._bbox = bbox
+
+
+def _as_list(table) -> list:
+    """A rhino3dm table as a list ([] if missing or not iterable, e.g. bare Mocks)."""
+    try:
+        return list(table) if table is not None else []
+    except TypeError:
+        return []
+
+
+def _model_ref(model):
+    """Weak reference to the model (the memo must not keep models alive)."""
+    try:
+        return weakref.ref(model)
+    except TypeError:
+        return lambda: model
+
+
+_indexes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_object_index(model) -> ObjectTableIndex:
+    """ObjectTableIndex of `model`, built once per model and object count."""
+    objects = getattr(model, 'Objects', None)
+    try:
+        object_count = len(objects) if objects is not None else 0
+    except TypeError:
+        object_count = None
+    try:
+        with _indexes_lock:
+            index = _indexes.get(model)
+    except TypeError:  # not weak-referenceable / hashable
+        return ObjectTableIndex(model)
+    if index is not None and index.object_count == object_count:
+        return index
+
+    index = ObjectTableIndex(model)
+    with _indexes_lock:
+        _indexes[model] = index
+    logger.debug("object_table_index.built", objects=index.object_count,
+                 instance_definitions=len(index.idef_names))
+    return index
@@ -12,9 +12,13 @@ import structlog
 try:
     from src.agent.models import FileProcessingResult, LayerInfo
     from src.agent.services.user_string_extractor import UserStringExtractor
+    from src.agent.services.model_cache_service import get_model_cache
+    from src.agent.services.object_table_index import get_object_index
 except ImportError:
     from models import FileProcessingResult, LayerInfo
     from services.user_string_extractor import UserStringExtractor
+    from services.model_cache_service import get_model_cache
+    from services.object_table_index import get_object_index
 
 # Import rhino3dm at module level for testability
 # Mock in unit tests with: @patch('src.agent.services.rhino_parser_service.rhino3dm')
@@ -68,8 +72,9 @@ class RhinoParserService:
             )
 
         try:
-            # Parse .3dm file with rhino3dm
-            model = rhino3dm.File3dm.Read(str(path))
+            # Parse .3dm file with rhino3dm (memoized per worker process, so
+            # later readers of the same file reuse this model)
+            model = get_model_cache().read_model(str(path), rhino3dm.File3dm.Read)
 
             if model is None:
                 logger.error("rhino_parser.read_failed", file_path=file_path)
@@ -80,11 +85,12 @@ class RhinoParserService:
                     file_metadata={}
                 )
 
-            # Extract layers
+            # Extract layers (object counts per layer from one pass over the object table)
             layers = []
-            for idx, layer in enumerate(model.Layers):
-                # Count objects in this layer
-                object_count = sum(1 for obj in model.Objects if obj.Attributes.LayerIndex == idx)
+            model_layers = list(model.Layers)
+            layer_object_counts = get_object_index(model).layer_object_counts(len(model_layers))
+            for idx, layer in enumerate(model_layers):
+                object_count = int(layer_object_counts[idx])
 
                 # Extract color (handle both tuple and object formats)
                 color = None
@@ -0,0 +1,237 @@
+"""
+Scene Octree
+
+Spatial hierarchy for whole-building rendering. Loading one low-poly GLB per
+element means thousands of requests and draw calls for a full tram view;
+the scene is instead cut into tiles: blocks are grouped by an octree over
+their stored bbox, every leaf is merged into ONE mesh, every internal node
+gets a simplified merge of its children (HLOD), and the hierarchy is
+described by a manifest in the spirit of OGC 3D Tiles (boundingVolume,
+geometricError, refine, content, children).
+
+- The root is a power-of-two cube snapped to a grid, so its subdivision
+  does not move when blocks are added inside it: a changed block only
+  changes the leaves on its octant path (addresses like "0-5-2").
+- A block belongs to the octant of its bbox center; tile bounds are the
+  tight union of the member bboxes, so children never leave their parent.
+- Internal nodes with a single non-empty octant are collapsed.
+
+Coordinates stay in Rhino mm, Z-up (the viewer applies the Z→Y rotation).
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import trimesh
+
+
+@dataclass
+class TileBlock:
+    """A render-ready block: its bbox and the low-poly asset merged into tiles."""
+    block_id: str
+    bounds: np.ndarray  # (2, 3) [min, max]
+    content_url: str
+
+    @property
+    def center(self) -> np.ndarray:
+        return (self.bounds[0] + self.bounds[1]) / 2
+
+
+@dataclass
+class TileNode:
+    """Octree node; leaves carry blocks, internal nodes carry children."""
+    address: str
+    bounds: np.ndarray
+    blocks: list[TileBlock] = field(default_factory=list)
+    children: list["TileNode"] = field(default_factory=list)
+
+    @property
+    def is_leaf(self) -> bool:
+        return not self.children
+
+    @property
+    def content_hash(self) -> str:
+        """Identity of a leaf's merged content: member ids and their asset URLs."""
+        digest = hashlib.sha256()
+        for block in sorted(self.blocks, key=lambda b: b.block_id):
+            digest.update(f"{block.block_id}\n{block.content_url}\n".encode("utf-8"))
+        return digest.hexdigest()[:32]
+
+    def leaves(self):
+        if self.is_leaf:
+            yield self
+            return
+        for child in self.children:
+            yield from child.leaves()
+
+    def post_order(self):
+        """Every node, children before their parent (HLOD build order)."""
+        for child in self.children:
+            yield from child.post_order()
+        yield self
+
+
+def hlod_content_hash(child_hashes: list[str], max_faces: int) -> str:
+    """Identity of an internal tile's merged content: its children's contents and the face budget."""
+    digest = hashlib.sha256(f"hlod\n{max_faces}\n".encode("utf-8"))
+    for content_hash in child_hashes:
+        digest.update(f"{content_hash}\n".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def octree_root_cube(bounds: np.ndarray, grid_mm: float) -> tuple[np.ndarray, float]:
+    """(min corner, edge) of the grid-snapped power-of-two cube containing `bounds`."""
+    low = np.floor(bounds[0] / grid_mm) * grid_mm
+    extent = float(np.max(bounds[1] - low))
+    edge = grid_mm * 2 ** max(0, math.ceil(math.log2(max(extent, grid_mm) / grid_mm)))
+    if np.any(low + edge < bounds[1]):  # float round-off at an exact power of two
+        edge *= 2
+    return low, edge
+
+
+def build_octree(
+    blocks: list[TileBlock],
+    max_blocks: int,
+    max_depth: int,
+    grid_mm: float,
+) -> TileNode | None:
+    """Octree over `blocks` (None if empty); leaves hold <= max_blocks blocks."""
+    if not blocks:
+        return None
+    all_bounds = np.stack([b.bounds for b in blocks])
+    union = np.stack([all_bounds[:, 0].min(axis=0), all_bounds[:, 1].max(axis=0)])
+    low, edge = octree_root_cube(union, grid_mm)
+    return _build_node("0", blocks, low, edge, 0, max_blocks, max_depth)
+
+
+def _build_node(address, blocks, low, edge, depth, max_blocks, max_depth) -> TileNode:
+    if len(blocks) <= max_blocks or depth >= max_depth:
+        return TileNode(address=address, bounds=_union(blocks), blocks=sorted(blocks, key=lambda b: b.block_id))
+
+    half = edge / 2
+    octants: dict[int, list[TileBlock]] = {}
+    for block in blocks:
+        side = block.center >= low + half
+        octants.setdefault(int(side[0]) | int(side[1]) << 1 | int(side[2]) << 2, []).append(block)
+
+    children = []
+    for octant in sorted(octants):
+        offset = np.array([octant & 1, octant >> 1 & 1, octant >> 2 & 1]) * half
+        children.append(_build_node(f"{address}-{octant}", octants[octant], low + offset, half,
+                                    depth + 1, max_blocks, max_depth))
+    if len(children) == 1:
+        return children[0]
+    return TileNode(address=address, bounds=_union(blocks), children=children)
+
+
+def _union(blocks: list[TileBlock]) -> np.ndarray:
+    bounds = np.stack([b.bounds for b in blocks])
+    return np.stack([bounds[:, 0].min(axis=0), bounds[:, 1].max(axis=0)])
+
+
+def merge_meshes(meshes: list[trimesh.Trimesh]) -> tuple[trimesh.Trimesh, list[list[int]]]:
+    """One mesh from `meshes`, and the [first_face, face_count] range of each input."""
+    vertices, faces, ranges = [], [], []
+    vertex_offset = face_offset = 0
+    for mesh in meshes:
+        mesh_faces = np.asarray(mesh.faces, dtype=np.int64)
+        vertices.append(np.asarray(mesh.vertices, dtype=np.float64))
+        faces.append(mesh_faces + vertex_offset)
+        ranges.append([face_offset, len(mesh_faces)])
+        vertex_offset += len(mesh.vertices)
+        face_offset += len(mesh_faces)
+    if not meshes:
+        return trimesh.Trimesh(vertices=np.zeros((0, 3)), faces=np.zeros((0, 3), dtype=np.int64)), []
+    merged = trimesh.Trimesh(vertices=np.concatenate(vertices), faces=np.concatenate(faces), process=False)
+    return merged, ranges
+
+
+def _bounding_box(bounds: np.ndarray) -> list[float]:
+    """3D Tiles boundingVolume.box: center + three half-axis vectors."""
+    center = (bounds[0] + bounds[1]) / 2
+    hx, hy, hz = ((bounds[1] - bounds[0]) / 2).tolist()
+    return [*center.tolist(), hx, 0.0, 0.0, 0.0, hy, 0.0, 0.0, 0.0, hz]
+
+
+def tileset_manifest(root: TileNode | None, contents: dict[str, dict], generator: str) -> dict:
+    """3D Tiles style tileset JSON for `root`.
+
+    Args:
+        root: Octree from build_octree (None: empty scene)
+        contents: {address: {'uri', 'content_hash', 'block_ids',
+            'face_ranges', 'geometric_error'}} of the tiles with merged
+            content (tiles without an entry are listed without content)
+        generator: asset.generator string
+
+    Returns:
+        Manifest dict. Refinement is REPLACE: an internal tile's content is
+        the simplified merge of its children (HLOD) and its geometricError
+        that content's deviation in mm (never below its children's); an
+        internal tile without content gets its bbox diagonal, so it is always
+        refined. Leaves have error 0. Leaf extras list the member block ids in
+        merge order with their face ranges, so a picked face maps back to its
+        element.
+    """
+    manifest = {
+        "asset": {"version": "1.1", "generator": generator,
+                  "extras": {"units": "mm", "up_axis": "Z"}},
+        "geometricError": 0.0,
+        "root": None,
+    }
+    if root is None:
+        return manifest
+    manifest["root"] = _tile_json(root, contents)
+    manifest["geometricError"] = manifest["root"]["geometricError"]
+    return manifest
+
+
+def _tile_json(node: TileNode, contents: dict[str, dict]) -> dict:
+    content = contents.get(node.address)
+    if node.is_leaf:
+        geometric_error = 0.0
+    elif content is None:
+        geometric_error = float(np.linalg.norm(node.bounds[1] - node.bounds[0]))
+    else:
+        geometric_error = float(content.get("geometric_error") or 0.0)
+    tile = {
+        "boundingVolume": {"box": _bounding_box(node.bounds)},
+        "geometricError": geometric_error,
+        "refine": "REPLACE",
+        "extras": {"address": node.address},
+    }
+    if content is not None:
+        tile["content"] = {"uri": content["uri"]}
+        tile["extras"]["content_hash"] = content["content_hash"]
+    if node.is_leaf:
+        if content is None:
+            tile["extras"]["block_ids"] = [block.block_id for block in node.blocks]
+        else:
+            tile["extras"]["block_ids"] = content["block_ids"]
+            tile["extras"]["face_ranges"] = content["face_ranges"]
+    else:
+        tile["children"] = [_tile_json(child, contents) for child in node.children]
+    return tile
+
+
+def manifest_contents(manifest: dict | None) -> dict[str, dict]:
+    """{content_hash: content entry} of every tile with content in a stored manifest (reuse index)."""
+    reusable = {}
+    stack = [manifest.get("root")] if manifest else []
+    while stack:
+        tile = stack.pop()
+        if not tile:
+            continue
+        extras = tile.get("extras") or {}
+        if tile.get("content") and extras.get("content_hash"):
+            reusable[extras["content_hash"]] = {
+                "uri": tile["content"]["uri"],
+                "content_hash": extras["content_hash"],
+                "block_ids": extras.get("block_ids") or [],
+                "face_ranges": extras.get("face_ranges") or [],
+                "geometric_error": tile.get("geometricError") or 0.0,
+                "address": extras.get("address"),
+            }
+        stack.extend(tile.get("children") or [])
+    return reusable
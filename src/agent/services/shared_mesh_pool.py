@@ -0,0 +1,344 @@
+"""
+Shared Mesh Pool
+
+Process pool for the CPU-bound half of per-block geometry work (decimation,
+LOD serialization). The InstanceDefinitions of one file are independent, so
+a file task can spread them over every core of the host instead of one.
+
+- Processes come from billiard (Celery's multiprocessing fork): unlike
+  multiprocessing/ProcessPoolExecutor it can start children from the
+  daemonic prefork worker processes that run the tasks.
+- Mesh arrays travel through one multiprocessing SharedMemory segment per
+  job: the parent copies them in once, the worker maps them, no pickling of
+  vertex/face arrays. Only small arguments and the results are pickled.
+- Host-wide budget: SHARED_MESH_POOL_WORKERS slots of
+  SHARED_MESH_POOL_WORKER_MEMORY_MB each, shared by every worker process of
+  the host through lock files in SHARED_MESH_POOL_SLOT_DIR (flock, released
+  by the kernel if a process dies). Each job holds its estimated peak
+  footprint (array bytes x SHARED_MESH_POOL_MEMORY_FACTOR) in slots, at least
+  one, so with --concurrency=N at most SHARED_MESH_POOL_WORKERS jobs encode
+  at once on the host; submit() blocks until the slots are free. A job that
+  does not fit in the whole budget runs alone.
+- A file task starts the pool for its batch and shuts it down at the end,
+  so idle prefork children keep no pool processes.
+"""
+
+import fcntl
+import math
+import mmap
+import os
+import signal
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+
+import _posixshmem
+import numpy as np
+import structlog
+from billiard.exceptions import WorkerLostError
+from billiard.pool import Pool
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        SHARED_MESH_POOL_WORKERS,
+        SHARED_MESH_POOL_WORKER_MEMORY_MB,
+        SHARED_MESH_POOL_MEMORY_FACTOR,
+        SHARED_MESH_POOL_SLOT_DIR,
+    )
+except ImportError:
+    from constants import (
+        SHARED_MESH_POOL_WORKERS,
+        SHARED_MESH_POOL_WORKER_MEMORY_MB,
+        SHARED_MESH_POOL_MEMORY_FACTOR,
+        SHARED_MESH_POOL_SLOT_DIR,
+    )
+
+logger = structlog.get_logger()
+
+# Errors meaning "no usable process pool here"
+POOL_UNAVAILABLE_ERRORS = (BrokenProcessPool, OSError, AssertionError)
+
+_ALIGNMENT = 64
+# Seconds a worker gets to exit on SIGTERM at shutdown before SIGKILL
+_SHUTDOWN_GRACE_SECONDS = 2
+
+
+class _HostSlots:
+    """
+    Budget of `count` slots shared by every process of the host.
+
+    One lock file per slot; a slot is held with an exclusive flock on its
+    file. Waiters queue on a separate admission lock, so a job never holds
+    part of its slots while another waiter holds the rest (no deadlock).
+    """
+
+    def __init__(self, directory: str, count: int):
+        self.directory = directory
+        self.count = count
+
+    def _open(self, name: str) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        return os.open(os.path.join(self.directory, name), os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o666)
+
+    @staticmethod
+    def close_inherited(directory: str) -> None:
+        """Pool worker initializer: close the slot files inherited through fork.
+
+        A flock belongs to the open file: a worker forked while its parent
+        holds a slot would otherwise keep that slot locked after the parent
+        releases it.
+        """
+        directory = os.path.realpath(directory) + os.sep
+        for name in os.listdir("/proc/self/fd"):
+            try:
+                if os.readlink(f"/proc/self/fd/{name}").startswith(directory):
+                    os.close(int(name))
+            except OSError:
+                pass
+
+    def acquire(self, slots: int) -> list[int]:
+        """Block until `slots` slots are held; returns their descriptors for release()."""
+        slots = max(1, min(slots, self.count))
+        held: list[int] = []
+        admission = self._open("admission.lock")
+        try:
+            fcntl.flock(admission, fcntl.LOCK_EX)
+            busy = []
+            for index in range(self.count):
+                fd = self._open(f"slot-{index}.lock")
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    busy.append(fd)
+                    continue
+                held.append(fd)
+                if len(held) == slots:
+                    break
+            # Not enough free slots: wait for running jobs (slot holders never wait)
+            while len(held) < slots:
+                fd = busy.pop(0)
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                held.append(fd)
+            for fd in busy:
+                os.close(fd)
+        except BaseException:
+            self.release(held)
+            raise
+        finally:
+            os.close(admission)  # Closing drops the admission lock
+        return held
+
+    @staticmethod
+    def release(held: list[int]) -> None:
+        for fd in held:
+            os.close(fd)  # Closing drops the slot lock
+
+
+def _pack_layout(arrays: dict[str, np.ndarray]) -> tuple[list[tuple[str, str, tuple, int]], int]:
+    """(name, dtype, shape, offset) of every array in one segment, and its size."""
+    layout, offset = [], 0
+    for name, array in arrays.items():
+        layout.append((name, array.dtype.str, array.shape, offset))
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    return layout, max(offset, 1)
+
+
+def _attach(segment: str) -> mmap.mmap:
+    """Map an existing segment read-only.
+
+    SharedMemory(name=...) would register the segment with the resource
+    tracker, whose lock a forked worker can inherit in the locked state (a
+    parent thread freeing another segment at fork time) and then wait on
+    forever. The parent owns and unlinks the segment, so the worker skips it.
+    """
+    fd = _posixshmem.shm_open("/" + segment, os.O_RDONLY, mode=0o600)
+    try:
+        return mmap.mmap(fd, os.fstat(fd).st_size, access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+
+
+def _run_shared(fn: Callable, segment: str, layout: list, kwargs: dict):
+    """Worker entry point: map the job's arrays, copy them out, call fn(arrays, **kwargs)."""
+    buffer = _attach(segment)
+    try:
+        arrays = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset).copy()
+            for name, dtype, shape, offset in layout
+        }
+    finally:
+        buffer.close()
+    return fn(arrays, **kwargs)
+
+
+class SharedMeshPool:
+    """
+    Host-budgeted billiard process pool fed through shared memory.
+
+    Usage:
+        pool = get_shared_mesh_pool()
+        pool.start(processes=len(blocks))
+        future = pool.submit(encode_fn, {"vertices": v, "faces": f}, block_id=block_id)
+        result = future.result()
+        pool.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = SHARED_MESH_POOL_WORKERS,
+        worker_memory_bytes: int = SHARED_MESH_POOL_WORKER_MEMORY_MB * 1024 * 1024,
+        memory_factor: float = SHARED_MESH_POOL_MEMORY_FACTOR,
+        slot_dir: str = SHARED_MESH_POOL_SLOT_DIR,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.worker_memory_bytes = worker_memory_bytes
+        self.memory_factor = memory_factor
+        self._slots = _HostSlots(slot_dir, self.max_workers)
+        self._executor: Pool | None = None
+        self._jobs: dict[Future, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def memory_budget_bytes(self) -> int:
+        """Host-wide budget, shared by the pools of every worker process."""
+        return self.max_workers * self.worker_memory_bytes
+
+    def estimate_bytes(self, arrays: dict[str, np.ndarray]) -> int:
+        """Peak memory charged to a job working on `arrays`."""
+        return int(sum(array.nbytes for array in arrays.values()) * self.memory_factor)
+
+    def start(self, processes: int | None = None) -> None:
+        """Fork the worker processes now (call before starting threads in this process).
+
+        Args:
+            processes: Processes wanted for the batch (capped at max_workers)
+
+        Raises:
+            One of POOL_UNAVAILABLE_ERRORS if processes cannot be started here
+        """
+        if self._executor is None:
+            processes = min(processes or self.max_workers, self.max_workers)
+            executor = Pool(processes=processes, initializer=_HostSlots.close_inherited,
+                            initargs=(self._slots.directory,))
+            try:
+                executor.apply(os.getpid)
+            except BaseException:
+                executor.terminate()
+                raise
+            self._executor = executor
+            logger.info("shared_mesh_pool.started", workers=processes, host_slots=self.max_workers,
+                        worker_memory_mb=self.worker_memory_bytes // (1024 * 1024))
+
+    def submit(self, fn: Callable, arrays: dict[str, np.ndarray], **kwargs) -> Future:
+        """Run fn(arrays, **kwargs) in a worker; blocks until the host has slots for it.
+
+        `fn` must be a module-level function (it is pickled by reference).
+        The job's segment and slots are released before its future resolves.
+        """
+        self.start()
+        held = self._slots.acquire(math.ceil(self.estimate_bytes(arrays) / self.worker_memory_bytes))
+        try:
+            arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+            layout, size = _pack_layout(arrays)
+            shm = SharedMemory(create=True, size=size)
+        except BaseException:
+            self._slots.release(held)
+            raise
+
+        future: Future = Future()
+        released = threading.Lock()
+
+        def release() -> bool:
+            if not released.acquire(blocking=False):
+                return False  # Already finished (result, error or shutdown)
+            with self._lock:
+                self._jobs.pop(future, None)
+            self._free(shm)
+            self._slots.release(held)
+            return True
+
+        def done(result):
+            if release():
+                future.set_result(result)
+
+        def failed(error):
+            if release():
+                future.set_exception(_pool_error(error))
+
+        try:
+            for (name, dtype, shape, offset) in layout:
+                np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)[...] = arrays[name]
+            with self._lock:
+                self._jobs[future] = release
+            if self._executor.apply_async(_run_shared, (fn, shm.name, layout, kwargs),
+                                          callback=done, error_callback=failed) is None:
+                raise BrokenProcessPool("Shared mesh pool is not running")
+        except BaseException:
+            release()
+            raise
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; unfinished jobs fail with BrokenProcessPool."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.close()  # no respawns while the workers go down
+            workers = list(executor._pool)
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join(_SHUTDOWN_GRACE_SECONDS)
+                if worker.is_alive():
+                    # Forked while another thread held a lock: stuck before its
+                    # SIGTERM handler can run, and terminate() would join it forever
+                    logger.warning("shared_mesh_pool.worker_killed", pid=worker.pid)
+                    os.kill(worker.pid, signal.SIGKILL)
+            executor.terminate()
+            executor.join()
+        with self._lock:
+            jobs = list(self._jobs.items())
+        for future, release in jobs:
+            if release():
+                future.set_exception(BrokenProcessPool("Shared mesh pool shut down"))
+
+    @staticmethod
+    def _free(shm: SharedMemory) -> None:
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _pool_error(error) -> BaseException:
+    """Exception of a failed billiard job (ExceptionInfo): a lost worker is a broken pool."""
+    if getattr(error, 'type', None) is WorkerLostError or isinstance(error, WorkerLostError):
+        return BrokenProcessPool(f"Shared mesh pool worker lost: {error}")
+    exception = getattr(error, 'exception', error)
+    return exception if isinstance(exception, BaseException) else RuntimeError(str(error))
+
+
+_shared_mesh_pool: SharedMeshPool | None = None
+
+
+def get_shared_mesh_pool() -> SharedMeshPool:
+    """Process-wide SharedMeshPool (its workers are forked by start())."""
+    global _shared_mesh_pool
+    if _shared_mesh_pool is None:
+        _shared_mesh_pool = SharedMeshPool()
+    return _shared_mesh_pool
+
+
+def reset_shared_mesh_pool() -> None:
+    """Drop a broken pool so the next get_shared_mesh_pool() starts a fresh one."""
+    global _shared_mesh_pool
+    if _shared_mesh_pool is not None:
+        try:
+            _shared_mesh_pool.shutdown()
+        except Exception as e:
+            logger.warning("shared_mesh_pool.shutdown_failed", error=str(e))
+        _shared_mesh_pool = None
@@ -0,0 +1,161 @@
+"""
+Stage Checkpoint
+
+Completed stages of one block's LOD pipeline, persisted on worker-local
+disk so a retried generate_low_poly_glb resumes instead of restarting.
+Without them a storage 503 on the last upload repeats the download, parse,
+extraction and decimation of the whole block.
+
+Layout: LOD_CHECKPOINT_DIR/<block_id>/<pipeline version>/<stage>/
+- meta.json: JSON part of the stage (written last: its presence marks the
+  stage complete, so a worker killed mid-write leaves no half stage)
+- arrays.npz: numpy arrays of the stage (optional)
+- blobs/<name>: raw bytes, e.g. encoded assets (optional)
+
+The pipeline version is a hash of the LOD settings: a checkpoint written
+under other settings is never resumed, and saving a stage drops the
+block's checkpoints of every other version. Stages older than
+LOD_CHECKPOINT_TTL_SECONDS are ignored.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import numpy as np
+import structlog
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import LOD_CHECKPOINT_DIR, LOD_CHECKPOINT_TTL_SECONDS
+except ImportError:
+    from constants import LOD_CHECKPOINT_DIR, LOD_CHECKPOINT_TTL_SECONDS
+
+logger = structlog.get_logger()
+
+_META = "meta.json"
+_ARRAYS = "arrays.npz"
+_BLOBS = "blobs"
+
+
+@dataclass
+class Stage:
+    """A completed stage read back from disk."""
+    meta: dict
+    arrays: dict[str, np.ndarray] = field(default_factory=dict)
+    blobs: dict[str, bytes] = field(default_factory=dict)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class StageCheckpoint:
+    """
+    Worker-local checkpoints of one block under one pipeline version.
+
+    Usage:
+        checkpoint = StageCheckpoint(block_id, _lod_pipeline_signature())
+        stage = checkpoint.load('encoded')
+        if stage is None:
+            ...
+            checkpoint.save('encoded', meta, blobs=assets)
+        ...
+        checkpoint.clear()  # block done (or failed for good)
+    """
+
+    def __init__(
+        self,
+        block_id: str,
+        pipeline_signature: str,
+        root: str = LOD_CHECKPOINT_DIR,
+        ttl_seconds: int = LOD_CHECKPOINT_TTL_SECONDS,
+    ):
+        self.block_id = block_id
+        self.version = hashlib.sha256(pipeline_signature.encode("utf-8")).hexdigest()[:16]
+        self.block_dir = os.path.join(root, block_id)
+        self.path = os.path.join(self.block_dir, self.version)
+        self.ttl_seconds = ttl_seconds
+
+    def load(self, stage: str) -> Stage | None:
+        """The completed stage, or None (never saved, expired or unreadable)."""
+        stage_dir = os.path.join(self.path, stage)
+        meta_path = os.path.join(stage_dir, _META)
+        try:
+            if time.time() - os.path.getmtime(meta_path) > self.ttl_seconds:
+                return None
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            arrays = {}
+            arrays_path = os.path.join(stage_dir, _ARRAYS)
+            if os.path.exists(arrays_path):
+                with np.load(arrays_path, allow_pickle=False) as npz:
+                    arrays = {name: npz[name] for name in npz.files}
+            blobs = {}
+            blobs_dir = os.path.join(stage_dir, _BLOBS)
+            if os.path.isdir(blobs_dir):
+                for name in os.listdir(blobs_dir):
+                    with open(os.path.join(blobs_dir, name), "rb") as f:
+                        blobs[name] = f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("stage_checkpoint.unreadable", block_id=self.block_id, stage=stage, error=str(e))
+            return None
+        logger.info("stage_checkpoint.resumed", block_id=self.block_id, stage=stage, version=self.version)
+        return Stage(meta=meta, arrays=arrays, blobs=blobs)
+
+    def save(
+        self,
+        stage: str,
+        meta: dict,
+        arrays: dict[str, np.ndarray] | None = None,
+        blobs: dict[str, bytes] | None = None,
+    ) -> None:
+        """Persist a completed stage (replacing a previous save of it).
+
+        Best effort: a checkpoint that cannot be written only costs the
+        resume, so disk errors are logged, never raised.
+        """
+        stage_dir = os.path.join(self.path, stage)
+        partial = f"{stage_dir}.{uuid.uuid4().hex}.part"
+        try:
+            self._drop_other_versions()
+            os.makedirs(os.path.join(partial, _BLOBS))
+            if arrays:
+                buffer = io.BytesIO()
+                np.savez(buffer, **arrays)
+                with open(os.path.join(partial, _ARRAYS), "wb") as f:
+                    f.write(buffer.getvalue())
+            for name, data in (blobs or {}).items():
+                with open(os.path.join(partial, _BLOBS, name), "wb") as f:
+                    f.write(data)
+            with open(os.path.join(partial, _META), "w", encoding="utf-8") as f:
+                json.dump(meta, f, default=_json_default)
+            shutil.rmtree(stage_dir, ignore_errors=True)
+            os.replace(partial, stage_dir)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("stage_checkpoint.save_failed", block_id=self.block_id, stage=stage, error=str(e))
+            shutil.rmtree(partial, ignore_errors=True)
+            return
+        logger.info("stage_checkpoint.saved", block_id=self.block_id, stage=stage, version=self.version)
+
+    def clear(self) -> None:
+        """Drop every checkpoint of the block (all versions)."""
+        shutil.rmtree(self.block_dir, ignore_errors=True)
+
+    def _drop_other_versions(self) -> None:
+        if not os.path.isdir(self.block_dir):
+            return
+        for name in os.listdir(self.block_dir):
+            if name != self.version:
+                shutil.rmtree(os.path.join(self.block_dir, name), ignore_errors=True)
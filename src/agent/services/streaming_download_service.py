@@ -0,0 +1,235 @@
+"""
+Streaming Download Service
+
+Downloads large objects (.3dm uploads, up to MAX_3DM_FILE_SIZE_MB) straight
+to disk instead of materializing them as one Python `bytes`:
+
+- The size limit is enforced before the body is requested (Content-Range /
+  Content-Length) and again while bytes arrive, so a missing or lying
+  header cannot push more than the limit to disk.
+- Objects above DOWNLOAD_PARALLEL_THRESHOLD_BYTES on servers that honour
+  `Range` are fetched as parallel range requests, each written at its
+  offset of a pre-sized file. A failed range is re-fetched on its own.
+- Peak memory is ~ DOWNLOAD_CHUNK_SIZE_BYTES x DOWNLOAD_MAX_PARALLEL_RANGES,
+  independent of the file size.
+
+Supabase Storage objects are read through a short-lived signed URL (the
+storage API accepts `Range` on it).
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+import structlog
+from requests.adapters import HTTPAdapter
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        MAX_3DM_FILE_SIZE_MB,
+        DOWNLOAD_CHUNK_SIZE_BYTES,
+        DOWNLOAD_RANGE_SIZE_BYTES,
+        DOWNLOAD_MAX_PARALLEL_RANGES,
+        DOWNLOAD_PARALLEL_THRESHOLD_BYTES,
+        DOWNLOAD_RANGE_MAX_ATTEMPTS,
+        DOWNLOAD_SIGNED_URL_TTL_SECONDS,
+    )
+except ImportError:
+    from constants import (
+        MAX_3DM_FILE_SIZE_MB,
+        DOWNLOAD_CHUNK_SIZE_BYTES,
+        DOWNLOAD_RANGE_SIZE_BYTES,
+        DOWNLOAD_MAX_PARALLEL_RANGES,
+        DOWNLOAD_PARALLEL_THRESHOLD_BYTES,
+        DOWNLOAD_RANGE_MAX_ATTEMPTS,
+        DOWNLOAD_SIGNED_URL_TTL_SECONDS,
+    )
+
+logger = structlog.get_logger()
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+# Supabase Storage answers a missing object with 400 {"statusCode": "404"}
+_NOT_FOUND_STATUSES = (400, 404)
+
+
+class DownloadTooLargeError(ValueError):
+    """Object exceeds the download size limit (possible zip bomb or corrupt file)."""
+
+
+@dataclass(frozen=True)
+class RemoteObject:
+    """What the server reports about an object before its body is read."""
+    size: int | None
+    etag: str | None
+    ranged: bool
+
+
+class StreamingDownloadService:
+    """
+    Size-capped streaming downloader with parallel HTTP range requests.
+
+    Usage:
+        service = StreamingDownloadService()
+        size = service.download_storage_object(supabase, "raw-uploads", key, local_path)
+        size = service.download("https://host/file.3dm", local_path)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = MAX_3DM_FILE_SIZE_MB * 1024 * 1024,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE_BYTES,
+        range_size: int = DOWNLOAD_RANGE_SIZE_BYTES,
+        max_parallel: int = DOWNLOAD_MAX_PARALLEL_RANGES,
+        parallel_threshold: int = DOWNLOAD_PARALLEL_THRESHOLD_BYTES,
+        timeout: float = 300,
+    ):
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.range_size = range_size
+        self.max_parallel = max(1, max_parallel)
+        self.parallel_threshold = parallel_threshold
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.max_parallel)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def download_storage_object(self, supabase, bucket: str, key: str, local_path: str) -> int:
+        """Download a Supabase Storage object through a signed URL.
+
+        Raises:
+            RuntimeError: If storage returns no signed URL
+            FileNotFoundError / DownloadTooLargeError: See download()
+        """
+        return self.download(self.signed_url(supabase, bucket, key), local_path)
+
+    @staticmethod
+    def signed_url(supabase, bucket: str, key: str) -> str:
+        """Short-lived signed URL of a storage object (accepts Range requests)."""
+        signed = supabase.storage.from_(bucket).create_signed_url(key, DOWNLOAD_SIGNED_URL_TTL_SECONDS)
+        url = (signed.get("signedURL") or signed.get("signedUrl")) if isinstance(signed, dict) else None
+        if not isinstance(url, str):
+            raise RuntimeError(f"Storage returned no signed URL for {bucket}/{key}")
+        return url
+
+    def stat(self, url: str) -> RemoteObject:
+        """Size, ETag and Range support of `url` from a 1-byte range GET.
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+        """
+        with self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout) as r:
+            if r.status_code in _NOT_FOUND_STATUSES:
+                raise FileNotFoundError(f"Object not found: {url.split('?')[0]}")
+            r.raise_for_status()
+            etag = r.headers.get("ETag")
+            if r.status_code == 206:
+                match = _CONTENT_RANGE.match(r.headers.get("Content-Range", ""))
+                if match and match.group(3) != "*":
+                    return RemoteObject(int(match.group(3)), etag, True)
+                return RemoteObject(None, etag, False)
+            length = r.headers.get("Content-Length")
+            return RemoteObject(int(length) if length else None, etag, False)
+
+    def download(self, url: str, local_path: str, remote: RemoteObject | None = None) -> int:
+        """Stream `url` into `local_path`.
+
+        Args:
+            url: HTTP(S) URL of the object
+            local_path: Destination file (removed again if the download fails)
+            remote: Result of a previous stat(url), saves the probe request
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            FileNotFoundError: If the object does not exist
+            DownloadTooLargeError: If the object exceeds max_bytes
+            requests.RequestException: On network / HTTP errors
+        """
+        remote = remote or self.stat(url)
+        size = remote.size
+        if size is not None and size > self.max_bytes:
+            raise self._too_large(url, size)
+
+        parallel = remote.ranged and size is not None and size >= self.parallel_threshold and self.max_parallel > 1
+        try:
+            if parallel:
+                written = self._download_ranges(url, local_path, size)
+            else:
+                written = self._download_stream(url, local_path)
+        except BaseException:
+            if os.path.exists(local_path):
+                os.remove(local_path)
+            raise
+
+        logger.info("streaming_download.success", local_path=local_path,
+                    size_mb=f"{written / (1024 * 1024):.2f}", parallel_ranges=parallel)
+        return written
+
+    def _download_stream(self, url: str, local_path: str) -> int:
+        """Single streamed GET, aborted as soon as the limit is crossed."""
+        written = 0
+        with self.session.get(url, stream=True, timeout=self.timeout) as r:
+            if r.status_code in _NOT_FOUND_STATUSES:
+                raise FileNotFoundError(f"Object not found: {url.split('?')[0]}")
+            r.raise_for_status()
+            with open(local_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=self.chunk_size):
+                    written += len(chunk)
+                    if written > self.max_bytes:
+                        raise self._too_large(url, written)
+                    f.write(chunk)
+        return written
+
+    def _download_ranges(self, url: str, local_path: str, size: int) -> int:
+        """Parallel range GETs, each written at its offset of a pre-sized file."""
+        with open(local_path, "wb") as f:
+            f.truncate(size)
+        ranges = [(start, min(start + self.range_size, size) - 1)
+                  for start in range(0, size, self.range_size)]
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(ranges))) as pool:
+            # list() re-raises the first failed range
+            list(pool.map(lambda r: self._fetch_range(url, local_path, *r), ranges))
+        return size
+
+    def _fetch_range(self, url: str, local_path: str, start: int, end: int) -> None:
+        for attempt in range(1, DOWNLOAD_RANGE_MAX_ATTEMPTS + 1):
+            try:
+                self._write_range(url, local_path, start, end)
+                return
+            except (requests.RequestException, IOError) as e:
+                if attempt == DOWNLOAD_RANGE_MAX_ATTEMPTS:
+                    raise
+                logger.warning("streaming_download.range_retry", start=start, end=end,
+                               attempt=attempt, error=str(e))
+
+    def _write_range(self, url: str, local_path: str, start: int, end: int) -> None:
+        expected = end - start + 1
+        headers = {"Range": f"bytes={start}-{end}"}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            match = _CONTENT_RANGE.match(r.headers.get("Content-Range", ""))
+            if r.status_code != 206 or not match or int(match.group(1)) != start:
+                raise IOError(f"Server ignored range {start}-{end} (status {r.status_code})")
+            received = 0
+            with open(local_path, "r+b") as f:
+                f.seek(start)
+                for chunk in r.iter_content(chunk_size=self.chunk_size):
+                    received += len(chunk)
+                    if received > expected:
+                        raise IOError(f"Range {start}-{end} returned more than {expected} bytes")
+                    f.write(chunk)
+        if received != expected:
+            raise IOError(f"Range {start}-{end} truncated ({received}/{expected} bytes)")
+
+    def _too_large(self, url: str, size: int) -> DownloadTooLargeError:
+        size_mb = size / (1024 * 1024)
+        logger.error("streaming_download.size_exceeded", url=url.split("?")[0], size_mb=f"{size_mb:.1f}")
+        return DownloadTooLargeError(
+            f"File size {size_mb:.1f}MB exceeds limit {self.max_bytes / (1024 * 1024):.0f}MB. "
+            f"Possible zip bomb attack or corrupt file."
+        )
@@ -0,0 +1,221 @@
+"""
+Validation Cache
+
+Memoized GeometryValidator results. Every block of an uploaded file used to
+run the same full-model scan (validate_file → ValidateGeometry node) and get
+the same result. Results are now keyed by the SHA-256 of the .3dm content +
+GEOMETRY_VALIDATOR_VERSION + a scope:
+
+- "model":          file-wide rules (validate_model_rules), shared by every
+                    block of the file
+- "block:<iso>":    checks of one block (validate_block): its placed
+                    instances and the geometry of its InstanceDefinition
+- "all":            whole-model validate_geometry, for blocks whose iso_code
+                    names no InstanceDefinition of the file
+
+Two tiers: a worker-local LRU (VALIDATION_CACHE_LOCAL_ENTRIES) in front of
+Redis (shared by every worker, VALIDATION_CACHE_TTL_SECONDS). Without Redis
+the local tier still serves the blocks of a file validated by one worker.
+Hits and misses are counted per process and in the Redis hash
+VALIDATION_CACHE_STATS_KEY.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, List, Optional
+
+import structlog
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.constants import (
+        GEOMETRY_VALIDATOR_VERSION,
+        VALIDATION_CACHE_KEY_PREFIX,
+        VALIDATION_CACHE_STATS_KEY,
+        VALIDATION_CACHE_TTL_SECONDS,
+        VALIDATION_CACHE_LOCAL_ENTRIES,
+    )
+    from src.agent.services.object_table_index import get_object_index
+except ImportError:
+    from constants import (
+        GEOMETRY_VALIDATOR_VERSION,
+        VALIDATION_CACHE_KEY_PREFIX,
+        VALIDATION_CACHE_STATS_KEY,
+        VALIDATION_CACHE_TTL_SECONDS,
+        VALIDATION_CACHE_LOCAL_ENTRIES,
+    )
+    from services.object_table_index import get_object_index
+
+try:
+    from infra.redis_client import get_redis_client
+except ModuleNotFoundError:
+    from src.agent.infra.redis_client import get_redis_client
+
+# Same resolution order as services/geometry_validator.py
+try:
+    from schemas import ValidationErrorItem
+except ModuleNotFoundError:
+    from src.backend.schemas import ValidationErrorItem
+
+logger = structlog.get_logger()
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def file_content_hash(path: str) -> str:
+    """SHA-256 hex digest of a file's content (streamed)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """
+    Worker-local LRU + Redis memo of validation errors.
+
+    Usage:
+        cache = get_validation_cache()
+        errors = cache.memoize(content_hash, "model", lambda: validator.validate_model_rules(model))
+    """
+
+    def __init__(
+        self,
+        max_entries: int = VALIDATION_CACHE_LOCAL_ENTRIES,
+        ttl_seconds: int = VALIDATION_CACHE_TTL_SECONDS,
+        version: int = GEOMETRY_VALIDATOR_VERSION,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = version
+        self.stats: Counter = Counter()
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, content_hash: str, scope: str) -> str:
+        return f"{VALIDATION_CACHE_KEY_PREFIX}v{self.version}:{content_hash}:{scope}"
+
+    def get(self, content_hash: str, scope: str) -> Optional[List[ValidationErrorItem]]:
+        """Cached errors, or None on a miss of both tiers."""
+        key = self.key(content_hash, scope)
+        with self._lock:
+            errors = self._entries.get(key)
+            if errors is not None:
+                self._entries.move_to_end(key)
+        if errors is not None:
+            self._record("local_hit")
+            return list(errors)
+
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                cached = redis_client.get(key)
+            except Exception as e:
+                logger.warning("validation_cache.lookup_failed", key=key, error=str(e))
+                cached = None
+            if cached:
+                errors = [ValidationErrorItem(**item) for item in json.loads(cached)]
+                self._remember(key, errors)
+                self._record("redis_hit")
+                return list(errors)
+
+        self._record("miss")
+        return None
+
+    def put(self, content_hash: str, scope: str, errors: List[ValidationErrorItem]) -> None:
+        key = self.key(content_hash, scope)
+        self._remember(key, list(errors))
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            redis_client.set(key, json.dumps([item.model_dump() for item in errors]), ex=self.ttl_seconds)
+        except Exception as e:
+            logger.warning("validation_cache.store_failed", key=key, error=str(e))
+
+    def memoize(
+        self,
+        content_hash: Optional[str],
+        scope: str,
+        compute: Callable[[], List[ValidationErrorItem]],
+    ) -> List[ValidationErrorItem]:
+        """Cached errors of (content, scope), else `compute()` stored in both tiers.
+
+        Without a content hash (model not read from a file) nothing is cached.
+        """
+        if not content_hash:
+            return list(compute())
+        errors = self.get(content_hash, scope)
+        if errors is None:
+            errors = list(compute())
+            self.put(content_hash, scope, errors)
+        return errors
+
+    def clear(self) -> None:
+        """Drop the worker-local tier (Redis entries expire by TTL / version bump)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, errors: List[ValidationErrorItem]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = errors
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _record(self, event: str) -> None:
+        self.stats[event] += 1
+        redis_client = get_redis_client()
+        if redis_client is None:
+            return
+        try:
+            redis_client.hincrby(VALIDATION_CACHE_STATS_KEY, event, 1)
+        except Exception as e:
+            logger.warning("validation_cache.stats_failed", counter=event, error=str(e))
+
+
+_cache: Optional[ValidationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_validation_cache() -> ValidationCache:
+    """Process-wide ValidationCache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ValidationCache()
+    return _cache
+
+
+def validate_block_geometry(
+    model,
+    content_hash: Optional[str],
+    iso_code: Optional[str],
+    validator,
+) -> List[ValidationErrorItem]:
+    """
+    Geometry errors of one block: file-wide rules + the block's own checks.
+
+    Both parts are memoized per file content, so the N blocks of a file run
+    the file-wide scan once. Blocks whose iso_code names no
+    InstanceDefinition of the model get the whole-model validation.
+
+    Args:
+        model: Parsed rhino3dm File3dm
+        content_hash: file_content_hash of the .3dm (None: no memoization)
+        iso_code: Block iso_code (== InstanceDefinition.Name)
+        validator: GeometryValidator instance
+    """
+    if iso_code and iso_code in get_object_index(model).idef_by_name:
+        cache = get_validation_cache()
+        model_errors = cache.memoize(content_hash, "model", lambda: validator.validate_model_rules(model))
+        block_errors = cache.memoize(content_hash, f"block:{iso_code}",
+                                     lambda: validator.validate_block(model, iso_code))
+        return model_errors + block_errors
+    return get_validation_cache().memoize(content_hash, "all", lambda: validator.validate_geometry(model))
@@ -7,9 +7,11 @@ This package contains all async tasks executed by the Celery worker.
 # Lazy imports to avoid conflicts between Celery worker and pytest contexts
 # Tasks can be imported directly: from src.agent.tasks.file_validation import ...
 try:
-    from .file_validation import health_check, validate_file
-    from .geometry_processing import generate_low_poly_glb
-    __all__ = ['health_check', 'validate_file', 'generate_low_poly_glb']
+    from .file_validation import health_check, validate_file, validate_file_blocks
+    from .geometry_processing import generate_low_poly_glb, generate_file_lod_assets, rebuild_lod_levels
+    from .scene_tiles import build_scene_tiles
+    __all__ = ['health_check', 'validate_file', 'validate_file_blocks', 'generate_low_poly_glb',
+               'generate_file_lod_assets', 'rebuild_lod_levels', 'build_scene_tiles']
 except ImportError:
     # In test context, import directly from modules instead
     __all__ = []
@@ -0,0 +1,433 @@
+"""
+Local bulk LOD conversion — generate_file_lod_assets without the broker.
+
+For a full reprocess of the inventory (maintenance window, big machine),
+enqueuing one Celery task per element and polling every task id is slow and
+ties the run to the broker. This module runs the SAME file pipeline
+(geometry_processing._run_file_lods: extraction, LOD cache, decimation,
+encoding, instancing) over a directory or storage prefix of .3dm files:
+
+- One process per file, BULK_LOD_WORKERS at a time (largest files first).
+- Assets go to PROCESSED_GEOMETRY_BUCKET, or to a local directory laid out
+  with the same keys (LocalAssetBucket). Rows always carry the storage
+  public URLs, so syncing the directory to the bucket completes the run.
+  Until then those URLs do not resolve: a local run neither indexes its
+  assets in the shared LOD cache (workers would hand them out) nor
+  schedules the scene tiles (built from the stored assets).
+- Rows are committed in batches of about BULK_LOD_COMMIT_BLOCKS blocks with
+  _update_blocks_lod_urls_batch; once committed, a file is appended to the
+  resume manifest and skipped by the next run. Files with transient
+  failures are not recorded, so a rerun retries them.
+
+Entry point: run_bulk_conversion (CLI: infra/bulk_convert_lod.py).
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import structlog
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.tasks.geometry_processing import (
+        LODAssetUploader,
+        _download_3dm_from_s3,
+        _is_transient_error,
+        _parse_rhino_file,
+        _run_file_lods,
+        _store_lod_cache,
+        _update_block_status_error,
+        _update_blocks_lod_urls_batch,
+        get_db_connection,
+        schedule_scene_tiles,
+    )
+    from src.agent.constants import (
+        BULK_LOD_WORKERS,
+        BULK_LOD_COMMIT_BLOCKS,
+        PROCESSED_GEOMETRY_BUCKET,
+        RAW_UPLOADS_BUCKET,
+        TEMP_DIR,
+    )
+except ImportError:
+    from tasks.geometry_processing import (
+        LODAssetUploader,
+        _download_3dm_from_s3,
+        _is_transient_error,
+        _parse_rhino_file,
+        _run_file_lods,
+        _store_lod_cache,
+        _update_block_status_error,
+        _update_blocks_lod_urls_batch,
+        get_db_connection,
+        schedule_scene_tiles,
+    )
+    from constants import (
+        BULK_LOD_WORKERS,
+        BULK_LOD_COMMIT_BLOCKS,
+        PROCESSED_GEOMETRY_BUCKET,
+        RAW_UPLOADS_BUCKET,
+        TEMP_DIR,
+    )
+
+try:
+    from infra.supabase_client import get_supabase_client
+except ModuleNotFoundError:
+    from src.agent.infra.supabase_client import get_supabase_client
+
+logger = structlog.get_logger()
+
+_URL_PROBE = "__bulk_lod_probe__"
+_STORAGE_LIST_PAGE = 1000
+
+
+class LocalAssetBucket:
+    """
+    Stand-in for PROCESSED_GEOMETRY_BUCKET that writes under a local directory.
+
+    Objects are stored at <root>/<key>; get_public_url returns the URL the
+    bucket would serve the key at, so committed rows are valid once the
+    directory is synced to storage.
+    """
+
+    def __init__(self, root: str, public_url_base: str):
+        self.root = root
+        self.public_url_base = public_url_base
+
+    def upload(self, key: str, data: bytes, options: dict | None = None) -> None:
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{os.getpid()}.part"
+        with open(partial, "wb") as f:
+            f.write(data)
+        os.replace(partial, path)
+
+    def download(self, key: str) -> bytes:
+        with open(os.path.join(self.root, key), "rb") as f:
+            return f.read()
+
+    def get_public_url(self, key: str) -> str:
+        return f"{self.public_url_base}{key}"
+
+
+def storage_public_url_base() -> str:
+    """Public URL prefix of PROCESSED_GEOMETRY_BUCKET (what LODAssetUploader URLs start with)."""
+    bucket = get_supabase_client().storage.from_(PROCESSED_GEOMETRY_BUCKET)
+    return bucket.get_public_url(_URL_PROBE).rstrip('?')[:-len(_URL_PROBE)]
+
+
+@dataclass
+class SourceFile:
+    """A .3dm to convert: file_key is blocks.url_original."""
+    file_key: str
+    local_path: str | None = None  # None: downloaded from RAW_UPLOADS_BUCKET
+    size_bytes: int | None = None
+
+
+def local_sources(directory: str, key_prefix: str = "") -> list[SourceFile]:
+    """.3dm files under a local mirror of RAW_UPLOADS_BUCKET.
+
+    The key of each file is key_prefix + its path relative to `directory`.
+    """
+    root = Path(directory)
+    return [
+        SourceFile(file_key=f"{key_prefix}{path.relative_to(root).as_posix()}",
+                   local_path=str(path), size_bytes=path.stat().st_size)
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and path.suffix.lower() == ".3dm"
+    ]
+
+
+def storage_sources(prefix: str) -> list[SourceFile]:
+    """.3dm objects of RAW_UPLOADS_BUCKET under a folder prefix (recursive)."""
+    bucket = get_supabase_client().storage.from_(RAW_UPLOADS_BUCKET)
+    found, folders = [], [prefix.strip('/')]
+    while folders:
+        folder = folders.pop()
+        offset = 0
+        while True:
+            entries = bucket.list(folder, {'limit': _STORAGE_LIST_PAGE, 'offset': offset})
+            for entry in entries:
+                key = f"{folder}/{entry['name']}" if folder else entry['name']
+                if entry.get('id') is None:
+                    folders.append(key)  # folder placeholder
+                elif key.lower().endswith('.3dm'):
+                    found.append(SourceFile(file_key=key, size_bytes=(entry.get('metadata') or {}).get('size')))
+            if len(entries) < _STORAGE_LIST_PAGE:
+                break
+            offset += _STORAGE_LIST_PAGE
+    return sorted(found, key=lambda source: source.file_key)
+
+
+def fetch_blocks_by_file(file_keys: list[str], include_processed: bool = False) -> dict[str, list[tuple[str, str]]]:
+    """Validated blocks of each file, as _fetch_pending_blocks_for_file returns them.
+
+    Args:
+        file_keys: blocks.url_original values
+        include_processed: Also blocks that already have LOD assets (rebuild from scratch)
+
+    Returns:
+        {file_key: [(block_id, iso_code)]} ordered by iso_code
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT url_original, id, iso_code FROM blocks
+            WHERE url_original = ANY(%s)
+              AND status = 'validated'
+              {'' if include_processed else 'AND low_poly_url IS NULL'}
+            ORDER BY iso_code
+            """,
+            (list(file_keys),)
+        )
+        blocks: dict[str, list[tuple[str, str]]] = {}
+        for file_key, block_id, iso_code in cursor.fetchall():
+            blocks.setdefault(file_key, []).append((str(block_id), iso_code))
+    return blocks
+
+
+@dataclass
+class FileConversion:
+    """Result of convert_file, sent back from the worker process."""
+    file_key: str
+    updates: list[dict] = field(default_factory=list)
+    instanced_meshes: list[dict] = field(default_factory=list)
+    cache_entries: list[tuple[str, dict]] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    transient_failures: int = 0
+    original_faces: int = 0
+    seconds: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """No block left to retry: the file can be recorded in the manifest."""
+        return self.transient_failures == 0
+
+
+def convert_file(
+    source: SourceFile,
+    pending: list[tuple[str, str]],
+    output_dir: str | None = None,
+    public_url_base: str | None = None,
+) -> FileConversion:
+    """Parse one .3dm and encode + store the LOD assets of its pending blocks (no DB commit).
+
+    A file that cannot be downloaded or parsed fails all its blocks, marked
+    error_processing unless the error is transient (as in the file task).
+    """
+    start = time.perf_counter()
+    conversion = FileConversion(file_key=source.file_key)
+    path, temp_path = source.local_path, None
+    try:
+        if path is None:
+            file_hash = hashlib.sha1(source.file_key.encode('utf-8')).hexdigest()[:16]
+            path = temp_path = os.path.join(TEMP_DIR, f"bulk_{file_hash}.3dm")
+            _download_3dm_from_s3(source.file_key, temp_path)
+        rhino_file = _parse_rhino_file(path, source.file_key)
+    except Exception as e:
+        logger.error("bulk_lod.file_error", file_key=source.file_key, error=str(e))
+        transient = _is_transient_error(e)
+        for block_id, _ in pending:
+            conversion.failed[block_id] = str(e)
+            if not transient:
+                _update_block_status_error(block_id, str(e))
+        conversion.transient_failures = len(pending) if transient else 0
+        return conversion
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    bucket = LocalAssetBucket(output_dir, public_url_base) if output_dir else None
+    uploader = LODAssetUploader(bucket=bucket)
+    try:
+        run = _run_file_lods(rhino_file, pending, uploader, None, source.file_key)
+    finally:
+        uploader.close()
+
+    conversion.updates = run.updates
+    conversion.instanced_meshes = run.instanced_meshes
+    conversion.cache_entries = run.cache_entries
+    conversion.failed = run.failed
+    conversion.transient_failures = len(run.transient_errors)
+    conversion.original_faces = sum(result['original_faces'] for result in run.results.values())
+    conversion.seconds = time.perf_counter() - start
+    return conversion
+
+
+class ConversionManifest:
+    """
+    Resume manifest: one JSON line per file whose rows are committed.
+
+    Appended (and fsynced) only after the commit, so an interrupted run
+    redoes at most the files of the batch it was committing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._done: set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._done.add(json.loads(line)['file_key'])
+
+    def done(self, file_key: str) -> bool:
+        return file_key in self._done
+
+    def record(self, conversion: FileConversion) -> None:
+        entry = {
+            'file_key': conversion.file_key,
+            'blocks': len(conversion.updates),
+            'failed': sorted(conversion.failed),
+            'seconds': round(conversion.seconds, 2),
+            'completed_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._done.add(conversion.file_key)
+
+
+@dataclass
+class BulkProgress:
+    """Snapshot passed to the on_progress callback after every file."""
+    files_total: int
+    files_done: int = 0
+    blocks_done: int = 0
+    blocks_failed: int = 0
+    blocks_committed: int = 0
+    original_faces: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def blocks_per_second(self) -> float:
+        return self.blocks_done / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def faces_per_second(self) -> float:
+        return self.original_faces / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        if not self.files_done:
+            return None
+        return self.elapsed_seconds / self.files_done * (self.files_total - self.files_done)
+
+
+def _converted(jobs: list[tuple[SourceFile, list]], workers: int, output_dir, public_url_base):
+    """Yield FileConversion per job, as they finish (in this process with one worker)."""
+    if workers <= 1:
+        for source, pending in jobs:
+            yield convert_file(source, pending, output_dir, public_url_base)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_file, source, pending, output_dir, public_url_base): (source, pending)
+                   for source, pending in jobs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # worker died (e.g. out of memory): retried by the next run
+                source, pending = futures[future]
+                logger.error("bulk_lod.worker_failed", file_key=source.file_key, error=str(e))
+                yield FileConversion(file_key=source.file_key, transient_failures=len(pending),
+                                     failed={block_id: str(e) for block_id, _ in pending})
+
+
+def run_bulk_conversion(
+    sources: list[SourceFile],
+    manifest_path: str,
+    output_dir: str | None = None,
+    public_url_base: str | None = None,
+    workers: int = BULK_LOD_WORKERS,
+    commit_blocks: int = BULK_LOD_COMMIT_BLOCKS,
+    include_processed: bool = False,
+    on_progress=None,
+) -> dict:
+    """Convert every source file not yet in the manifest and commit their rows in batches.
+
+    Args:
+        sources: Files to convert (local_sources / storage_sources)
+        manifest_path: Resume manifest (created if missing)
+        output_dir: Write assets here instead of PROCESSED_GEOMETRY_BUCKET (no LOD
+            cache entries, no scene tiles: see module docstring)
+        public_url_base: URL prefix of the bucket (default: storage_public_url_base())
+        workers: Worker processes (0 = one per CPU core)
+        commit_blocks: Commit once this many converted blocks are buffered
+        include_processed: Rebuild blocks that already have LOD assets
+        on_progress: on_progress(BulkProgress) after every file
+
+    Returns:
+        dict: {files, skipped_files, blocks, failed, committed, elapsed_seconds}
+    """
+    manifest = ConversionManifest(manifest_path)
+    todo = [source for source in sources if not manifest.done(source.file_key)]
+    blocks = fetch_blocks_by_file([source.file_key for source in todo], include_processed) if todo else {}
+    jobs = [(source, blocks[source.file_key]) for source in todo if blocks.get(source.file_key)]
+    jobs.sort(key=lambda job: job[0].size_bytes or 0, reverse=True)  # largest first: even finish
+    if output_dir and public_url_base is None:
+        public_url_base = storage_public_url_base()
+    workers = workers or os.cpu_count() or 1
+
+    logger.info("bulk_lod.started", files=len(jobs), skipped_files=len(sources) - len(jobs),
+                blocks=sum(len(pending) for _, pending in jobs), workers=workers,
+                output=output_dir or PROCESSED_GEOMETRY_BUCKET)
+
+    progress = BulkProgress(files_total=len(jobs))
+    buffer: list[FileConversion] = []
+    failed: dict[str, str] = {}
+    start = time.perf_counter()
+
+    def commit() -> None:
+        if not buffer:
+            return
+        _update_blocks_lod_urls_batch(
+            [u for c in buffer for u in c.updates],
+            [m for c in buffer for m in c.instanced_meshes],
+        )
+        for conversion in buffer:
+            if not output_dir:
+                for lod_cache_key, lod_data in conversion.cache_entries:
+                    _store_lod_cache(lod_cache_key, lod_data)
+            if conversion.complete:
+                manifest.record(conversion)
+        progress.blocks_committed += sum(len(c.updates) for c in buffer)
+        buffer.clear()
+
+    for conversion in _converted(jobs, workers, output_dir, public_url_base):
+        buffer.append(conversion)
+        failed.update(conversion.failed)
+        progress.files_done += 1
+        progress.blocks_done += len(conversion.updates)
+        progress.blocks_failed += len(conversion.failed)
+        progress.original_faces += conversion.original_faces
+        if sum(len(c.updates) for c in buffer) >= commit_blocks:
+            commit()
+        progress.elapsed_seconds = time.perf_counter() - start
+        if on_progress is not None:
+            on_progress(progress)
+    commit()
+
+    if progress.blocks_committed:
+        if output_dir:
+            logger.warning("bulk_lod.sync_required", output_dir=output_dir,
+                           message="Sync the directory to storage, then run build_scene_tiles")
+        else:
+            schedule_scene_tiles()
+    summary = {
+        'files': len(jobs),
+        'skipped_files': len(sources) - len(jobs),
+        'blocks': progress.blocks_done,
+        'failed': failed,
+        'committed': progress.blocks_committed,
+        'elapsed_seconds': round(time.perf_counter() - start, 1),
+    }
+    logger.info("bulk_lod.completed", **{k: v for k, v in summary.items() if k != 'failed'},
+                failed=len(failed), progress=asdict(progress))
+    return summary
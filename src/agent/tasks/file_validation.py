@@ -11,31 +11,40 @@ try:
     from src.agent.constants import (
         TASK_HEALTH_CHECK,
         TASK_VALIDATE_FILE,
+        TASK_VALIDATE_FILE_BLOCKS,
         TASK_REGISTER_3DM_BLOCKS,
-        TASK_GENERATE_LOW_POLY_GLB,
         TASK_EMBED_BLOCK,
         TASK_MAX_RETRIES,
         TASK_RETRY_DELAY_SECONDS,
+        VALIDATE_FILE_BATCH_BLOCKS,
     )
     from src.agent.services.file_download_service import FileDownloadService
     from src.agent.services.db_service import DBService
     from src.agent.services.rhino_parser_service import RhinoParserService
+    from src.agent.services.model_cache_service import get_model_cache
+    from src.agent.tasks.geometry_processing import get_db_connection, schedule_file_lod_assets
 except ImportError:
     from celery_app import celery_app
     from constants import (
         TASK_HEALTH_CHECK,
         TASK_VALIDATE_FILE,
+        TASK_VALIDATE_FILE_BLOCKS,
         TASK_REGISTER_3DM_BLOCKS,
-        TASK_GENERATE_LOW_POLY_GLB,
         TASK_EMBED_BLOCK,
         TASK_MAX_RETRIES,
         TASK_RETRY_DELAY_SECONDS,
+        VALIDATE_FILE_BATCH_BLOCKS,
     )
     from services.file_download_service import FileDownloadService
     from services.db_service import DBService
     from services.rhino_parser_service import RhinoParserService
+    from services.model_cache_service import get_model_cache
+    from tasks.geometry_processing import get_db_connection, schedule_file_lod_assets
 
+import json
 import structlog
+import psycopg2.extras
+from celery.exceptions import Retry
 from datetime import datetime
 import rhino3dm
 
@@ -98,6 +107,124 @@ def _collect_graph_errors(final_state) -> list:
     return collected
 
 
+def _run_block_graph(part_id: str, geometry_metadata: dict, parse_result, retry_count: int = 0) -> dict:
+    """Per-block part of the validation: run validation_graph on preloaded
+    geometry and map its final state to the report fields.
+
+    Shared by validate_file (one block) and validate_file_blocks (every block
+    of a file, same preloaded file-wide metadata), so both persist identical
+    reports.
+
+    Returns:
+        dict: {is_valid, overall_status, semantic, classification_method, errors, metadata}
+    """
+    # Lazy import of the LangGraph pipeline: deferred to task-execution time so
+    # that merely importing this module (e.g. Celery autodiscovery, pytest
+    # collection of contract tests) does NOT eagerly compile the graph or pull
+    # the graph→nodes→llm_client chain into sys.modules.
+    try:
+        from src.agent.graph.graph import validation_graph
+        from src.agent.graph.state import make_initial_state, ValidationStatus
+    except ImportError:
+        from graph.graph import validation_graph
+        from graph.state import make_initial_state, ValidationStatus
+
+    # We pre-load the parsed geometry so ExtractGeometry reuses it (its
+    # idempotency guard) instead of re-downloading by the wrong key.
+    layers_metadata = [
+        {
+            "name": layer.name,
+            "index": layer.index,
+            "object_count": layer.object_count,
+            "color": layer.color,
+            "is_visible": layer.is_visible
+        }
+        for layer in parse_result.layers
+    ]
+
+    initial_state = make_initial_state(
+        block_id=part_id,
+        retry_count=retry_count,
+    )
+    initial_state["geometry_metadata"] = geometry_metadata
+
+    final_state = validation_graph.invoke(initial_state)
+
+    overall_status = final_state.get("overall_status")
+    semantic = final_state.get("semantic_data") or {}
+    classification_method = final_state.get("classification_method")
+
+    metadata = {
+        "layers": layers_metadata,
+        **parse_result.file_metadata,
+        "geometry": {
+            "volume": geometry_metadata.get("volume"),
+            "bbox": geometry_metadata.get("bbox"),
+            "vertices_count": geometry_metadata.get("vertices_count"),
+            "faces_count": geometry_metadata.get("faces_count"),
+        },
+        "classification": {
+            "tipologia": semantic.get("tipologia"),
+            "material": semantic.get("material"),
+            "confidence": semantic.get("confidence"),
+            "reasoning": semantic.get("reasoning"),
+            "method": classification_method.value if classification_method else None,
+            "circuit_breaker_tripped": final_state.get("circuit_breaker_tripped", False),
+        },
+        "validation_path": final_state.get("validation_path", []),
+    }
+
+    return {
+        "is_valid": overall_status == ValidationStatus.VALIDATED,
+        "overall_status": overall_status,
+        "semantic": semantic,
+        "classification_method": classification_method,
+        "errors": _collect_graph_errors(final_state),
+        "metadata": metadata,
+    }
+
+
+def _update_blocks_status_batch(part_ids: list, status: str) -> None:
+    """Set the status of many blocks in one statement."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE blocks SET status = %s WHERE id = ANY(%s::uuid[])", (status, list(part_ids)))
+        conn.commit()
+
+
+def _save_validation_results_batch(results: list) -> None:
+    """Persist the validation report, status and tipologia of many blocks in one transaction.
+
+    Batched counterpart of DBService.save_validation_report +
+    update_block_status + update_block_classification.
+
+    Args:
+        results: List of dicts with part_id, validation_report (see
+                 DBService.build_validation_report), status and tipologia
+                 (None keeps the current value)
+    """
+    if not results:
+        return
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        psycopg2.extras.execute_batch(
+            cursor,
+            """
+            UPDATE blocks
+            SET validation_report = %s,
+                status = %s,
+                tipologia = COALESCE(%s, tipologia)
+            WHERE id = %s
+            """,
+            [
+                (json.dumps(r["validation_report"]), r["status"], r.get("tipologia"), r["part_id"])
+                for r in results
+            ],
+        )
+        conn.commit()
+    logger.info("validation_results_batch.saved", blocks=len(results))
+
+
 @celery_app.task(
     name=TASK_HEALTH_CHECK,
     bind=True,
@@ -152,17 +279,9 @@ def validate_file(self, part_id: str, s3_key: str, iso_code: str = None):
     """
     logger.info("validate_file.started", part_id=part_id, s3_key=s3_key, iso_code=iso_code)
 
-    # Lazy import of the LangGraph pipeline: deferred to task-execution time so
-    # that merely importing this module (e.g. Celery autodiscovery, pytest
-    # collection of contract tests) does NOT eagerly compile the graph or pull
-    # the graph→nodes→llm_client chain into sys.modules.
     try:
-        from src.agent.graph.graph import validation_graph
-        from src.agent.graph.state import make_initial_state, ValidationStatus
         from src.agent.graph.nodes import build_initial_geometry_metadata
     except ImportError:
-        from graph.graph import validation_graph
-        from graph.state import make_initial_state, ValidationStatus
         from graph.nodes import build_initial_geometry_metadata
 
     # Initialize services
@@ -274,53 +393,14 @@ def validate_file(self, part_id: str, s3_key: str, iso_code: str = None):
                 "error": parse_result.error_message
             }
 
-        # Step 6: Run the LangGraph "Librarian" pipeline.
-        # We pre-load the parsed geometry so ExtractGeometry reuses it (its
-        # idempotency guard) instead of re-downloading by the wrong key.
-        layers_metadata = [
-            {
-                "name": layer.name,
-                "index": layer.index,
-                "object_count": layer.object_count,
-                "color": layer.color,
-                "is_visible": layer.is_visible
-            }
-            for layer in parse_result.layers
-        ]
-
-        initial_state = make_initial_state(
-            block_id=part_id,
-            retry_count=self.request.retries,
-        )
-        initial_state["geometry_metadata"] = geometry_metadata
-
-        final_state = validation_graph.invoke(initial_state)
-
-        overall_status = final_state.get("overall_status")
-        is_valid = overall_status == ValidationStatus.VALIDATED
-        semantic = final_state.get("semantic_data") or {}
-        classification_method = final_state.get("classification_method")
-        errors = _collect_graph_errors(final_state)
-
-        metadata = {
-            "layers": layers_metadata,
-            **parse_result.file_metadata,
-            "geometry": {
-                "volume": geometry_metadata.get("volume"),
-                "bbox": geometry_metadata.get("bbox"),
-                "vertices_count": geometry_metadata.get("vertices_count"),
-                "faces_count": geometry_metadata.get("faces_count"),
-            },
-            "classification": {
-                "tipologia": semantic.get("tipologia"),
-                "material": semantic.get("material"),
-                "confidence": semantic.get("confidence"),
-                "reasoning": semantic.get("reasoning"),
-                "method": classification_method.value if classification_method else None,
-                "circuit_breaker_tripped": final_state.get("circuit_breaker_tripped", False),
-            },
-            "validation_path": final_state.get("validation_path", []),
-        }
+        # Step 6: Run the LangGraph "Librarian" pipeline on the preloaded geometry
+        outcome = _run_block_graph(part_id, geometry_metadata, parse_result, self.request.retries)
+        overall_status = outcome["overall_status"]
+        is_valid = outcome["is_valid"]
+        semantic = outcome["semantic"]
+        classification_method = outcome["classification_method"]
+        errors = outcome["errors"]
+        metadata = outcome["metadata"]
 
         # Step 7: Persist the validation report (keyed by blocks.id)
         db_service.save_validation_report(
@@ -340,10 +420,12 @@ def validate_file(self, part_id: str, s3_key: str, iso_code: str = None):
                 part_id, semantic["tipologia"], semantic.get("material")
             )
 
-        # Step 9: Only generate the low-poly GLB for accepted pieces
+        # Step 9: Only generate the low-poly GLB for accepted pieces.
+        # Scheduled per file (debounced) so the shared .3dm is downloaded and
+        # parsed once for all of its blocks; falls back to the per-block task.
         if is_valid:
-            celery_app.send_task(TASK_GENERATE_LOW_POLY_GLB, args=[part_id])
-            logger.info("validate_file.geometry_task_enqueued", part_id=part_id)
+            schedule_mode = schedule_file_lod_assets(s3_key, part_id)
+            logger.info("validate_file.geometry_task_enqueued", part_id=part_id, mode=schedule_mode)
 
             # Step 9b: Fire-and-forget RAG embedding so The Archivist can find
             # this piece immediately (no manual backfill required). Soft-fail:
@@ -413,6 +495,179 @@ def validate_file(self, part_id: str, s3_key: str, iso_code: str = None):
         }
 
 
+@celery_app.task(
+    name=TASK_VALIDATE_FILE_BLOCKS,
+    bind=True,
+    max_retries=TASK_MAX_RETRIES,
+    default_retry_delay=TASK_RETRY_DELAY_SECONDS
+)
+def validate_file_blocks(self, file_key: str, blocks: list):
+    """
+    Validate many blocks of one .3dm file in a single task (file-level validate_file).
+
+    validate_file repeats the file-wide work for every block: download of the
+    shared .3dm, RhinoParserService.parse_file and build_initial_geometry_metadata.
+    Here they run ONCE; only the per-block part of validation_graph runs for
+    each block, on the shared preloaded metadata (ExtractGeometry reuses it,
+    ValidateGeometry checks only the block's own geometry, the file-wide rules
+    being memoized by content hash in services/validation_cache.py). The LLM
+    classifications of the blocks are requested in batches
+    (graph/batch_classification.py) instead of one request per block.
+    Reports, statuses and tipologias are committed in one transaction.
+
+    Failure handling mirrors validate_file: a file-level error fails every
+    block (transient errors retry the task). A transient error in one block
+    retries the task with only the failed blocks, after the others are
+    committed.
+
+    Args:
+        file_key: S3 object key of the .3dm file (blocks.url_original)
+        blocks: [[block_id, iso_code], ...] of the file to validate
+
+    Returns:
+        dict: {success, file_key, validated, rejected, failed: {block_id: error}}
+    """
+    logger.info("validate_file_blocks.started", file_key=file_key, blocks=len(blocks))
+
+    try:
+        from src.agent.graph.nodes import build_initial_geometry_metadata
+        from src.agent.graph.batch_classification import classify_blocks_batch
+    except ImportError:
+        from graph.nodes import build_initial_geometry_metadata
+        from graph.batch_classification import classify_blocks_batch
+
+    file_download = FileDownloadService()
+    rhino_parser = RhinoParserService()
+    worker_id = self.request.hostname or "unknown-worker"
+    part_ids = [block_id for block_id, _ in blocks]
+
+    def retry(exc: Exception, retry_blocks: list):
+        countdown = TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries)
+        logger.warning(
+            "validate_file_blocks.retry_scheduled",
+            file_key=file_key,
+            blocks=len(retry_blocks),
+            retry_count=self.request.retries + 1,
+            countdown_seconds=countdown
+        )
+        return self.retry(args=[file_key, retry_blocks], exc=exc,
+                          countdown=countdown, max_retries=TASK_MAX_RETRIES)
+
+    def error_result(part_id: str, message: str) -> dict:
+        report = DBService.build_validation_report(
+            False, [{"category": "io", "target": file_key, "message": message}], {}, worker_id
+        )
+        return {"part_id": part_id, "validation_report": report, "status": "error_processing"}
+
+    # Steps 1-4: file-wide work, once for every block
+    try:
+        _update_blocks_status_batch(part_ids, "processing")
+
+        success, local_path, download_error = file_download.download_from_s3(file_key, task_id=self.request.id)
+        if not success:
+            logger.error("validate_file_blocks.download_failed", file_key=file_key, error=download_error)
+            if _is_transient_error(Exception(download_error), download_error):
+                raise retry(Exception(download_error), blocks)
+            file_error = download_error
+        else:
+            parse_result = rhino_parser.parse_file(local_path)
+            geometry_metadata = None
+            if parse_result.success:
+                # content_hash keys the memoized geometry validation: the
+                # file-wide rules run once, then only each block's own checks
+                geometry_metadata = build_initial_geometry_metadata(local_path, parse_result)
+            file_download.cleanup_temp_file(local_path)
+
+            file_error = None if parse_result.success else parse_result.error_message
+            if file_error:
+                logger.error("validate_file_blocks.parse_failed", file_key=file_key, error=file_error)
+                if _is_transient_error(Exception(file_error), file_error):
+                    raise retry(Exception(file_error), blocks)
+    except Retry:
+        raise
+    except Exception as e:
+        logger.exception("validate_file_blocks.file_error", file_key=file_key, error=str(e),
+                         retry_count=self.request.retries)
+        if _is_transient_error(e):
+            raise retry(e, blocks)
+        file_error = f"Unexpected error: {str(e)}"
+
+    if file_error:
+        _save_validation_results_batch([error_result(part_id, file_error) for part_id in part_ids])
+        return {"success": False, "file_key": file_key, "validated": 0, "rejected": 0,
+                "failed": {part_id: file_error for part_id in part_ids}}
+
+    # Step 5: per-block part of the graph on the shared metadata. The LLM
+    # classifications are requested up front, LLM_BATCH_SIZE blocks per request;
+    # blocks left out are classified by ClassifyTipologia one by one.
+    try:
+        classifications = classify_blocks_batch(geometry_metadata, blocks)
+    except Exception as e:
+        logger.exception("validate_file_blocks.batch_classification_failed", file_key=file_key, error=str(e))
+        classifications = {}
+
+    results, validated, failed, transient_blocks = [], [], {}, []
+    transient_error = None
+    for block_id, iso_code in blocks:
+        try:
+            block_metadata = {**geometry_metadata, "iso_code": iso_code,
+                              "llm_classification": classifications.get(block_id)}
+            outcome = _run_block_graph(block_id, block_metadata, parse_result, self.request.retries)
+        except Exception as e:
+            logger.exception("validate_file_blocks.block_error", file_key=file_key,
+                             part_id=block_id, iso_code=iso_code, error=str(e))
+            failed[block_id] = str(e)
+            if _is_transient_error(e):
+                transient_blocks.append([block_id, iso_code])
+                transient_error = transient_error or e
+            else:
+                results.append(error_result(block_id, f"Unexpected error: {str(e)}"))
+            continue
+
+        is_valid = outcome["is_valid"]
+        semantic = outcome["semantic"]
+        results.append({
+            "part_id": block_id,
+            "validation_report": DBService.build_validation_report(
+                is_valid, outcome["errors"], outcome["metadata"], worker_id
+            ),
+            "status": "validated" if is_valid else "error_processing",
+            "tipologia": semantic.get("tipologia") if is_valid else None,
+        })
+        if is_valid:
+            validated.append(block_id)
+
+    # Step 6: one transaction for every report + status + tipologia
+    _save_validation_results_batch(results)
+
+    # Step 7: LOD generation (one file task) and RAG embedding for accepted pieces
+    if validated:
+        schedule_mode = schedule_file_lod_assets(file_key, validated[0])
+        logger.info("validate_file_blocks.geometry_task_enqueued", file_key=file_key, mode=schedule_mode)
+        for block_id in validated:
+            celery_app.send_task(TASK_EMBED_BLOCK, args=[block_id])
+
+    logger.info(
+        "validate_file_blocks.completed",
+        file_key=file_key,
+        blocks=len(blocks),
+        validated=len(validated),
+        rejected=len(results) - len(validated),
+        failed=len(failed),
+    )
+
+    if transient_blocks:
+        raise retry(transient_error, transient_blocks)
+
+    return {
+        "success": not failed,
+        "file_key": file_key,
+        "validated": len(validated),
+        "rejected": len(results) - len(validated),
+        "failed": failed,
+    }
+
+
 @celery_app.task(
     name=TASK_REGISTER_3DM_BLOCKS,
     bind=True,
@@ -434,7 +689,8 @@ def register_3dm_blocks(self, file_key: str):
     1. Download .3dm file from S3
     2. Enumerate InstanceDefinitions (each .Name is an iso_code / Codi)
     3. Register new blocks in DB (skip existing ones)
-    4. Enqueue validate_file for each newly created block
+    4. Enqueue validate_file_blocks for the newly created blocks
+       (one task per VALIDATE_FILE_BATCH_BLOCKS blocks)
     5. Clean up temp file
 
     Args:
@@ -456,7 +712,7 @@ def register_3dm_blocks(self, file_key: str):
 
     try:
         # Step 2: Open file and enumerate InstanceDefinitions
-        file3dm = rhino3dm.File3dm.Read(local_path)
+        file3dm = get_model_cache().read_model(local_path, rhino3dm.File3dm.Read)
         if file3dm is None:
             raise ValueError(f"rhino3dm could not open file: {file_key}")
 
@@ -473,17 +729,20 @@ def register_3dm_blocks(self, file_key: str):
         # Step 3: Register blocks (idempotent — skips existing iso_codes)
         new_blocks = db_service.register_blocks_for_iso_codes(iso_codes, file_key)
 
-        # Step 4: Enqueue validate_file for each newly created block.
+        # Step 4: Enqueue file-level validation for the newly created blocks:
+        # the .3dm is downloaded and parsed once per chunk, not once per block.
         # iso_code is passed so the LangGraph ClassifyTipologia node feeds the
         # real ISO-19650 code to the LLM (block id is an opaque UUID).
-        for block in new_blocks:
+        for start in range(0, len(new_blocks), VALIDATE_FILE_BATCH_BLOCKS):
+            chunk = new_blocks[start:start + VALIDATE_FILE_BATCH_BLOCKS]
             celery_app.send_task(
-                TASK_VALIDATE_FILE,
-                args=[block["id"], file_key, block["iso_code"]],
+                TASK_VALIDATE_FILE_BLOCKS,
+                args=[file_key, [[block["id"], block["iso_code"]] for block in chunk]],
             )
             logger.info("register_3dm_blocks.validate_enqueued",
-                        block_id=block["id"],
-                        iso_code=block["iso_code"])
+                        file_key=file_key,
+                        blocks=len(chunk),
+                        iso_codes=[block["iso_code"] for block in chunk])
 
         skipped = len(iso_codes) - len(new_blocks)
         logger.info("register_3dm_blocks.success",
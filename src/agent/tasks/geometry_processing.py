@@ -5,24 +5,90 @@ This module contains Celery tasks for processing .3dm files and generating
 low-poly GLB representations suitable for web visualization.
 """
 
+import io
 import os
 import json
 import shutil
+import hashlib
+import itertools
+import time
+import uuid
+from operator import attrgetter
 import subprocess
 import psycopg2
+import psycopg2.extras
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 import structlog
 import requests
+from celery.exceptions import SoftTimeLimitExceeded
 
 # Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
 try:
     from src.agent.celery_app import celery_app
+    from src.agent.services.lod_decimation_service import (
+        LODDecimationService,
+        apply_vertex_clustering,
+        decimate_to_target,
+        lod_face_targets,
+        surface_deviation,
+    )
+    from src.agent.services.glb_export_service import GLBExportService
+    from src.agent.services.model_cache_service import get_model_cache
+    from src.agent.services.object_table_index import get_object_index
+    from src.agent.services.instance_table import InstanceTable, pack_matrices, placement_matrices
+    from src.agent.services.lod_container import pack_lod_container, read_lod_chunk
+    from src.agent.services.lod_rebuild_planner import (
+        lod_level_hashes, lod_level_params, lod_params_hash, plan_lod_rebuild,
+    )
+    from src.agent.services.mesh_metrics import DEFAULT_UNIT_SCALE, compute_mesh_metrics, model_unit_scale
+    from src.agent.services.stage_checkpoint import StageCheckpoint
+    from src.agent.services.shared_mesh_pool import (
+        POOL_UNAVAILABLE_ERRORS,
+        SharedMeshPool,
+        get_shared_mesh_pool,
+        reset_shared_mesh_pool,
+    )
     from src.agent.constants import (
         TASK_GENERATE_LOW_POLY_GLB,
+        TASK_GENERATE_FILE_LOD_ASSETS,
+        FILE_LOD_SCHEDULE_DEBOUNCE_SECONDS,
+        FILE_LOD_SCHEDULE_KEY_PREFIX,
+        FILE_LOD_CLAIM_TTL_SECONDS,
+        FILE_LOD_BATCH_BLOCKS,
+        TASK_BUILD_SCENE_TILES,
+        TASK_REBUILD_LOD_LEVELS,
+        SCENE_TILES_SCHEDULE_DEBOUNCE_SECONDS,
+        SCENE_TILES_SCHEDULE_KEY,
+        FILE_LOD_POOL_MIN_BLOCKS,
+        LOD_INSTANCING,
+        LOD_INSTANCING_MIN_INSTANCES,
+        INSTANCED_ASSET_PREFIX,
         DECIMATION_TARGET_FACES,
-        LOD_DECIMATION_TARGETS,
+        LOD_DECIMATION_MODE,
+        LOD_DECIMATION_CACHE_SIZE,
+        MAX_GLB_SIZE_KB,
+        LOD_ADAPTIVE_MIN_FACES,
+        GEOMETRY_FINGERPRINT_QUANTUM_MM,
+        LOD_CACHE_VERSION,
+        LOD_CACHE_KEY_PREFIX,
+        LOD_CACHE_TTL_SECONDS,
+        LOD_CACHE_STATS_KEY,
         LOD_PREFIXES,
+        LOD_ASSET_FORMATS,
+        LOD_ASSET_FORMAT,
+        LOD_ASSET_CONTENT_TYPES,
+        LOD_UPLOAD_MAX_WORKERS,
+        LOD_UPLOAD_MAX_ATTEMPTS,
+        LOD_UPLOAD_RETRY_BACKOFF_SECONDS,
         MATERIALS_PREFIX,
+        LOD_CONTAINER,
+        LOD_CONTAINER_FORMAT,
+        LOD_CONTAINER_PREFIX,
+        LOD_CHECKPOINTS,
         PROCESSED_GEOMETRY_BUCKET,
         RAW_UPLOADS_BUCKET,
         LOW_POLY_PREFIX,
@@ -32,7 +98,6 @@ try:
         ERROR_MSG_FAILED_PARSE_3DM,
         TASK_MAX_RETRIES,
         TASK_RETRY_DELAY_SECONDS,
-        MAX_3DM_FILE_SIZE_MB,
         DRACO_COMPRESSION_LEVEL,
         DRACO_QUANTIZE_POSITION_BITS,
         DRACO_QUANTIZE_NORMAL_BITS,
@@ -40,12 +105,66 @@ try:
     )
 except ImportError:
     from celery_app import celery_app
+    from services.lod_decimation_service import (
+        LODDecimationService,
+        apply_vertex_clustering,
+        decimate_to_target,
+        lod_face_targets,
+        surface_deviation,
+    )
+    from services.glb_export_service import GLBExportService
+    from services.model_cache_service import get_model_cache
+    from services.object_table_index import get_object_index
+    from services.instance_table import InstanceTable, pack_matrices, placement_matrices
+    from services.lod_container import pack_lod_container, read_lod_chunk
+    from services.lod_rebuild_planner import (
+        lod_level_hashes, lod_level_params, lod_params_hash, plan_lod_rebuild,
+    )
+    from services.mesh_metrics import DEFAULT_UNIT_SCALE, compute_mesh_metrics, model_unit_scale
+    from services.stage_checkpoint import StageCheckpoint
+    from services.shared_mesh_pool import (
+        POOL_UNAVAILABLE_ERRORS,
+        SharedMeshPool,
+        get_shared_mesh_pool,
+        reset_shared_mesh_pool,
+    )
     from constants import (
         TASK_GENERATE_LOW_POLY_GLB,
+        TASK_GENERATE_FILE_LOD_ASSETS,
+        FILE_LOD_SCHEDULE_DEBOUNCE_SECONDS,
+        FILE_LOD_SCHEDULE_KEY_PREFIX,
+        FILE_LOD_CLAIM_TTL_SECONDS,
+        FILE_LOD_BATCH_BLOCKS,
+        TASK_BUILD_SCENE_TILES,
+        TASK_REBUILD_LOD_LEVELS,
+        SCENE_TILES_SCHEDULE_DEBOUNCE_SECONDS,
+        SCENE_TILES_SCHEDULE_KEY,
+        FILE_LOD_POOL_MIN_BLOCKS,
+        LOD_INSTANCING,
+        LOD_INSTANCING_MIN_INSTANCES,
+        INSTANCED_ASSET_PREFIX,
         DECIMATION_TARGET_FACES,
-        LOD_DECIMATION_TARGETS,
+        LOD_DECIMATION_MODE,
+        LOD_DECIMATION_CACHE_SIZE,
+        MAX_GLB_SIZE_KB,
+        LOD_ADAPTIVE_MIN_FACES,
+        GEOMETRY_FINGERPRINT_QUANTUM_MM,
+        LOD_CACHE_VERSION,
+        LOD_CACHE_KEY_PREFIX,
+        LOD_CACHE_TTL_SECONDS,
+        LOD_CACHE_STATS_KEY,
         LOD_PREFIXES,
+        LOD_ASSET_FORMATS,
+        LOD_ASSET_FORMAT,
+        LOD_ASSET_CONTENT_TYPES,
+        LOD_UPLOAD_MAX_WORKERS,
+        LOD_UPLOAD_MAX_ATTEMPTS,
+        LOD_UPLOAD_RETRY_BACKOFF_SECONDS,
         MATERIALS_PREFIX,
+        LOD_CONTAINER,
+        LOD_CONTAINER_FORMAT,
+        LOD_CONTAINER_PREFIX,
+        LOD_CHECKPOINTS,
         PROCESSED_GEOMETRY_BUCKET,
         RAW_UPLOADS_BUCKET,
         LOW_POLY_PREFIX,
@@ -55,7 +174,6 @@ except ImportError:
         ERROR_MSG_FAILED_PARSE_3DM,
         TASK_MAX_RETRIES,
         TASK_RETRY_DELAY_SECONDS,
-        MAX_3DM_FILE_SIZE_MB,
         DRACO_COMPRESSION_LEVEL,
         DRACO_QUANTIZE_POSITION_BITS,
         DRACO_QUANTIZE_NORMAL_BITS,
@@ -72,6 +190,11 @@ try:
 except ModuleNotFoundError:
     from src.agent.infra.supabase_client import get_supabase_client
 
+try:
+    from infra.redis_client import get_redis_client
+except ModuleNotFoundError:
+    from src.agent.infra.redis_client import get_redis_client
+
 logger = structlog.get_logger()
 
 
@@ -118,7 +241,9 @@ def _update_block_status_error(block_id: str, error_message: str) -> None:
     try:
         supabase = get_supabase_client()
         supabase.table('blocks').update({
-            'status': 'error_processing'
+            'status': 'error_processing',
+            'lod_claimed_by': None,
+            'lod_claimed_at': None,
         }).eq('id', block_id).execute()
         
         logger.error(
@@ -205,6 +330,119 @@ def _fetch_block_metadata(block_id: str) -> tuple[str, str, str | None]:
         return url_original, iso_code, low_poly_url
 
 
+def _fetch_pending_blocks_for_file(file_key: str, claim_token: str | None = None) -> list[tuple[str, str]]:
+    """Fetch validated blocks of a .3dm file that still have no LOD assets.
+
+    Blocks claimed by a live file run are left out. With `claim_token` the
+    returned blocks are claimed for the caller in the same statement
+    (FOR UPDATE SKIP LOCKED), so concurrent runs on one file get disjoint
+    blocks. A claim is cleared when the block's LODs are committed, when it
+    is marked error_processing or by _release_lod_claims; one older than
+    FILE_LOD_CLAIM_TTL_SECONDS (killed worker) is taken over.
+
+    Args:
+        file_key: Storage key shared by all blocks of the file (blocks.url_original)
+        claim_token: Identifier of the claiming run, None to only read
+
+    Returns:
+        List of (block_id, iso_code) tuples, ordered by iso_code
+    """
+    pending_filter = """
+        url_original = %s
+        AND status = 'validated'
+        AND low_poly_url IS NULL
+        AND (lod_claimed_by IS NULL OR lod_claimed_at < NOW() - make_interval(secs => %s))
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if claim_token is None:
+            cursor.execute(
+                f"SELECT id, iso_code FROM blocks WHERE {pending_filter}",
+                (file_key, FILE_LOD_CLAIM_TTL_SECONDS)
+            )
+        else:
+            cursor.execute(
+                f"""
+                UPDATE blocks
+                SET lod_claimed_by = %s, lod_claimed_at = NOW()
+                WHERE id IN (
+                    SELECT id FROM blocks WHERE {pending_filter}
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, iso_code
+                """,
+                (claim_token, file_key, FILE_LOD_CLAIM_TTL_SECONDS)
+            )
+        rows = [(str(block_id), iso_code) for block_id, iso_code in cursor.fetchall()]
+        if claim_token is not None:
+            conn.commit()
+
+    rows.sort(key=lambda row: row[1] or '')  # RETURNING has no ORDER BY
+    logger.info("fetch_pending_blocks.success", file_key=file_key, pending=len(rows),
+                claimed=claim_token is not None)
+    return rows
+
+
+def _release_lod_claims(block_ids: list[str], claim_token: str) -> None:
+    """Clear the claim of a file run on the blocks it leaves pending.
+
+    Used for interrupted chunks and transient errors, so the continuation or
+    retry can claim them again. Never raises: a claim that cannot be cleared
+    lapses after FILE_LOD_CLAIM_TTL_SECONDS.
+
+    Args:
+        block_ids: UUIDs of the blocks (claims of other runs are kept)
+        claim_token: Identifier the run claimed them with
+    """
+    if not block_ids:
+        return
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE blocks
+                SET lod_claimed_by = NULL, lod_claimed_at = NULL
+                WHERE id = ANY(%s::uuid[])
+                  AND lod_claimed_by = %s
+                """,
+                (list(block_ids), claim_token)
+            )
+            conn.commit()
+        logger.info("release_lod_claims.success", blocks=len(block_ids))
+    except Exception as e:
+        logger.warning("release_lod_claims.failed", blocks=len(block_ids), error=str(e))
+
+
+def _fetch_rebuild_blocks(block_ids: list[str]) -> list[dict]:
+    """LOD columns of blocks to rebuild (rebuild_lod_levels), as planner rows.
+
+    Args:
+        block_ids: UUIDs of the blocks (archived ones are left out)
+
+    Returns:
+        List of dicts with id, iso_code, url_original, high/mid/low_poly_url,
+        mtl_url, lod_container and lod_build
+    """
+    columns = ('id', 'iso_code', 'url_original', 'high_poly_url', 'mid_poly_url', 'low_poly_url',
+               'mtl_url', 'lod_container', 'lod_build')
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT {', '.join(columns)} FROM blocks
+            WHERE id = ANY(%s::uuid[])
+              AND is_archived = false
+            ORDER BY iso_code
+            """,
+            (list(block_ids),)
+        )
+        rows = [dict(zip(columns, row), id=str(row[0])) for row in cursor.fetchall()]
+
+    logger.info("fetch_rebuild_blocks.success", requested=len(block_ids), found=len(rows))
+    return rows
+
+
 def _download_3dm_from_s3(url: str, local_path: str) -> None:
     """
     Download .3dm file from Supabase Storage (primary) or HTTP URL (fallback).
@@ -212,6 +450,13 @@ def _download_3dm_from_s3(url: str, local_path: str) -> None:
     Treats `url` as a Supabase storage key first (e.g. 'uploads/{id}/file.3dm').
     Falls back to HTTP requests for full URLs, then to s3_client mock for tests.
 
+    Both paths go through the worker's disk cache (ModelCacheService): an
+    unchanged object (same key, size and ETag) is not downloaded again, and
+    `local_path` is a hard link to the cache entry. Misses are streamed to
+    disk (StreamingDownloadService): the object is never held in memory as a
+    whole, MAX_3DM_FILE_SIZE_MB is enforced while bytes arrive and large
+    objects are fetched as parallel range requests.
+
     Args:
         url: Supabase storage key or HTTP URL of the .3dm file
         local_path: Local filesystem path where file will be saved
@@ -220,23 +465,16 @@ def _download_3dm_from_s3(url: str, local_path: str) -> None:
         FileNotFoundError: If download fails from all sources
         ValueError: If file exceeds MAX_3DM_FILE_SIZE_MB
     """
+    model_cache = get_model_cache()
+
     # Primary: Supabase storage client (handles storage paths like 'uploads/...')
     try:
         supabase = get_supabase_client()
-        content = supabase.storage.from_(RAW_UPLOADS_BUCKET).download(url)
-
-        # isinstance check distinguishes real bytes from test mocks (MagicMock)
-        if isinstance(content, (bytes, bytearray)) and len(content) > 0:
-            file_size_mb = len(content) / (1024 * 1024)
-            if file_size_mb > MAX_3DM_FILE_SIZE_MB:
-                raise ValueError(
-                    f"File size {file_size_mb:.1f}MB exceeds limit {MAX_3DM_FILE_SIZE_MB}MB. "
-                    f"Possible zip bomb attack or corrupt file."
-                )
-            with open(local_path, 'wb') as f:
-                f.write(content)
-            logger.info("download_3dm.supabase_success", key=url, size_mb=f"{file_size_mb:.2f}")
-            return
+        cached = model_cache.fetch(supabase, url, bucket=RAW_UPLOADS_BUCKET)
+        model_cache.materialize(cached, local_path)
+        logger.info("download_3dm.supabase_success", key=url,
+                    size_mb=f"{cached.size / (1024 * 1024):.2f}", cache_hit=cached.disk_hit)
+        return
     except ValueError:
         raise  # Re-raise size validation errors
     except Exception as e:
@@ -249,33 +487,10 @@ def _download_3dm_from_s3(url: str, local_path: str) -> None:
 
     # Fallback: HTTP download (for full HTTPS URLs)
     try:
-        response = requests.head(url, timeout=10)
-        response.raise_for_status()
-
-        content_length = int(response.headers.get('Content-Length', 0))
-        size_mb = content_length / (1024 * 1024)
-        max_bytes = MAX_3DM_FILE_SIZE_MB * 1024 * 1024
-
-        if content_length > max_bytes:
-            error_msg = (
-                f"File size {size_mb:.1f}MB exceeds limit {MAX_3DM_FILE_SIZE_MB}MB. "
-                f"Possible zip bomb attack or corrupt file."
-            )
-            logger.error("download_3dm.size_exceeded", url=url, size_mb=size_mb)
-            raise ValueError(error_msg)
-
-    except requests.exceptions.RequestException as e:
-        logger.warning("download_3dm.head_request_failed", url=url, error=str(e))
-
-    try:
-        with requests.get(url, stream=True, timeout=300) as r:
-            r.raise_for_status()
-            with open(local_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+        model_cache.materialize(model_cache.fetch_url(url), local_path)
         logger.info("download_3dm.http_success", url=url, local_path=local_path)
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, FileNotFoundError) as e:
         logger.warning(
             "download_3dm.requests_failed_fallback",
             url=url,
@@ -299,7 +514,9 @@ def _parse_rhino_file(file_path: str, iso_code: str) -> rhino3dm.File3dm:
     Raises:
         ValueError: If file is corrupted or cannot be parsed
     """
-    rhino_file = rhino3dm.File3dm.Read(file_path)
+    # Parsed once per worker process (ModelCacheService): every block of a
+    # file reuses the same File3dm
+    rhino_file = get_model_cache().read_model(file_path, rhino3dm.File3dm.Read)
 
     if rhino_file is None:
         error_msg = ERROR_MSG_FAILED_PARSE_3DM.format(iso_code=iso_code)
@@ -347,51 +564,37 @@ def _extract_all_user_strings(rhino_file: rhino3dm.File3dm, block_id: str, iso_c
         }
     """
     all_user_strings = {}
-    
-    # Find the InstanceDefinition matching this ISO code
-    matched_idef = None
-    if hasattr(rhino_file, 'InstanceDefinitions') and rhino_file.InstanceDefinitions is not None:
-        for idef in rhino_file.InstanceDefinitions:
-            if idef.Name == iso_code:
-                matched_idef = idef
-                break
-    
-    # Extract UserStrings from InstanceReferences that point to this InstanceDefinition
-    instance_refs_checked = 0
-    if hasattr(rhino_file, 'Objects') and rhino_file.Objects is not None:
-        for obj in rhino_file.Objects:
-            try:
-                # Check if this is an InstanceReference
-                obj_type = getattr(obj.Geometry, 'ObjectType', None)
-                if obj_type != rhino3dm.ObjectType.InstanceReference:
-                    continue
-                
-                instance_refs_checked += 1
-                
-                # Check if this InstanceReference points to our InstanceDefinition
-                if matched_idef is not None:
-                    iref_geom = obj.Geometry
-                    # ParentIdefId is the UUID of the InstanceDefinition this instance references
-                    if hasattr(iref_geom, 'ParentIdefId'):
-                        if str(iref_geom.ParentIdefId).lower() != str(matched_idef.Id).lower():
-                            continue  # This instance belongs to a different block
-                
-                # Extract UserStrings from the InstanceReference's Attributes
-                if hasattr(obj, 'Attributes') and hasattr(obj.Attributes, 'GetUserStrings'):
-                    obj_strings = obj.Attributes.GetUserStrings()
-                    
-                    # rhino3dm.GetUserStrings() returns a tuple of (key, value) pairs
-                    if obj_strings is not None and isinstance(obj_strings, (tuple, list)):
-                        for key, value in obj_strings:
-                            # Store first occurrence of each key (skip duplicates)
-                            if key not in all_user_strings:
-                                all_user_strings[key] = value
-                                
-            except Exception as e:
-                logger.warning("extract_all_user_strings.instance_error",
-                             block_id=block_id,
-                             error=str(e))
-                continue
+
+    # InstanceReferences that point to the InstanceDefinition of this ISO code
+    # (all InstanceReferences if none matches), from the per-file object index
+    index = get_object_index(rhino_file)
+    idef_row = index.idef_by_name.get(iso_code)
+    if idef_row is not None:
+        reference_rows = index.reference_rows(idef_row)
+    else:
+        reference_rows = index.rows_of_type('InstanceReference')
+
+    objects = rhino_file.Objects
+    instance_refs_checked = len(reference_rows)
+    for row in reference_rows:
+        try:
+            obj = objects[int(row)]
+            # Extract UserStrings from the InstanceReference's Attributes
+            if hasattr(obj, 'Attributes') and hasattr(obj.Attributes, 'GetUserStrings'):
+                obj_strings = obj.Attributes.GetUserStrings()
+
+                # rhino3dm.GetUserStrings() returns a tuple of (key, value) pairs
+                if obj_strings is not None and isinstance(obj_strings, (tuple, list)):
+                    for key, value in obj_strings:
+                        # Store first occurrence of each key (skip duplicates)
+                        if key not in all_user_strings:
+                            all_user_strings[key] = value
+
+        except Exception as e:
+            logger.warning("extract_all_user_strings.instance_error",
+                         block_id=block_id,
+                         error=str(e))
+            continue
     
     # Log results
     if all_user_strings:
@@ -411,11 +614,169 @@ def _extract_all_user_strings(rhino_file: rhino3dm.File3dm, block_id: str, iso_c
     return all_user_strings
 
 
+_VERTEX_XYZ = attrgetter('X', 'Y', 'Z')
+
+
+def _mesh_vertices_to_array(vertices) -> np.ndarray:
+    """Bulk-convert a rhino3dm vertex table into a contiguous (N, 3) float64 array.
+
+    Streams the coordinates straight into NumPy with np.fromiter instead of
+    building one Python list per vertex. Elements are fetched by index:
+    MeshVertexList has no __iter__, so a for-loop goes through the slower
+    sequence-protocol fallback.
+
+    Args:
+        vertices: rhino3dm MeshVertexList (or any sequence of objects with .X/.Y/.Z)
+
+    Returns:
+        np.ndarray of shape (N, 3), dtype float64
+    """
+    count = len(vertices)
+    if count == 0:
+        return np.empty((0, 3), dtype=np.float64)
+    flat = np.fromiter(
+        itertools.chain.from_iterable(map(_VERTEX_XYZ, map(vertices.__getitem__, range(count)))),
+        dtype=np.float64,
+        count=count * 3,
+    )
+    return flat.reshape(count, 3)
+
+
+def _split_quad_faces(quad_table: np.ndarray) -> np.ndarray:
+    """Triangulate an (M, 4) rhino3dm face table with NumPy masks.
+
+    rhino3dm encodes triangles as (A, B, C, C) and quads as (A, B, C, D).
+    Each quad becomes (A, B, C) + (A, C, D), emitted right after each other so
+    the output order matches a face-by-face walk of the table.
+
+    Args:
+        quad_table: Integer array of shape (M, 4)
+
+    Returns:
+        np.ndarray of shape (M + n_quads, 3), dtype int32
+    """
+    is_quad = quad_table[:, 2] != quad_table[:, 3]
+    tris_per_face = 1 + is_quad.astype(np.int64)
+    first_tri = np.cumsum(tris_per_face) - tris_per_face
+
+    triangles = np.empty((int(tris_per_face.sum()), 3), dtype=np.int32)
+    triangles[first_tri] = quad_table[:, :3]
+    triangles[first_tri[is_quad] + 1] = quad_table[is_quad][:, [0, 2, 3]]
+    return triangles
+
+
+def _mesh_faces_to_array(faces) -> np.ndarray:
+    """Convert a rhino3dm face table into an (M, 3) int32 triangle array.
+
+    Fast path: real rhino3dm faces are 4-tuples, flattened with np.fromiter
+    and triangulated by _split_quad_faces. Unit-test mocks (objects with
+    .IsQuad/.A/.B/.C/.D) go through a per-face compatibility path.
+
+    Args:
+        faces: rhino3dm MeshFaceList, list of 4-tuples, or list of mock faces
+
+    Returns:
+        np.ndarray of shape (M, 3), dtype int32 (quads already split)
+    """
+    count = len(faces)
+    if count == 0:
+        return np.empty((0, 3), dtype=np.int32)
+
+    if isinstance(faces[0], tuple):
+        quad_table = np.fromiter(
+            itertools.chain.from_iterable(map(faces.__getitem__, range(count))),
+            dtype=np.int32,
+            count=count * 4,
+        ).reshape(count, 4)
+        return _split_quad_faces(quad_table)
+
+    # Mock format with .IsQuad attribute (unit tests only)
+    triangles = []
+    for face in faces:
+        triangles.append([face.A, face.B, face.C])
+        if face.IsQuad:
+            triangles.append([face.A, face.C, face.D])
+    return np.array(triangles, dtype=np.int32).reshape(-1, 3)
+
+
+@dataclass
+class BlockGeometry:
+    """Single-pass extraction result for one block.
+
+    Everything the LOD stage needs, produced by ONE walk of the object table
+    (each Brep render mesh fetched once): the merged mesh, the Rhino layer of
+    every merged face (aligned with mesh.faces), the world-space bbox and the
+    true mesh measures (compute_mesh_metrics, in meters). `unit_scale` is
+    the file's meters per model unit (model_unit_scale).
+    """
+    mesh: trimesh.Trimesh
+    face_layers: np.ndarray
+    original_faces_count: int
+    bbox: dict
+    matched_idef: object | None = None
+    idef_object_ids: set[str] | None = None
+    fingerprint: str | None = None
+    metrics: dict | None = None
+    unit_scale: float = DEFAULT_UNIT_SCALE
+
+
+def _layer_index(obj) -> int:
+    """Rhino layer index of an object (0 when unavailable, e.g. unit-test mocks)."""
+    layer_idx = getattr(obj.Attributes, 'LayerIndex', 0)
+    return layer_idx if isinstance(layer_idx, int) else 0
+
+
+def _geometry_fingerprint(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    face_layers: np.ndarray,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> str:
+    """Stable, placement-independent fingerprint of a block's geometry.
+
+    SHA-256 over the vertices relative to their bbox center, quantized to
+    GEOMETRY_FINGERPRINT_QUANTUM_MM, the triangle indices and the per-face
+    layer indices. InstanceDefinitions that differ only by a translation
+    (repeated dovelas) share a fingerprint, and float noise below the
+    quantum does not change it. The quantum is converted to model units
+    (unit_scale: meters per model unit), so the same block modelled in mm
+    or in m quantizes to the same integers.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    center = (vertices.min(axis=0) + vertices.max(axis=0)) / 2 if len(vertices) else 0.0
+    quantized = np.rint((vertices - center) / _fingerprint_quantum(unit_scale)).astype(np.int64)
+    digest = hashlib.sha256()
+    for array in (quantized, np.asarray(faces, dtype=np.int64), np.asarray(face_layers, dtype=np.int64)):
+        digest.update(str(array.shape).encode('ascii'))
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _fingerprint_quantum(unit_scale: float) -> float:
+    """GEOMETRY_FINGERPRINT_QUANTUM_MM in model units."""
+    return GEOMETRY_FINGERPRINT_QUANTUM_MM / 1000.0 / unit_scale
+
+
 def _extract_and_merge_meshes(
     rhino_file: rhino3dm.File3dm,
     block_id: str,
     iso_code: str
-) -> tuple[trimesh.Trimesh, int]:
+) -> tuple:
+    """Tuple view of _extract_block_geometry (kept for existing callers).
+
+    Returns:
+        Tuple of (merged_mesh, original_faces_count, bbox, matched_idef, idef_object_ids)
+    """
+    geometry = _extract_block_geometry(rhino_file, block_id, iso_code)
+    return (geometry.mesh, geometry.original_faces_count, geometry.bbox,
+            geometry.matched_idef, geometry.idef_object_ids)
+
+
+def _extract_block_geometry(
+    rhino_file: rhino3dm.File3dm,
+    block_id: str,
+    iso_code: str
+) -> BlockGeometry:
     """Extract meshes from preprocessed Rhino file using InstanceObject API.
 
     Expects .3dm files with ONLY InstanceObject architecture (ADR-001):
@@ -433,24 +794,20 @@ def _extract_and_merge_meshes(
         iso_code: ISO code of the block — must match InstanceDefinition.Name (Codi)
 
     Returns:
-        Tuple of (merged_mesh, original_faces_count, bbox, matched_idef, idef_object_ids)
+        BlockGeometry with merged mesh, per-face layer indices, face count, bbox,
+        matched InstanceDefinition, its object-id filter and the mesh metrics
 
     Raises:
         ValueError: If no valid meshes found (file not preprocessed or wrong file)
 
     Example:
-        mesh, face_count, bbox, idef, ids = _extract_and_merge_meshes(rhino_file, block_id, "GLPER.B-PAE0720.0102")
+        geometry = _extract_block_geometry(rhino_file, block_id, "GLPER.B-PAE0720.0102")
     """
-    # Phase 1: InstanceDefinition structure validation (ADR-001 API usage)
-    idef_count = len(rhino_file.InstanceDefinitions)
-    matched_idef = None
-
-    for idef in rhino_file.InstanceDefinitions:
-        logger.debug("extract_meshes.idef",
-                     name=idef.Name, id=str(idef.Id),
-                     object_ids=len(idef.GetObjectIds()))
-        if idef.Name == iso_code:
-            matched_idef = idef
+    # Phase 1: InstanceDefinition structure validation (ADR-001 API usage).
+    # The object index is built once per parsed file and shared by every block.
+    index = get_object_index(rhino_file)
+    idef_row = index.idef_by_name.get(iso_code)
+    matched_idef = rhino_file.InstanceDefinitions[idef_row] if idef_row is not None else None
 
     if matched_idef:
         logger.info("extract_meshes.idef_matched",
@@ -459,109 +816,89 @@ def _extract_and_merge_meshes(
     else:
         logger.warning("extract_meshes.idef_not_matched",
                        block_id=block_id, iso_code=iso_code,
-                       available=[idef.Name for idef in rhino_file.InstanceDefinitions])
+                       available=index.idef_names)
 
-    iref_count = sum(
-        1 for obj in rhino_file.Objects
-        if getattr(obj.Geometry, 'ObjectType', None) == rhino3dm.ObjectType.InstanceReference
-    )
     logger.info("extract_meshes.file_structure",
                 block_id=block_id, iso_code=iso_code,
-                instance_definitions=idef_count,
-                instance_references=iref_count)
+                instance_definitions=len(index.idef_names),
+                instance_references=len(index.rows_of_type('InstanceReference')))
 
     # Phase 2: Extract Mesh objects (POC pattern — export_gltf_draco.py:73–122)
     # rhino3dm's object table exposes Meshes embedded inside InstanceDefinitions
     # when iterating file3dm.Objects alongside the InstanceReferences.
     #
     # InstanceDefinition filter: each block maps 1-to-1 to one InstanceDefinition
-    # (iso_code == idef.Name). Only process objects whose ID is listed in that
+    # (iso_code == idef.Name). Only process the object rows listed in that
     # InstanceDefinition's object table so each GLB contains only its own geometry.
     # Fallback: if no InstanceDefinition matched (unit tests, standalone geometry),
     # skip the filter and process all objects.
     if matched_idef:
-        idef_object_ids = set(str(oid).lower() for oid in matched_idef.GetObjectIds())
+        object_rows = index.idef_object_rows[idef_row]
+        idef_object_ids = {index.object_ids[row] for row in object_rows}
         logger.info("extract_meshes.idef_filter_active",
                     block_id=block_id, iso_code=iso_code,
                     object_ids_count=len(idef_object_ids))
     else:
+        object_rows = range(index.object_count)
         idef_object_ids = None  # No filter — process all objects
 
     all_vertices = []
     all_faces = []
+    all_face_layers = []
     vertex_offset = 0
     original_faces_count = 0
     mesh_count = 0
     brep_count = 0
 
-    # Collect mesh geometries to process:
+    # Collect (layer_index, mesh geometry) pairs to process:
     # - Direct Mesh objects (preprocessed files)
     # - Render meshes attached to Brep objects (raw files saved from Rhino)
     meshes_to_process = []
 
-    for obj in rhino_file.Objects:
-        # Skip objects that don't belong to the matched InstanceDefinition
-        if idef_object_ids is not None:
-            if str(obj.Attributes.Id).lower() not in idef_object_ids:
-                continue
-
+    objects = rhino_file.Objects
+    instance_reference = rhino3dm.ObjectType.InstanceReference
+    for row in object_rows:
+        obj = objects[int(row)]
         geom = obj.Geometry
         obj_type = getattr(geom, 'ObjectType', None)
 
         # Skip InstanceReferences (scene placement objects, not geometry)
-        if obj_type == rhino3dm.ObjectType.InstanceReference:
+        if obj_type == instance_reference:
             continue
 
         # Primary: isinstance check for real rhino3dm objects (POC pattern)
         # Fallback: ObjectType comparison for unit test MagicMocks (ObjectType=32)
         is_mesh = isinstance(geom, rhino3dm.Mesh) or obj_type == rhino3dm.ObjectType.Mesh
         if is_mesh:
-            meshes_to_process.append(geom)
+            meshes_to_process.append((_layer_index(obj), geom))
         elif obj_type == rhino3dm.ObjectType.Brep:
             brep_count += 1
+            layer_idx = _layer_index(obj)
             # BrepFace.GetMesh(Render) returns the render mesh attached to each
             # face — pre-computed by Rhino when the file was saved.
             # This avoids requiring _Mesh preprocessing before upload.
             for brep_face in geom.Faces:
                 mesh = brep_face.GetMesh(rhino3dm.MeshType.Render)
                 if mesh is not None:
-                    meshes_to_process.append(mesh)
+                    meshes_to_process.append((layer_idx, mesh))
 
     if brep_count > 0:
         logger.info("extract_meshes.breps_with_render_mesh",
                     block_id=block_id, iso_code=iso_code,
                     brep_count=brep_count, meshes_from_breps=len(meshes_to_process))
 
-    # Process all collected mesh geometries
-    for geom in meshes_to_process:
+    # Process all collected mesh geometries (bulk NumPy conversion per mesh)
+    for layer_idx, geom in meshes_to_process:
         mesh_count += 1
-        vertices = np.array([[v.X, v.Y, v.Z] for v in geom.Vertices])
+        vertices = _mesh_vertices_to_array(geom.Vertices)
         if len(vertices) == 0:
             continue
 
-        # Extract faces: rhino3dm returns 4-tuples — (A,B,C,C) for triangles, (A,B,C,D) for quads
-        # Unit test mocks use objects with .IsQuad, .A, .B, .C, .D attributes
-        for face in geom.Faces:
-            if isinstance(face, tuple):
-                a, b, c, d = face
-                if c == d:
-                    # Triangle (degenerate quad with C repeated)
-                    all_faces.append([a + vertex_offset, b + vertex_offset, c + vertex_offset])
-                    original_faces_count += 1
-                else:
-                    # Quad: split into 2 triangles (A,B,C) + (A,C,D)
-                    all_faces.append([a + vertex_offset, b + vertex_offset, c + vertex_offset])
-                    all_faces.append([a + vertex_offset, c + vertex_offset, d + vertex_offset])
-                    original_faces_count += 2
-            else:
-                # Mock format with .IsQuad attribute (unit tests only)
-                if face.IsQuad:
-                    all_faces.append([face.A + vertex_offset, face.B + vertex_offset, face.C + vertex_offset])
-                    all_faces.append([face.A + vertex_offset, face.C + vertex_offset, face.D + vertex_offset])
-                    original_faces_count += 2
-                else:
-                    all_faces.append([face.A + vertex_offset, face.B + vertex_offset, face.C + vertex_offset])
-                    original_faces_count += 1
+        # Faces: quads split into 2 triangles, offset into the merged vertex table
+        faces = _mesh_faces_to_array(geom.Faces)
+        all_faces.append(faces + vertex_offset)
+        all_face_layers.append(np.full(len(faces), layer_idx, dtype=np.int32))
+        original_faces_count += len(faces)
 
         all_vertices.append(vertices)
         vertex_offset += len(vertices)
@@ -573,13 +910,22 @@ def _extract_and_merge_meshes(
 
     # Merge into single trimesh
     combined_vertices = np.vstack(all_vertices)
-    combined_faces = np.array(all_faces)
+    combined_faces = np.vstack(all_faces)
+    face_layers = np.concatenate(all_face_layers)
+
+    # Drop faces touching non-finite vertices up front: trimesh would remove
+    # them during process=True and break the face ↔ face_layers alignment.
+    # process=True otherwise only merges vertices (face order is preserved).
+    finite_faces = np.isfinite(combined_vertices).all(axis=1)[combined_faces].all(axis=1)
+    if not finite_faces.all():
+        combined_faces = combined_faces[finite_faces]
+        face_layers = face_layers[finite_faces]
     merged_mesh = trimesh.Trimesh(vertices=combined_vertices, faces=combined_faces, process=True)
 
     # Keep geometry in Rhino world-space coordinates (absolute building position).
     # This creates a true digital twin where parts maintain their real spatial relationships.
     # The frontend will render them at their actual building positions.
-    # Z-up → Y-up rotation is applied on frontend during OBJ rendering (see _export_and_upload_obj).
+    # Z-up → Y-up rotation is applied on frontend during OBJ rendering (see _serialize_lod_asset).
     centroid = merged_mesh.centroid.copy()
     logger.info("extract_meshes.absolute_coords",
                 block_id=block_id, iso_code=iso_code,
@@ -607,7 +953,19 @@ def _extract_and_merge_meshes(
                 actual_faces=len(merged_mesh.faces),
                 vertices=len(merged_mesh.vertices))
 
-    return merged_mesh, original_faces_count, bbox, matched_idef, idef_object_ids
+    unit_scale = model_unit_scale(rhino_file)
+    return BlockGeometry(
+        mesh=merged_mesh,
+        face_layers=face_layers,
+        original_faces_count=original_faces_count,
+        bbox=bbox,
+        matched_idef=matched_idef,
+        idef_object_ids=idef_object_ids,
+        fingerprint=_geometry_fingerprint(merged_mesh.vertices, merged_mesh.faces, face_layers, unit_scale),
+        # Volume / area / OBB while the merged arrays are in memory (blocks.mesh_* columns)
+        metrics=compute_mesh_metrics(merged_mesh.vertices, merged_mesh.faces, unit_scale),
+        unit_scale=unit_scale,
+    )
 
 
 def _apply_decimation(
@@ -615,11 +973,11 @@ def _apply_decimation(
     target_faces: int,
     block_id: str
 ) -> tuple[trimesh.Trimesh, int]:
-    """Apply quadric decimation to reduce mesh complexity.
+    """Reduce mesh complexity to at most `target_faces` faces.
 
-    Uses trimesh's quadric decimation algorithm (via open3d backend) to reduce
-    face count while preserving overall shape. Skips decimation if mesh is
-    already below target. Falls back to original mesh if decimation fails.
+    Single-level primitive, see LODDecimationService / decimate_to_target.
+    Skips decimation if mesh is already below target; quadric decimation,
+    with vertex clustering for oversized inputs or when quadric fails.
 
     Args:
         mesh: Input trimesh mesh
@@ -632,48 +990,16 @@ def _apply_decimation(
     Example:
         decimated_mesh, face_count = _apply_decimation(mesh, 1000, block_id)
     """
-    actual_faces = len(mesh.faces)
-
-    if actual_faces <= target_faces:
-        logger.info("decimation.skipped",
-                   block_id=block_id,
-                   faces=actual_faces,
-                   target=target_faces)
-        return mesh, actual_faces
-
-    logger.info("decimation.attempt",
-               block_id=block_id,
-               target=target_faces,
-               is_watertight=mesh.is_watertight,
-               is_volume=mesh.is_volume,
-               euler_number=mesh.euler_number)
-
-    try:
-        decimated_mesh = mesh.simplify_quadric_decimation(target_faces)
-        decimated_faces_count = len(decimated_mesh.faces)
-
-        if decimated_faces_count == actual_faces:
-            logger.warning("decimation.failed",
-                         block_id=block_id,
-                         reason="Mesh geometry not suitable for quadric decimation")
-        else:
-            logger.info("decimation.success",
-                       block_id=block_id,
-                       original=actual_faces,
-                       decimated=decimated_faces_count)
-
-        return decimated_mesh, decimated_faces_count
-
-    except Exception as e:
-        logger.error("decimation.error", block_id=block_id, error=str(e))
-        # Fall back to non-decimated mesh
-        return mesh, actual_faces
+    decimated_mesh, face_count, _ = decimate_to_target(mesh, target_faces, block_id)
+    return decimated_mesh, face_count
 
 
 def _apply_draco_compression(input_path: str, output_path: str) -> bool:
     """Apply Draco compression to GLB via gltf-pipeline CLI (Node.js).
 
     Mirrors POC: poc/formats-comparison/exporters/export_gltf_draco.py:166-207
+    Legacy file-to-file helper: LOD assets are compressed in-process by
+    GLBExportService (LOD_GLB_COMPRESSION='draco') without a subprocess.
 
     Falls back to copying the uncompressed file if gltf-pipeline is not
     available (dev environments without Node.js installed).
@@ -803,64 +1129,29 @@ def _validate_layer_colors(
     return True
 
 
-def _build_layer_face_groups(
-    rhino_file: rhino3dm.File3dm,
-    matched_idef,
-    idef_object_ids,
-) -> list[tuple[int, list]]:
-    """Collect (layer_index, mesh_geometry) pairs for a matched InstanceDefinition.
-
-    Iterates the same objects as _extract_and_merge_meshes but records the
-    LayerIndex of each mesh so we can later group faces per layer.
-
-    Args:
-        rhino_file: Parsed rhino3dm File3dm
-        matched_idef: The InstanceDefinition object matched to this block
-        idef_object_ids: Set of lowercase object ID strings (filter), or None for all
-
-    Returns:
-        List of (layer_index, rhino_mesh_geometry) pairs in mesh order.
-    """
-    pairs = []
-    for obj in rhino_file.Objects:
-        if idef_object_ids is not None:
-            if str(obj.Attributes.Id).lower() not in idef_object_ids:
-                continue
-        geom = obj.Geometry
-        obj_type = getattr(geom, 'ObjectType', None)
-        if obj_type == rhino3dm.ObjectType.InstanceReference:
-            continue
-        layer_idx = getattr(obj.Attributes, 'LayerIndex', 0)
-        is_mesh = isinstance(geom, rhino3dm.Mesh) or obj_type == rhino3dm.ObjectType.Mesh
-        if is_mesh:
-            pairs.append((layer_idx, geom))
-        elif obj_type == rhino3dm.ObjectType.Brep:
-            for brep_face in geom.Faces:
-                mesh = brep_face.GetMesh(rhino3dm.MeshType.Render)
-                if mesh is not None:
-                    pairs.append((layer_idx, mesh))
-    return pairs
-
-
 def _generate_obj_mtl_with_layers(
-    mesh_pairs: list[tuple[int, object]],
+    mesh: trimesh.Trimesh,
+    face_layers: np.ndarray,
     layer_colors: dict[int, tuple[int, int, int]],
     block_id: str,
     layer_names: dict[int, str] | None = None,
 ) -> tuple[str, str]:
-    """Serialise per-layer OBJ + MTL content strings.
+    """Serialise per-layer OBJ + MTL content strings from merged arrays.
 
-    Creates an OBJ file with `usemtl <layer_name>` groups and a companion MTL
-    file that assigns the Rhino layer color (`Kd R G B`) to each material.
-    Material names use the actual Rhino layer name (spaces → _) when
-    layer_names is provided, falling back to `layer_N` otherwise.
+    Creates an OBJ file with one `usemtl <layer_name>` group per Rhino layer
+    and a companion MTL file that assigns the Rhino layer color (`Kd R G B`)
+    to each material. Material names use the actual Rhino layer name
+    (spaces → _) when layer_names is provided, falling back to `layer_N`.
+    Layers appear in the order their first face appears in the mesh.
 
+    Vertices and faces are written in bulk (np.savetxt) straight from the
+    BlockGeometry arrays — no second walk over the Rhino object table.
     The OBJ keeps all vertices in world-space (Rhino Z-up absolute coords).
     The frontend applies Z→Y rotation just as it does for the monolithic OBJ.
 
     Args:
-        mesh_pairs: List of (layer_index, rhino_mesh_geometry) as returned by
-                    _build_layer_face_groups.
+        mesh: Merged block mesh (BlockGeometry.mesh)
+        face_layers: Rhino layer index per face, aligned with mesh.faces
         layer_colors: Dict of layer_index → (R, G, B) 0-255 tuples.
         block_id: UUID for MTL material name disambiguation.
         layer_names: Optional dict of layer_index → sanitised layer name string.
@@ -869,185 +1160,414 @@ def _generate_obj_mtl_with_layers(
         Tuple of (obj_content_str, mtl_content_str)
     """
     mtl_filename = f"{block_id}.mtl"
-
-    obj_lines = [f"mtllib {mtl_filename}"]
     mtl_lines = ["# Rhino layer colors — generated by SF-PM geometry pipeline"]
 
-    seen_layers: set[int] = set()
-    global_vertex_offset = 0
+    buffer = io.StringIO()
+    buffer.write(f"mtllib {mtl_filename}\n")
+    np.savetxt(buffer, mesh.vertices, fmt="v %.6f %.6f %.6f")
 
-    for layer_idx, geom in mesh_pairs:
+    # Group faces per layer (stable sort keeps the original order inside a layer)
+    unique_layers, first_seen = np.unique(face_layers, return_index=True)
+    layer_order = unique_layers[np.argsort(first_seen)]
+    obj_faces = np.asarray(mesh.faces) + 1  # OBJ is 1-indexed
+
+    for layer_idx in layer_order.tolist():
         mat_name = (layer_names or {}).get(layer_idx) or f"layer_{layer_idx}"
+        r, g, b = layer_colors.get(layer_idx, (200, 200, 200))
+        kd_r, kd_g, kd_b = r / 255.0, g / 255.0, b / 255.0
+        mtl_lines += [
+            f"newmtl {mat_name}",
+            "illum 2",
+            f"Kd {kd_r:.4f} {kd_g:.4f} {kd_b:.4f}",
+            "Ka 0.0000 0.0000 0.0000",
+            "Ks 0.1000 0.1000 0.1000",
+            "Ns 10.0000",
+            "",
+        ]
 
-        # Register material in MTL (once per unique layer)
-        if layer_idx not in seen_layers:
-            seen_layers.add(layer_idx)
-            r, g, b = layer_colors.get(layer_idx, (200, 200, 200))
-            kd_r, kd_g, kd_b = r / 255.0, g / 255.0, b / 255.0
-            mtl_lines += [
-                f"newmtl {mat_name}",
-                "illum 2",
-                f"Kd {kd_r:.4f} {kd_g:.4f} {kd_b:.4f}",
-                "Ka 0.0000 0.0000 0.0000",
-                "Ks 0.1000 0.1000 0.1000",
-                "Ns 10.0000",
-                "",
-            ]
-
-        # Write vertices for this mesh chunk
-        vertices = [[v.X, v.Y, v.Z] for v in geom.Vertices]
-        if not vertices:
-            continue
-        for vx, vy, vz in vertices:
-            obj_lines.append(f"v {vx:.6f} {vy:.6f} {vz:.6f}")
-
-        # Switch material group
-        obj_lines += [f"usemtl {mat_name}", "g"]
-
-        # Write faces (OBJ is 1-indexed)
-        for face in geom.Faces:
-            if isinstance(face, tuple):
-                a, b, c, d = face
-                a1 = a + global_vertex_offset + 1
-                b1 = b + global_vertex_offset + 1
-                c1 = c + global_vertex_offset + 1
-                d1 = d + global_vertex_offset + 1
-                if c == d:
-                    obj_lines.append(f"f {a1} {b1} {c1}")
-                else:
-                    obj_lines.append(f"f {a1} {b1} {c1}")
-                    obj_lines.append(f"f {a1} {c1} {d1}")
-            else:
-                # Mock format (unit tests)
-                a1 = face.A + global_vertex_offset + 1
-                b1 = face.B + global_vertex_offset + 1
-                c1 = face.C + global_vertex_offset + 1
-                if face.IsQuad:
-                    d1 = face.D + global_vertex_offset + 1
-                    obj_lines.append(f"f {a1} {b1} {c1}")
-                    obj_lines.append(f"f {a1} {c1} {d1}")
-                else:
-                    obj_lines.append(f"f {a1} {b1} {c1}")
+        buffer.write(f"usemtl {mat_name}\ng\n")
+        np.savetxt(buffer, obj_faces[face_layers == layer_idx], fmt="f %d %d %d")
 
-        global_vertex_offset += len(vertices)
+    return buffer.getvalue().rstrip("\n"), "\n".join(mtl_lines)
 
-    return "\n".join(obj_lines), "\n".join(mtl_lines)
 
+def _lod_asset_key(asset_id: str, lod_level: str, asset_format: str) -> str:
+    """Storage key of one LOD asset, e.g. 'mid-poly/<fingerprint>/<variant>.glb'."""
+    return f"{LOD_PREFIXES[lod_level]}{asset_id}.{asset_format}"
 
-def _upload_mtl_file(mtl_content: str, block_id: str) -> str:
-    """Upload MTL companion file to Supabase Storage.
 
-    Args:
-        mtl_content: String content of the .mtl file
-        block_id: UUID used as the storage key
+def _storage_key(url: str) -> str:
+    """Storage key of a public PROCESSED_GEOMETRY_BUCKET URL."""
+    return url.split(f"{PROCESSED_GEOMETRY_BUCKET}/", 1)[-1].split('?', 1)[0]
 
-    Returns:
-        Public URL of the uploaded MTL file (trailing '?' stripped)
-    """
-    supabase = get_supabase_client()
-    mtl_key = f"{MATERIALS_PREFIX}{block_id}.mtl"
-    supabase.storage.from_(PROCESSED_GEOMETRY_BUCKET).upload(
-        mtl_key,
-        mtl_content.encode('utf-8'),
-        {'content-type': 'model/mtl', 'upsert': 'true'}
-    )
-    public_url = supabase.storage.from_(PROCESSED_GEOMETRY_BUCKET).get_public_url(mtl_key)
-    return public_url.rstrip('?')
 
+class LODAssetUploader:
+    """
+    Concurrent uploads of in-memory LOD assets to PROCESSED_GEOMETRY_BUCKET.
+
+    Assets are submitted as soon as they are serialized and uploaded by a
+    bounded thread pool (LOD_UPLOAD_MAX_WORKERS); each object is retried on
+    its own (LOD_UPLOAD_MAX_ATTEMPTS, exponential backoff) with upsert, so a
+    retry never duplicates content. Public URLs are derived locally from the
+    key, so callers get them without waiting for the upload: the upload
+    phase of a block (or of a whole file batch) costs about one round trip.
+
+    Any object with the storage bucket's upload/get_public_url can stand in
+    for PROCESSED_GEOMETRY_BUCKET (e.g. LocalAssetBucket, local bulk runs).
+
+    Usage:
+        with LODAssetUploader() as uploader:
+            url = uploader.submit(block_id, key, data, content_type)
+            ...
+            failed = uploader.wait()  # {block_id: first upload error}
+    """
 
-def _export_and_upload_obj(
+    def __init__(self, max_workers: int = LOD_UPLOAD_MAX_WORKERS, bucket=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lod-upload")
+        self._bucket = bucket
+        self._futures: dict[str, list[tuple[str, Future]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def bucket(self):
+        if self._bucket is None:
+            self._bucket = get_supabase_client().storage.from_(PROCESSED_GEOMETRY_BUCKET)
+        return self._bucket
+
+    def submit(self, block_id: str, key: str, data: bytes, content_type: str) -> str:
+        """Queue one upload and return its public URL (trailing '?' stripped)."""
+        bucket = self.bucket
+        future = self._executor.submit(self._upload_with_retry, bucket, key, data, content_type)
+        self._futures.setdefault(block_id, []).append((key, future))
+        # BUG FIX: Remove trailing '?' from Supabase URLs (causes issues with OBJLoader)
+        # Supabase client appends '?' for cache busting, but some loaders don't handle it well
+        return bucket.get_public_url(key).rstrip('?')
+
+    @staticmethod
+    def _upload_with_retry(bucket, key: str, data: bytes, content_type: str) -> None:
+        for attempt in range(1, LOD_UPLOAD_MAX_ATTEMPTS + 1):
+            try:
+                bucket.upload(key, data, {'content-type': content_type, 'upsert': 'true'})
+                logger.info("lod_upload.success", key=key, size_kb=len(data) // 1024, attempt=attempt)
+                return
+            except Exception as e:
+                if attempt == LOD_UPLOAD_MAX_ATTEMPTS:
+                    raise
+                delay = LOD_UPLOAD_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1))
+                logger.warning("lod_upload.retry", key=key, attempt=attempt,
+                               delay_seconds=delay, error=str(e))
+                time.sleep(delay)
+
+    def wait(self) -> dict[str, Exception]:
+        """Block until every submitted upload finished.
+
+        Returns:
+            {block_id: first upload error} for blocks with a failed asset
+        """
+        failed = {}
+        for block_id, entries in self._futures.items():
+            for key, future in entries:
+                error = future.exception()
+                if error is not None and block_id not in failed:
+                    logger.error("lod_upload.failed", block_id=block_id, key=key, error=str(error))
+                    failed[block_id] = error
+        self._futures.clear()
+        return failed
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+def _serialize_lod_asset(
     mesh: trimesh.Trimesh,
     block_id: str,
-    lod_level: str = 'low'
-) -> tuple[str, int]:
-    """Export mesh to OBJ format and upload to Supabase storage.
+    lod_level: str,
+    origin=None,
+) -> tuple[str, bytes]:
+    """Serialize one LOD level in memory in the configured LOD_ASSET_FORMAT.
 
-    OBJ format chosen because trimesh GLB export has persistent bugs (collapses geometry).
-    Tested versions: 4.0.5, 4.11.3 - both fail to export valid GLBs.
+    - 'glb' (default): GLBExportService, positions local to `origin` (world
+      offset in the node translation), so the viewer places the block exactly
+      where the absolute-coordinate OBJ did.
+    - 'obj' (legacy): text OBJ with ABSOLUTE RHINO COORDINATES in Z-up.
+      Written by trimesh; its GLB exporter collapsed geometry in 4.0.5 and
+      4.11.3, which is why GLB goes through GLBExportService instead.
 
-    Pipeline:
-    1. Export to OBJ format (preserves Rhino Z-up absolute coordinates)
-    2. Upload to Supabase Storage (high-poly/, mid-poly/, or low-poly/ prefix)
-    3. Return public URL and file size
+    Either way the frontend applies the Z→Y rotation via Three.js.
 
     Args:
-        mesh: Trimesh mesh to export (in Rhino Z-up coordinates with absolute position)
-        block_id: UUID of the block (used in storage key)
-        lod_level: LOD level ('high', 'mid', or 'low') for storage path/naming
+        mesh: Trimesh mesh to export (Rhino Z-up, absolute coordinates)
+        block_id: UUID of the block (for logging)
+        lod_level: LOD level ('high', 'mid', or 'low')
+        origin: World offset shared by all LOD levels (default: mesh bbox center)
 
     Returns:
-        Tuple of (public_url, file_size_kb)
+        Tuple of (asset_format, data)
+    """
+    if LOD_ASSET_FORMAT not in LOD_ASSET_FORMATS:
+        raise ValueError(
+            f"Unknown LOD asset format '{LOD_ASSET_FORMAT}' (expected one of {LOD_ASSET_FORMATS})"
+        )
 
-    Example:
-        url, size = _export_and_upload_obj(mesh, "123e4567-e89b-12d3-a456-426614174000", "high")
+    if LOD_ASSET_FORMAT == 'obj':
+        data = mesh.export(file_type='obj').encode('utf-8')
+        logger.info("export_obj.success",
+                    block_id=block_id,
+                    lod_level=lod_level,
+                    file_size_kb=len(data) // 1024,
+                    vertices=len(mesh.vertices))
+        return 'obj', data
+
+    asset = GLBExportService().encode(mesh, origin=origin)
+    logger.info("export_glb.success",
+                block_id=block_id,
+                lod_level=lod_level,
+                file_size_kb=asset.size_kb,
+                vertices=asset.vertices,
+                faces=asset.faces,
+                quantized=asset.quantized,
+                compression=asset.compression,
+                origin=asset.origin)
+    return 'glb', asset.data
+
+
+def _layer_palette(rhino_file: rhino3dm.File3dm) -> tuple[dict[int, tuple[int, int, int]], dict[int, str]]:
+    """(layer colors, layer names) of a file: everything the per-layer MTL needs from rhino3dm."""
+    return _extract_layer_colors(rhino_file), _extract_layer_names(rhino_file)
+
+
+def _build_layered_high_poly(
+    merged_mesh: trimesh.Trimesh,
+    face_layers: np.ndarray,
+    layer_palette: tuple[dict[int, tuple[int, int, int]], dict[int, str]],
+    block_id: str,
+    iso_code: str,
+) -> tuple[str, str] | None:
+    """Build the per-layer high-poly OBJ + MTL, or None when colors are unusable.
+
+    Args:
+        layer_palette: (layer_colors, layer_names) from _layer_palette
+
+    Returns:
+        Tuple of (obj_content, mtl_content), or None if layer colors are invalid
     """
-    # Export OBJ with ABSOLUTE RHINO COORDINATES in Z-up coordinate system
-    # OBJ format chosen because trimesh GLB export has persistent bugs (collapses geometry)
-    # Tested: trimesh 4.0.5, 4.11.3 - both fail to export valid GLBs
-    # Frontend applies Z→Y rotation via Three.js
-    
-    centroid = mesh.centroid.copy()
-    bounds = {"min": mesh.bounds[0].tolist(), "max": mesh.bounds[1].tolist()}
-    logger.info(
-        "export_obj.rhino_zup_absolute",
-        block_id=block_id,
-        lod_level=lod_level,
-        centroid_mm=centroid.tolist(),
-        bounds=bounds,
-        vertices=len(mesh.vertices),
-        message="Exporting OBJ in Rhino Z-up with absolute coordinates (no backend transforms)",
-    )
-    logger.info(
-        "export_obj.frontend_rotation_required",
-        block_id=block_id,
-        message="Frontend must apply Z→Y rotation via Three.js rotation prop",
+    layer_colors, layer_names = layer_palette
+    if not _validate_layer_colors(layer_colors, block_id, iso_code):
+        return None
+    return _generate_obj_mtl_with_layers(
+        merged_mesh, face_layers, layer_colors, block_id, layer_names
     )
 
-    # Export OBJ (simpler format than GLB, more robust with trimesh)
-    temp_obj_path = os.path.join(TEMP_DIR, f"{block_id}_{lod_level}.obj")
-    mesh.export(temp_obj_path, file_type='obj')
-
-    file_size_bytes = os.path.getsize(temp_obj_path)
-    file_size_kb = file_size_bytes // 1024
-    logger.info("export_obj.success",
-               block_id=block_id,
-               lod_level=lod_level,
-               file_size_kb=file_size_kb,
-               path=temp_obj_path)
-
-    # Upload to Supabase Storage with LOD-specific path
-    supabase = get_supabase_client()
-    obj_key = f"{LOD_PREFIXES[lod_level]}{block_id}.obj"
-
-    with open(temp_obj_path, 'rb') as f:
-        obj_data = f.read()
-
-    supabase.storage.from_(PROCESSED_GEOMETRY_BUCKET).upload(
-        obj_key,
-        obj_data,
-        {'content-type': 'model/obj', 'upsert': 'true'}
-    )
 
-    # Get public URL
-    public_url = supabase.storage.from_(PROCESSED_GEOMETRY_BUCKET).get_public_url(obj_key)
-    
-    # BUG FIX: Remove trailing '?' from Supabase URLs (causes issues with OBJLoader)
-    # Supabase client appends '?' for cache busting, but some loaders don't handle it well
-    public_url = public_url.rstrip('?')
+# ===== Content-addressed LOD reuse =====
+# Tier 1 (assets): Redis indexes '<fingerprint>/<variant>' (geometry + palette
+# + LOD settings, no placement) with a TTL. A block matching an entry at the
+# same placement only gets its URLs updated; a translated duplicate gets the
+# cached assets re-placed (_relocate_cached_lod) instead of re-decimated.
+# Assets are stored under '<prefix><fingerprint>/<variant>/<placement>'.
+# Tier 2 (decimation, per worker): translated duplicates (same fingerprint,
+# different placement) reuse the decimated mid/low arrays and only re-encode.
+_decimation_cache: OrderedDict = OrderedDict()
+_lod_cache_stats: Counter = Counter()
+
+
+def _lod_pipeline_signature() -> str:
+    """Settings that change LOD output; part of every LOD cache key.
+
+    Built from lod_level_params(), the same parameter set the rebuild
+    planner stamps, so a setting can never invalidate one and not the other.
+    """
+    return json.dumps(lod_level_params(), sort_keys=True)
+
+
+def _lod_cache_key(geometry: BlockGeometry, rhino_file: rhino3dm.File3dm) -> str:
+    """Content address of a block's LOD assets: '<fingerprint>/<variant>'.
+
+    Translation-invariant: the variant covers the palette of the block's
+    layers (drives the high-poly MTL) and the LOD pipeline settings, not
+    the world origin, so translated duplicates share one Redis entry.
+    """
+    used_layers = np.unique(geometry.face_layers).tolist()
+    layer_colors = _extract_layer_colors(rhino_file)
+    layer_names = _extract_layer_names(rhino_file)
+    palette = [(idx, layer_names.get(idx), layer_colors.get(idx)) for idx in used_layers]
+    variant = hashlib.sha256(
+        json.dumps([palette, _lod_pipeline_signature()], default=str).encode('utf-8')
+    ).hexdigest()[:16]
+    return f"{geometry.fingerprint}/{variant}"
+
+
+def _lod_asset_id(lod_cache_key: str, geometry: BlockGeometry) -> str:
+    """Storage name of a block's assets: '<lod_cache_key>/<placement>'.
+
+    Stored assets bake the placement (OBJ absolute coordinates, GLB node
+    translation), so each quantized world origin gets its own objects.
+    """
+    origin = np.rint(_asset_origin(geometry) / _fingerprint_quantum(geometry.unit_scale)).astype(np.int64)
+    placement = hashlib.sha256(json.dumps(origin.tolist()).encode('utf-8')).hexdigest()[:16]
+    return f"{lod_cache_key}/{placement}"
+
+
+def _asset_origin(geometry: BlockGeometry) -> np.ndarray:
+    """World origin of a block's GLB assets (bbox center, as in _encode_lod_assets)."""
+    bounds = np.asarray(geometry.mesh.bounds)
+    return (bounds[0] + bounds[1]) / 2
+
+
+def _record_lod_cache(event: str) -> None:
+    """Count a cache event (asset_hit/asset_miss/decimation_hit/decimation_miss)."""
+    _lod_cache_stats[event] += 1
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.hincrby(LOD_CACHE_STATS_KEY, event, 1)
+    except Exception as e:
+        logger.warning("lod_cache.stats_failed", counter=event, error=str(e))
+
+
+def get_lod_cache_stats() -> dict[str, int]:
+    """LOD cache hit/miss counters: fleet-wide from Redis, else this worker's."""
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            return {event: int(count) for event, count in redis_client.hgetall(LOD_CACHE_STATS_KEY).items()}
+        except Exception as e:
+            logger.warning("lod_cache.stats_failed", error=str(e))
+    return dict(_lod_cache_stats)
+
+
+def _lookup_lod_cache(lod_cache_key: str) -> dict | None:
+    """Stored lod_data of an identical block, or None (miss / Redis unavailable)."""
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return None
+    try:
+        cached = redis_client.get(f"{LOD_CACHE_KEY_PREFIX}{lod_cache_key}")
+    except Exception as e:
+        logger.warning("lod_cache.lookup_failed", key=lod_cache_key, error=str(e))
+        return None
+    return json.loads(cached) if cached else None
+
+
+def _store_lod_cache(lod_cache_key: str, lod_data: dict) -> None:
+    """Index uploaded assets under their content address (call once uploads succeeded)."""
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    entry = {k: lod_data.get(k) for k in (
+        'high_poly_url', 'mid_poly_url', 'low_poly_url', 'mtl_url', 'lod_container_url', 'lod_container',
+        'asset_format', 'asset_origin', 'file_sizes_kb', 'face_counts', 'lod_errors_mm',
+    )}
+    try:
+        redis_client.set(f"{LOD_CACHE_KEY_PREFIX}{lod_cache_key}", json.dumps(entry), ex=LOD_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("lod_cache.store_failed", key=lod_cache_key, error=str(e))
 
-    logger.info("upload_obj.success",
-               block_id=block_id,
-               lod_level=lod_level,
-               url=public_url,
-               key=obj_key)
 
-    # Cleanup temp file
+def _relocate_cached_lod(entry: dict, geometry: BlockGeometry, asset_id: str, block_id: str) -> dict | None:
+    """Cached lod_data of a translated duplicate, re-placed at `geometry`'s origin.
+
+    Downloads the entry's levels and moves them without decoding the
+    meshes: GLB node translation (GLBExportService.relocate), OBJ vertex
+    lines (_translate_obj). The container is repacked from the moved
+    levels and the MTL is reused as is. Uploads go under `asset_id`.
+
+    Returns:
+        lod_data with the new URLs and asset_origin, or None when the entry
+        can't be re-placed (caller falls back to a miss)
+    """
+    if entry.get('asset_origin') is None:
+        return None
+    origin = _asset_origin(geometry)
+    offset = origin - np.asarray(entry['asset_origin'], dtype=np.float64)
+    urls, assets = {}, []
     try:
-        os.remove(temp_obj_path)
+        with LODAssetUploader() as uploader:
+            for level in ('high', 'mid', 'low'):
+                url = entry[f'{level}_poly_url']
+                asset_format = url.split('?', 1)[0].rsplit('.', 1)[-1]
+                data = uploader.bucket.download(_storage_key(url))
+                if asset_format == 'glb':
+                    data = GLBExportService.relocate(data, origin)
+                else:
+                    data = _translate_obj(data, offset)
+                assets.append((level, asset_format, data))
+                _submit_lod_asset(uploader, urls, block_id, asset_id, level, asset_format, data)
+            container = None
+            if entry.get('lod_container'):
+                data, container = pack_lod_container(assets)
+                for level, chunk in container['levels'].items():
+                    chunk['faces'] = (entry['lod_container']['levels'].get(level) or {}).get('faces')
+                _submit_lod_asset(uploader, urls, block_id, asset_id, 'container', LOD_CONTAINER_FORMAT, data)
+            failed = uploader.wait()
+        if block_id in failed:
+            raise failed[block_id]
     except Exception as e:
-        logger.warning("cleanup.temp_obj_failed", block_id=block_id, lod_level=lod_level, error=str(e))
+        logger.warning("lod_cache.relocate_failed", block_id=block_id, asset_id=asset_id, error=str(e))
+        return None
+
+    logger.info("lod_cache.asset_relocated", block_id=block_id, asset_id=asset_id,
+                offset=offset.tolist())
+    return {**entry, **urls, 'asset_origin': origin.tolist(), 'lod_container': container}
+
+
+def _translate_obj(data: bytes, offset: np.ndarray) -> bytes:
+    """OBJ `data` with every vertex position moved by `offset` (other lines kept)."""
+    lines = data.split(b'\n')
+    for i, line in enumerate(lines):
+        if line.startswith(b'v '):
+            fields = line.split()
+            xyz = [float(value) + delta for value, delta in zip(fields[1:4], offset)]
+            lines[i] = b' '.join([b'v', *(b'%.6f' % value for value in xyz), *fields[4:]])
+    return b'\n'.join(lines)
+
+
+def _decimate_with_cache(
+    merged_mesh: trimesh.Trimesh,
+    targets: dict[str, int],
+    block_id: str,
+    fingerprint: str | None,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> tuple[dict[str, trimesh.Trimesh], dict]:
+    """LODDecimationService.generate, reusing levels of a same-fingerprint block.
 
-    return public_url, file_size_kb
+    Cached levels are stored relative to the source bbox center and moved to
+    this block's center, so translated duplicates skip decimation entirely.
+    """
+    bounds = np.asarray(merged_mesh.bounds)
+    center = (bounds[0] + bounds[1]) / 2
+    cache_key = (
+        (fingerprint, _lod_pipeline_signature(), json.dumps(targets, sort_keys=True), unit_scale)
+        if fingerprint else None
+    )
+
+    if cache_key is not None and cache_key in _decimation_cache:
+        _decimation_cache.move_to_end(cache_key)
+        levels, report = _decimation_cache[cache_key]
+        _record_lod_cache('decimation_hit')
+        logger.info("lod_cache.decimation_hit", block_id=block_id, fingerprint=fingerprint)
+        meshes = {
+            level: trimesh.Trimesh(vertices=local + center, faces=faces, process=False)
+            for level, (local, faces) in levels.items()
+        }
+        return meshes, {level: {**entry, 'source': 'cache'} for level, entry in report.items()}
+
+    decimated, report = LODDecimationService().generate(merged_mesh, targets, block_id, unit_scale)
+    if cache_key is not None:
+        _record_lod_cache('decimation_miss')
+        _decimation_cache[cache_key] = (
+            {level: (np.asarray(m.vertices) - center, np.asarray(m.faces)) for level, m in decimated.items()},
+            report,
+        )
+        while len(_decimation_cache) > LOD_DECIMATION_CACHE_SIZE:
+            _decimation_cache.popitem(last=False)
+    return decimated, report
 
 
 def _generate_lod_objs(
@@ -1055,132 +1575,395 @@ def _generate_lod_objs(
     block_id: str,
     rhino_file: rhino3dm.File3dm | None = None,
     matched_idef=None,
-    idef_object_ids=None,
+    face_layers: np.ndarray | None = None,
+    uploader: LODAssetUploader | None = None,
+    asset_id: str | None = None,
+    fingerprint: str | None = None,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
 ) -> dict:
-    """Generate 3-level LOD OBJ files (high/mid/low) from merged mesh.
+    """Generate 3-level LOD assets (high/mid/low) from merged mesh.
 
     US-015: Real LOD System Implementation
     
     Pipeline for each LOD level:
     1. High-poly: No decimation (original quality, ~5000-8000 faces)
-    2. Mid-poly: Moderate decimation to ~2000 faces (~70-80% reduction)
-    3. Low-poly: Aggressive decimation to ~500 faces (~90-95% reduction)
+    2. Mid-poly: Moderate decimation (LOD_ERROR_TOLERANCE_MM['mid'] budget,
+       or ~2000 faces with LOD_TARGET_MODE "fixed")
+    3. Low-poly: Aggressive decimation (LOD_ERROR_TOLERANCE_MM['low'] budget,
+       or ~500 faces with LOD_TARGET_MODE "fixed")
     
     Each mesh is:
-    - Exported to OBJ format (Z-up coordinates preserved)
-    - Frontend applies Z-up → Y-up rotation during rendering
-    - Uploaded to Supabase Storage (separate folders: high-poly/, mid-poly/, low-poly/)
+    - Exported as GLB (local-origin positions, world offset in the node
+      translation) or legacy OBJ, per LOD_ASSET_FORMAT. The per-layer
+      high-poly (OBJ + MTL) stays OBJ.
+    - Z-up coordinates preserved; frontend applies Z-up → Y-up rotation
+    - Serialized in memory and uploaded concurrently to Supabase Storage
+      (separate folders: high-poly/, mid-poly/, low-poly/)
     
     Args:
         merged_mesh: Original merged mesh from Rhino .3dm (in world coordinates)
         block_id: UUID of the block
-        
+        rhino_file: Parsed file (layer colors/names for the high-poly MTL)
+        matched_idef: InstanceDefinition of the block (MTL only when matched)
+        face_layers: Rhino layer index per face of merged_mesh (BlockGeometry)
+        uploader: Shared LODAssetUploader of a file batch. When given, uploads
+            are only queued and the caller must wait() before using the URLs;
+            otherwise a private uploader is drained before returning (an
+            upload that still fails after its retries is raised).
+        asset_id: Storage name of the assets (_lod_asset_id); defaults to block_id
+        fingerprint: Geometry fingerprint, enables decimation reuse across
+            translated duplicates (_decimate_with_cache)
+        unit_scale: Meters per model unit (BlockGeometry.unit_scale), for the
+            deviation_mm of the decimation report
+
     Returns:
         Dictionary with LOD URLs and metadata:
         {
             'high_poly_url': str,
             'mid_poly_url': str,
             'low_poly_url': str,
+            'mtl_url': str | None,
+            'lod_container_url': str | None,
+            'lod_container': {...} | None,  # chunk index, see pack_lod_container
+            'asset_format': 'glb' | 'obj',
+            'asset_origin': [x, y, z],  # world offset of the GLB local positions
             'file_sizes_kb': {'high': int, 'mid': int, 'low': int},
-            'face_counts': {'original': int, 'high': int, 'mid': int, 'low': int}
+            'face_counts': {'original': int, 'high': int, 'mid': int, 'low': int},
+            'lod_errors_mm': {'high': 0.0, 'mid': float, 'low': float},  # achieved deviation
+            'decimation_report': {'mid': {...}, 'low': {...}}  # see LODDecimationService
         }
-        
+
     Example:
         lod_data = _generate_lod_objs(mesh, "123e4567-e89b-12d3-a456-426614174000")
         # Returns URLs for all 3 LOD levels + metadata
     """
-    original_faces = len(merged_mesh.faces)
-    logger.info("lod_generation.start",
-                block_id=block_id,
-                original_faces=original_faces)
-    
-    results = {
-        'file_sizes_kb': {},
-        'face_counts': {'original': original_faces}
-    }
-    
-    # Level 1: High-Poly (no decimation)
-    logger.info("lod_generation.high_poly",
-                block_id=block_id,
-                target_faces="no decimation (original)")
-    
-    high_poly_mesh = merged_mesh.copy()  # Work with copy to preserve original
-    high_url, high_size = _export_and_upload_obj(high_poly_mesh, block_id, 'high')
-    results['high_poly_url'] = high_url
-    results['file_sizes_kb']['high'] = high_size
-    results['face_counts']['high'] = len(high_poly_mesh.faces)
-
-    # MTL companion for high-poly: per-face Rhino layer colors
-    # Generated ONLY for high-poly (decimation destroys face-to-layer mapping)
-    results['mtl_url'] = None
-    if rhino_file is not None and matched_idef is not None:
-        try:
-            layer_colors = _extract_layer_colors(rhino_file)
-            iso_code = matched_idef.Name if matched_idef else block_id
-            if _validate_layer_colors(layer_colors, block_id, iso_code):
-                mesh_pairs = _build_layer_face_groups(
-                    rhino_file, matched_idef, idef_object_ids
-                )
-                if mesh_pairs:
-                    layer_names = _extract_layer_names(rhino_file)
-                    obj_content, mtl_content = _generate_obj_mtl_with_layers(
-                        mesh_pairs, layer_colors, block_id, layer_names
-                    )
-                    # Upload the per-layer OBJ as the high-poly (overrides monolithic)
-                    supabase = get_supabase_client()
-                    obj_key = f"{LOD_PREFIXES['high']}{block_id}.obj"
-                    supabase.storage.from_(PROCESSED_GEOMETRY_BUCKET).upload(
-                        obj_key,
-                        obj_content.encode('utf-8'),
-                        {'content-type': 'model/obj', 'upsert': 'true'},
-                    )
-                    mtl_url = _upload_mtl_file(mtl_content, block_id)
-                    results['mtl_url'] = mtl_url
-                    logger.info(
-                        "lod_generation.mtl_generated",
-                        block_id=block_id,
-                        mtl_url=mtl_url,
-                        layer_count=len(set(li for li, _ in mesh_pairs)),
-                    )
-        except Exception as exc:
-            logger.warning(
-                "lod_generation.mtl_skipped",
-                block_id=block_id,
-                error=str(exc),
-                reason="MTL generation failed — fallback to material color in frontend",
-            )
+    # Every asset is serialized in memory and submitted right away; uploads run
+    # concurrently (LODAssetUploader) while the next levels are decimated. A
+    # caller-provided uploader (file batch) is drained by the caller instead.
+    own_uploader = uploader is None
+    if own_uploader:
+        uploader = LODAssetUploader()
+
+    layer_palette = None
+    if rhino_file is not None and matched_idef is not None and face_layers is not None:
+        layer_palette = _layer_palette(rhino_file)
+
+    results_urls = {}
+    try:
+        results, _ = _encode_lod_assets(
+            merged_mesh, block_id,
+            face_layers=face_layers,
+            layer_palette=layer_palette,
+            iso_code=matched_idef.Name if matched_idef is not None else None,
+            fingerprint=fingerprint,
+            on_asset=lambda level, asset_format, data: _submit_lod_asset(
+                uploader, results_urls, block_id, asset_id or block_id, level, asset_format, data
+            ),
+            unit_scale=unit_scale,
+        )
+        results.update(results_urls)
 
-    # Level 2: Mid-Poly (moderate decimation)
-    target_mid = LOD_DECIMATION_TARGETS['mid']
-    logger.info("lod_generation.mid_poly",
-                block_id=block_id,
-                target_faces=target_mid)
-    
-    mid_poly_mesh, mid_faces = _apply_decimation(merged_mesh.copy(), target_mid, block_id)
-    mid_url, mid_size = _export_and_upload_obj(mid_poly_mesh, block_id, 'mid')
-    results['mid_poly_url'] = mid_url
-    results['file_sizes_kb']['mid'] = mid_size
-    results['face_counts']['mid'] = mid_faces
-    
-    # Level 3: Low-Poly (aggressive decimation)
-    target_low = LOD_DECIMATION_TARGETS['low']
-    logger.info("lod_generation.low_poly",
+        if own_uploader:
+            failed = uploader.wait()
+            if block_id in failed:
+                raise failed[block_id]
+    finally:
+        if own_uploader:
+            uploader.close()
+
+    return results
+
+
+def _submit_lod_asset(
+    uploader: LODAssetUploader,
+    urls: dict,
+    block_id: str,
+    asset_id: str,
+    level: str,
+    asset_format: str,
+    data: bytes,
+) -> None:
+    """Queue one encoded asset (level 'high'/'mid'/'low', 'mtl' or 'container') and record its URL in `urls`."""
+    url_field, key, content_type = _lod_asset_target(asset_id, level, asset_format)
+    urls[url_field] = uploader.submit(block_id, key, data, content_type)
+    if level == 'mtl':
+        logger.info("lod_generation.mtl_generated", block_id=block_id, mtl_url=urls['mtl_url'])
+
+
+def _lod_asset_target(asset_id: str, level: str, asset_format: str) -> tuple[str, str, str]:
+    """(lod_data URL field, storage key, content type) of one encoded asset."""
+    if level == 'container':
+        return 'lod_container_url', f"{LOD_CONTAINER_PREFIX}{asset_id}.{asset_format}", \
+            LOD_ASSET_CONTENT_TYPES[asset_format]
+    if level == 'mtl':
+        return 'mtl_url', f"{MATERIALS_PREFIX}{asset_id}.mtl", LOD_ASSET_CONTENT_TYPES['mtl']
+    return f'{level}_poly_url', _lod_asset_key(asset_id, level, asset_format), LOD_ASSET_CONTENT_TYPES[asset_format]
+
+
+def _encode_lod_assets(
+    merged_mesh: trimesh.Trimesh,
+    block_id: str,
+    face_layers: np.ndarray | None = None,
+    layer_palette: tuple[dict, dict] | None = None,
+    iso_code: str | None = None,
+    fingerprint: str | None = None,
+    on_asset=None,
+    origin: list[float] | None = None,
+    container: bool = True,
+    levels: list[str] | None = None,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> tuple[dict, list[tuple[str, str, bytes]]]:
+    """CPU half of _generate_lod_objs: decimate and serialize every LOD asset in memory.
+
+    Needs no rhino3dm object and does no I/O, so it also runs in
+    SharedMeshPool workers (_encode_lod_assets_worker).
+
+    Args:
+        merged_mesh: Original merged mesh (world coordinates)
+        block_id: UUID of the block (for logging)
+        face_layers: Rhino layer index per face of merged_mesh
+        layer_palette: (layer_colors, layer_names) of the file; with
+            face_layers, the high-poly is written as per-layer OBJ + MTL
+        iso_code: Block ISO code (for logging)
+        fingerprint: Geometry fingerprint (decimation reuse, _decimate_with_cache)
+        on_asset: on_asset(level, asset_format, data), called as soon as an
+            asset is serialized (level 'mtl' for the MTL companion, 'container'
+            for the progressive LOD container when LOD_CONTAINER is on)
+        origin: World offset of the GLB local positions (default: bbox center)
+        container: Also emit the progressive LOD container (when LOD_CONTAINER is on)
+        levels: Only encode these of 'high'/'mid'/'low' (selective rebuild,
+            default all). The container is only packed when every level is
+            encoded; rebuild_lod_levels repacks it with the kept chunks.
+        unit_scale: Meters per model unit (BlockGeometry.unit_scale)
+
+    Returns:
+        Tuple of (lod_data without URLs, [(level, asset_format, data)])
+    """
+    original_faces = len(merged_mesh.faces)
+    logger.info("lod_generation.start",
                 block_id=block_id,
-                target_faces=target_low)
-    
-    low_poly_mesh, low_faces = _apply_decimation(merged_mesh.copy(), target_low, block_id)
-    low_url, low_size = _export_and_upload_obj(low_poly_mesh, block_id, 'low')
-    results['low_poly_url'] = low_url
-    results['file_sizes_kb']['low'] = low_size
-    results['face_counts']['low'] = low_faces
+                original_faces=original_faces)
     
+    # One world origin for every level so the GLB local frames coincide
+    if origin is None:
+        bounds = np.asarray(merged_mesh.bounds)
+        origin = ((bounds[0] + bounds[1]) / 2).tolist()
+    results = {
+        'mtl_url': None,
+        'lod_container': None,
+        'asset_format': LOD_ASSET_FORMAT,
+        'asset_origin': origin,
+        'file_sizes_kb': {},
+        'face_counts': {'original': original_faces},
+        'lod_errors_mm': {'high': 0.0},
+    }
+    assets = []
+    levels = set(levels) if levels is not None else {'high', 'mid', 'low'}
+
+    def emit(level: str, asset_format: str, data: bytes) -> None:
+        assets.append((level, asset_format, data))
+        if level not in ('mtl', 'container'):
+            results['file_sizes_kb'][level] = len(data) // 1024
+        if on_asset is not None:
+            on_asset(level, asset_format, data)
+
+    # Level 1: High-Poly (no decimation)
+    if 'high' in levels:
+        logger.info("lod_generation.high_poly",
+                    block_id=block_id,
+                    target_faces="no decimation (original)")
+
+        # Per-face Rhino layer colors: when available the high-poly is written ONCE
+        # as a per-layer OBJ + MTL companion, straight from the extraction arrays.
+        # Generated ONLY for high-poly (decimation destroys face-to-layer mapping)
+        layered = None
+        if layer_palette is not None and face_layers is not None:
+            try:
+                layered = _build_layered_high_poly(
+                    merged_mesh, face_layers, layer_palette, block_id, iso_code
+                )
+            except Exception as exc:
+                logger.warning(
+                    "lod_generation.mtl_skipped",
+                    block_id=block_id,
+                    error=str(exc),
+                    reason="MTL generation failed — fallback to material color in frontend",
+                )
+
+        if layered is not None:
+            obj_content, mtl_content = layered
+            emit('high', 'obj', obj_content.encode('utf-8'))
+            emit('mtl', 'mtl', mtl_content.encode('utf-8'))
+        else:
+            emit('high', *_serialize_lod_asset(merged_mesh, block_id, 'high', origin))
+        results['face_counts']['high'] = original_faces
+
+    # Levels 2-3: Mid-Poly and Low-Poly, sized for the block (lod_face_targets).
+    # LODDecimationService runs them sequentially, cascaded (low ← mid) or in
+    # a process pool depending on LOD_DECIMATION_MODE, and reports per-level
+    # face counts, latency and deviation from the full-resolution mesh.
+    decimated_levels = [level for level in ('mid', 'low') if level in levels]
+    targets = lod_face_targets(merged_mesh, unit_scale=unit_scale) if decimated_levels else {}
+    if LOD_DECIMATION_MODE != "cascade":
+        # Cascaded low is decimated from mid: mid is then needed even if not emitted
+        targets = {level: faces for level, faces in targets.items() if level in levels}
+    decimated, decimation_report = {}, {}
+    if targets:
+        logger.info("lod_generation.decimated_levels",
+                    block_id=block_id,
+                    target_faces=targets)
+        decimated, decimation_report = _decimate_with_cache(merged_mesh, targets, block_id, fingerprint, unit_scale)
+    results['decimation_report'] = decimation_report
+
+    for level in decimated_levels:
+        report_entry = decimation_report.get(level, {})
+        mesh, asset_format, data = _serialize_within_size_limit(
+            decimated[level], block_id, level, origin, report_entry
+        )
+        if report_entry.get('size_capped'):
+            report_entry['deviation_mm'] = round(surface_deviation(merged_mesh, mesh), 3)
+        emit(level, asset_format, data)
+        results['face_counts'][level] = len(mesh.faces)
+        results['lod_errors_mm'][level] = report_entry.get('deviation_mm')
+
+    # The same level assets again, coarse to fine, in one range-addressable object
+    if container and LOD_CONTAINER and levels >= {'high', 'mid', 'low'}:
+        data, index = pack_lod_container(assets)  # MTL companion left out
+        for level, chunk in index['levels'].items():
+            chunk['faces'] = results['face_counts'][level]
+        results['lod_container'] = index
+        emit('container', LOD_CONTAINER_FORMAT, data)
+
+    low_faces = results['face_counts'].get('low', original_faces)
     logger.info("lod_generation.complete",
                 block_id=block_id,
                 face_counts=results['face_counts'],
                 total_size_kb=sum(results['file_sizes_kb'].values()),
                 reduction_pct=round((1 - low_faces / max(original_faces, 1)) * 100, 1))
     
-    return results
+    return results, assets
+
+
+def _serialize_within_size_limit(
+    mesh: trimesh.Trimesh,
+    block_id: str,
+    lod_level: str,
+    origin,
+    report_entry: dict | None = None,
+) -> tuple[trimesh.Trimesh, str, bytes]:
+    """_serialize_lod_asset, re-clustering the mesh until it fits MAX_GLB_SIZE_KB.
+
+    A decimated level must never reach the viewer bigger than its budget:
+    while the serialized asset is over MAX_GLB_SIZE_KB[lod_level], the face
+    ceiling is halved and the mesh re-simplified (apply_vertex_clustering),
+    down to LOD_ADAPTIVE_MIN_FACES. A mesh that still does not fit (or that
+    clustering collapses) is replaced by its bbox proxy, a 12-face box.
+    `report_entry` (decimation report of the level) records the final count.
+
+    Returns:
+        Tuple of (serialized_mesh, asset_format, data)
+
+    Raises:
+        ValueError: Not even the bbox proxy fits MAX_GLB_SIZE_KB[lod_level]
+    """
+    limit = MAX_GLB_SIZE_KB[lod_level] * 1024
+    source = mesh
+    asset_format, data = _serialize_lod_asset(mesh, block_id, lod_level, origin)
+    while len(data) > limit and len(mesh.faces) > LOD_ADAPTIVE_MIN_FACES:
+        ceiling = max(len(mesh.faces) // 2, LOD_ADAPTIVE_MIN_FACES)
+        logger.warning("lod_generation.size_limit_exceeded",
+                       block_id=block_id,
+                       lod_level=lod_level,
+                       size_kb=len(data) // 1024,
+                       limit_kb=MAX_GLB_SIZE_KB[lod_level],
+                       faces=len(mesh.faces),
+                       retry_faces=ceiling)
+        clustered, _ = apply_vertex_clustering(mesh, ceiling, block_id)
+        if len(clustered.faces) == 0:
+            break  # Collapsed: the bbox proxy below
+        mesh = clustered
+        asset_format, data = _serialize_lod_asset(mesh, block_id, lod_level, origin)
+        if report_entry is not None:
+            report_entry.update(faces=len(mesh.faces), method='vertex_clustering', size_capped=True)
+
+    if len(data) > limit or len(mesh.faces) == 0:
+        mesh = trimesh.creation.box(bounds=source.bounds)
+        asset_format, data = _serialize_lod_asset(mesh, block_id, lod_level, origin)
+        logger.warning("lod_generation.bbox_proxy",
+                       block_id=block_id,
+                       lod_level=lod_level,
+                       size_kb=len(data) // 1024,
+                       limit_kb=MAX_GLB_SIZE_KB[lod_level])
+        if len(data) > limit:
+            raise ValueError(f"{lod_level} LOD of block {block_id} does not fit "
+                             f"{MAX_GLB_SIZE_KB[lod_level]} KB, not even as a bbox proxy")
+        if report_entry is not None:
+            report_entry.update(faces=len(mesh.faces), method='bbox_proxy', size_capped=True)
+    return mesh, asset_format, data
+
+
+def _encode_lod_assets_worker(
+    arrays: dict[str, np.ndarray],
+    block_id: str,
+    layer_palette: tuple[dict, dict] | None,
+    iso_code: str | None,
+    fingerprint: str | None,
+    unit_scale: float = DEFAULT_UNIT_SCALE,
+) -> tuple[dict, list[tuple[str, str, bytes]]]:
+    """SharedMeshPool entry point: _encode_lod_assets on the block's shared arrays.
+
+    The arrays are the already processed BlockGeometry mesh, so it is rebuilt
+    with process=False (same vertices/faces as the task process would use).
+    """
+    mesh = trimesh.Trimesh(vertices=arrays['vertices'], faces=arrays['faces'], process=False)
+    return _encode_lod_assets(
+        mesh, block_id,
+        face_layers=arrays['face_layers'],
+        layer_palette=layer_palette,
+        iso_code=iso_code,
+        fingerprint=fingerprint,
+        unit_scale=unit_scale,
+    )
+
+
+def _lod_container_column(lod_data: dict) -> dict | None:
+    """blocks.lod_container value: the container URL and its chunk index (None without container)."""
+    if not lod_data.get('lod_container_url') or not lod_data.get('lod_container'):
+        return None
+    return {'url': lod_data['lod_container_url'], **lod_data['lod_container']}
+
+
+def _lod_build_stamp(lod_data: dict) -> dict:
+    """blocks.lod_build value: pipeline version, per-level params hashes and face counts.
+
+    The hashes (lod_level_hashes) are those of this worker's settings, which
+    produced `lod_data`; the container level is only stamped when the block
+    has one. infra/reprocess_lod_assets.py plans selective rebuilds from it.
+    """
+    level_hashes = lod_level_hashes()
+    if not lod_data.get('lod_container'):
+        level_hashes.pop('container', None)
+    return {
+        'version': LOD_CACHE_VERSION,
+        'levels': level_hashes,
+        'face_counts': lod_data.get('face_counts') or {},
+    }
+
+
+def _lod_build_columns(lod_build: dict | None) -> tuple:
+    """(lod_pipeline_version, lod_params_hash, lod_build) column values of a stamp."""
+    if not lod_build:
+        return None, None, None
+    return lod_build['version'], lod_params_hash(lod_build['levels']), json.dumps(lod_build)
+
+
+def _mesh_metrics_columns(metrics: dict | None) -> tuple:
+    """(mesh_volume_m3, mesh_area_m2, mesh_watertight, obb_length_m, obb_width_m,
+    obb_height_m, obb) column values of compute_mesh_metrics' result."""
+    if not metrics:
+        return None, None, None, None, None, None, None
+    return (metrics['volume_m3'], metrics['area_m2'], metrics['watertight'],
+            *metrics['dimensions_m'], json.dumps(metrics['obb']))
 
 
 def _update_block_lod_urls(
@@ -1191,6 +1974,10 @@ def _update_block_lod_urls(
     bbox: dict,
     rhino_metadata: dict | None = None,
     mtl_url: str | None = None,
+    lod_errors_mm: dict | None = None,
+    lod_container: dict | None = None,
+    lod_build: dict | None = None,
+    mesh_metrics: dict | None = None,
 ) -> None:
     """Update database with all LOD URLs, bbox, rhino_metadata, and mtl_url.
     
@@ -1208,6 +1995,11 @@ def _update_block_lod_urls(
         bbox: Bounding box in absolute Rhino coordinates: {"min": [x,y,z], "max": [x,y,z]}
         rhino_metadata: Complete UserStrings dictionary (all metadata from 3DM file)
         mtl_url: Public URL of companion .mtl file for per-face layer colors (or None)
+        lod_errors_mm: Achieved geometric error per LOD level, {'high': 0.0, 'mid': x, 'low': y}
+        lod_container: Progressive LOD container, {'url', 'size', 'levels': {level:
+            {'offset', 'length', 'format', 'faces'}}} (see _lod_container_column)
+        lod_build: Version stamp of the assets (see _lod_build_stamp)
+        mesh_metrics: Volume, area and OBB of the block mesh (see compute_mesh_metrics)
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
@@ -1219,11 +2011,26 @@ def _update_block_lod_urls(
                 low_poly_url = %s,
                 bbox = %s,
                 rhino_metadata = %s,
-                mtl_url = %s
+                mtl_url = %s,
+                lod_errors_mm = %s,
+                lod_container = %s,
+                lod_pipeline_version = %s,
+                lod_params_hash = %s,
+                lod_build = %s,
+                mesh_volume_m3 = %s,
+                mesh_area_m2 = %s,
+                mesh_watertight = %s,
+                obb_length_m = %s,
+                obb_width_m = %s,
+                obb_height_m = %s,
+                obb = %s
             WHERE id = %s
             """,
             (high_poly_url, mid_poly_url, low_poly_url, json.dumps(bbox),
-             json.dumps(rhino_metadata or {}), mtl_url, block_id)
+             json.dumps(rhino_metadata or {}), mtl_url,
+             json.dumps(lod_errors_mm) if lod_errors_mm else None,
+             json.dumps(lod_container) if lod_container else None,
+             *_lod_build_columns(lod_build), *_mesh_metrics_columns(mesh_metrics), block_id)
         )
         conn.commit()
         logger.info("database.lod_urls_updated",
@@ -1235,6 +2042,858 @@ def _update_block_lod_urls(
                     metadata_keys=list(rhino_metadata.keys()) if rhino_metadata else [])
 
 
+def _update_blocks_lod_urls_batch(updates: list[dict], instanced_meshes: list[dict] | None = None) -> None:
+    """Write the LOD results of many blocks in a single transaction.
+
+    Batched counterpart of _update_block_lod_urls used by the file-level task:
+    one connection, one execute_batch round trip, one commit.
+
+    Args:
+        updates: List of dicts with keys block_id, high_poly_url, mid_poly_url,
+                 low_poly_url, bbox, rhino_metadata, mtl_url, lod_errors_mm,
+                 lod_container, lod_build, mesh_metrics and,
+                 for instanced blocks, instance_group and instance_transforms
+        instanced_meshes: Shared meshes of the instance groups referenced by
+                 `updates` (instance_group, LOD URLs, face_counts, instance_count),
+                 upserted in the same transaction
+    """
+    if not updates:
+        return
+
+    rows = [
+        (u['high_poly_url'], u['mid_poly_url'], u['low_poly_url'], json.dumps(u['bbox']),
+         json.dumps(u.get('rhino_metadata') or {}), u.get('mtl_url'),
+         json.dumps(u['lod_errors_mm']) if u.get('lod_errors_mm') else None,
+         json.dumps(u['lod_container']) if u.get('lod_container') else None,
+         *_lod_build_columns(u.get('lod_build')),
+         *_mesh_metrics_columns(u.get('mesh_metrics')),
+         u.get('instance_group'),
+         json.dumps(u['instance_transforms']) if u.get('instance_transforms') else None,
+         u['block_id'])
+        for u in updates
+    ]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if instanced_meshes:
+            # Groups first: blocks.instance_group references instanced_meshes
+            psycopg2.extras.execute_batch(
+                cursor,
+                """
+                INSERT INTO instanced_meshes
+                    (instance_group, high_poly_url, mid_poly_url, low_poly_url,
+                     face_counts, instance_count, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (instance_group) DO UPDATE
+                SET high_poly_url = EXCLUDED.high_poly_url,
+                    mid_poly_url = EXCLUDED.mid_poly_url,
+                    low_poly_url = EXCLUDED.low_poly_url,
+                    face_counts = EXCLUDED.face_counts,
+                    instance_count = EXCLUDED.instance_count,
+                    updated_at = NOW()
+                """,
+                [
+                    (m['instance_group'], m['high_poly_url'], m['mid_poly_url'], m['low_poly_url'],
+                     json.dumps(m.get('face_counts') or {}), m['instance_count'])
+                    for m in instanced_meshes
+                ],
+            )
+        psycopg2.extras.execute_batch(
+            cursor,
+            """
+            UPDATE blocks
+            SET high_poly_url = %s,
+                mid_poly_url = %s,
+                low_poly_url = %s,
+                bbox = %s,
+                rhino_metadata = %s,
+                mtl_url = %s,
+                lod_errors_mm = %s,
+                lod_container = %s,
+                lod_pipeline_version = %s,
+                lod_params_hash = %s,
+                lod_build = %s,
+                mesh_volume_m3 = %s,
+                mesh_area_m2 = %s,
+                mesh_watertight = %s,
+                obb_length_m = %s,
+                obb_width_m = %s,
+                obb_height_m = %s,
+                obb = %s,
+                instance_group = %s,
+                instance_transforms = %s,
+                lod_claimed_by = NULL,
+                lod_claimed_at = NULL
+            WHERE id = %s
+            """,
+            rows,
+        )
+        if instanced_meshes:
+            # A group can span several commits (file chunks, retries): count the
+            # placements of every member block instead of this batch's only
+            cursor.execute(
+                """
+                UPDATE instanced_meshes m
+                SET instance_count = (
+                    SELECT COALESCE(SUM(jsonb_array_length(b.instance_transforms)), 0)
+                    FROM blocks b
+                    WHERE b.instance_group = m.instance_group
+                )
+                WHERE m.instance_group = ANY(%s)
+                """,
+                ([m['instance_group'] for m in instanced_meshes],),
+            )
+        conn.commit()
+        logger.info("database.lod_urls_batch_updated",
+                    blocks=len(rows),
+                    instance_groups=len(instanced_meshes or []),
+                    block_ids=[u['block_id'] for u in updates])
+
+
+def _update_blocks_lod_levels_batch(updates: list[dict]) -> None:
+    """Write the results of a selective LOD rebuild in a single transaction.
+
+    Unlike _update_blocks_lod_urls_batch only the rebuilt levels change:
+    a level URL left as None keeps its stored value, lod_errors_mm entries
+    are merged and the MTL URL is only replaced with the high-poly.
+
+    Args:
+        updates: List of dicts with keys block_id, high_poly_url, mid_poly_url,
+                 low_poly_url (None = kept), mtl_url (with 'high' rebuilt),
+                 lod_errors_mm (rebuilt levels), lod_container (repacked
+                 column, None without container) and lod_build (merged stamp)
+    """
+    if not updates:
+        return
+
+    rows = [
+        (u.get('high_poly_url'), u.get('mid_poly_url'), u.get('low_poly_url'),
+         u.get('high_poly_url') is not None, u.get('mtl_url'),
+         json.dumps(u.get('lod_errors_mm') or {}),
+         json.dumps(u['lod_container']) if u.get('lod_container') else None,
+         *_lod_build_columns(u['lod_build']),
+         u['block_id'])
+        for u in updates
+    ]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        psycopg2.extras.execute_batch(
+            cursor,
+            """
+            UPDATE blocks
+            SET high_poly_url = COALESCE(%s, high_poly_url),
+                mid_poly_url = COALESCE(%s, mid_poly_url),
+                low_poly_url = COALESCE(%s, low_poly_url),
+                mtl_url = CASE WHEN %s THEN %s ELSE mtl_url END,
+                lod_errors_mm = COALESCE(lod_errors_mm, '{}'::jsonb) || %s::jsonb,
+                lod_container = %s,
+                lod_pipeline_version = %s,
+                lod_params_hash = %s,
+                lod_build = %s
+            WHERE id = %s
+            """,
+            rows,
+        )
+        conn.commit()
+        logger.info("database.lod_levels_batch_updated",
+                    blocks=len(rows),
+                    block_ids=[u['block_id'] for u in updates])
+
+
+def _prepare_block_geometry(
+    rhino_file: rhino3dm.File3dm,
+    block_id: str,
+    iso_code: str,
+) -> dict:
+    """rhino3dm half of the per-block pipeline: metadata, extraction, LOD cache lookup.
+
+    Returns:
+        Dict with rhino_metadata, geometry (BlockGeometry), lod_cache_key,
+        lod_asset_id (storage name of new assets), cache_hit,
+        instance_matrices and, on a hit, the reused lod_data
+    """
+    # UserStrings for metadata storage (includes GrauEstructural, etc.)
+    rhino_metadata = _extract_all_user_strings(rhino_file, block_id, iso_code)
+
+    # Single-pass extraction: merged mesh, per-face layers, bbox (absolute Rhino coords)
+    geometry = _extract_block_geometry(rhino_file, block_id, iso_code)
+
+    # Same geometry + LOD settings already processed: reuse its assets,
+    # re-placed when this block is a translated duplicate
+    lod_cache_key = _lod_cache_key(geometry, rhino_file)
+    lod_asset_id = _lod_asset_id(lod_cache_key, geometry)
+    lod_data = _lookup_lod_cache(lod_cache_key)
+    if lod_data is not None and not np.allclose(
+        lod_data.get('asset_origin') or np.inf, _asset_origin(geometry),
+        rtol=0.0, atol=_fingerprint_quantum(geometry.unit_scale),
+    ):
+        lod_data = _relocate_cached_lod(lod_data, geometry, lod_asset_id, block_id)
+    cache_hit = lod_data is not None
+    _record_lod_cache('asset_hit' if cache_hit else 'asset_miss')
+    if cache_hit:
+        logger.info("lod_cache.asset_hit", block_id=block_id, iso_code=iso_code,
+                    lod_cache_key=lod_cache_key)
+
+    return {
+        'rhino_metadata': rhino_metadata,
+        'geometry': geometry,
+        'lod_cache_key': lod_cache_key,
+        'lod_asset_id': lod_asset_id,
+        'cache_hit': cache_hit,
+        'lod_data': lod_data,
+        'instance_matrices': _block_instance_matrices(rhino_file, geometry),
+    }
+
+
+def _block_instance_matrices(rhino_file: rhino3dm.File3dm, geometry: BlockGeometry) -> np.ndarray:
+    """(k, 4, 4) world placements of a block's re-centered mesh (see InstanceTable).
+
+    One matrix per InstanceReference of the block's InstanceDefinition
+    (reference Xform @ translation to the bbox center); a block without
+    references is placed once, where its geometry is.
+    """
+    bounds = np.asarray(geometry.mesh.bounds)
+    center = (bounds[0] + bounds[1]) / 2
+    xforms = []
+    if geometry.matched_idef is not None:
+        index = get_object_index(rhino_file)
+        idef_row = index.idef_by_name.get(geometry.matched_idef.Name)
+        if idef_row is not None:
+            objects = rhino_file.Objects
+            xforms = [objects[int(row)].Geometry.Xform for row in index.reference_rows(idef_row)]
+    return placement_matrices(xforms, center)
+
+
+def _block_result(prepared: dict, lod_data: dict) -> dict:
+    """Return value of _process_block_geometry for a prepared block and its lod_data."""
+    geometry = prepared['geometry']
+    return {
+        'lod_data': lod_data,
+        'bbox': geometry.bbox,
+        'mesh_metrics': geometry.metrics,
+        'rhino_metadata': prepared['rhino_metadata'],
+        'original_faces': geometry.original_faces_count,
+        'fingerprint': geometry.fingerprint,
+        'lod_cache_key': prepared['lod_cache_key'],
+        'cache_hit': prepared['cache_hit'],
+        'instance_matrices': prepared.get('instance_matrices'),
+    }
+
+
+def _process_block_geometry(
+    rhino_file: rhino3dm.File3dm,
+    block_id: str,
+    iso_code: str,
+    uploader: LODAssetUploader | None = None,
+) -> dict:
+    """Run the per-block geometry pipeline on an already parsed .3dm file.
+
+    Used by generate_file_lod_assets (every pending block of a file, parsed
+    once). generate_low_poly_glb runs the same stages through
+    _prepare_block_for_lods + _generate_block_lods_resumable, checkpointed.
+
+    Args:
+        rhino_file: Parsed rhino3dm File3dm containing the block's InstanceDefinition
+        block_id: UUID of the block
+        iso_code: ISO code of the block (== InstanceDefinition.Name)
+        uploader: Shared uploader of a file batch (see _generate_lod_objs)
+
+    Returns:
+        Dict with lod_data (see _generate_lod_objs), bbox, mesh_metrics,
+        rhino_metadata, original_faces, fingerprint, lod_cache_key and cache_hit (assets
+        reused from an identical block; caller indexes misses with
+        _store_lod_cache once their uploads succeeded)
+    """
+    prepared = _prepare_block_geometry(rhino_file, block_id, iso_code)
+    lod_data = prepared['lod_data']
+    if not prepared['cache_hit']:
+        geometry = prepared['geometry']
+        # 3-level LOD (US-015): high-poly (original), mid-poly (~2000), low-poly (~500)
+        lod_data = _generate_lod_objs(
+            geometry.mesh,
+            block_id,
+            rhino_file=rhino_file,
+            matched_idef=geometry.matched_idef,
+            face_layers=geometry.face_layers,
+            uploader=uploader,
+            asset_id=prepared['lod_asset_id'],
+            fingerprint=geometry.fingerprint,
+            unit_scale=geometry.unit_scale,
+        )
+    return _block_result(prepared, lod_data)
+
+
+def _prepare_block_for_lods(rhino_file: rhino3dm.File3dm, block_id: str, iso_code: str) -> dict:
+    """_prepare_block_geometry plus the rhino3dm inputs of the LOD encoding.
+
+    Adds 'layer_palette' (per-layer high-poly, only for a matched
+    InstanceDefinition) and 'lod_iso_code', so the remaining stages need no
+    File3dm and can resume from a checkpoint (_save_prepared_checkpoint).
+    """
+    prepared = _prepare_block_geometry(rhino_file, block_id, iso_code)
+    matched_idef = prepared['geometry'].matched_idef
+    prepared['layer_palette'] = _layer_palette(rhino_file) if matched_idef is not None else None
+    prepared['lod_iso_code'] = matched_idef.Name if matched_idef is not None else None
+    return prepared
+
+
+def _save_prepared_checkpoint(checkpoint: StageCheckpoint, prepared: dict) -> None:
+    """Stage 'prepared': extracted geometry and metadata (skips download, parse, extraction)."""
+    geometry = prepared['geometry']
+    arrays = {
+        'vertices': np.asarray(geometry.mesh.vertices),
+        'faces': np.asarray(geometry.mesh.faces),
+        'face_layers': np.asarray(geometry.face_layers),
+    }
+    if prepared.get('instance_matrices') is not None:
+        arrays['instance_matrices'] = np.asarray(prepared['instance_matrices'])
+    layer_palette = prepared.get('layer_palette')
+    if layer_palette is not None:
+        # JSON object keys are strings; layer indices are restored on load
+        layer_palette = [{str(idx): value for idx, value in part.items()} for part in layer_palette]
+    checkpoint.save('prepared', {
+        'rhino_metadata': prepared['rhino_metadata'],
+        'bbox': geometry.bbox,
+        'metrics': geometry.metrics,
+        'unit_scale': geometry.unit_scale,
+        'original_faces': geometry.original_faces_count,
+        'fingerprint': geometry.fingerprint,
+        'lod_cache_key': prepared['lod_cache_key'],
+        'lod_asset_id': prepared['lod_asset_id'],
+        'cache_hit': prepared['cache_hit'],
+        'lod_data': prepared['lod_data'],
+        'layer_palette': layer_palette,
+        'lod_iso_code': prepared.get('lod_iso_code'),
+    }, arrays=arrays)
+
+
+def _load_prepared_checkpoint(checkpoint: StageCheckpoint) -> dict | None:
+    """`prepared` dict of _prepare_block_for_lods rebuilt from stage 'prepared', or None."""
+    stage = checkpoint.load('prepared')
+    if stage is None:
+        return None
+    meta, arrays = stage.meta, stage.arrays
+    geometry = BlockGeometry(
+        mesh=trimesh.Trimesh(vertices=arrays['vertices'], faces=arrays['faces'], process=False),
+        face_layers=arrays['face_layers'],
+        original_faces_count=meta['original_faces'],
+        bbox=meta['bbox'],
+        fingerprint=meta['fingerprint'],
+        metrics=meta.get('metrics'),
+        unit_scale=meta.get('unit_scale', DEFAULT_UNIT_SCALE),
+    )
+    layer_palette = meta['layer_palette']
+    if layer_palette is not None:
+        colors, names = layer_palette
+        layer_palette = ({int(idx): tuple(color) for idx, color in colors.items()},
+                         {int(idx): name for idx, name in names.items()})
+    return {
+        'rhino_metadata': meta['rhino_metadata'],
+        'geometry': geometry,
+        'lod_cache_key': meta['lod_cache_key'],
+        'lod_asset_id': meta.get('lod_asset_id', meta['lod_cache_key']),
+        'cache_hit': meta['cache_hit'],
+        'lod_data': meta['lod_data'],
+        'instance_matrices': arrays.get('instance_matrices'),
+        'layer_palette': layer_palette,
+        'lod_iso_code': meta['lod_iso_code'],
+    }
+
+
+def _generate_block_lods_resumable(
+    prepared: dict,
+    block_id: str,
+    checkpoint: StageCheckpoint | None = None,
+) -> dict:
+    """Encode and upload the LOD assets of a prepared block, resuming from `checkpoint`.
+
+    - Stage 'encoded': decimated + serialized assets and their lod_data. When
+      present, decimation is skipped and the stored bytes are uploaded.
+    - Stage 'uploaded': ledger {storage key: public URL} of the objects that
+      reached storage. They are not uploaded again.
+
+    Uploads start while later levels are still decimated (as in
+    _generate_lod_objs); failed ones are raised after the ledger is saved,
+    so the next attempt only uploads what is missing.
+
+    Returns:
+        lod_data with URLs (see _generate_lod_objs)
+    """
+    geometry = prepared['geometry']
+    asset_id = prepared['lod_asset_id'] or block_id
+    uploaded = checkpoint.load('uploaded') if checkpoint is not None else None
+    ledger = dict(uploaded.meta) if uploaded is not None else {}
+    urls, submitted = {}, {}
+
+    def submit(level: str, asset_format: str, data: bytes) -> None:
+        url_field, key, content_type = _lod_asset_target(asset_id, level, asset_format)
+        if key in ledger:
+            urls[url_field] = ledger[key]
+            return
+        urls[url_field] = submitted[key] = uploader.submit(key, key, data, content_type)
+
+    with LODAssetUploader() as uploader:
+        encoded = checkpoint.load('encoded') if checkpoint is not None else None
+        if encoded is None:
+            lod_data, assets = _encode_lod_assets(
+                geometry.mesh, block_id,
+                face_layers=geometry.face_layers,
+                layer_palette=prepared.get('layer_palette'),
+                iso_code=prepared.get('lod_iso_code'),
+                fingerprint=geometry.fingerprint,
+                on_asset=submit,
+                unit_scale=geometry.unit_scale,
+            )
+            if checkpoint is not None:
+                names = [f"{i}-{level}.{asset_format}" for i, (level, asset_format, _) in enumerate(assets)]
+                checkpoint.save(
+                    'encoded',
+                    {'lod_data': lod_data,
+                     'assets': [[level, asset_format, name]
+                                for (level, asset_format, _), name in zip(assets, names)]},
+                    blobs={name: data for (_, _, data), name in zip(assets, names)},
+                )
+        else:
+            lod_data = encoded.meta['lod_data']
+            for level, asset_format, name in encoded.meta['assets']:
+                submit(level, asset_format, encoded.blobs[name])
+        failed = uploader.wait()
+
+    if ledger:
+        logger.info("stage_checkpoint.uploads_skipped", block_id=block_id,
+                    skipped=len(urls) - len(submitted), uploaded=len(submitted))
+    ledger.update({key: url for key, url in submitted.items() if key not in failed})
+    if checkpoint is not None and submitted:
+        checkpoint.save('uploaded', ledger)
+    if failed:
+        raise next(iter(failed.values()))
+
+    lod_data.update(urls)
+    return lod_data
+
+
+def _file_lod_pool(block_count: int) -> SharedMeshPool | None:
+    """Started SharedMeshPool for a file batch, or None to process it in this process.
+
+    Call before the batch uploader starts its threads (the pool forks), and
+    shut the pool down when the batch is done.
+    """
+    if block_count < FILE_LOD_POOL_MIN_BLOCKS:
+        return None
+    pool = get_shared_mesh_pool()
+    if pool.max_workers < 2:
+        return None
+    try:
+        pool.start(processes=block_count)
+    except POOL_UNAVAILABLE_ERRORS as e:
+        logger.warning("file_lod_pool.unavailable", error=str(e),
+                       message="Processing the file's blocks in the task process")
+        reset_shared_mesh_pool()
+        return None
+    return pool
+
+
+def _process_file_blocks(
+    rhino_file: rhino3dm.File3dm,
+    pending: list[tuple[str, str]],
+    uploader: LODAssetUploader,
+    pool: SharedMeshPool | None = None,
+):
+    """Yield (block_id, iso_code, block_result | exception) for every pending block.
+
+    Without a pool every block runs through _process_block_geometry. With a
+    pool, this process does the rhino3dm work (metadata, extraction, cache
+    lookup) and the LOD encoding of every cache miss runs in the pool, its
+    mesh arrays passed through shared memory; encoded assets are queued on
+    `uploader` as they come back. Blocks whose pool job cannot run (pool
+    broken, no shared memory) fall back to this process.
+    """
+    if pool is None:
+        for block_id, iso_code in pending:
+            try:
+                yield block_id, iso_code, _process_block_geometry(rhino_file, block_id, iso_code, uploader=uploader)
+            except SoftTimeLimitExceeded:
+                raise  # Not a block error: the task stops here
+            except Exception as e:
+                yield block_id, iso_code, e
+        return
+
+    layer_palette = _layer_palette(rhino_file)
+    jobs: dict[Future, tuple[str, str, dict]] = {}
+
+    def generate_inline(block_id: str, prepared: dict) -> dict:
+        geometry = prepared['geometry']
+        return _generate_lod_objs(
+            geometry.mesh, block_id,
+            rhino_file=rhino_file,
+            matched_idef=geometry.matched_idef,
+            face_layers=geometry.face_layers,
+            uploader=uploader,
+            asset_id=prepared['lod_asset_id'],
+            fingerprint=geometry.fingerprint,
+            unit_scale=geometry.unit_scale,
+        )
+
+    def collect(future: Future):
+        nonlocal pool
+        block_id, iso_code, prepared = jobs.pop(future)
+        try:
+            try:
+                lod_data, assets = future.result()
+            except BrokenProcessPool as e:
+                logger.warning("file_lod_pool.broken", block_id=block_id, error=str(e))
+                reset_shared_mesh_pool()
+                pool = None
+                lod_data = generate_inline(block_id, prepared)
+            else:
+                urls = {}
+                for level, asset_format, data in assets:
+                    _submit_lod_asset(uploader, urls, block_id, prepared['lod_asset_id'],
+                                      level, asset_format, data)
+                lod_data.update(urls)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            return block_id, iso_code, e
+        return block_id, iso_code, _block_result(prepared, lod_data)
+
+    for block_id, iso_code in pending:
+        # Hand back finished blocks first, so their assets upload while the pool works
+        for future in [f for f in jobs if f.done()]:
+            yield collect(future)
+
+        try:
+            prepared = _prepare_block_geometry(rhino_file, block_id, iso_code)
+            if prepared['cache_hit']:
+                yield block_id, iso_code, _block_result(prepared, prepared['lod_data'])
+                continue
+            geometry = prepared['geometry']
+            if pool is not None:
+                try:
+                    future = pool.submit(
+                        _encode_lod_assets_worker,
+                        {
+                            'vertices': np.asarray(geometry.mesh.vertices),
+                            'faces': np.asarray(geometry.mesh.faces),
+                            'face_layers': np.asarray(geometry.face_layers),
+                        },
+                        block_id=block_id,
+                        layer_palette=layer_palette if geometry.matched_idef is not None else None,
+                        iso_code=iso_code,
+                        fingerprint=geometry.fingerprint,
+                        unit_scale=geometry.unit_scale,
+                    )
+                    jobs[future] = (block_id, iso_code, prepared)
+                    continue
+                except POOL_UNAVAILABLE_ERRORS as e:
+                    logger.warning("file_lod_pool.submit_failed", block_id=block_id, error=str(e))
+                    if isinstance(e, BrokenProcessPool):
+                        reset_shared_mesh_pool()
+                        pool = None
+            block_result = _block_result(prepared, generate_inline(block_id, prepared))
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            yield block_id, iso_code, e
+            continue
+        yield block_id, iso_code, block_result
+
+    for future in as_completed(list(jobs)):
+        yield collect(future)
+
+
+def _submit_instanced_meshes(
+    rhino_file: rhino3dm.File3dm,
+    table: InstanceTable,
+    iso_codes: dict[str, str],
+    uploader: LODAssetUploader,
+) -> dict[str, dict]:
+    """Encode and queue the shared local-frame mesh of every instanced group.
+
+    The mesh of each group's first block is re-centered on its bbox center
+    and goes through _encode_lod_assets with origin [0, 0, 0] (decimation is
+    reused through the fingerprint cache). Assets already indexed under the
+    same content address are not uploaded again. Uploads are queued under
+    the uploader key 'instanced:<fingerprint>'; the caller drops the groups
+    whose upload failed once uploader.wait() returns.
+
+    Returns:
+        {fingerprint: {'group': InstanceGroup, 'asset_id': str, 'lod_data': dict}}
+    """
+    instanced = {}
+    for group in table.groups(LOD_INSTANCING_MIN_INSTANCES):
+        block_id = group.canonical_block
+        asset_id = f"{INSTANCED_ASSET_PREFIX}{group.fingerprint}/" + hashlib.sha256(
+            _lod_pipeline_signature().encode('utf-8')
+        ).hexdigest()[:16]
+        upload_key = f"instanced:{group.fingerprint}"
+        try:
+            lod_data = _lookup_lod_cache(asset_id)
+            if lod_data is None:
+                geometry = _extract_block_geometry(rhino_file, block_id, iso_codes[block_id])
+                bounds = np.asarray(geometry.mesh.bounds)
+                local_mesh = geometry.mesh.copy()
+                local_mesh.apply_translation(-(bounds[0] + bounds[1]) / 2)
+                urls = {}
+                lod_data, _ = _encode_lod_assets(
+                    local_mesh, block_id,
+                    face_layers=geometry.face_layers,
+                    layer_palette=_layer_palette(rhino_file) if geometry.matched_idef is not None else None,
+                    iso_code=iso_codes[block_id],
+                    fingerprint=group.fingerprint,
+                    origin=[0.0, 0.0, 0.0],
+                    on_asset=lambda level, asset_format, data: _submit_lod_asset(
+                        uploader, urls, upload_key, asset_id, level, asset_format, data
+                    ),
+                    container=False,  # instanced_meshes rows only reference the level files
+                    unit_scale=geometry.unit_scale,
+                )
+                lod_data.update(urls)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            logger.warning("instancing.group_skipped", fingerprint=group.fingerprint,
+                           block_id=block_id, error=str(e))
+            continue
+        instanced[group.fingerprint] = {'group': group, 'asset_id': asset_id, 'lod_data': lod_data}
+        logger.info("instancing.group",
+                    fingerprint=group.fingerprint,
+                    blocks=len(group.block_ids),
+                    instances=group.instance_count,
+                    face_counts=lod_data.get('face_counts'))
+    return instanced
+
+
+def schedule_file_lod_assets(file_key: str, block_id: str) -> str:
+    """Schedule LOD generation for a freshly validated block.
+
+    validate_file runs once per block, so scheduling is debounced per file:
+    the first validated block of a file sets a Redis key (SET NX EX) and
+    enqueues generate_file_lod_assets with a countdown; blocks validated while
+    the key is alive are picked up by that same file-level run. The run holds
+    the key until it ends and then reschedules blocks it did not fetch
+    (_finish_file_lod_schedule). Without Redis the per-block task is enqueued
+    as before.
+
+    Args:
+        file_key: Storage key of the .3dm file (blocks.url_original)
+        block_id: UUID of the block that was just validated
+
+    Returns:
+        'file' if the file task was enqueued, 'joined' if an already scheduled
+        file run will pick the block up, 'block' if the per-block fallback was used
+    """
+    redis_client = get_redis_client()
+    if redis_client is not None:
+        try:
+            acquired = redis_client.set(
+                f"{FILE_LOD_SCHEDULE_KEY_PREFIX}{file_key}",
+                block_id,
+                nx=True,
+                ex=FILE_LOD_SCHEDULE_DEBOUNCE_SECONDS,
+            )
+            if not acquired:
+                logger.info("schedule_file_lod.joined", file_key=file_key, block_id=block_id)
+                return 'joined'
+            celery_app.send_task(
+                TASK_GENERATE_FILE_LOD_ASSETS,
+                args=[file_key],
+                countdown=FILE_LOD_SCHEDULE_DEBOUNCE_SECONDS,
+            )
+            logger.info("schedule_file_lod.file_task_enqueued", file_key=file_key, block_id=block_id)
+            return 'file'
+        except Exception as e:
+            logger.warning("schedule_file_lod.redis_failed", file_key=file_key, error=str(e))
+
+    celery_app.send_task(TASK_GENERATE_LOW_POLY_GLB, args=[block_id])
+    logger.info("schedule_file_lod.block_task_enqueued", file_key=file_key, block_id=block_id)
+    return 'block'
+
+
+def _hold_file_lod_schedule(file_key: str) -> None:
+    """Keep the file's debounce key set while its LOD run works.
+
+    Blocks validated meanwhile join the run instead of scheduling another;
+    _finish_file_lod_schedule drops the key and picks them up. The TTL
+    covers the whole run (hard time limit). Never raises.
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        redis_client.set(f"{FILE_LOD_SCHEDULE_KEY_PREFIX}{file_key}", 'running',
+                         ex=FILE_LOD_CLAIM_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("schedule_file_lod.hold_failed", file_key=file_key, error=str(e))
+
+
+def _finish_file_lod_schedule(file_key: str) -> bool:
+    """Drop the file's debounce key at the end of a run and re-check its blocks.
+
+    A block validated after the run fetched its pending list joined the run
+    (key held) but was not processed by it: it is scheduled again here. The
+    key is deleted before the check, so a block validated in between is
+    scheduled once, by whichever side sets the key first. Never raises.
+
+    Returns:
+        True if a new file run was enqueued
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return False
+    try:
+        redis_client.delete(f"{FILE_LOD_SCHEDULE_KEY_PREFIX}{file_key}")
+        pending = _fetch_pending_blocks_for_file(file_key)
+    except Exception as e:
+        logger.warning("schedule_file_lod.finish_failed", file_key=file_key, error=str(e))
+        return False
+    if not pending:
+        return False
+    logger.info("schedule_file_lod.pending_after_run", file_key=file_key, pending=len(pending))
+    return schedule_file_lod_assets(file_key, pending[0][0]) == 'file'
+
+
+def schedule_scene_tiles() -> bool:
+    """Schedule one incremental rebuild of the scene tileset after LOD changes.
+
+    Debounced like schedule_file_lod_assets: the first caller sets a Redis key
+    (SET NX EX) and enqueues build_scene_tiles with a countdown, so a burst of
+    LOD runs leads to a single rebuild. Without Redis nothing is scheduled
+    (build_scene_tiles can be run by hand). Never raises.
+
+    Returns:
+        True if a rebuild was enqueued by this call
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        return False
+    try:
+        if not redis_client.set(SCENE_TILES_SCHEDULE_KEY, 1, nx=True,
+                                ex=SCENE_TILES_SCHEDULE_DEBOUNCE_SECONDS):
+            return False
+        celery_app.send_task(TASK_BUILD_SCENE_TILES, countdown=SCENE_TILES_SCHEDULE_DEBOUNCE_SECONDS)
+        logger.info("schedule_scene_tiles.enqueued")
+        return True
+    except Exception as e:
+        logger.warning("schedule_scene_tiles.failed", error=str(e))
+        return False
+
+
+@dataclass
+class FileLodRun:
+    """Outcome of _run_file_lods: rows to commit and the per-block report."""
+    updates: list[dict] = field(default_factory=list)
+    instanced_meshes: list[dict] = field(default_factory=list)
+    results: dict[str, dict] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+    transient_errors: list[Exception] = field(default_factory=list)
+    cache_entries: list[tuple[str, dict]] = field(default_factory=list)  # indexed once committed
+
+
+def _run_file_lods(
+    rhino_file: rhino3dm.File3dm,
+    pending: list[tuple[str, str]],
+    uploader: LODAssetUploader,
+    pool: SharedMeshPool | None = None,
+    file_key: str | None = None,
+) -> FileLodRun:
+    """LOD assets of every pending block of a parsed file, up to (not including) the DB commit.
+
+    Shared by generate_file_lod_assets and the local bulk conversion
+    (tasks/bulk_lod_conversion.py), so both produce the same assets and rows.
+    Runs the blocks through _process_file_blocks, builds the instanced groups,
+    waits for `uploader` and drops the blocks whose assets did not all reach
+    storage. Permanent block errors are marked error_processing here;
+    transient ones are returned for the caller to retry.
+    """
+    run = FileLodRun()
+    updates, results, failed = run.updates, run.results, run.failed
+    cache_misses = {}  # block_id -> (lod_cache_key, lod_data) to index once committed
+    instance_table = InstanceTable()
+    iso_codes = dict(pending)
+
+    for block_id, iso_code, block_result in _process_file_blocks(rhino_file, pending, uploader, pool):
+        if isinstance(block_result, Exception):
+            e = block_result
+            logger.error("generate_file_lod_assets.block_error",
+                         file_key=file_key, block_id=block_id,
+                         iso_code=iso_code, error=str(e), exc_info=e)
+            failed[block_id] = str(e)
+            if _is_transient_error(e):
+                run.transient_errors.append(e)
+            else:
+                _update_block_status_error(block_id, str(e))
+            continue
+
+        lod_data = block_result['lod_data']
+        updates.append({
+            'block_id': block_id,
+            'high_poly_url': lod_data['high_poly_url'],
+            'mid_poly_url': lod_data['mid_poly_url'],
+            'low_poly_url': lod_data['low_poly_url'],
+            'bbox': block_result['bbox'],
+            'rhino_metadata': block_result['rhino_metadata'],
+            'mtl_url': lod_data.get('mtl_url'),
+            'lod_errors_mm': lod_data.get('lod_errors_mm'),
+            'lod_container': _lod_container_column(lod_data),
+            'lod_build': _lod_build_stamp(lod_data),
+            'mesh_metrics': block_result.get('mesh_metrics'),
+        })
+        results[block_id] = {
+            'high_poly_url': lod_data['high_poly_url'],
+            'mid_poly_url': lod_data['mid_poly_url'],
+            'low_poly_url': lod_data['low_poly_url'],
+            'original_faces': block_result['original_faces'],
+            'face_counts': lod_data['face_counts'],
+            'lod_errors_mm': lod_data.get('lod_errors_mm'),
+            'cache_hit': block_result.get('cache_hit', False),
+        }
+        if block_result.get('lod_cache_key') and not block_result.get('cache_hit'):
+            cache_misses[block_id] = (block_result['lod_cache_key'], lod_data)
+        instance_table.add(block_id, block_result.get('fingerprint'), block_result.get('instance_matrices'))
+
+    # Repeated geometry: one shared mesh per group, placed by a transform table
+    instanced = {}
+    if LOD_INSTANCING:
+        instanced = _submit_instanced_meshes(rhino_file, instance_table, iso_codes, uploader)
+
+    # Rows are only written for blocks whose assets are all in storage
+    upload_errors = uploader.wait()
+    for fingerprint in list(instanced):
+        e = upload_errors.pop(f"instanced:{fingerprint}", None)
+        if e is not None:
+            logger.warning("instancing.upload_failed", fingerprint=fingerprint, error=str(e))
+            del instanced[fingerprint]
+    for block_id, e in upload_errors.items():
+        failed[block_id] = str(e)
+        results.pop(block_id, None)
+        if _is_transient_error(e):
+            run.transient_errors.append(e)
+        else:
+            _update_block_status_error(block_id, str(e))
+    updates[:] = [u for u in updates if u['block_id'] not in upload_errors]
+
+    for fingerprint, entry in instanced.items():
+        group = entry['group']
+        members = [u for u in updates if u['block_id'] in group.matrices]
+        for u in members:
+            u['instance_group'] = fingerprint
+            u['instance_transforms'] = pack_matrices(group.matrices[u['block_id']])
+            results[u['block_id']]['instance_group'] = fingerprint
+        lod_data = entry['lod_data']
+        run.instanced_meshes.append({
+            'instance_group': fingerprint,
+            'high_poly_url': lod_data['high_poly_url'],
+            'mid_poly_url': lod_data['mid_poly_url'],
+            'low_poly_url': lod_data['low_poly_url'],
+            'face_counts': lod_data.get('face_counts'),
+            'instance_count': sum(len(u['instance_transforms']) for u in members),
+        })
+
+    run.cache_entries = [entry for block_id, entry in cache_misses.items() if block_id in results]
+    run.cache_entries += [(entry['asset_id'], entry['lod_data']) for entry in instanced.values()]
+    return run
+
+
 @celery_app.task(
     name=TASK_GENERATE_LOW_POLY_GLB,
     bind=True,
@@ -1244,6 +2903,11 @@ def _update_block_lod_urls(
 def generate_low_poly_glb(self, block_id: str):
     """Generate Low-Poly GLB from .3dm file.
 
+    Single-block fallback of generate_file_lod_assets: used to reprocess one
+    block, or when file-level scheduling is unavailable (see
+    schedule_file_lod_assets). Every block of a file processed this way
+    downloads and parses the whole .3dm again.
+
     Main orchestrator task that coordinates the 10-step pipeline to convert
     high-poly .3dm CAD files into low-poly GLB models suitable for web visualization.
 
@@ -1259,6 +2923,11 @@ def generate_low_poly_glb(self, block_id: str):
         9. Update database with low_poly_url
         10. Cleanup temp files
 
+    Retries resume: the extracted geometry (steps 2-5), the encoded LODs
+    (6-7) and the ledger of uploaded objects (8) are checkpointed on
+    worker-local disk (StageCheckpoint, LOD_CHECKPOINTS), so a transient
+    failure late in the pipeline does not redo the earlier stages.
+
     Args:
         block_id: UUID of the block to process
 
@@ -1281,6 +2950,7 @@ def generate_low_poly_glb(self, block_id: str):
     """
     logger.info("generate_low_poly_glb.started", block_id=block_id)
     temp_3dm_path = None
+    checkpoint = None
 
     try:
         # Step 1: Fetch block metadata
@@ -1300,30 +2970,35 @@ def generate_low_poly_glb(self, block_id: str):
                 'error_message': None
             }
 
-        # Step 2: Download .3dm file
-        temp_3dm_path = os.path.join(TEMP_DIR, f"{block_id}.3dm")
-        _download_3dm_from_s3(url_original, temp_3dm_path)
-
-        # Step 3: Parse .3dm file
-        rhino_file = _parse_rhino_file(temp_3dm_path, iso_code)
-
-        # Step 3b: Extract ALL UserStrings for metadata storage (includes GrauEstructural, etc.)
-        rhino_metadata = _extract_all_user_strings(rhino_file, block_id, iso_code)
-
-        # Step 4-5: Extract and merge meshes (returns bbox in absolute Rhino coords)
-        merged_mesh, original_faces_count, bbox, matched_idef, idef_object_ids = _extract_and_merge_meshes(
-            rhino_file, block_id, iso_code
-        )
-
-        # Step 6: Generate 3-level LOD GLBs (US-015: Real LOD System)
-        # Creates high-poly (~5000-8000 faces), mid-poly (~2000 faces), low-poly (~500 faces)
-        lod_data = _generate_lod_objs(
-            merged_mesh,
-            block_id,
-            rhino_file=rhino_file,
-            matched_idef=matched_idef,
-            idef_object_ids=idef_object_ids,
-        )
+        # A retry resumes from the last stage the failed attempt completed;
+        # a first attempt never reuses checkpoints (the source may have changed)
+        if LOD_CHECKPOINTS:
+            checkpoint = StageCheckpoint(block_id, _lod_pipeline_signature())
+            if self.request.retries == 0:
+                checkpoint.clear()
+        prepared = _load_prepared_checkpoint(checkpoint) if checkpoint is not None else None
+
+        if prepared is None:
+            # Step 2: Download .3dm file
+            temp_3dm_path = os.path.join(TEMP_DIR, f"{block_id}.3dm")
+            _download_3dm_from_s3(url_original, temp_3dm_path)
+
+            # Step 3: Parse .3dm file
+            rhino_file = _parse_rhino_file(temp_3dm_path, iso_code)
+
+            # Step 4-5: UserStrings, merged mesh + bbox, LOD cache lookup
+            prepared = _prepare_block_for_lods(rhino_file, block_id, iso_code)
+            if checkpoint is not None:
+                _save_prepared_checkpoint(checkpoint, prepared)
+
+        # Step 6: 3-level LOD, unless an identical block's assets are reused
+        lod_data = prepared['lod_data']
+        if not prepared['cache_hit']:
+            lod_data = _generate_block_lods_resumable(prepared, block_id, checkpoint)
+        block_result = _block_result(prepared, lod_data)
+        bbox = block_result['bbox']
+        rhino_metadata = block_result['rhino_metadata']
+        original_faces_count = block_result['original_faces']
 
         # Step 7: Update database with all LOD URLs + bbox + rhino_metadata
         _update_block_lod_urls(
@@ -1334,7 +3009,16 @@ def generate_low_poly_glb(self, block_id: str):
             bbox,
             rhino_metadata,
             mtl_url=lod_data.get('mtl_url'),
+            lod_errors_mm=lod_data.get('lod_errors_mm'),
+            lod_container=_lod_container_column(lod_data),
+            lod_build=_lod_build_stamp(lod_data),
+            mesh_metrics=block_result.get('mesh_metrics'),
         )
+        if checkpoint is not None:
+            checkpoint.clear()
+        if not block_result.get('cache_hit'):
+            _store_lod_cache(block_result['lod_cache_key'], lod_data)
+        schedule_scene_tiles()
 
         # Step 8: Cleanup temp .3dm file
         if temp_3dm_path and os.path.exists(temp_3dm_path):
@@ -1360,7 +3044,9 @@ def generate_low_poly_glb(self, block_id: str):
             'low_poly_url': lod_data['low_poly_url'],
             'original_faces': original_faces_count,
             'face_counts': lod_data['face_counts'],
+            'lod_errors_mm': lod_data.get('lod_errors_mm'),
             'file_sizes_kb': lod_data['file_sizes_kb'],
+            'cache_hit': block_result.get('cache_hit', False),
             'error_message': None
         }
 
@@ -1402,4 +3088,398 @@ def generate_low_poly_glb(self, block_id: str):
             )
             
             _update_block_status_error(block_id, str(e))
+            if checkpoint is not None:
+                checkpoint.clear()
             raise  # Propagate exception without retry
+
+
+@celery_app.task(
+    name=TASK_GENERATE_FILE_LOD_ASSETS,
+    bind=True,
+    max_retries=TASK_MAX_RETRIES,
+    default_retry_delay=TASK_RETRY_DELAY_SECONDS
+)
+def generate_file_lod_assets(self, file_key: str):
+    """Generate LOD assets for every pending block of one .3dm file.
+
+    File-level counterpart of generate_low_poly_glb: the shared .3dm is
+    downloaded and parsed ONCE, then each validated block without LODs goes
+    through _process_block_geometry, and the DB updates are written in one
+    batch per chunk of FILE_LOD_BATCH_BLOCKS blocks.
+
+    On SoftTimeLimitExceeded the committed chunks are kept, a new run of the
+    task is enqueued for the blocks still pending and the exception is
+    re-raised (it is never recorded as a block error).
+
+    Failure handling is per block: a permanent error marks only that block as
+    error_processing; a transient error leaves it pending and the task is
+    retried after the successful blocks are committed (they are no longer
+    pending, so the retry only redoes the failed ones).
+
+    The run claims its pending blocks, so a second run on the same file
+    (continuation, retry, late schedule) never encodes them too; claims on
+    blocks left pending are released when the run stops. The file's
+    debounce key is held until the run ends, then blocks validated in the
+    meantime are scheduled again (_finish_file_lod_schedule).
+
+    Args:
+        file_key: Storage key of the .3dm file (blocks.url_original)
+
+    Returns:
+        dict: {status, file_key, processed, failed, blocks: {block_id: urls},
+               cache: {asset_hits, asset_misses}}
+    """
+    logger.info("generate_file_lod_assets.started", file_key=file_key)
+    temp_3dm_path = None
+    pending = []
+    claim_token = self.request.id or uuid.uuid4().hex
+    _hold_file_lod_schedule(file_key)
+
+    try:
+        pending = _fetch_pending_blocks_for_file(file_key, claim_token=claim_token)
+        if not pending:
+            logger.info("generate_file_lod_assets.nothing_pending", file_key=file_key)
+            _finish_file_lod_schedule(file_key)
+            return {'status': 'skipped', 'file_key': file_key, 'processed': 0,
+                    'failed': {}, 'blocks': {}}
+
+        # Download + parse once for the whole file
+        file_hash = hashlib.sha1(file_key.encode('utf-8')).hexdigest()[:16]
+        temp_3dm_path = os.path.join(TEMP_DIR, f"file_{file_hash}.3dm")
+        _download_3dm_from_s3(file_key, temp_3dm_path)
+        rhino_file = _parse_rhino_file(temp_3dm_path, file_key)
+    except Exception as e:
+        logger.exception("generate_file_lod_assets.file_error",
+                         file_key=file_key, error=str(e),
+                         retry_count=self.request.retries)
+        if temp_3dm_path and os.path.exists(temp_3dm_path):
+            os.remove(temp_3dm_path)
+        if _is_transient_error(e):
+            _release_lod_claims([block_id for block_id, _ in pending], claim_token)
+            countdown = TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries)
+            raise self.retry(exc=e, countdown=countdown, max_retries=TASK_MAX_RETRIES)
+        for block_id, _ in pending:
+            _update_block_status_error(block_id, str(e))
+        raise
+
+    # Blocks are independent: with enough of them their LOD encoding is spread
+    # over a process pool. Blocks are committed FILE_LOD_BATCH_BLOCKS at a time,
+    # so hitting the time limit only loses the chunk in progress; within a
+    # chunk, block N uploads while N+1 is decimated.
+    pool = _file_lod_pool(len(pending))
+    processed, results, failed, transient_errors = 0, {}, {}, []
+    instance_groups = set()
+    interrupted = False
+    try:
+        for start in range(0, len(pending), FILE_LOD_BATCH_BLOCKS):
+            chunk = pending[start:start + FILE_LOD_BATCH_BLOCKS]
+            uploader = LODAssetUploader()
+            try:
+                run = _run_file_lods(rhino_file, chunk, uploader, pool, file_key)
+            finally:
+                uploader.close()
+
+            _update_blocks_lod_urls_batch(run.updates, run.instanced_meshes)
+            for lod_cache_key, lod_data in run.cache_entries:
+                _store_lod_cache(lod_cache_key, lod_data)
+            processed += len(run.updates)
+            results.update(run.results)
+            failed.update(run.failed)
+            transient_errors += run.transient_errors
+            instance_groups.update(m['instance_group'] for m in run.instanced_meshes)
+    except SoftTimeLimitExceeded:
+        # Committed chunks are no longer pending: a new run picks up the rest
+        logger.warning("generate_file_lod_assets.time_limit",
+                       file_key=file_key, pending=len(pending), processed=processed)
+        interrupted = True
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        # Committed and error_processing blocks are no longer claimed; the rest
+        # is released before the continuation is enqueued, so it can claim them
+        _release_lod_claims([block_id for block_id, _ in pending if block_id not in results], claim_token)
+        if interrupted:
+            celery_app.send_task(TASK_GENERATE_FILE_LOD_ASSETS, args=[file_key])
+        if processed:
+            schedule_scene_tiles()
+        if temp_3dm_path and os.path.exists(temp_3dm_path):
+            try:
+                os.remove(temp_3dm_path)
+            except Exception as e:
+                logger.warning("cleanup.failed", file_key=file_key, error=str(e))
+
+    cache_hits = sum(1 for r in results.values() if r['cache_hit'])
+    logger.info("generate_file_lod_assets.completed",
+                file_key=file_key,
+                pending=len(pending),
+                processed=processed,
+                failed=len(failed),
+                cache_hits=cache_hits,
+                instance_groups=len(instance_groups))
+
+    if transient_errors:
+        countdown = TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries)
+        logger.warning("generate_file_lod_assets.retry_scheduled",
+                       file_key=file_key,
+                       transient_failures=len(transient_errors),
+                       countdown_seconds=countdown)
+        raise self.retry(exc=transient_errors[0], countdown=countdown, max_retries=TASK_MAX_RETRIES)
+
+    _finish_file_lod_schedule(file_key)
+    return {
+        'status': 'success' if not failed else 'partial',
+        'file_key': file_key,
+        'processed': processed,
+        'failed': failed,
+        'blocks': results,
+        'cache': {'asset_hits': cache_hits, 'asset_misses': len(results) - cache_hits},
+    }
+
+
+def _kept_lod_chunks(bucket, row: dict, levels: list[str]) -> tuple[list[tuple[str, str, bytes]], dict]:
+    """Stored assets of the levels a selective rebuild keeps, for the container repack.
+
+    Read from the block's current container (one download for every level),
+    else from the per-level files.
+
+    Returns:
+        Tuple of ([(level, asset_format, data)], {level: faces or None})
+    """
+    container = row.get('lod_container') or {}
+    container_data = None
+    if levels and container.get('url'):
+        try:
+            container_data = bucket.download(_storage_key(container['url']))
+        except Exception as e:
+            logger.warning("rebuild_lod_levels.container_unreadable", block_id=row['id'], error=str(e))
+    face_counts = (row.get('lod_build') or {}).get('face_counts') or {}
+
+    chunks, faces = [], {}
+    for level in levels:
+        chunk_index = (container.get('levels') or {}).get(level)
+        if container_data is not None and chunk_index is not None:
+            asset_format, data = read_lod_chunk(container_data, level)
+            faces[level] = chunk_index.get('faces')
+        else:
+            url = row[f'{level}_poly_url']
+            asset_format = url.split('?', 1)[0].rsplit('.', 1)[-1]
+            data = bucket.download(_storage_key(url))
+            faces[level] = face_counts.get(level)
+        chunks.append((level, asset_format, data))
+    return chunks, faces
+
+
+def _rebuild_block_levels(
+    rhino_file: rhino3dm.File3dm,
+    row: dict,
+    levels: list[str],
+    uploader: LODAssetUploader,
+) -> tuple[dict, tuple[str, dict] | None]:
+    """Re-encode the stale `levels` of one block and queue their uploads.
+
+    Only the stale mesh levels are decimated and serialized (cascaded low
+    still decimates mid, without storing it). With LOD_CONTAINER the
+    container is repacked from the new assets and the kept chunks. A block
+    with every mesh level stale, or whose geometry + settings are already
+    in the LOD cache, gets a full set of assets.
+
+    Args:
+        rhino_file: Parsed .3dm of the block
+        row: Planner row of the block (_fetch_rebuild_blocks)
+        levels: Stale levels (RebuildPlan), e.g. ['low', 'container']
+        uploader: Uploader of the file batch (owner: block_id)
+
+    Returns:
+        Tuple of (update for _update_blocks_lod_levels_batch,
+        (lod_cache_key, lod_data) to index once committed, or None)
+    """
+    block_id = row['id']
+    prepared = _prepare_block_for_lods(rhino_file, block_id, row['iso_code'])
+    mesh_levels = [level for level in ('high', 'mid', 'low') if level in levels]
+    full = prepared['cache_hit'] or len(mesh_levels) == 3
+
+    if prepared['cache_hit']:
+        lod_data = dict(prepared['lod_data'])
+    else:
+        geometry = prepared['geometry']
+        urls = {}
+
+        def submit(level: str, asset_format: str, data: bytes) -> None:
+            _submit_lod_asset(uploader, urls, block_id, prepared['lod_asset_id'], level, asset_format, data)
+
+        lod_data, assets = _encode_lod_assets(
+            geometry.mesh, block_id,
+            face_layers=geometry.face_layers,
+            layer_palette=prepared['layer_palette'],
+            iso_code=prepared['lod_iso_code'],
+            fingerprint=geometry.fingerprint,
+            on_asset=submit,
+            levels=mesh_levels,
+            unit_scale=geometry.unit_scale,
+        )
+        if not full and LOD_CONTAINER:
+            kept, kept_faces = _kept_lod_chunks(
+                uploader.bucket, row, [level for level in ('high', 'mid', 'low') if level not in mesh_levels]
+            )
+            data, index = pack_lod_container(assets + kept)
+            for level, chunk in index['levels'].items():
+                chunk['faces'] = lod_data['face_counts'].get(level, kept_faces.get(level))
+            lod_data['lod_container'] = index
+            submit('container', LOD_CONTAINER_FORMAT, data)
+        lod_data.update(urls)
+
+    stamp = _lod_build_stamp(lod_data)
+    rebuilt = ('high', 'mid', 'low') if full else mesh_levels
+    if not full:
+        # Kept levels keep their stored hashes and face counts
+        stored = row.get('lod_build') or {}
+        stamp['levels'] = {
+            **{level: h for level, h in (stored.get('levels') or {}).items()
+               if level not in rebuilt and level != 'container'},
+            **{level: h for level, h in stamp['levels'].items() if level in rebuilt or level == 'container'},
+        }
+        stamp['face_counts'] = {**(stored.get('face_counts') or {}), **stamp['face_counts']}
+
+    update = {
+        'block_id': block_id,
+        **{f'{level}_poly_url': lod_data[f'{level}_poly_url'] for level in rebuilt},
+        'mtl_url': lod_data.get('mtl_url'),
+        'lod_errors_mm': {level: error for level, error in (lod_data.get('lod_errors_mm') or {}).items()
+                          if level in rebuilt},
+        'lod_container': _lod_container_column(lod_data),
+        'lod_build': stamp,
+    }
+    cache_entry = (prepared['lod_cache_key'], lod_data) if full and not prepared['cache_hit'] else None
+    return update, cache_entry
+
+
+@celery_app.task(
+    name=TASK_REBUILD_LOD_LEVELS,
+    bind=True,
+    max_retries=TASK_MAX_RETRIES,
+    default_retry_delay=TASK_RETRY_DELAY_SECONDS
+)
+def rebuild_lod_levels(self, file_key: str, block_levels: dict[str, list[str]]):
+    """Rebuild only the stale LOD levels of some blocks of one .3dm file.
+
+    Selective counterpart of generate_file_lod_assets, enqueued in batches
+    by infra/reprocess_lod_assets.py from a plan_lod_rebuild plan. The .3dm
+    is parsed ONCE; each block only re-encodes and uploads its stale
+    levels, and the batch is committed in one transaction
+    (_update_blocks_lod_levels_batch) with the merged version stamp.
+
+    The worker re-plans the blocks against its own settings and their
+    stored stamps, so a retry (or a plan made elsewhere) only redoes what
+    is still stale; `block_levels` is compared and logged. A block that
+    fails keeps its current, still servable assets: it is reported, not
+    marked error_processing. Transient errors retry the task after the
+    successful blocks are committed.
+
+    Args:
+        file_key: Storage key of the .3dm file (blocks.url_original)
+        block_levels: {block_id: stale levels} from RebuildPlan
+
+    Returns:
+        dict: {status, file_key, rebuilt: {block_id: levels}, up_to_date, failed}
+    """
+    logger.info("rebuild_lod_levels.started", file_key=file_key, blocks=len(block_levels))
+    temp_3dm_path = None
+
+    try:
+        rows = [row for row in _fetch_rebuild_blocks(list(block_levels)) if row['url_original'] == file_key]
+        plan = plan_lod_rebuild(rows, batch_blocks=max(len(rows), 1))
+        stale = {block.block_id: block.levels for block in plan.blocks}
+        if not stale:
+            logger.info("rebuild_lod_levels.up_to_date", file_key=file_key, blocks=len(rows))
+            return {'status': 'skipped', 'file_key': file_key, 'rebuilt': {},
+                    'up_to_date': plan.up_to_date, 'failed': {}}
+
+        file_hash = hashlib.sha1(file_key.encode('utf-8')).hexdigest()[:16]
+        temp_3dm_path = os.path.join(TEMP_DIR, f"rebuild_{file_hash}.3dm")
+        _download_3dm_from_s3(file_key, temp_3dm_path)
+        rhino_file = _parse_rhino_file(temp_3dm_path, file_key)
+    except Exception as e:
+        logger.exception("rebuild_lod_levels.file_error",
+                         file_key=file_key, error=str(e),
+                         retry_count=self.request.retries)
+        if temp_3dm_path and os.path.exists(temp_3dm_path):
+            os.remove(temp_3dm_path)
+        if _is_transient_error(e):
+            countdown = TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries)
+            raise self.retry(exc=e, countdown=countdown, max_retries=TASK_MAX_RETRIES)
+        raise
+
+    replanned = {block_id: levels for block_id, levels in stale.items()
+                 if sorted(levels) != sorted(block_levels.get(block_id) or [])}
+    if replanned:
+        logger.info("rebuild_lod_levels.plan_changed", file_key=file_key, blocks=replanned)
+
+    rows_by_id = {row['id']: row for row in rows}
+    updates = []
+    failed = {}
+    transient_errors = []
+    cache_entries = {}
+    uploader = LODAssetUploader()
+    try:
+        for block_id, levels in stale.items():
+            try:
+                update, cache_entry = _rebuild_block_levels(rhino_file, rows_by_id[block_id], levels, uploader)
+            except Exception as e:
+                logger.error("rebuild_lod_levels.block_error",
+                             file_key=file_key, block_id=block_id,
+                             levels=levels, error=str(e), exc_info=e)
+                failed[block_id] = str(e)
+                if _is_transient_error(e):
+                    transient_errors.append(e)
+                continue
+            updates.append(update)
+            if cache_entry is not None:
+                cache_entries[block_id] = cache_entry
+        upload_errors = uploader.wait()
+    finally:
+        uploader.close()
+    for block_id, e in upload_errors.items():
+        failed[block_id] = str(e)
+        if _is_transient_error(e):
+            transient_errors.append(e)
+    updates = [u for u in updates if u['block_id'] not in upload_errors]
+
+    try:
+        _update_blocks_lod_levels_batch(updates)
+    finally:
+        if temp_3dm_path and os.path.exists(temp_3dm_path):
+            try:
+                os.remove(temp_3dm_path)
+            except Exception as e:
+                logger.warning("cleanup.failed", file_key=file_key, error=str(e))
+
+    for block_id, (lod_cache_key, lod_data) in cache_entries.items():
+        if block_id not in failed:
+            _store_lod_cache(lod_cache_key, lod_data)
+    if updates:
+        schedule_scene_tiles()
+
+    rebuilt = {u['block_id']: stale[u['block_id']] for u in updates}
+    logger.info("rebuild_lod_levels.completed",
+                file_key=file_key,
+                rebuilt=len(rebuilt),
+                up_to_date=plan.up_to_date,
+                failed=len(failed),
+                levels=Counter(level for levels in rebuilt.values() for level in levels))
+
+    if transient_errors:
+        countdown = TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries)
+        logger.warning("rebuild_lod_levels.retry_scheduled",
+                       file_key=file_key,
+                       transient_failures=len(transient_errors),
+                       countdown_seconds=countdown)
+        raise self.retry(exc=transient_errors[0], countdown=countdown, max_retries=TASK_MAX_RETRIES)
+
+    return {
+        'status': 'success' if not failed else 'partial',
+        'file_key': file_key,
+        'rebuilt': rebuilt,
+        'up_to_date': plan.up_to_date,
+        'failed': failed,
+    }
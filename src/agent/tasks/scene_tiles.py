@@ -0,0 +1,388 @@
+"""
+build_scene_tiles — hierarchical scene tiles for whole-building rendering.
+
+The dashboard used to fetch one low-poly asset per element: thousands of
+requests and draw calls for a full tram view. This task groups the low-poly
+meshes of every render-ready block with an octree over the stored bbox
+(services/scene_octree.py), merges each leaf into ONE GLB, gives every
+internal tile the merge of its children simplified to
+SCENE_TILE_HLOD_MAX_FACES (HLOD: a distant view loads a few parent tiles,
+not every leaf) and stores a 3D Tiles style manifest (per-tile bounds,
+geometric error, child hierarchy, member face ranges) in `scene_tilesets`,
+served by GET /api/elements/tileset.
+
+Incremental rebuilds:
+- Scheduled (debounced) by the LOD tasks whenever block assets change, see
+  geometry_processing.schedule_scene_tiles.
+- Leaf content is addressed by a hash of its member ids and low-poly URLs
+  (new geometry = new URL), internal content by the hashes of its children.
+  Tiles whose hash is already in the stored manifest keep their object;
+  only the others are merged and uploaded again.
+- A member whose asset cannot be read is left out of its tile; the tile
+  then records the hash of what it actually contains, so the next run
+  rebuilds it.
+- Objects the new manifest no longer references are deleted from storage
+  once a run completes.
+
+Chunked builds: the manifest is committed every SCENE_TILES_BATCH_TILES
+rebuilt tiles (tiles not rebuilt yet keep their previous content), so a
+first build of the whole building that hits the task time limit keeps its
+progress and a continuation run only merges what is left.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from celery.exceptions import SoftTimeLimitExceeded
+
+import numpy as np
+import structlog
+import trimesh
+
+# Conditional imports: src.agent.* preferred (tests + dev), fallback to direct (production)
+try:
+    from src.agent.celery_app import celery_app
+    from src.agent.services.glb_export_service import GLBExportService, GLB_MAGIC
+    from src.agent.services.lod_decimation_service import decimate_to_target, surface_deviation
+    from src.agent.services.scene_octree import (
+        TileBlock,
+        TileNode,
+        build_octree,
+        hlod_content_hash,
+        manifest_contents,
+        merge_meshes,
+        tileset_manifest,
+    )
+    from src.agent.tasks.geometry_processing import LODAssetUploader, _storage_key, get_db_connection
+    from src.agent.constants import (
+        TASK_BUILD_SCENE_TILES,
+        TASK_MAX_RETRIES,
+        TASK_RETRY_DELAY_SECONDS,
+        SCENE_TILESET_NAME,
+        SCENE_TILES_PREFIX,
+        SCENE_TILE_MAX_BLOCKS,
+        SCENE_TILE_MAX_DEPTH,
+        SCENE_TILE_GRID_MM,
+        SCENE_TILE_HLOD_MAX_FACES,
+        SCENE_TILES_BATCH_TILES,
+        SCENE_TILES_DOWNLOAD_WORKERS,
+        PROCESSED_GEOMETRY_BUCKET,
+        LOD_ASSET_CONTENT_TYPES,
+    )
+except ImportError:
+    from celery_app import celery_app
+    from services.glb_export_service import GLBExportService, GLB_MAGIC
+    from services.lod_decimation_service import decimate_to_target, surface_deviation
+    from services.scene_octree import (
+        TileBlock,
+        TileNode,
+        build_octree,
+        hlod_content_hash,
+        manifest_contents,
+        merge_meshes,
+        tileset_manifest,
+    )
+    from tasks.geometry_processing import LODAssetUploader, _storage_key, get_db_connection
+    from constants import (
+        TASK_BUILD_SCENE_TILES,
+        TASK_MAX_RETRIES,
+        TASK_RETRY_DELAY_SECONDS,
+        SCENE_TILESET_NAME,
+        SCENE_TILES_PREFIX,
+        SCENE_TILE_MAX_BLOCKS,
+        SCENE_TILE_MAX_DEPTH,
+        SCENE_TILE_GRID_MM,
+        SCENE_TILE_HLOD_MAX_FACES,
+        SCENE_TILES_BATCH_TILES,
+        SCENE_TILES_DOWNLOAD_WORKERS,
+        PROCESSED_GEOMETRY_BUCKET,
+        LOD_ASSET_CONTENT_TYPES,
+    )
+
+try:
+    from infra.supabase_client import get_supabase_client
+except ModuleNotFoundError:
+    from src.agent.infra.supabase_client import get_supabase_client
+
+logger = structlog.get_logger()
+
+TILESET_GENERATOR = "sf-pm-agent build_scene_tiles"
+
+
+def _fetch_tile_blocks() -> list[TileBlock]:
+    """Render-ready blocks (low-poly asset + bbox, not archived), ordered by id."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, bbox, low_poly_url
+            FROM blocks
+            WHERE low_poly_url IS NOT NULL
+              AND bbox IS NOT NULL
+              AND is_archived = false
+            ORDER BY id
+            """
+        )
+        rows = cursor.fetchall()
+
+    blocks = []
+    for block_id, bbox, low_poly_url in rows:
+        if isinstance(bbox, str):
+            bbox = json.loads(bbox)
+        try:
+            bounds = np.array([bbox['min'], bbox['max']], dtype=np.float64).reshape(2, 3)
+        except (KeyError, TypeError, ValueError):
+            logger.warning("scene_tiles.invalid_bbox", block_id=str(block_id))
+            continue
+        if not np.isfinite(bounds).all():
+            logger.warning("scene_tiles.invalid_bbox", block_id=str(block_id))
+            continue
+        blocks.append(TileBlock(block_id=str(block_id), bounds=bounds, content_url=low_poly_url))
+    return blocks
+
+
+def _fetch_tileset(name: str) -> dict | None:
+    """Stored manifest of tileset `name`, or None."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT manifest FROM scene_tilesets WHERE name = %s", (name,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0]) if isinstance(row[0], str) else row[0]
+
+
+def _store_tileset(name: str, manifest: dict, tile_count: int, block_count: int) -> None:
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO scene_tilesets (name, manifest, tile_count, block_count, updated_at)
+            VALUES (%s, %s, %s, %s, NOW())
+            ON CONFLICT (name) DO UPDATE
+            SET manifest = EXCLUDED.manifest,
+                tile_count = EXCLUDED.tile_count,
+                block_count = EXCLUDED.block_count,
+                updated_at = NOW()
+            """,
+            (name, json.dumps(manifest), tile_count, block_count),
+        )
+        conn.commit()
+    logger.info("database.scene_tileset_updated", name=name, tiles=tile_count, blocks=block_count)
+
+
+def _load_block_mesh(bucket, block: TileBlock) -> trimesh.Trimesh:
+    """Low-poly mesh of a block in absolute Rhino coordinates (GLB or legacy OBJ)."""
+    data = bucket.download(_storage_key(block.content_url))
+    if data[:4] == GLB_MAGIC:
+        return GLBExportService.decode(data)
+    return trimesh.load(trimesh.util.wrap_as_stream(data), file_type='obj', force='mesh', process=False)
+
+
+def _merge_tile(
+    bucket,
+    downloads: ThreadPoolExecutor,
+    blocks: list[TileBlock],
+) -> tuple[trimesh.Trimesh, bytes, list, list]:
+    """(merged mesh, GLB bytes, merged block ids, their face ranges) of one leaf."""
+    futures = [(block, downloads.submit(_load_block_mesh, bucket, block)) for block in blocks]
+    meshes, merged = [], []
+    for block, future in futures:
+        try:
+            meshes.append(future.result())
+            merged.append(block.block_id)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception as e:
+            logger.warning("scene_tiles.block_skipped", block_id=block.block_id, error=str(e))
+    mesh, face_ranges = merge_meshes(meshes)
+    # No Draco: it reorders faces, and face_ranges must index the merged triangles
+    asset = GLBExportService(compression="none").encode(mesh)
+    return mesh, asset.data, merged, face_ranges
+
+
+def _load_tile_mesh(bucket, uri: str) -> trimesh.Trimesh:
+    """Merged mesh of a tile stored by an earlier run."""
+    return GLBExportService.decode(bucket.download(_storage_key(uri)))
+
+
+def _hlod_tile(meshes: list[trimesh.Trimesh], address: str) -> tuple[bytes, float]:
+    """(GLB bytes, deviation in mm) of an internal tile: its children merged and simplified."""
+    merged, _ = merge_meshes(meshes)
+    if len(merged.faces) <= SCENE_TILE_HLOD_MAX_FACES:
+        simplified, deviation = merged, 0.0
+    else:
+        simplified, _, _ = decimate_to_target(merged, SCENE_TILE_HLOD_MAX_FACES, f"tile-{address}")
+        deviation = surface_deviation(merged, simplified)
+    return GLBExportService().encode(simplified).data, deviation
+
+
+def _tile_keys(manifest: dict | None) -> set[str]:
+    """Storage keys of the tile objects a manifest references."""
+    return {_storage_key(entry['uri']) for entry in manifest_contents(manifest).values()}
+
+
+def _delete_tiles(bucket, keys: set[str]) -> int:
+    """Remove superseded tile objects (never anything outside SCENE_TILES_PREFIX)."""
+    keys = sorted(key for key in keys if key.startswith(SCENE_TILES_PREFIX))
+    if not keys:
+        return 0
+    try:
+        bucket.remove(keys)
+    except Exception as e:
+        logger.warning("scene_tiles.delete_failed", tiles=len(keys), error=str(e))
+        return 0
+    logger.info("scene_tiles.deleted", tiles=len(keys))
+    return len(keys)
+
+
+@celery_app.task(
+    name=TASK_BUILD_SCENE_TILES,
+    bind=True,
+    max_retries=TASK_MAX_RETRIES,
+    default_retry_delay=TASK_RETRY_DELAY_SECONDS,
+)
+def build_scene_tiles(self, name: str = SCENE_TILESET_NAME):
+    """(Re)build the scene tileset: octree over block bboxes, merged GLB per tile.
+
+    Tiles are built children first: a leaf merges its members' low-poly
+    GLBs, an internal tile its children's contents (downloaded back when a
+    child was reused). Every SCENE_TILES_BATCH_TILES rebuilt tiles the
+    uploads are awaited and the manifest committed; on SoftTimeLimitExceeded
+    the finished tiles are committed, a continuation run is enqueued and the
+    exception is re-raised. Objects no longer referenced are deleted when the
+    run completes (listed in manifest extras until then).
+
+    Args:
+        name: Tileset row in scene_tilesets
+
+    Returns:
+        dict: {status, name, blocks, tiles, rebuilt, reused, skipped_blocks, deleted}
+    """
+    logger.info("build_scene_tiles.started", name=name)
+    try:
+        blocks = _fetch_tile_blocks()
+        stored = _fetch_tileset(name)
+    except Exception as e:
+        logger.exception("build_scene_tiles.fetch_failed", name=name, error=str(e))
+        raise self.retry(exc=e, countdown=TASK_RETRY_DELAY_SECONDS * (2 ** self.request.retries))
+
+    previous = manifest_contents(stored)
+    previous_by_address = {entry['address']: entry for entry in previous.values()}
+    # Objects of the stored manifest, plus those an unfinished run left to delete
+    superseded = _tile_keys(stored) | set(((stored or {}).get('extras') or {}).get('superseded_tiles') or [])
+
+    root = build_octree(blocks, SCENE_TILE_MAX_BLOCKS, SCENE_TILE_MAX_DEPTH, SCENE_TILE_GRID_MM)
+    nodes = list(root.post_order()) if root is not None else []
+
+    contents: dict[str, dict] = {}  # uploaded tiles
+    pending: dict[str, dict] = {}   # queued uploads, committed at the next flush
+    meshes: dict[str, trimesh.Trimesh] = {}  # merged meshes of rebuilt tiles, until their parent is built
+    rebuilt = reused = skipped = failed = 0
+    uploader = LODAssetUploader()
+    bucket = get_supabase_client().storage.from_(PROCESSED_GEOMETRY_BUCKET)
+
+    def flush() -> None:
+        nonlocal rebuilt, failed
+        errors = uploader.wait()
+        for address, content in pending.items():
+            if address in errors:
+                failed += 1
+            else:
+                contents[address] = content
+                rebuilt += 1
+        pending.clear()
+
+    def commit(final: bool) -> None:
+        """Store the manifest; tiles not rebuilt yet keep their previous content until `final`."""
+        tiles = dict(contents)
+        if not final:
+            addresses = {node.address for node in nodes}
+            tiles = {**{a: e for a, e in previous_by_address.items() if a in addresses}, **tiles}
+        manifest = tileset_manifest(root, tiles, TILESET_GENERATOR)
+        unreferenced = superseded - _tile_keys(manifest)
+        if not final and unreferenced:
+            manifest['extras'] = {'superseded_tiles': sorted(unreferenced)}
+        _store_tileset(name, manifest, len(tiles), len(blocks))
+
+    try:
+        with ThreadPoolExecutor(max_workers=SCENE_TILES_DOWNLOAD_WORKERS,
+                                thread_name_prefix="tile-download") as downloads:
+            for node in nodes:
+                if node.is_leaf:
+                    content_hash = node.content_hash
+                else:
+                    children = {child.address: built for child in node.children
+                                if (built := pending.get(child.address) or contents.get(child.address))}
+                    if not children:
+                        continue
+                    content_hash = hlod_content_hash([child['content_hash'] for child in children.values()],
+                                                     SCENE_TILE_HLOD_MAX_FACES)
+                if content_hash in previous:
+                    contents[node.address] = previous[content_hash]
+                    reused += 1
+                    continue
+
+                if node.is_leaf:
+                    mesh, data, merged, face_ranges = _merge_tile(bucket, downloads, node.blocks)
+                    skipped += len(node.blocks) - len(merged)
+                    if not merged:
+                        continue
+                    if len(merged) < len(node.blocks):
+                        included = set(merged)
+                        content_hash = TileNode(
+                            address=node.address, bounds=node.bounds,
+                            blocks=[b for b in node.blocks if b.block_id in included],
+                        ).content_hash
+                    geometric_error = 0.0
+                else:
+                    try:
+                        child_meshes = [
+                            meshes.pop(address) if address in meshes else _load_tile_mesh(bucket, child['uri'])
+                            for address, child in children.items()
+                        ]
+                        data, deviation = _hlod_tile(child_meshes, node.address)
+                    except SoftTimeLimitExceeded:
+                        raise
+                    except Exception as e:
+                        # Left without content: its error stays the bbox diagonal, so it is always refined
+                        logger.warning("scene_tiles.hlod_failed", address=node.address, error=str(e))
+                        failed += 1
+                        continue
+                    mesh, merged, face_ranges = None, [], []
+                    geometric_error = max([deviation] + [c.get('geometric_error') or 0.0 for c in children.values()])
+
+                uri = uploader.submit(node.address, f"{SCENE_TILES_PREFIX}{name}/{content_hash}.glb",
+                                      data, LOD_ASSET_CONTENT_TYPES['glb'])
+                pending[node.address] = {'uri': uri, 'content_hash': content_hash, 'block_ids': merged,
+                                         'face_ranges': face_ranges, 'geometric_error': geometric_error}
+                if mesh is not None:
+                    meshes[node.address] = mesh
+                if len(pending) >= SCENE_TILES_BATCH_TILES:
+                    flush()
+                    commit(final=False)
+        flush()
+    except SoftTimeLimitExceeded:
+        # Uploaded tiles are committed: the continuation reuses them by hash
+        logger.warning("build_scene_tiles.time_limit", name=name, rebuilt=rebuilt, tiles=len(contents))
+        commit(final=False)
+        celery_app.send_task(TASK_BUILD_SCENE_TILES, args=[name])
+        raise
+    finally:
+        uploader.close()
+
+    commit(final=True)
+    deleted = _delete_tiles(bucket, superseded - _tile_keys(tileset_manifest(root, contents, TILESET_GENERATOR)))
+
+    result = {
+        'status': 'success' if not (skipped or failed) else 'partial',
+        'name': name,
+        'blocks': len(blocks),
+        'tiles': len(contents),
+        'rebuilt': rebuilt,
+        'reused': reused,
+        'skipped_blocks': skipped,
+        'deleted': deleted,
+    }
+    logger.info("build_scene_tiles.completed", **result)
+    return result
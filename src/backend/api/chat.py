@@ -30,6 +30,11 @@ limiter = Limiter(key_func=get_remote_address)
 EMBED_MODEL = "text-embedding-3-small"          # must match the vector(1536) column
 CHAT_MODEL = os.environ.get("RAG_CHAT_MODEL", "gpt-4-turbo")
 
+# Indexed material of a block: the expression of idx_blocks_material_mesh_volume
+# (migration 20261019000005). Queries must use it unchanged, together with the
+# index predicate is_archived = false, for the planner to pick the index.
+MATERIAL_EXPR = "COALESCE(b.rhino_metadata->>'SF_GEN_Material', b.rhino_metadata->>'Material')"
+
 SYSTEM_PROMPT = (
     "Eres «El Archivista», asistente del inventario de piezas de la Sagrada "
     "Família. Responde ÚNICAMENTE con la información del CONTEXTO. Si la "
@@ -531,31 +536,48 @@ async def ask(request: Request, body: ChatAskRequest) -> ChatAskResponse:
                     used_context=True,
                 )
 
-            # Volume sum by material questions (full inventory, no top_k truncation)
+            # Volume sum by material questions (full inventory, no top_k truncation).
+            # Mesh volume computed by the geometry pipeline (blocks.mesh_volume_m3);
+            # the SF_GEN_Volum_m3 UserString only for blocks not processed yet.
+            # The patterns are matched against the few DISTINCT indexed
+            # materials, then the sum looks those values up with = ANY on
+            # idx_blocks_material_mesh_volume. Open meshes (mesh_watertight =
+            # false) have no exact volume: they are left out and reported.
             if _is_volume_sum_question(body.question) and material_terms:
                 patterns: list[str] = []
                 for t in material_terms:
                     patterns.extend(_material_patterns(t))
                 cur.execute(
+                    "WITH materials AS ("
+                    f"  SELECT DISTINCT {MATERIAL_EXPR} AS material "
+                    "  FROM blocks b WHERE b.is_archived = false"
+                    ") "
                     "SELECT "
-                    "  COUNT(*)::int AS piece_count, "
-                    "  COALESCE(SUM(NULLIF(regexp_replace(COALESCE(b.rhino_metadata->>'SF_GEN_Volum_m3', ''), '[^0-9.\-]', '', 'g'), '')::double precision), 0)::double precision AS total_volume "
+                    "  COUNT(*) FILTER (WHERE b.mesh_watertight IS NOT FALSE)::int AS piece_count, "
+                    "  COUNT(*) FILTER (WHERE b.mesh_watertight IS FALSE)::int AS open_count, "
+                    "  COALESCE(SUM(COALESCE(b.mesh_volume_m3, NULLIF(regexp_replace(COALESCE(b.rhino_metadata->>'SF_GEN_Volum_m3', ''), '[^0-9.\\-]', '', 'g'), '')::double precision)) "
+                    "    FILTER (WHERE b.mesh_watertight IS NOT FALSE), 0)::double precision AS total_volume "
                     "FROM blocks b "
-                    "WHERE EXISTS ("
-                    "  SELECT 1 FROM unnest(%s::text[]) p(pattern) "
-                    "  WHERE COALESCE(b.rhino_metadata->>'Material', '') ILIKE p.pattern "
-                    "     OR COALESCE(b.rhino_metadata->>'SF_GEN_Material', '') ILIKE p.pattern"
-                    ")",
+                    "WHERE b.is_archived = false "
+                    f"  AND {MATERIAL_EXPR} = ANY(ARRAY("
+                    "    SELECT m.material FROM materials m "
+                    "    WHERE EXISTS (SELECT 1 FROM unnest(%s::text[]) p(pattern) WHERE m.material ILIKE p.pattern)"
+                    "  ))",
                     (patterns,),
                 )
-                row = cur.fetchone() or {"piece_count": 0, "total_volume": 0.0}
+                row = cur.fetchone() or {"piece_count": 0, "open_count": 0, "total_volume": 0.0}
                 piece_count = int(row.get("piece_count") or 0)
+                open_count = int(row.get("open_count") or 0)
                 total_volume = float(row.get("total_volume") or 0.0)
                 human_terms = " o ".join(material_terms)
+                open_text = (
+                    f" {open_count} piezas con malla abierta no se incluyen (volumen no exacto)."
+                    if open_count else ""
+                )
                 return ChatAskResponse(
                     answer=(
                         f"El sumatorio de volúmenes para {human_terms} es "
-                        f"{total_volume:.6f} m³ en {piece_count} piezas."
+                        f"{total_volume:.6f} m³ en {piece_count} piezas.{open_text}"
                     ),
                     sources=[],
                     used_context=True,
@@ -10,6 +10,8 @@ Breaking Changes from /api/parts:
 
 Endpoints:
 - GET /api/elements - List elements with optional filters
+- GET /api/elements/instances - Instanced meshes + per-element transform tables
+- GET /api/elements/tileset - Scene tileset manifest (merged spatial tiles)
 - GET /api/elements/{id} - Get element detail
 """
 
@@ -17,7 +19,9 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, Query
 
-from schemas import ElementsListResponse, ElementDetail, ElementStatus, ElementNavigationResponse
+from schemas import (
+    ElementsListResponse, ElementDetail, ElementStatus, ElementNavigationResponse, InstancesResponse, SceneTileset,
+)
 from infra.supabase_client import get_supabase_client
 from services.elements_service import ElementsService
 from services.element_detail_service import ElementDetailService
@@ -26,6 +30,7 @@ from constants import (
     ERROR_MSG_INVALID_UUID,
     ERROR_MSG_ELEMENT_NOT_FOUND,
     ERROR_MSG_FETCH_ELEMENTS_FAILED,
+    ERROR_MSG_TILESET_NOT_FOUND,
     TABLE_BLOCKS,
 )
 
@@ -146,6 +151,61 @@ async def list_elements(
         )
 
 
+@router.get("/instances", response_model=InstancesResponse)
+async def list_instances() -> InstancesResponse:
+    """
+    List the instanced meshes of the scene (repeated geometry stored once).
+
+    Each group carries the LOD URLs of ONE shared mesh (local frame, centered
+    on its bbox) and a transform table: transforms[i] (column-major 4x4,
+    Rhino world mm, Z-up) places a copy for element_ids[i]. The viewer draws
+    a group with a single instanced draw call; elements with an
+    instance_group in GET /api/elements can skip their own mesh.
+
+    Declared before /{element_id} so "instances" is not parsed as an id.
+
+    Errors:
+        - 500: Database query failure
+    """
+    try:
+        service = ElementsService(get_supabase_client())
+        return service.list_instances()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=ERROR_MSG_FETCH_ELEMENTS_FAILED.format(error=str(e))
+        )
+
+
+@router.get("/tileset", response_model=SceneTileset)
+async def get_scene_tileset() -> SceneTileset:
+    """
+    Scene tileset manifest for whole-building rendering.
+
+    A 3D Tiles style hierarchy built by the build_scene_tiles agent task:
+    elements are grouped by an octree over their bbox and each leaf tile is
+    ONE merged low-poly GLB, so a full view costs one request and one draw
+    call per visible tile instead of one per element. Leaf extras map face
+    ranges of the merged mesh back to element ids (picking).
+
+    Declared before /{element_id} so "tileset" is not parsed as an id.
+
+    Errors:
+        - 404: Tileset not built yet
+        - 500: Database query failure
+    """
+    try:
+        tileset = ElementsService(get_supabase_client()).get_tileset()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=ERROR_MSG_FETCH_ELEMENTS_FAILED.format(error=str(e))
+        )
+    if tileset is None:
+        raise HTTPException(status_code=404, detail=ERROR_MSG_TILESET_NOT_FOUND)
+    return tileset
+
+
 @router.get("/{element_id}", response_model=ElementDetail)
 async def get_element_detail(
     element_id: str
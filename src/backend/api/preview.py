@@ -39,36 +39,31 @@ def _validate_iso(name: str) -> tuple[bool, list[str]]:
     return True, []
 
 
-def _extract_refs_and_strings(
-    file3dm, idef_id: str
-) -> tuple[int, dict[str, str]]:
+def _index_instance_references(file3dm) -> dict[str, tuple[int, dict[str, str]]]:
     """
-    Count InstanceReferences that point to `idef_id` and extract UserStrings
-    from the first one found.
+    Group the InstanceReferences of the file by the InstanceDefinition they
+    point to, in ONE pass over the object table (instead of one full scan per
+    InstanceDefinition).
 
     Returns:
-        (count_refs, user_strings_dict)
+        {idef_id (lowercase): (count_refs, user_strings of the first reference)}
     """
-    count = 0
-    first_strings: dict[str, str] = {}
+    refs: dict[str, tuple[int, dict[str, str]]] = {}
 
     if not hasattr(file3dm, "Objects") or file3dm.Objects is None:
-        return 0, {}
+        return refs
 
+    instance_reference = rhino3dm.ObjectType.InstanceReference
     for obj in file3dm.Objects:
         try:
-            obj_type = getattr(obj.Geometry, "ObjectType", None)
-            if obj_type != rhino3dm.ObjectType.InstanceReference:
-                continue
-
             iref_geom = obj.Geometry
-            if not hasattr(iref_geom, "ParentIdefId"):
+            if getattr(iref_geom, "ObjectType", None) != instance_reference:
                 continue
-            if str(iref_geom.ParentIdefId).lower() != idef_id.lower():
+            if not hasattr(iref_geom, "ParentIdefId"):
                 continue
+            idef_id = str(iref_geom.ParentIdefId).lower()
 
-            count += 1
-
+            count, first_strings = refs.get(idef_id, (0, {}))
             # Extract UserStrings from first matching reference only
             if not first_strings and hasattr(obj, "Attributes") and hasattr(
                 obj.Attributes, "GetUserStrings"
@@ -78,10 +73,11 @@ def _extract_refs_and_strings(
                     for key, value in raw:
                         if key not in first_strings:
                             first_strings[key] = value
+            refs[idef_id] = (count + 1, first_strings)
         except Exception:
             continue
 
-    return count, first_strings
+    return refs
 
 
 def _check_exists(supabase, iso_code: str) -> bool:
@@ -142,10 +138,11 @@ async def preview_file(
 
         supabase = get_supabase_client()
         blocks: list[BlockPreview] = []
+        refs_by_idef = _index_instance_references(file3dm)
 
         for idef in file3dm.InstanceDefinitions:
             idef_id_str = str(idef.Id).lower()
-            count_refs, user_strings = _extract_refs_and_strings(file3dm, idef_id_str)
+            count_refs, user_strings = refs_by_idef.get(idef_id_str, (0, {}))
 
             codi: str | None = user_strings.get("Codi") or None
             material: str | None = user_strings.get("Material") or None
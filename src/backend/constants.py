@@ -24,6 +24,9 @@ TABLE_EVENTS = "events"
 TABLE_FILES = "files"
 TABLE_PARTS = "parts"
 TABLE_BLOCKS = "blocks"
+TABLE_INSTANCED_MESHES = "instanced_meshes"
+TABLE_SCENE_TILESETS = "scene_tilesets"
+SCENE_TILESET_DEFAULT = "default"
 
 # ===== File Validation =====
 ALLOWED_EXTENSION = ".3dm"
@@ -53,6 +56,12 @@ QUERY_ORDER_DESC = True
 METRICS_WINDOW_HOURS = 24  # Time window for 24h metrics
 PERCENTILES = [0.50, 0.95, 0.99]  # Processing time percentiles to calculate
 CLASSIFICATION_METHODS = ["LLM_GPT4", "FALLBACK_REGEX"]  # Valid classification methods
+# Agent worker cache counters (Redis hashes written by the workers, see
+# src/agent/constants.py MODEL_CACHE_STATS_KEY / LOD_CACHE_STATS_KEY)
+WORKER_CACHE_STATS_KEYS = {
+    "model": "geometry:model_cache_stats",
+    "lod": "geometry:lod_cache_stats",
+}
 
 # Event types for metrics aggregation
 EVENT_TYPE_GRAPH_STARTED = "GRAPH_STARTED"
@@ -62,9 +71,18 @@ EVENT_TYPE_NODE_COMPLETED = "NODE_COMPLETED"
 EVENT_TYPE_FALLBACK_ACTIVATED = "FALLBACK_ACTIVATED"
 
 # ===== Element API Query Fields (T-1504-BACK + US-015 LOD) =====
-ELEMENTS_LIST_SELECT_FIELDS = "id, iso_code, status, high_poly_url, mid_poly_url, low_poly_url, mtl_url, bbox, rhino_metadata"
+ELEMENTS_LIST_SELECT_FIELDS = ("id, iso_code, status, high_poly_url, mid_poly_url, low_poly_url, mtl_url, "
+                               "lod_errors_mm, lod_container, instance_group, bbox, rhino_metadata")
+INSTANCED_MESH_SELECT_FIELDS = "instance_group, high_poly_url, mid_poly_url, low_poly_url, face_counts"
+INSTANCE_MEMBER_SELECT_FIELDS = "id, instance_group, instance_transforms"
+# PostgREST truncates any select at its max-rows (1000 by default): instance
+# members are read in pages of this size (must not exceed max-rows), and the
+# instanced_meshes lookup sends this many groups per IN filter
+INSTANCES_PAGE_SIZE = 1000
+INSTANCE_GROUPS_PER_QUERY = 100
 ELEMENT_DETAIL_SELECT_FIELDS = ("id, iso_code, status, created_at, updated_at, "
-                                 "high_poly_url, mid_poly_url, low_poly_url, mtl_url, bbox, validation_report, rhino_metadata")
+                                 "high_poly_url, mid_poly_url, low_poly_url, mtl_url, lod_errors_mm, lod_container, bbox, "
+                                 "validation_report, rhino_metadata")
 
 # ===== Validation Error Messages =====
 ERROR_MSG_INVALID_STATUS = "Invalid status value. Must be one of: {valid_values}"
@@ -74,6 +92,7 @@ ERROR_MSG_ELEMENT_NOT_FOUND = "Element not found"
 ERROR_MSG_INVALID_UUID_FORMAT = "Invalid UUID format"
 ERROR_MSG_DATABASE_ERROR = "Database error: {error}"
 ERROR_MSG_FETCH_ELEMENTS_FAILED = "Failed to fetch elements: {error}"
+ERROR_MSG_TILESET_NOT_FOUND = "Scene tileset not built yet"
 
 # ===== US-020: ISO-19650 Validation Pattern =====
 # Duplicated from agent.constants for backend-only imports (Railway separation)
@@ -409,6 +409,39 @@ class ElementStatus(str, Enum):
     ARCHIVED = "archived"
 
 
+class LodChunk(BaseModel):
+    """
+    Byte range of one LOD level inside the progressive LOD container.
+
+    The chunk is a complete asset of its level (GLB, or OBJ for the per-layer
+    high-poly): fetch it with `Range: bytes={offset}-{offset + length - 1}`.
+    """
+    offset: int = Field(..., description="First byte of the chunk in the container")
+    length: int = Field(..., description="Chunk size in bytes")
+    format: str = Field(..., description="Asset format of the chunk ('glb' or 'obj')")
+    faces: Optional[int] = Field(None, description="Triangle count of the level")
+
+
+class LodContainer(BaseModel):
+    """
+    Progressive LOD container: every LOD level of an element in ONE object.
+
+    Chunks are stored coarse to fine (low, mid, high); a viewer loads the low
+    level with one HTTP range request and refines with further ranges of the
+    same CDN object.
+
+    Attributes:
+        url: CDN URL of the container
+        size: Container size in bytes
+        header_length: Bytes of the binary header (chunk index repeated in the file)
+        levels: Byte range per LOD level
+    """
+    url: str = Field(..., description="CDN URL of the container")
+    size: int = Field(..., description="Container size in bytes")
+    header_length: int = Field(..., description="Size of the container header in bytes")
+    levels: Dict[str, LodChunk] = Field(..., description="Byte range per LOD level ('low', 'mid', 'high')")
+
+
 class Element(BaseModel):
     """
     Element schema optimized for 3D canvas rendering (US-005 + US-015 LOD).
@@ -432,6 +465,9 @@ class Element(BaseModel):
         high_poly_url: CDN URL to high-detail GLB (~7k tris, Level 0: 0-5m viewing)
         mid_poly_url: CDN URL to mid-detail GLB (~2k tris, Level 1: 5-20m viewing)
         low_poly_url: CDN URL to low-detail GLB (~500 tris, Level 2: 20-50m viewing)
+        lod_errors_mm: Achieved geometric error per LOD level ({'high': 0.0, 'mid': x, 'low': y})
+        instance_group: Shared instanced mesh this element is drawn from (GET /api/elements/instances)
+        lod_container: Byte ranges of the LOD levels in the progressive LOD container
         bbox: 3D bounding box for camera centering and LOD Level 3 (>50m wireframe proxy)
     """
     id: UUID = Field(..., description="Element UUID")
@@ -453,6 +489,18 @@ class Element(BaseModel):
         None,
         description="Companion MTL URL for per-face Rhino layer colors (high-poly only)"
     )
+    lod_errors_mm: Optional[Dict[str, Optional[float]]] = Field(
+        None,
+        description="Achieved geometric error (mm) per LOD level vs the full-resolution mesh"
+    )
+    instance_group: Optional[str] = Field(
+        None,
+        description="Instanced mesh group (geometry fingerprint); null if the element is not instanced"
+    )
+    lod_container: Optional[LodContainer] = Field(
+        None,
+        description="Progressive LOD container (one object, chunk byte ranges per level); null if not generated"
+    )
     bbox: Optional[BoundingBox] = Field(
         None,
         description="3D bounding box (used for camera centering and LOD Level 3: >50m wireframe proxy)"
@@ -521,6 +569,64 @@ class ElementsListResponse(BaseModel):
         }
         }
     )
+class InstancedMesh(BaseModel):
+    """
+    One shared mesh drawn with a single instanced draw call.
+
+    Repeated geometry is stored once, in a local frame centered on its bbox.
+    `transforms[i]` places one copy for element `element_ids[i]` (an element
+    placed by several InstanceReferences appears several times).
+
+    Attributes:
+        instance_group: Geometry fingerprint shared by the member elements
+        high_poly_url / mid_poly_url / low_poly_url: CDN URLs of the shared mesh LODs
+        face_counts: Faces per LOD level of the shared mesh
+        instance_count: Number of placements (== len(transforms))
+        element_ids: Element of each placement
+        transforms: Column-major 4x4 matrices (16 floats, Rhino world mm, Z-up)
+    """
+    instance_group: str = Field(..., description="Geometry fingerprint of the group")
+    high_poly_url: Optional[str] = Field(None, description="CDN URL to the shared high-detail GLB")
+    mid_poly_url: Optional[str] = Field(None, description="CDN URL to the shared mid-detail GLB")
+    low_poly_url: Optional[str] = Field(None, description="CDN URL to the shared low-detail GLB")
+    face_counts: Dict[str, int] = Field(default_factory=dict, description="Faces per LOD level")
+    instance_count: int = Field(..., description="Number of placements")
+    element_ids: List[UUID] = Field(..., description="Element of each placement (aligned with transforms)")
+    transforms: List[List[float]] = Field(..., description="Column-major 4x4 placement matrices")
+
+
+class InstancesResponse(BaseModel):
+    """
+    Response for GET /api/elements/instances endpoint.
+
+    Attributes:
+        groups: Instanced meshes with their placements
+        meta: Metadata (group and instance counts)
+    """
+    groups: List[InstancedMesh] = Field(..., description="Instanced meshes")
+    meta: dict = Field(
+        default_factory=lambda: {"groups": 0, "instances": 0},
+        description="Response metadata"
+    )
+
+
+class SceneTileset(BaseModel):
+    """
+    Response for GET /api/elements/tileset (3D Tiles style manifest).
+
+    Built by the build_scene_tiles agent task: an octree over element bboxes
+    whose leaves are merged low-poly GLBs and whose parents carry a
+    simplified merge of their children (HLOD). Tiles carry boundingVolume.box,
+    geometricError, refine ("REPLACE"), content.uri and children; leaf
+    extras list block_ids with their [first_face, face_count] ranges in the
+    merged mesh. Coordinates are Rhino mm, Z-up.
+    """
+    asset: dict = Field(..., description="3D Tiles asset block (version, generator, extras)")
+    geometricError: float = Field(..., description="Geometric error (mm) of the whole scene")
+    root: Optional[dict] = Field(None, description="Root tile (null for an empty scene)")
+    updated_at: Optional[str] = Field(None, description="Last rebuild (ISO 8601)")
+
+
 class ElementDetail(BaseModel):
     """
     Detailed element info for 3D viewer modal (US-010).
@@ -552,6 +658,8 @@ class ElementDetail(BaseModel):
     mid_poly_url: Optional[str] = Field(None, description="Presigned CDN URL for mid-poly OBJ")
     low_poly_url: Optional[str] = Field(None, description="Presigned CDN URL (TTL 5min)")
     mtl_url: Optional[str] = Field(None, description="Companion MTL URL for per-face Rhino layer colors")
+    lod_errors_mm: Optional[Dict[str, Optional[float]]] = Field(None, description="Achieved geometric error (mm) per LOD level")
+    lod_container: Optional[LodContainer] = Field(None, description="Progressive LOD container with chunk byte ranges")
     bbox: Optional[BoundingBox] = Field(None, description="3D bounding box")
     validation_report: Optional[ValidationReport] = Field(None, description="Validation results")
     glb_size_bytes: Optional[int] = Field(None, description="GLB file size in bytes")
@@ -145,6 +145,8 @@ class ElementDetailService:
             'mid_poly_url': element.get('mid_poly_url'),
             'low_poly_url': element.get('low_poly_url'),
             'mtl_url': element.get('mtl_url'),
+            'lod_errors_mm': element.get('lod_errors_mm'),
+            'lod_container': element.get('lod_container'),
             'bbox': element.get('bbox'),
             'validation_report': element.get('validation_report'),
             'rhino_metadata': element.get('rhino_metadata'),
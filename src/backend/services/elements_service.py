@@ -10,16 +10,25 @@ Breaking Changes from PartsService:
 - Application-level filtering: low_poly_url IS NOT NULL AND bbox IS NOT NULL
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from supabase import Client
 
-from schemas import Element, ElementsListResponse, BoundingBox, ElementStatus
+from schemas import (
+    Element, ElementsListResponse, BoundingBox, ElementStatus, InstancedMesh, InstancesResponse, SceneTileset,
+)
 from constants import (
     TABLE_BLOCKS,
+    TABLE_INSTANCED_MESHES,
+    TABLE_SCENE_TILESETS,
+    SCENE_TILESET_DEFAULT,
     QUERY_FIELD_IS_ARCHIVED,
     QUERY_FIELD_CREATED_AT,
     QUERY_ORDER_DESC,
     ELEMENTS_LIST_SELECT_FIELDS,
+    INSTANCED_MESH_SELECT_FIELDS,
+    INSTANCE_MEMBER_SELECT_FIELDS,
+    INSTANCES_PAGE_SIZE,
+    INSTANCE_GROUPS_PER_QUERY,
 )
 
 
@@ -107,6 +116,9 @@ class ElementsService:
         mid_poly_url = self._apply_cdn_transformation(row.get("mid_poly_url"))
         low_poly_url = self._apply_cdn_transformation(row.get("low_poly_url"))
         mtl_url = row.get("mtl_url") or None
+        lod_container = row.get("lod_container") or None
+        if lod_container:
+            lod_container = {**lod_container, "url": self._apply_cdn_transformation(lod_container["url"])}
 
         # Extract SF_ARC_Agrupacio1 from rhino_metadata JSONB
         rhino_metadata = row.get("rhino_metadata") or {}
@@ -128,6 +140,9 @@ class ElementsService:
             mid_poly_url=mid_poly_url,    # CDN-transformed or None
             low_poly_url=low_poly_url,    # CDN-transformed or None
             mtl_url=mtl_url,
+            lod_errors_mm=row.get("lod_errors_mm") or None,
+            instance_group=row.get("instance_group") or None,
+            lod_container=lod_container,
             bbox=bbox,
             agrupacio=agrupacio,
             material=material,
@@ -253,3 +268,126 @@ class ElementsService:
                 "filtered": len(elements)
             }
         )
+
+    def list_instances(self) -> InstancesResponse:
+        """
+        List the instanced meshes of all active elements with their placements.
+
+        Repeated geometry is stored once (instanced_meshes) and placed by the
+        per-element transform tables (blocks.instance_transforms), so the
+        viewer can draw each group with one instanced draw call instead of one
+        mesh per element.
+
+        Both tables are read in pages (INSTANCES_PAGE_SIZE members per
+        request, INSTANCE_GROUPS_PER_QUERY groups per mesh lookup), so large
+        scenes are not truncated at the PostgREST max-rows limit.
+
+        Returns:
+            InstancesResponse with one InstancedMesh per group; transforms and
+            element_ids are aligned (one entry per placement)
+
+        Raises:
+            Exception: If database query fails
+        """
+        members: List[Dict[str, Any]] = []
+        while True:
+            page = (
+                self.supabase
+                .table(TABLE_BLOCKS)
+                .select(INSTANCE_MEMBER_SELECT_FIELDS)
+                .eq(QUERY_FIELD_IS_ARCHIVED, False)
+                .not_.is_("instance_group", "null")
+                .order(QUERY_FIELD_CREATED_AT, desc=QUERY_ORDER_DESC)
+                .order("id")  # Unique tiebreaker: stable pages
+                .range(len(members), len(members) + INSTANCES_PAGE_SIZE - 1)
+                .execute()
+            ).data
+            members.extend(page)
+            if len(page) < INSTANCES_PAGE_SIZE:
+                break
+
+        placements: Dict[str, list] = {}
+        for row in members:
+            for transform in row.get("instance_transforms") or []:
+                placements.setdefault(row["instance_group"], []).append((row["id"], transform))
+        if not placements:
+            return InstancesResponse(groups=[], meta={"groups": 0, "instances": 0})
+
+        group_names = list(placements)
+        meshes = []
+        for start in range(0, len(group_names), INSTANCE_GROUPS_PER_QUERY):
+            meshes.extend((
+                self.supabase
+                .table(TABLE_INSTANCED_MESHES)
+                .select(INSTANCED_MESH_SELECT_FIELDS)
+                .in_("instance_group", group_names[start:start + INSTANCE_GROUPS_PER_QUERY])
+                .execute()
+            ).data)
+
+        groups = []
+        for mesh in meshes:
+            group_placements = placements.get(mesh["instance_group"], [])
+            groups.append(InstancedMesh(
+                instance_group=mesh["instance_group"],
+                high_poly_url=self._apply_cdn_transformation(mesh.get("high_poly_url")),
+                mid_poly_url=self._apply_cdn_transformation(mesh.get("mid_poly_url")),
+                low_poly_url=self._apply_cdn_transformation(mesh.get("low_poly_url")),
+                face_counts=mesh.get("face_counts") or {},
+                instance_count=len(group_placements),
+                element_ids=[element_id for element_id, _ in group_placements],
+                transforms=[transform for _, transform in group_placements],
+            ))
+
+        return InstancesResponse(
+            groups=groups,
+            meta={
+                "groups": len(groups),
+                "instances": sum(group.instance_count for group in groups),
+            }
+        )
+
+    def get_tileset(self, name: str = SCENE_TILESET_DEFAULT) -> Optional[SceneTileset]:
+        """
+        Fetch the scene tileset manifest (merged spatial tiles of all elements).
+
+        Tile content URIs go through the same CDN transformation as the
+        per-element LOD URLs.
+
+        Args:
+            name: Tileset name (scene_tilesets.name)
+
+        Returns:
+            SceneTileset, or None if the tileset has not been built yet
+
+        Raises:
+            Exception: If database query fails
+        """
+        response = (
+            self.supabase
+            .table(TABLE_SCENE_TILESETS)
+            .select("manifest, updated_at")
+            .eq("name", name)
+            .limit(1)
+            .execute()
+        )
+        if not response.data:
+            return None
+        row = response.data[0]
+        manifest = row["manifest"]
+
+        stack = [manifest.get("root")]
+        while stack:
+            tile = stack.pop()
+            if not tile:
+                continue
+            content = tile.get("content")
+            if content and content.get("uri"):
+                content["uri"] = self._apply_cdn_transformation(content["uri"])
+            stack.extend(tile.get("children") or [])
+
+        return SceneTileset(
+            asset=manifest.get("asset") or {},
+            geometricError=manifest.get("geometricError") or 0.0,
+            root=manifest.get("root"),
+            updated_at=row.get("updated_at"),
+        )
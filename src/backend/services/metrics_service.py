@@ -15,6 +15,7 @@ import structlog
 
 from constants import (
     METRICS_WINDOW_HOURS,
+    WORKER_CACHE_STATS_KEYS,
     PERCENTILES,
     EVENT_TYPE_GRAPH_COMPLETED,
     EVENT_TYPE_FALLBACK_ACTIVATED,
@@ -164,6 +165,29 @@ class MetricsService:
         except Exception as e:
             logger.error("langgraph.metrics.error", error=str(e), exc_info=True)
             return False, None, f"Failed to generate metrics: {str(e)}"
+
+    def get_worker_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Read the agent workers' cache counters from Redis.
+
+        Workers increment one Redis hash per cache (.3dm model cache, LOD
+        asset cache): hits, misses, evictions and bytes saved/downloaded.
+
+        Returns:
+            {cache: {event: count}}; empty if Redis is unavailable
+        """
+        try:
+            from infra.redis_client import get_redis_client
+            redis = get_redis_client()
+            if redis is None:
+                return {}
+            return {
+                cache: {event: int(count) for event, count in redis.hgetall(key).items()}
+                for cache, key in WORKER_CACHE_STATS_KEYS.items()
+            }
+        except Exception as e:
+            logger.warning("worker_cache.metrics_error", error=str(e))
+            return {}
     
     def _query_total_processed(self) -> int:
         """
@@ -11,6 +11,11 @@
  * - Replaced drei's <Detailed> component with custom useLOD hook (Detailed incompatible with OBJ geometry)
  * - OBJ files preserve absolute Rhino Z-up coordinates from backend (no centering)
  * - Frontend applies Z→Y rotation via group rotation prop
+ *
+ * LOD assets may be GLB (agent GLBExportService, default) or legacy OBJ;
+ * useLODAsset picks GLTFLoader/OBJLoader per URL. GLB positions are local to
+ * the block origin stored in the node translation, so both land at the same
+ * absolute Rhino coordinates.
  * 
  * Renders elements at their real building coordinates from Rhino (absolute positioning).
  * LOD system: 
@@ -23,14 +28,13 @@
  */
 
 import { useState, useEffect, useMemo } from 'react';
-import { useLoader } from '@react-three/fiber';
-import { OBJLoader } from 'three/examples/jsm/loaders/OBJLoader.js';
 import { Html } from '@react-three/drei';
 import { STATUS_COLORS } from '@/constants/dashboard3d.constants';
 import { FILTER_VISUAL_FEEDBACK } from '@/constants/parts.constants';
 import { MATERIAL_COLORS, DEFAULT_MATERIAL, getMaterialColorHex } from '@/constants/materials';
 import { usePartsStore } from '@/stores/parts.store';
 import { useLOD } from '@/hooks/useLOD';
+import { useLODAsset } from '@/hooks/useLODAsset';
 import { BBoxProxy } from './BBoxProxy';
 // import { WireframeHelper } from './WireframeHelper'; // DISABLED
 import type { ElementMeshProps } from './PartsScene.types';
@@ -171,10 +175,10 @@ export function ElementMesh({ part, position, enableLod = true }: ElementMeshPro
 
   // useLoader suspends during loading (handled by parent <Suspense> boundary)
   // IMPORTANT: These hooks always return valid scenes or suspend - no need for null checks
-  // OBJ format used instead of GLB due to trimesh GLB export bugs (versions 4.0.5, 4.11.3)
-  const lowPolyScene = useLoader(OBJLoader, lowPolyUrl);
-  const midPolyScene = useLoader(OBJLoader, midPolyUrl);
-  const highPolyScene = useLoader(OBJLoader, highPolyUrl);
+  // Loader chosen per URL extension (.glb → GLTFLoader, otherwise OBJLoader)
+  const lowPolyScene = useLODAsset(lowPolyUrl);
+  const midPolyScene = useLODAsset(midPolyUrl);
+  const highPolyScene = useLODAsset(highPolyUrl);
 
   // Clone scenes so each LOD level owns its own Three.js Object3D.
   // useLoader returns the same cached object for the same URL; a Three.js
@@ -17,7 +17,7 @@ vi.mock('@react-three/fiber', () => ({
   Canvas: ({ children }: { children: React.ReactNode }) => (
     <div data-testid="r3f-canvas">{children}</div>
   ),
-  useLoader: vi.fn(() => ({ clone: () => ({ traverse: vi.fn() }) })),
+  useLoader: vi.fn(() => ({ traverse: vi.fn(), clone: () => ({ traverse: vi.fn() }) })),
   useThree: vi.fn(() => ({
     camera: { position: { set: vi.fn() }, lookAt: vi.fn(), updateProjectionMatrix: vi.fn() },
   })),
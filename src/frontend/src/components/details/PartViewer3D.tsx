@@ -6,7 +6,7 @@
  * falling back to a solid material color from the MATERIAL_COLORS dictionary.
  *
  * Key design decisions:
- * - Uses OBJLoader (not useGLTF/GLB) — consistent with the main scene pipeline
+ * - Uses useLODAsset (GLTFLoader for .glb, OBJLoader otherwise) — consistent with the main scene pipeline
  * - Applies Z→Y rotation (-Math.PI/2 on X) to convert Rhino Z-up → Three.js Y-up
  * - Color: solid MeshStandardMaterial from MATERIAL_COLORS[material_type] or default "Montjuïc"
  * - Camera: auto-positioned from bbox; falls back to fixed position if bbox absent
@@ -16,11 +16,11 @@
  */
 
 import { Suspense, useMemo, useEffect } from 'react';
-import { Canvas, useLoader } from '@react-three/fiber';
+import { Canvas } from '@react-three/fiber';
 import { OrbitControls, Html, Bounds } from '@react-three/drei';
-import { OBJLoader } from 'three/examples/jsm/loaders/OBJLoader.js';
 import { Box3, Vector3, MeshStandardMaterial, Color } from 'three';
 import { MATERIAL_COLORS, DEFAULT_MATERIAL } from '@/constants/materials';
+import { useLODAsset } from '@/hooks/useLODAsset';
 
 // ─── Types ────────────────────────────────────────────────────────────────────
 
@@ -56,7 +56,7 @@ function resolveMaterialColor(materialType?: string | null): string {
  * Suspends via useLoader while loading (handled by parent Suspense).
  */
 function OBJMesh({ url, mtlUrl, colorHex }: { url: string; mtlUrl?: string | null; colorHex: string }) {
-  const scene = useLoader(OBJLoader, url);
+  const scene = useLODAsset(url);
 
   const clone = useMemo(() => scene.clone(true), [scene]);
 
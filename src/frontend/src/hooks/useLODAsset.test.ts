@@ -0,0 +1,114 @@
+/**
+ * useLODAsset Hook Tests
+ *
+ * Loader selection by URL extension (GLTFLoader + shared DRACOLoader for
+ * .glb, OBJLoader otherwise), the GLTF `scene` vs OBJ group return value,
+ * and vertex normals computed on load for meshes written without them.
+ *
+ * @module useLODAsset.test
+ */
+
+import { describe, it, expect, vi, beforeEach } from 'vitest';
+import { renderHook } from '@testing-library/react';
+import { useLoader } from '@react-three/fiber';
+import { BufferGeometry, Float32BufferAttribute, Group, Mesh } from 'three';
+import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { OBJLoader } from 'three/examples/jsm/loaders/OBJLoader.js';
+import { ensureVertexNormals, isGlbUrl, useLODAsset } from './useLODAsset';
+
+vi.mock('three/examples/jsm/loaders/GLTFLoader.js', () => ({
+  GLTFLoader: class {},
+}));
+
+vi.mock('three/examples/jsm/loaders/OBJLoader.js', () => ({
+  OBJLoader: class {},
+}));
+
+vi.mock('three/examples/jsm/loaders/DRACOLoader.js', () => ({
+  DRACOLoader: class {
+    setDecoderPath = vi.fn();
+  },
+}));
+
+/** One triangle in the XY plane, without a NORMAL attribute */
+function makeTriangleGroup(): Group {
+  const geometry = new BufferGeometry();
+  geometry.setAttribute('position', new Float32BufferAttribute([0, 0, 0, 1, 0, 0, 0, 1, 0], 3));
+  const group = new Group();
+  group.add(new Mesh(geometry));
+  return group;
+}
+
+function meshOf(root: any): Mesh {
+  return root.children[0] as Mesh;
+}
+
+describe('isGlbUrl', () => {
+  it('detects .glb regardless of case and query string', () => {
+    expect(isGlbUrl('https://cdn/low-poly/fp/v1.glb')).toBe(true);
+    expect(isGlbUrl('https://cdn/low-poly/fp/v1.GLB?token=abc')).toBe(true);
+    expect(isGlbUrl('https://cdn/high-poly/block.obj')).toBe(false);
+  });
+});
+
+describe('useLODAsset', () => {
+  beforeEach(() => {
+    vi.clearAllMocks();
+  });
+
+  it('loads .glb with GLTFLoader, Draco configured, and returns its scene', () => {
+    const scene = makeTriangleGroup();
+    vi.mocked(useLoader).mockReturnValue({ scene } as any);
+
+    const { result } = renderHook(() => useLODAsset('https://cdn/mid-poly/fp/v1.glb'));
+
+    const [loader, url, configure] = vi.mocked(useLoader).mock.calls[0] as any[];
+    expect(loader).toBe(GLTFLoader);
+    expect(url).toBe('https://cdn/mid-poly/fp/v1.glb');
+    const gltfLoader = { setDRACOLoader: vi.fn() };
+    configure(gltfLoader);
+    expect(gltfLoader.setDRACOLoader).toHaveBeenCalledTimes(1);
+    expect(result.current).toBe(scene);
+  });
+
+  it('loads anything else with OBJLoader and returns the group itself', () => {
+    const group = makeTriangleGroup();
+    vi.mocked(useLoader).mockReturnValue(group as any);
+
+    const { result } = renderHook(() => useLODAsset('https://cdn/high-poly/block.obj'));
+
+    const [loader, , configure] = vi.mocked(useLoader).mock.calls[0] as any[];
+    expect(loader).toBe(OBJLoader);
+    expect(configure).toBeUndefined();
+    expect(result.current).toBe(group);
+  });
+
+  it('computes vertex normals for meshes loaded without them', () => {
+    vi.mocked(useLoader).mockReturnValue({ scene: makeTriangleGroup() } as any);
+
+    const { result } = renderHook(() => useLODAsset('https://cdn/low-poly/fp/v1.glb'));
+
+    const normal = meshOf(result.current).geometry.attributes.normal;
+    expect(normal).toBeDefined();
+    expect(Array.from(normal.array.slice(0, 3))).toEqual([0, 0, 1]);
+  });
+});
+
+describe('ensureVertexNormals', () => {
+  it('keeps normals the asset already carries', () => {
+    const root = makeTriangleGroup();
+    const stored = new Float32BufferAttribute([1, 0, 0, 1, 0, 0, 1, 0, 0], 3);
+    meshOf(root).geometry.setAttribute('normal', stored);
+
+    ensureVertexNormals(root);
+
+    expect(meshOf(root).geometry.attributes.normal).toBe(stored);
+  });
+
+  it('tolerates an empty mesh', () => {
+    const root = new Group();
+    root.add(new Mesh(new BufferGeometry()));
+
+    expect(() => ensureVertexNormals(root)).not.toThrow();
+  });
+});
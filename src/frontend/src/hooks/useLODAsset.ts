@@ -0,0 +1,80 @@
+/**
+ * Hook: useLODAsset
+ *
+ * Loads one LOD asset and returns its Object3D, picking the loader from the
+ * file extension:
+ * - `.glb` → GLTFLoader. Agent output (GLBExportService): local-origin
+ *   positions with the world offset in the node translation, optionally
+ *   quantized (KHR_mesh_quantization) or Draco-compressed.
+ * - anything else → OBJLoader (legacy absolute-coordinate OBJ, and the
+ *   per-layer high-poly OBJ used with the MTL in 'layer' color mode).
+ *
+ * Both resolve to Rhino Z-up geometry at absolute building coordinates, so
+ * callers keep applying the Z→Y group rotation.
+ *
+ * GLBs are written without a NORMAL attribute by default (LOD_GLB_NORMALS)
+ * and OBJ `vn` lines are optional, so vertex normals are computed here, once
+ * per loaded asset, for every mesh that has none.
+ *
+ * @module useLODAsset
+ */
+
+import { useMemo } from 'react';
+import { useLoader } from '@react-three/fiber';
+import type { Object3D } from 'three';
+import { GLTFLoader } from 'three/examples/jsm/loaders/GLTFLoader.js';
+import { DRACOLoader } from 'three/examples/jsm/loaders/DRACOLoader.js';
+import { OBJLoader } from 'three/examples/jsm/loaders/OBJLoader.js';
+
+/** Same decoder build drei's useGLTF uses by default */
+const DRACO_DECODER_PATH = 'https://www.gstatic.com/draco/versioned/decoders/1.5.5/';
+
+// Shared across all GLTFLoader instances (decoder WASM is fetched once)
+let dracoLoader: DRACOLoader | null = null;
+
+/**
+ * Whether a (sanitized) asset URL points to a binary glTF file
+ */
+export function isGlbUrl(url: string): boolean {
+  return /\.glb$/i.test(url.split('?')[0]);
+}
+
+function configureGLTFLoader(loader: any) {
+  if (!dracoLoader) {
+    dracoLoader = new DRACOLoader();
+    dracoLoader.setDecoderPath(DRACO_DECODER_PATH);
+  }
+  loader.setDRACOLoader(dracoLoader);
+}
+
+/**
+ * Compute vertex normals of every mesh under `root` that has none.
+ * Idempotent: meshes that already carry normals are left untouched.
+ */
+export function ensureVertexNormals(root: Object3D): Object3D {
+  root.traverse((child: any) => {
+    if (child.isMesh && child.geometry && !child.geometry.attributes.normal) {
+      child.geometry.computeVertexNormals();
+    }
+  });
+  return root;
+}
+
+/**
+ * Load an LOD asset (GLB or OBJ). Suspends while loading.
+ *
+ * @param url - Asset URL (trailing '?' already stripped)
+ * @returns Loaded scene root (GLTF `scene` or the OBJ group), with normals
+ */
+export function useLODAsset(url: string): Object3D {
+  const glb = isGlbUrl(url);
+  const asset: any = useLoader(
+    (glb ? GLTFLoader : OBJLoader) as any,
+    url,
+    glb ? configureGLTFLoader : undefined
+  );
+  // GLTFLoader resolves to { scene, ... }; OBJLoader to the Group itself
+  const root: Object3D = asset.scene ?? asset;
+  // useLoader caches per URL: normals are computed once, before any clone
+  return useMemo(() => ensureVertexNormals(root), [root]);
+}
@@ -8,7 +8,7 @@
  */
 
 import axios from 'axios';
-import type { PartCanvasItem } from '@/types/parts';
+import type { InstancesResponse, PartCanvasItem, SceneTileset } from '@/types/parts';
 
 /**
  * Base URL for backend API calls.
@@ -60,6 +60,9 @@ export async function listParts(
     mid_poly_url: element.mid_poly_url || null,    // US-015: Mid-detail LOD (~2k tris)
     low_poly_url: element.low_poly_url,             // US-015: Low-detail LOD (~500 tris)
     mtl_url: element.mtl_url || null,              // Per-face Rhino layer colors
+    lod_errors_mm: element.lod_errors_mm ?? null,  // Achieved error per LOD level (mm)
+    instance_group: element.instance_group ?? null,  // Shared instanced mesh group
+    lod_container: element.lod_container ?? null,  // Chunk byte ranges of the LOD container
     bbox: element.bbox,
     workshop_id: null, // Elements don't have workshop_id
     workshop_name: null, // Elements don't have workshop_name
@@ -68,3 +71,37 @@ export async function listParts(
 
   return parts;
 }
+
+/**
+ * Fetch the instanced meshes of the scene (repeated geometry stored once)
+ *
+ * Each group is one shared mesh plus a transform table (one column-major
+ * 4x4 per placement), suitable for a single InstancedMesh draw call.
+ *
+ * @returns Promise resolving to the instance groups
+ *
+ * @throws {Error} If backend request fails
+ */
+export async function listInstances(): Promise<InstancesResponse> {
+  const response = await axios.get(`${ELEMENTS_ENDPOINT}/instances`);
+  return response.data;
+}
+
+/**
+ * Fetch the scene tileset manifest (octree of merged low-poly tiles)
+ *
+ * @returns Promise resolving to the tileset, or null if it has not been built yet
+ *
+ * @throws {Error} If backend request fails (other than 404)
+ */
+export async function getSceneTileset(): Promise<SceneTileset | null> {
+  try {
+    const response = await axios.get(`${ELEMENTS_ENDPOINT}/tileset`);
+    return response.data;
+  } catch (error) {
+    if (axios.isAxiosError(error) && error.response?.status === 404) {
+      return null;
+    }
+    throw error;
+  }
+}
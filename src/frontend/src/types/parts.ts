@@ -30,6 +30,33 @@ export interface BoundingBox {
   max: [number, number, number];  // [x, y, z] - exactly 3 elements
 }
 
+export interface LodErrors {
+  high: number;
+  mid: number | null;
+  low: number | null;
+}
+
+/**
+ * Byte range of one LOD level in the progressive LOD container
+ * (fetch with `Range: bytes=offset-(offset + length - 1)`).
+ */
+export interface LodChunk {
+  offset: number;
+  length: number;
+  format: 'glb' | 'obj';
+  faces?: number | null;
+}
+
+/**
+ * All LOD levels of an element in ONE object, coarse to fine (low, mid, high).
+ */
+export interface LodContainer {
+  url: string;
+  size: number;
+  header_length: number;
+  levels: Partial<Record<'low' | 'mid' | 'high', LodChunk>>;
+}
+
 export interface PartCanvasItem {
   id: string;                      // UUID string
   iso_code: string;                // e.g., "SF-C12-D-001"
@@ -41,12 +68,61 @@ export interface PartCanvasItem {
   mid_poly_url?: string | null;    // US-015: Mid-poly URL (~2k tris) for LOD Level 1 (5-20m)
   low_poly_url: string | null;     // US-015: Low-poly URL (~500 tris) for LOD Level 2 (20-50m), required fallback
   mtl_url?: string | null;         // Companion MTL for per-face Rhino layer colors (high-poly only)
+  lod_errors_mm?: LodErrors | null; // Achieved geometric error per LOD level (mm)
+  instance_group?: string | null;  // Shared instanced mesh (GET /api/elements/instances), null if not instanced
+  lod_container?: LodContainer | null; // Progressive LOD container (range-addressable chunks), null if absent
   bbox: BoundingBox | null;        // 3D bounding box, or null if not extracted yet (used for LOD Level 3 >50m)
   workshop_id: string | null;      // UUID string or null if unassigned
   workshop_name?: string | null;   // Workshop display name (joined from workshops table) or null if unassigned
   rhino_metadata?: Record<string, unknown> | null;  // Raw Rhino metadata for material extraction
 }
 
+/**
+ * One shared mesh drawn with a single instanced draw call
+ * (GET /api/elements/instances). transforms[i] places a copy for element_ids[i].
+ */
+export interface InstancedMesh {
+  instance_group: string;
+  high_poly_url: string | null;
+  mid_poly_url: string | null;
+  low_poly_url: string | null;
+  face_counts: Record<string, number>;
+  instance_count: number;
+  element_ids: string[];
+  transforms: number[][];          // Column-major 4x4 (Matrix4.fromArray), Rhino world mm, Z-up
+}
+
+export interface InstancesResponse {
+  groups: InstancedMesh[];
+  meta: { groups: number; instances: number };
+}
+
+/**
+ * 3D Tiles style tile of the scene tileset (GET /api/elements/tileset).
+ * boundingVolume.box = center + 3 half-axes. Leaves carry the merged low-poly GLB of
+ * their blocks; parents a simplified merge of their children (HLOD, refine REPLACE).
+ */
+export interface SceneTile {
+  boundingVolume: { box: number[] };
+  geometricError: number;
+  refine: 'ADD' | 'REPLACE';
+  content?: { uri: string };
+  children?: SceneTile[];
+  extras: {
+    address: string;
+    block_ids?: string[];  // leaves only
+    content_hash?: string;
+    face_ranges?: [number, number][];  // [first_face, face_count] per block_ids entry
+  };
+}
+
+export interface SceneTileset {
+  asset: { version: string; generator?: string; extras?: Record<string, unknown> };
+  geometricError: number;
+  root: SceneTile | null;
+  updated_at?: string | null;
+}
+
 export interface PartsListResponse {
   parts: PartCanvasItem[];
   count: number;
@@ -0,0 +1,14 @@
+-- Migration: Add lod_errors_mm column to blocks table
+-- Purpose: Store the geometric error achieved by each LOD level
+-- Generated by: geometry pipeline (screen-space-error adaptive LOD targets)
+-- Frontend: LOD switch distances can be derived from the error of each level
+--
+-- Shape: {"high": 0.0, "mid": <mm>, "low": <mm>} — symmetric vertex Hausdorff
+-- distance to the full-resolution mesh (LODDecimationService deviation_mm).
+-- NULL until the block's LOD assets are (re)generated.
+
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS lod_errors_mm JSONB;
+
+COMMENT ON COLUMN blocks.lod_errors_mm IS
+    'Achieved geometric error (mm) per LOD level: {"high": 0.0, "mid": x, "low": y}. NULL until LOD generation runs.';
@@ -0,0 +1,53 @@
+-- Migration: GPU-instanced output for repeated geometry
+-- Purpose: Store ONE shared mesh per group of identical blocks plus a
+--          per-block table of placement transforms, so the viewer can draw a
+--          group with a single instanced draw call.
+-- Generated by: geometry pipeline (generate_file_lod_assets, InstanceTable)
+--
+-- This migration adds:
+--   1. instanced_meshes: one row per instance group (key = geometry
+--      fingerprint). LOD URLs point to the shared mesh, expressed in a local
+--      frame centered on its bbox.
+--   2. blocks.instance_group: the block's group (NULL = not instanced).
+--   3. blocks.instance_transforms: the block's placements, one 16-float
+--      column-major 4x4 matrix per InstanceReference (Rhino world mm, Z-up):
+--      [[m00, m10, m20, m30, m01, ...], ...]
+--
+-- Per-block LOD URLs are still written for every block, so viewers that do
+-- not support instancing keep working.
+
+BEGIN;
+
+-- 1. Shared meshes (one row per instance group)
+CREATE TABLE IF NOT EXISTS instanced_meshes (
+    instance_group  text PRIMARY KEY,
+    high_poly_url   text NOT NULL,
+    mid_poly_url    text NOT NULL,
+    low_poly_url    text NOT NULL,
+    asset_format    text NOT NULL DEFAULT 'glb',
+    face_counts     jsonb NOT NULL DEFAULT '{}'::jsonb,
+    instance_count  integer NOT NULL DEFAULT 0,
+    updated_at      timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE instanced_meshes IS
+'Shared local-frame meshes of repeated geometry. One row per geometry fingerprint; '
+'placements live in blocks.instance_transforms. Served by GET /api/elements/instances.';
+
+-- 2-3. Block membership and placements
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS instance_group text
+        REFERENCES instanced_meshes(instance_group) ON DELETE SET NULL,
+    ADD COLUMN IF NOT EXISTS instance_transforms jsonb;
+
+CREATE INDEX IF NOT EXISTS idx_blocks_instance_group
+    ON blocks (instance_group)
+    WHERE instance_group IS NOT NULL;
+
+COMMENT ON COLUMN blocks.instance_group IS
+'Geometry fingerprint of the instanced_meshes row this block is drawn from. NULL if not instanced.';
+
+COMMENT ON COLUMN blocks.instance_transforms IS
+'Placements of the shared mesh: list of 16-float column-major 4x4 matrices (world mm, Z-up).';
+
+COMMIT;
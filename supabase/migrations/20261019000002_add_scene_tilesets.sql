@@ -0,0 +1,26 @@
+-- Migration: Hierarchical scene tiles for whole-building rendering
+-- Purpose: Store the tileset manifest built by the build_scene_tiles agent task
+--          (octree over blocks.bbox, one merged low-poly GLB per leaf tile)
+-- Served by: GET /api/elements/tileset
+--
+-- manifest follows the OGC 3D Tiles layout (asset, geometricError, root with
+-- boundingVolume.box / geometricError / refine / content.uri / children).
+-- Leaf extras: address (octant path), content_hash, block_ids and the
+-- [first_face, face_count] range of each block in the merged GLB.
+-- Coordinates are Rhino mm, Z-up (asset.extras.up_axis).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS scene_tilesets (
+    name         text PRIMARY KEY,
+    manifest     jsonb NOT NULL,
+    tile_count   integer NOT NULL DEFAULT 0,
+    block_count  integer NOT NULL DEFAULT 0,
+    updated_at   timestamptz NOT NULL DEFAULT now()
+);
+
+COMMENT ON TABLE scene_tilesets IS
+'3D Tiles style manifests of merged scene tiles (one row per tileset, "default" for the whole building). '
+'Rebuilt incrementally by the build_scene_tiles agent task; only tiles whose members changed are re-merged.';
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Migration: Add lod_container column to blocks table
+-- Purpose: Index of the progressive LOD container (all LOD levels of a block
+--          in ONE storage object, 'progressive/<asset id>.sflc')
+-- Generated by: geometry pipeline (services/lod_container.py)
+-- Frontend: fetch the low chunk with one HTTP range request, refine with the
+--           mid/high ranges of the same CDN object
+--
+-- Shape: {"url": <public URL>, "version": 1, "size": <bytes>, "header_length": <bytes>,
+--         "levels": {"low": {"offset", "length", "format", "faces"}, "mid": {...}, "high": {...}}}
+-- Chunks are complete assets of their level (GLB, or OBJ for the per-layer high-poly).
+-- NULL until the block's LOD assets are (re)generated with LOD_CONTAINER enabled.
+
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS lod_container JSONB;
+
+COMMENT ON COLUMN blocks.lod_container IS
+    'Progressive LOD container: URL and byte range per LOD level (coarse to fine). NULL until LOD generation runs.';
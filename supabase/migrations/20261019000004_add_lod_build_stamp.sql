@@ -0,0 +1,29 @@
+-- Migration: Add LOD build stamp columns to blocks table
+-- Purpose: Versioned LOD outputs, so a config change rebuilds only the stale
+--          levels of the stale blocks instead of resetting every block
+-- Generated by: geometry pipeline (services/lod_rebuild_planner.py)
+-- Consumer: infra/reprocess_lod_assets.py (plan + dry-run cost estimate),
+--           rebuild_lod_levels task
+--
+-- lod_pipeline_version: LOD_CACHE_VERSION the assets were generated with
+-- lod_params_hash:      hash over every level's settings (equal = up to date)
+-- lod_build shape: {"version": 2, "levels": {"high": <hash>, "mid": <hash>, "low": <hash>,
+--                   "container": <hash>}, "face_counts": {"original": N, "mid": N, "low": N}}
+-- NULL on blocks generated before this migration: every level is planned as stale.
+
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS lod_pipeline_version INTEGER,
+    ADD COLUMN IF NOT EXISTS lod_params_hash TEXT,
+    ADD COLUMN IF NOT EXISTS lod_build JSONB;
+
+-- Planner query: blocks whose stamp differs from the current configuration
+CREATE INDEX IF NOT EXISTS idx_blocks_lod_params_hash
+    ON blocks (lod_params_hash)
+    WHERE is_archived = false;
+
+COMMENT ON COLUMN blocks.lod_pipeline_version IS
+    'LOD pipeline version (LOD_CACHE_VERSION) of the stored LOD assets. NULL until LOD generation runs.';
+COMMENT ON COLUMN blocks.lod_params_hash IS
+    'Hash of the LOD settings the stored assets were generated with (all levels).';
+COMMENT ON COLUMN blocks.lod_build IS
+    'Per-level params hashes and face counts of the stored LOD assets (selective rebuild).';
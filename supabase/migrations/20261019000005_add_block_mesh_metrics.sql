@@ -0,0 +1,64 @@
+-- Migration: True per-block mesh metrics as typed columns
+-- Purpose: Volume, surface area and oriented bounding box of each block's
+--          merged mesh (not the file-wide axis-aligned bbox volume), so
+--          aggregate questions (total volume per tram / material) are one
+--          indexed SQL query instead of a JSONB scan of rhino_metadata.
+-- Generated by: geometry pipeline (services/mesh_metrics.py, computed during
+--               mesh extraction in generate_low_poly_glb / generate_file_lod_assets)
+-- Consumer: /api/chat volume aggregates
+--
+-- Units are meters (converted from the file's model unit system).
+-- mesh_volume_m3 is exact for closed meshes; mesh_watertight = false flags
+-- open meshes, whose volume is that of the implied closure.
+-- obb_length_m >= obb_width_m >= obb_height_m: principal dimensions (OBB extents).
+-- obb shape: {"center": [x, y, z], "axes": [[...], [...], [...]], "extents": [l, w, h]}
+-- (world coordinates in m; axes are unit row vectors, longest extent first)
+-- NULL until LOD generation runs for the block.
+
+BEGIN;
+
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS mesh_volume_m3 DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS mesh_area_m2 DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS mesh_watertight BOOLEAN,
+    ADD COLUMN IF NOT EXISTS obb_length_m DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS obb_width_m DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS obb_height_m DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS obb JSONB;
+
+-- Range filters / sorting ("pieces larger than 0.5 m³", "longest pieces")
+CREATE INDEX IF NOT EXISTS idx_blocks_mesh_volume_m3
+    ON blocks (mesh_volume_m3)
+    WHERE is_archived = false AND mesh_volume_m3 IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_blocks_obb_length_m
+    ON blocks (obb_length_m)
+    WHERE is_archived = false AND obb_length_m IS NOT NULL;
+
+-- Aggregates per tram / material: index-only scans (group key + covered volume/area)
+CREATE INDEX IF NOT EXISTS idx_blocks_tram_mesh_volume
+    ON blocks ((rhino_metadata->>'SF_PRO_Tram'))
+    INCLUDE (mesh_volume_m3, mesh_area_m2)
+    WHERE is_archived = false;
+
+CREATE INDEX IF NOT EXISTS idx_blocks_material_mesh_volume
+    ON blocks ((COALESCE(rhino_metadata->>'SF_GEN_Material', rhino_metadata->>'Material')))
+    INCLUDE (mesh_volume_m3, mesh_area_m2)
+    WHERE is_archived = false;
+
+COMMENT ON COLUMN blocks.mesh_volume_m3 IS
+    'Volume of the block mesh in m³ (signed tetrahedron sum). NULL until LOD generation runs.';
+COMMENT ON COLUMN blocks.mesh_area_m2 IS
+    'Surface area of the block mesh in m².';
+COMMENT ON COLUMN blocks.mesh_watertight IS
+    'True when the mesh is closed (mesh_volume_m3 exact).';
+COMMENT ON COLUMN blocks.obb_length_m IS
+    'Longest principal dimension (oriented bounding box extent) in m.';
+COMMENT ON COLUMN blocks.obb_width_m IS
+    'Middle principal dimension (oriented bounding box extent) in m.';
+COMMENT ON COLUMN blocks.obb_height_m IS
+    'Shortest principal dimension (oriented bounding box extent) in m.';
+COMMENT ON COLUMN blocks.obb IS
+    'Oriented bounding box: center, axes (unit rows, longest first) and extents, world coordinates in m.';
+
+COMMIT;
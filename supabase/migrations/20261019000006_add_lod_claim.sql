@@ -0,0 +1,20 @@
+-- Migration: Add LOD claim columns to blocks table
+-- Purpose: Two generate_file_lod_assets runs on the same .3dm (late schedule,
+--          continuation, retry) must not decimate and upload the same blocks
+-- Generated by: generate_file_lod_assets (_fetch_pending_blocks_for_file claims
+--               its pending blocks with UPDATE ... FOR UPDATE SKIP LOCKED)
+--
+-- lod_claimed_by: identifier of the run encoding the block (Celery task id)
+-- lod_claimed_at: when it was claimed; a claim older than the task hard time
+--                 limit (FILE_LOD_CLAIM_TTL_SECONDS) was left by a killed worker
+-- Cleared when the LOD URLs are committed, when the block is marked
+-- error_processing, or when the run stops with the block still pending.
+
+ALTER TABLE blocks
+    ADD COLUMN IF NOT EXISTS lod_claimed_by TEXT,
+    ADD COLUMN IF NOT EXISTS lod_claimed_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN blocks.lod_claimed_by IS
+    'LOD generation run currently encoding the block. NULL when no run holds it.';
+COMMENT ON COLUMN blocks.lod_claimed_at IS
+    'When lod_claimed_by claimed the block; stale after the task hard time limit.';
@@ -0,0 +1,32 @@
+"""
+Unit tests for the worker tunables in Settings (src/agent/config.py).
+
+Verifies that the environment overrides each tunable with pydantic parsing
+and that constants.py re-exports the loaded values under the same names.
+"""
+
+from src.agent import constants
+from src.agent.config import Settings, settings
+
+
+class TestWorkerTunables:
+    """Env-driven tunables live in Settings; constants mirrors them."""
+
+    def test_environment_overrides_defaults(self, monkeypatch):
+        monkeypatch.setenv("LOD_CONTAINER", "true")
+        monkeypatch.setenv("SCENE_TILE_MAX_BLOCKS", "16")
+        monkeypatch.setenv("LOD_MID_ERROR_TOLERANCE_MM", "3.5")
+
+        loaded = Settings()
+
+        assert loaded.LOD_CONTAINER is True
+        assert loaded.SCENE_TILE_MAX_BLOCKS == 16
+        assert loaded.LOD_MID_ERROR_TOLERANCE_MM == 3.5
+
+    def test_constants_reexport_settings(self):
+        assert constants.FILE_LOD_BATCH_BLOCKS == settings.FILE_LOD_BATCH_BLOCKS
+        assert constants.LOD_CACHE_TTL_SECONDS == settings.LOD_CACHE_TTL_SECONDS
+        assert constants.LOD_ERROR_TOLERANCE_MM == {
+            'mid': settings.LOD_MID_ERROR_TOLERANCE_MM,
+            'low': settings.LOD_LOW_ERROR_TOLERANCE_MM,
+        }
@@ -0,0 +1,187 @@
+"""
+Unit tests for the background audit event writer (graph/events.py AuditEventWriter).
+
+Verifies that node events are queued instead of inserted inline, written by
+one bulk insert per flush (by size, or on an explicit task-end flush), and
+that overflowed events, failed flushes and the journal of a crashed process
+are all eventually written, while rows the database rejects for good are
+set aside in a dead-letter file instead of blocking the spool.
+"""
+
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agent.constants import EventType
+from src.agent.graph.events import AuditEventWriter
+from src.agent.graph.state import make_initial_state
+
+
+class RecordingWrite:
+    """Bulk write double: records each batch, optionally failing the first calls.
+
+    Batches containing a `rejected` block_id always fail the way PostgREST
+    rejects a non-UUID value for events.block_id.
+    """
+
+    def __init__(self, failures=0, rejected=()):
+        self.batches = []
+        self.failures = failures
+        self.rejected = set(rejected)
+
+    def __call__(self, rows):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection refused")
+        if any(row['block_id'] in self.rejected for row in rows):
+            raise Exception('invalid input syntax for type uuid: "unknown"')
+        self.batches.append(list(rows))
+
+    @property
+    def rows(self):
+        return [row for batch in self.batches for row in batch]
+
+
+def _emit(writer, count, block_id='block-1'):
+    state = make_initial_state(block_id)
+    for i in range(count):
+        writer.emit(block_id, EventType.NODE_ENTERED, f"Node{i}", state)
+
+
+class TestAuditEventWriter:
+    """Bounded queue, bulk flushes, no silent loss."""
+
+    def test_flushes_by_size_in_one_bulk_insert(self, tmp_path):
+        write = RecordingWrite()
+        writer = AuditEventWriter(spool_dir=str(tmp_path), batch_size=3, flush_interval=60, write=write).start()
+        try:
+            _emit(writer, 3)
+            deadline = time.monotonic() + 5
+            while not write.batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            writer.stop()
+
+        assert len(write.batches) == 1
+        rows = write.batches[0]
+        assert [row['node_name'] for row in rows] == ['Node0', 'Node1', 'Node2']
+        assert rows == sorted(rows, key=lambda row: row['created_at'])
+        assert len({row['id'] for row in rows}) == 3
+        assert os.listdir(tmp_path) == []  # journal deleted once written
+
+    def test_overflow_is_counted_and_written_from_the_journal(self, tmp_path):
+        write = RecordingWrite()
+        writer = AuditEventWriter(spool_dir=str(tmp_path), queue_size=2, batch_size=100, write=write)
+
+        _emit(writer, 5)
+        assert writer.stats['overflowed'] == 3
+
+        assert writer.flush() == 5
+        assert [row['node_name'] for row in write.rows] == [f"Node{i}" for i in range(5)]
+
+    def test_failed_flush_is_spooled_and_retried(self, tmp_path):
+        write = RecordingWrite(failures=1)
+        writer = AuditEventWriter(spool_dir=str(tmp_path), write=write)
+
+        _emit(writer, 2)
+        assert writer.flush() == 0
+        assert writer.stats['failed_flushes'] == 1 and len(os.listdir(tmp_path)) == 1
+
+        _emit(writer, 1, block_id='block-2')
+        assert writer.flush() == 3
+        assert sorted(row['block_id'] for row in write.rows) == ['block-1', 'block-1', 'block-2']
+        assert os.listdir(tmp_path) == []
+
+    def test_rejected_row_is_dead_lettered_and_the_rest_written(self, tmp_path):
+        write = RecordingWrite(rejected={'unknown'})
+        writer = AuditEventWriter(spool_dir=str(tmp_path), write=write)
+
+        _emit(writer, 3)
+        _emit(writer, 1, block_id='unknown')
+        _emit(writer, 2, block_id='block-2')
+        assert writer.flush() == 5
+
+        assert sorted(row['block_id'] for row in write.rows) == ['block-1'] * 3 + ['block-2'] * 2
+        assert writer.stats['poisoned'] == 1 and writer.stats['failed_flushes'] == 0
+        (dead_letter,) = os.listdir(tmp_path)
+        assert dead_letter.endswith('.dead')
+        (entry,) = [json.loads(line) for line in (tmp_path / dead_letter).read_text().splitlines()]
+        assert entry['event']['block_id'] == 'unknown' and 'uuid' in entry['error']
+
+        calls = len(write.batches)
+        assert writer.flush() == 0 and len(write.batches) == calls  # never re-sent
+
+    def test_rejected_row_does_not_block_later_segments(self, tmp_path):
+        write = RecordingWrite(failures=3, rejected={'unknown'})
+        writer = AuditEventWriter(spool_dir=str(tmp_path), write=write)
+
+        _emit(writer, 1, block_id='unknown')
+        _emit(writer, 1)
+        assert writer.flush() == 0  # database down: spooled, poisoned row first in the backlog
+        _emit(writer, 1, block_id='block-2')
+        assert writer.flush() == 0  # still down: second segment spooled behind it
+        assert len(os.listdir(tmp_path)) == 2
+
+        assert writer.flush() == 2  # back up: both segments written in one flush
+        assert sorted(row['block_id'] for row in write.rows) == ['block-1', 'block-2']
+        assert writer.stats['poisoned'] == 1
+        assert [name for name in os.listdir(tmp_path) if not name.endswith('.dead')] == []
+
+    def test_journal_of_a_crashed_process_is_recovered(self, tmp_path):
+        crashed = AuditEventWriter(spool_dir=str(tmp_path), write=RecordingWrite())
+        _emit(crashed, 2)  # never flushed: the process dies here
+        (segment,) = os.listdir(tmp_path)
+        os.rename(tmp_path / segment, tmp_path / ('999999' + segment[segment.index('-'):]))
+
+        write = RecordingWrite()
+        with patch('src.agent.graph.events._pid_alive', return_value=False):
+            writer = AuditEventWriter(spool_dir=str(tmp_path), write=write)
+            assert writer.recover() == 1
+        writer.flush()
+
+        assert [row['node_name'] for row in write.rows] == ['Node0', 'Node1']
+        assert os.listdir(tmp_path) == []
+
+
+class TestInsertEventRouting:
+    """insert_event queues on the worker's writer, written on the task-end flush."""
+
+    @pytest.fixture
+    def worker_writer(self, tmp_path):
+        from src.agent.graph import events
+
+        write = RecordingWrite()
+        with patch.object(events, '_writer', None), patch.object(events, 'AUDIT_EVENT_WRITER', True):
+            events.start_event_writer(spool_dir=str(tmp_path), flush_interval=60, write=write)
+            yield write
+            events.stop_event_writer()
+
+    @patch("src.agent.graph.nodes.get_supabase_client")
+    def test_node_events_skip_the_inline_insert(self, mock_get_supabase, worker_writer):
+        from src.agent.graph.events import flush_event_writer
+        from src.agent.graph.nodes import with_audit_trail
+
+        @with_audit_trail
+        def node_extract_geometry(state):
+            return {"geometry_metadata": {}}
+
+        node_extract_geometry(make_initial_state('block-1'))
+        mock_get_supabase.assert_not_called()
+        assert worker_writer.batches == []
+
+        assert flush_event_writer() == 2
+        assert [row['event_type'] for row in worker_writer.batches[0]] == [
+            EventType.NODE_ENTERED, EventType.NODE_COMPLETED]
+
+    def test_upsert_is_idempotent_by_id(self):
+        from src.agent.graph.events import _upsert_events
+
+        client = MagicMock()
+        with patch('src.agent.graph.events.get_supabase_client', return_value=client):
+            _upsert_events([{'id': 'e1'}])
+
+        client.table.return_value.upsert.assert_called_once_with(
+            [{'id': 'e1'}], on_conflict='id', ignore_duplicates=True)
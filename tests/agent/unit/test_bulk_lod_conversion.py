@@ -0,0 +1,153 @@
+"""
+Unit tests for the local bulk LOD conversion (tasks/bulk_lod_conversion.py).
+
+Verifies that a local run produces the same assets and rows as the
+generate_file_lod_assets task for the same file, that rows are committed in
+batches, that files recorded in the resume manifest are skipped, and that
+a run into a local directory publishes nothing (LOD cache, scene tiles)
+before the directory is synced, and that the infra/bulk_convert_lod.py
+entry point starts from the repo root.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import rhino3dm
+
+GP = 'src.agent.tasks.geometry_processing'
+BL = 'src.agent.tasks.bulk_lod_conversion'
+
+FIXTURE = Path(__file__).parents[2] / 'fixtures' / 'test-model.3dm'
+URL_BASE = 'https://cdn/processed-geometry/'
+
+
+@pytest.fixture(scope='module')
+def pending():
+    """One pending block per block definition of the fixture."""
+    definitions = rhino3dm.File3dm.Read(str(FIXTURE)).InstanceDefinitions
+    return [(f"block-{i}", definitions[i].Name) for i in range(len(definitions))]
+
+
+class TestBulkConversion:
+    """Local runs are equivalent to the Celery task."""
+
+    def _run_task(self, pending):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        uploaded = {}
+        storage = MagicMock()
+        storage.upload.side_effect = lambda key, data, options=None: uploaded.__setitem__(key, data)
+        storage.get_public_url.side_effect = lambda key: f"{URL_BASE}{key}?"
+        client = MagicMock()
+        client.storage.from_.return_value = storage
+        with patch(f'{GP}._fetch_pending_blocks_for_file', return_value=pending), \
+             patch(f'{GP}._download_3dm_from_s3', side_effect=lambda key, path: shutil.copy(FIXTURE, path)), \
+             patch(f'{GP}._file_lod_pool', return_value=None), \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{GP}.schedule_scene_tiles'), \
+             patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.get_supabase_client', return_value=client):
+            result = generate_file_lod_assets('uploads/test-model.3dm')
+        return result, uploaded, mock_batch.call_args.args
+
+    def _run_bulk(self, pending, tmp_path, commit_blocks=200):
+        from src.agent.tasks.bulk_lod_conversion import local_sources, run_bulk_conversion
+
+        source_dir = tmp_path / 'raw'
+        (source_dir / 'uploads').mkdir(parents=True, exist_ok=True)
+        shutil.copy(FIXTURE, source_dir / 'uploads' / 'test-model.3dm')
+        sources = local_sources(str(source_dir))
+        with patch(f'{BL}.fetch_blocks_by_file', return_value={'uploads/test-model.3dm': pending}), \
+             patch(f'{BL}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{BL}.schedule_scene_tiles') as mock_tiles, \
+             patch(f'{GP}.get_redis_client', return_value=None):
+            summary = run_bulk_conversion(
+                sources, manifest_path=str(tmp_path / 'manifest.jsonl'),
+                output_dir=str(tmp_path / 'out'), public_url_base=URL_BASE,
+                workers=1, commit_blocks=commit_blocks,
+            )
+        return summary, mock_batch, mock_tiles
+
+    def test_same_assets_and_rows_as_task(self, pending, tmp_path):
+        result, uploaded, (task_updates, task_instanced) = self._run_task(pending)
+        summary, mock_batch, mock_tiles = self._run_bulk(pending, tmp_path)
+
+        assert result['status'] == 'success' and summary['committed'] == len(pending) == result['processed']
+        out = tmp_path / 'out'
+        written = {p.relative_to(out).as_posix(): p.read_bytes() for p in out.rglob('*') if p.is_file()}
+        assert written.keys() == uploaded.keys()
+        assert all(written[key] == data for key, data in uploaded.items())
+
+        bulk_updates, bulk_instanced = mock_batch.call_args.args
+        assert bulk_updates == task_updates
+        assert bulk_instanced == task_instanced
+        mock_tiles.assert_not_called()  # assets are not in storage until the directory is synced
+
+    def test_commits_in_batches_and_resumes_from_manifest(self, pending, tmp_path):
+        from src.agent.tasks.bulk_lod_conversion import ConversionManifest
+
+        summary, mock_batch, _ = self._run_bulk(pending[:2], tmp_path, commit_blocks=1)
+        assert mock_batch.call_count == 1  # one file = one commit, even past commit_blocks
+        assert ConversionManifest(str(tmp_path / 'manifest.jsonl')).done('uploads/test-model.3dm')
+
+        summary, mock_batch, mock_tiles = self._run_bulk(pending[:2], tmp_path)
+        assert summary['files'] == 0 and summary['skipped_files'] == 1
+        mock_batch.assert_not_called()
+        mock_tiles.assert_not_called()
+
+    def test_transient_failure_is_not_recorded(self, tmp_path):
+        from src.agent.tasks.bulk_lod_conversion import (
+            ConversionManifest, SourceFile, run_bulk_conversion,
+        )
+
+        source = SourceFile(file_key='uploads/missing.3dm')
+        with patch(f'{BL}.fetch_blocks_by_file', return_value={source.file_key: [('b1', 'ISO-1')]}), \
+             patch(f'{BL}._download_3dm_from_s3', side_effect=ConnectionError('connection reset by peer')), \
+             patch(f'{BL}._update_block_status_error') as mock_error, \
+             patch(f'{BL}._update_blocks_lod_urls_batch'):
+            summary = run_bulk_conversion([source], manifest_path=str(tmp_path / 'manifest.jsonl'),
+                                          public_url_base=URL_BASE, workers=1)
+
+        assert summary['failed'] == {'b1': 'connection reset by peer'}
+        mock_error.assert_not_called()
+        assert not ConversionManifest(str(tmp_path / 'manifest.jsonl')).done(source.file_key)
+
+    @pytest.mark.parametrize('output_dir', [None, 'out'])
+    def test_local_output_publishes_nothing_before_sync(self, tmp_path, output_dir):
+        from src.agent.tasks.bulk_lod_conversion import FileConversion, SourceFile, run_bulk_conversion
+
+        source = SourceFile(file_key='uploads/a.3dm')
+        conversion = FileConversion(file_key=source.file_key, updates=[{'id': 'b1'}],
+                                    cache_entries=[('fp/variant', {'low_poly_url': URL_BASE + 'low.glb'})])
+        with patch(f'{BL}.fetch_blocks_by_file', return_value={source.file_key: [('b1', 'ISO-1')]}), \
+             patch(f'{BL}._converted', return_value=iter([conversion])), \
+             patch(f'{BL}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{BL}._store_lod_cache') as mock_cache, \
+             patch(f'{BL}.schedule_scene_tiles') as mock_tiles:
+            run_bulk_conversion([source], manifest_path=str(tmp_path / 'manifest.jsonl'),
+                                output_dir=output_dir and str(tmp_path / output_dir),
+                                public_url_base=URL_BASE, workers=1)
+
+        mock_batch.assert_called_once()
+        published = output_dir is None
+        assert mock_cache.called is published
+        assert mock_tiles.called is published
+
+
+class TestCommandLine:
+    """infra/bulk_convert_lod.py, run the way the docs say: from the repo root."""
+
+    def test_main_help_from_repo_root(self):
+        root = Path(__file__).resolve().parents[3]
+        code = "import sys; sys.path.insert(0, 'infra'); import bulk_convert_lod; bulk_convert_lod.main(['--help'])"
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env,
+                                capture_output=True, text=True, timeout=120)
+
+        assert result.returncode == 0, result.stderr
+        assert "--dir" in result.stdout and "--prefix" in result.stdout
@@ -0,0 +1,157 @@
+"""
+Unit tests for the classification cache (graph/classification_cache.py).
+
+Verifies that re-classifying identical features costs no LLM call (and no
+circuit breaker / rate limiter interaction), that a prompt or model change
+misses, and that invalidation and hit/miss counters work.
+"""
+
+import fnmatch
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agent.graph.classification_cache import (
+    ClassificationCache,
+    classification_features,
+    naming_pattern,
+)
+from src.agent.graph.state import ClassificationMethod, make_initial_state
+from src.agent.models import LayerInfo
+
+CC = 'src.agent.graph.classification_cache'
+
+BBOX = {"min": [0.0, 0.0, 0.0], "max": [1.2, 0.8, 0.5]}
+LAYERS = [LayerInfo(name="Dovelas", index=0, object_count=4), LayerInfo(name="Default", index=1, object_count=1)]
+LLM_RESULT = {"tipologia": "dovela", "confidence": 0.92, "reasoning": "wedge-shaped arch stone",
+              "classified_at": "2026-01-01T00:00:00Z"}
+
+
+class FakeRedis:
+    """The get/set/delete/scan_iter/hash subset used by the cache, in memory."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def scan_iter(self, match=None, count=None):
+        return [key for key in list(self.data) if fnmatch.fnmatch(key, match)]
+
+    def hincrby(self, key, field, amount):
+        counters = self.hashes.setdefault(key, {})
+        counters[field] = counters.get(field, 0) + amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+def _features(iso_code="GLPER.B-PAE0720.0701", bbox=BBOX, layers=LAYERS):
+    return classification_features(2.5, bbox, layers, 1200, iso_code)
+
+
+class TestFeatureFingerprint:
+    """Canonical features: what the LLM sees, not where the block is."""
+
+    def test_naming_pattern_masks_trailing_sequence(self):
+        assert naming_pattern("GLPER.B-PAE0720.0701") == "GLPER.B-PAE0720.####"
+        assert naming_pattern("SF-NAV-CO-001") == "SF-NAV-CO-###"
+        assert naming_pattern(None) == ""
+
+    def test_translation_and_layer_order_share_a_key(self):
+        cache = ClassificationCache(FakeRedis())
+        moved = {"min": [10.0, 5.0, 2.0], "max": [11.2, 5.8, 2.5]}
+
+        assert cache.key(_features()) == cache.key(_features("GLPER.B-PAE0720.0702", moved, LAYERS[::-1]))
+        assert cache.key(_features()) != cache.key(_features(bbox={"min": [0, 0, 0], "max": [1.3, 0.8, 0.5]}))
+        assert cache.key(_features()) != cache.key(_features("GLPER.C-PAE0720.0701"))
+
+    def test_prompt_or_model_change_misses(self):
+        redis = FakeRedis()
+        ClassificationCache(redis).put(_features(), LLM_RESULT)
+
+        with patch(f'{CC}.CLASSIFICATION_PROMPTS', {"v1": "a reworded prompt {iso_code}"}):
+            assert ClassificationCache(redis).get(_features()) is None
+        with patch(f'{CC}.LLM_MODEL', "gpt-4o"):
+            assert ClassificationCache(redis).get(_features()) is None
+        assert ClassificationCache(redis).get(_features())["tipologia"] == "dovela"
+
+
+class TestClassificationCache:
+    """TTL, invalidation, hit/miss counters, degraded Redis."""
+
+    def test_put_get_with_ttl_and_stats(self):
+        redis = FakeRedis()
+        redis.set = MagicMock(wraps=redis.set)
+        cache = ClassificationCache(redis, ttl_seconds=60)
+
+        assert cache.get(_features()) is None
+        cache.put(_features(), {**LLM_RESULT, "raw": "not cached"})
+        assert cache.get(_features()) == LLM_RESULT
+
+        assert redis.set.call_args.kwargs["ex"] == 60
+        assert cache.get_stats() == {"miss": 1, "store": 1, "hit": 1}
+
+    def test_invalidate_one_and_all(self):
+        redis = FakeRedis()
+        cache = ClassificationCache(redis)
+        cache.put(_features(), LLM_RESULT)
+        cache.put(_features("SF-NAV-CO-001"), LLM_RESULT)
+
+        assert cache.invalidate(_features()) is True
+        assert cache.get(_features()) is None
+        assert cache.invalidate_all() == 1
+        assert cache.get(_features("SF-NAV-CO-001")) is None
+        assert cache.get_stats()["invalidated"] == 2
+
+    def test_unusable_redis_is_a_miss(self):
+        cache = ClassificationCache(MagicMock())  # returns MagicMocks, not JSON
+        assert cache.get(_features()) is None
+        assert ClassificationCache(None).get(_features()) is None
+
+
+class TestClassifyNodeUsesCache:
+    """Re-ingesting an unchanged block: zero LLM calls, circuit breaker untouched."""
+
+    @pytest.fixture
+    def graph_env(self):
+        redis = FakeRedis()
+        llm_client = MagicMock()
+        llm_client.classify_tipologia.return_value = dict(LLM_RESULT)
+        breaker = MagicMock()
+        breaker.is_open.return_value = False
+        with patch("infra.redis_client.get_redis_client", return_value=redis), \
+                patch("src.agent.graph.llm_client.get_llm_client", return_value=llm_client), \
+                patch("src.agent.graph.circuit_breaker.get_circuit_breaker", return_value=breaker), \
+                patch("src.agent.graph.nodes.insert_event"):
+            yield redis, llm_client, breaker
+
+    def _state(self, block_id):
+        state = make_initial_state(block_id)
+        state["geometry_metadata"] = {"volume": 2.5, "bbox": BBOX, "layers": LAYERS,
+                                      "vertices_count": 1200, "iso_code": "GLPER.B-PAE0720.0701"}
+        return state
+
+    def test_second_ingest_hits_cache(self, graph_env):
+        from src.agent.graph.nodes import node_classify_tipologia
+
+        redis, llm_client, breaker = graph_env
+        first = node_classify_tipologia(self._state("block-1"))
+        breaker.is_open.return_value = True  # a cached answer needs no LLM, even with the circuit open
+        second = node_classify_tipologia(self._state("block-2"))
+
+        assert llm_client.classify_tipologia.call_count == 1
+        assert breaker.record_success.call_count == 1
+        assert first["classification_method"] == second["classification_method"] == ClassificationMethod.LLM_GPT4
+        assert second["semantic_data"]["tipologia"] == "dovela"
+        assert redis.hgetall("classification:cache_stats") == {"miss": 1, "store": 1, "hit": 1}
+        assert json.loads(next(iter(redis.data.values())))["reasoning"] == LLM_RESULT["reasoning"]
@@ -0,0 +1,287 @@
+"""
+Unit tests for file-level LOD generation (generate_file_lod_assets).
+
+Verifies that the shared .3dm is downloaded and parsed once per file, that
+every pending block goes through the per-block pipeline, that DB updates are
+batched, and that scheduling from validate_file is debounced per file.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+def _block_result(block_id):
+    return {
+        'lod_data': {
+            'high_poly_url': f'https://cdn/high-poly/{block_id}.obj',
+            'mid_poly_url': f'https://cdn/mid-poly/{block_id}.obj',
+            'low_poly_url': f'https://cdn/low-poly/{block_id}.obj',
+            'mtl_url': None,
+            'file_sizes_kb': {'high': 10, 'mid': 5, 'low': 2},
+            'face_counts': {'original': 100, 'high': 100, 'mid': 100, 'low': 100},
+        },
+        'bbox': {'min': [0, 0, 0], 'max': [1, 1, 1]},
+        'rhino_metadata': {'Codi': block_id},
+        'original_faces': 100,
+    }
+
+
+class TestGenerateFileLodAssets:
+    """File-level task: one download + one parse, batched DB write."""
+
+    def test_downloads_and_parses_once_for_all_blocks(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        pending = [('b1', 'ISO-1'), ('b2', 'ISO-2'), ('b3', 'ISO-3')]
+        rhino_file = MagicMock()
+
+        with patch(f'{GP}._fetch_pending_blocks_for_file', return_value=pending), \
+             patch(f'{GP}._download_3dm_from_s3') as mock_download, \
+             patch(f'{GP}._parse_rhino_file', return_value=rhino_file) as mock_parse, \
+             patch(f'{GP}._process_block_geometry',
+                   side_effect=lambda rf, bid, iso, **kw: _block_result(bid)) as mock_process, \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch:
+            result = generate_file_lod_assets('uploads/facade.3dm')
+
+        assert mock_download.call_count == 1
+        assert mock_parse.call_count == 1
+        assert mock_process.call_count == 3
+        assert all(call.args[0] is rhino_file for call in mock_process.call_args_list)
+
+        mock_batch.assert_called_once()
+        updates = mock_batch.call_args.args[0]
+        assert [u['block_id'] for u in updates] == ['b1', 'b2', 'b3']
+        assert result['status'] == 'success'
+        assert result['processed'] == 3
+
+    def test_nothing_pending_skips_download(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        with patch(f'{GP}._fetch_pending_blocks_for_file', return_value=[]), \
+             patch(f'{GP}._download_3dm_from_s3') as mock_download:
+            result = generate_file_lod_assets('uploads/facade.3dm')
+
+        assert result['status'] == 'skipped'
+        mock_download.assert_not_called()
+
+    def test_permanent_block_error_is_isolated(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        def process(rf, block_id, iso, **kwargs):
+            if block_id == 'b2':
+                raise ValueError("No meshes found for ISO-2")
+            return _block_result(block_id)
+
+        with patch(f'{GP}._fetch_pending_blocks_for_file',
+                   return_value=[('b1', 'ISO-1'), ('b2', 'ISO-2')]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry', side_effect=process), \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{GP}._update_block_status_error') as mock_status_error:
+            result = generate_file_lod_assets('uploads/facade.3dm')
+
+        assert result['status'] == 'partial'
+        assert list(result['failed']) == ['b2']
+        mock_status_error.assert_called_once()
+        assert mock_status_error.call_args.args[0] == 'b2'
+        assert [u['block_id'] for u in mock_batch.call_args.args[0]] == ['b1']
+
+    def test_commits_per_chunk_and_stops_on_soft_time_limit(self):
+        from celery.exceptions import SoftTimeLimitExceeded
+        from src.agent.constants import TASK_GENERATE_FILE_LOD_ASSETS
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        def process(rf, block_id, iso, **kwargs):
+            if block_id == 'b3':
+                raise SoftTimeLimitExceeded()
+            return _block_result(block_id)
+
+        with patch(f'{GP}.FILE_LOD_BATCH_BLOCKS', 2), \
+             patch(f'{GP}._fetch_pending_blocks_for_file',
+                   return_value=[('b1', 'ISO-1'), ('b2', 'ISO-2'), ('b3', 'ISO-3'), ('b4', 'ISO-4')]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry', side_effect=process), \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{GP}._update_block_status_error') as mock_status_error, \
+             patch(f'{GP}.schedule_scene_tiles') as mock_tiles, \
+             patch(f'{GP}._release_lod_claims') as mock_release, \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            calls = MagicMock()
+            calls.attach_mock(mock_release, 'release')
+            calls.attach_mock(mock_send, 'send_task')
+            with pytest.raises(SoftTimeLimitExceeded):
+                generate_file_lod_assets('uploads/facade.3dm')
+
+        # First chunk committed, the interrupted block is not an error
+        assert [[u['block_id'] for u in call.args[0]] for call in mock_batch.call_args_list] == [['b1', 'b2']]
+        mock_status_error.assert_not_called()
+        mock_tiles.assert_called_once()
+        mock_send.assert_called_once_with(TASK_GENERATE_FILE_LOD_ASSETS, args=['uploads/facade.3dm'])
+        # The continuation must find the unfinished blocks unclaimed
+        assert [name for name, _, _ in calls.mock_calls] == ['release', 'send_task']
+        assert mock_release.call_args.args[0] == ['b3', 'b4']
+
+
+class TestFileLodClaims:
+    """Concurrent runs on one file never encode the same block."""
+
+    def test_run_claims_its_pending_blocks(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        with patch(f'{GP}._fetch_pending_blocks_for_file', return_value=[('b1', 'ISO-1')]) as mock_fetch, \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry',
+                   side_effect=lambda rf, bid, iso, **kw: _block_result(bid)), \
+             patch(f'{GP}._update_blocks_lod_urls_batch'), \
+             patch(f'{GP}._release_lod_claims') as mock_release:
+            generate_file_lod_assets('uploads/facade.3dm')
+
+        assert mock_fetch.call_args.kwargs['claim_token']
+        # Every block was committed, which already cleared its claim
+        assert mock_release.call_args.args[0] == []
+
+    def test_claim_skips_locked_rows_and_commits(self):
+        from src.agent.tasks.geometry_processing import _fetch_pending_blocks_for_file
+
+        with patch(f'{GP}.get_db_connection') as mock_db:
+            conn = mock_db.return_value.__enter__.return_value
+            cursor = conn.cursor.return_value
+            cursor.fetchall.return_value = [('b2', 'ISO-2'), ('b1', 'ISO-1')]
+            rows = _fetch_pending_blocks_for_file('uploads/facade.3dm', claim_token='run-1')
+
+        sql, params = cursor.execute.call_args.args
+        assert 'FOR UPDATE SKIP LOCKED' in sql
+        assert 'lod_claimed_by = %s' in sql
+        assert params[:2] == ('run-1', 'uploads/facade.3dm')
+        conn.commit.assert_called_once()
+        assert rows == [('b1', 'ISO-1'), ('b2', 'ISO-2')]
+
+    def test_read_only_fetch_leaves_out_live_claims(self):
+        from src.agent.tasks.geometry_processing import _fetch_pending_blocks_for_file
+
+        with patch(f'{GP}.get_db_connection') as mock_db:
+            conn = mock_db.return_value.__enter__.return_value
+            cursor = conn.cursor.return_value
+            cursor.fetchall.return_value = []
+            _fetch_pending_blocks_for_file('uploads/facade.3dm')
+
+        sql = cursor.execute.call_args.args[0]
+        assert sql.lstrip().startswith('SELECT')
+        assert 'lod_claimed_by IS NULL' in sql
+        conn.commit.assert_not_called()
+
+
+class TestFileLodScheduleHold:
+    """The debounce key lives as long as the run; late blocks are rescheduled."""
+
+    def _run(self, redis_client, pending_after):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        def fetch(file_key, claim_token=None):
+            return [('b1', 'ISO-1')] if claim_token else pending_after
+
+        with patch(f'{GP}.get_redis_client', return_value=redis_client), \
+             patch(f'{GP}._fetch_pending_blocks_for_file', side_effect=fetch), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry',
+                   side_effect=lambda rf, bid, iso, **kw: _block_result(bid)), \
+             patch(f'{GP}._update_blocks_lod_urls_batch'), \
+             patch(f'{GP}._release_lod_claims'), \
+             patch(f'{GP}.schedule_scene_tiles'), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            result = generate_file_lod_assets('uploads/facade.3dm')
+        return result, mock_send
+
+    def test_key_held_for_the_run_and_dropped_at_the_end(self):
+        from src.agent.constants import FILE_LOD_CLAIM_TTL_SECONDS, FILE_LOD_SCHEDULE_KEY_PREFIX
+
+        redis_client = MagicMock()
+        result, mock_send = self._run(redis_client, pending_after=[])
+
+        assert result['status'] == 'success'
+        key = f'{FILE_LOD_SCHEDULE_KEY_PREFIX}uploads/facade.3dm'
+        assert redis_client.set.call_args_list[0].args[0] == key
+        assert redis_client.set.call_args_list[0].kwargs == {'ex': FILE_LOD_CLAIM_TTL_SECONDS}
+        redis_client.delete.assert_called_once_with(key)
+        mock_send.assert_not_called()
+
+    def test_block_validated_during_the_run_is_rescheduled(self):
+        from src.agent.constants import TASK_GENERATE_FILE_LOD_ASSETS
+
+        redis_client = MagicMock()
+        redis_client.set.return_value = True
+        result, mock_send = self._run(redis_client, pending_after=[('b9', 'ISO-9')])
+
+        assert result['processed'] == 1
+        mock_send.assert_called_once()
+        assert mock_send.call_args.args[0] == TASK_GENERATE_FILE_LOD_ASSETS
+        assert mock_send.call_args.kwargs['args'] == ['uploads/facade.3dm']
+
+
+class TestBatchUpdate:
+    """_update_blocks_lod_urls_batch writes every block in one transaction."""
+
+    def test_single_execute_batch_and_commit(self):
+        from src.agent.tasks.geometry_processing import _update_blocks_lod_urls_batch
+
+        updates = [
+            {'block_id': bid, 'bbox': {'min': [0, 0, 0], 'max': [1, 1, 1]},
+             **{k: v for k, v in _block_result(bid)['lod_data'].items() if k.endswith('_url')}}
+            for bid in ('b1', 'b2')
+        ]
+        with patch(f'{GP}.get_db_connection') as mock_db, \
+             patch(f'{GP}.psycopg2.extras.execute_batch') as mock_execute_batch:
+            conn = mock_db.return_value.__enter__.return_value
+            _update_blocks_lod_urls_batch(updates)
+
+        mock_execute_batch.assert_called_once()
+        rows = mock_execute_batch.call_args.args[2]
+        assert [row[-1] for row in rows] == ['b1', 'b2']
+        conn.commit.assert_called_once()
+
+
+class TestScheduleFileLodAssets:
+    """validate_file scheduling: one file task per debounce window."""
+
+    def test_first_block_enqueues_file_task(self):
+        from src.agent.tasks.geometry_processing import schedule_file_lod_assets
+        from src.agent.constants import TASK_GENERATE_FILE_LOD_ASSETS
+
+        redis_client = MagicMock()
+        redis_client.set.return_value = True
+        with patch(f'{GP}.get_redis_client', return_value=redis_client), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            mode = schedule_file_lod_assets('uploads/facade.3dm', 'b1')
+
+        assert mode == 'file'
+        assert mock_send.call_args.args[0] == TASK_GENERATE_FILE_LOD_ASSETS
+        assert mock_send.call_args.kwargs['args'] == ['uploads/facade.3dm']
+
+    def test_following_blocks_join_scheduled_run(self):
+        from src.agent.tasks.geometry_processing import schedule_file_lod_assets
+
+        redis_client = MagicMock()
+        redis_client.set.return_value = None  # NX not acquired
+        with patch(f'{GP}.get_redis_client', return_value=redis_client), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            mode = schedule_file_lod_assets('uploads/facade.3dm', 'b2')
+
+        assert mode == 'joined'
+        mock_send.assert_not_called()
+
+    def test_without_redis_falls_back_to_block_task(self):
+        from src.agent.tasks.geometry_processing import schedule_file_lod_assets
+        from src.agent.constants import TASK_GENERATE_LOW_POLY_GLB
+
+        with patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            mode = schedule_file_lod_assets('uploads/facade.3dm', 'b1')
+
+        assert mode == 'block'
+        mock_send.assert_called_once_with(TASK_GENERATE_LOW_POLY_GLB, args=['b1'])
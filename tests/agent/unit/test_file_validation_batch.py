@@ -0,0 +1,168 @@
+"""
+Unit tests for file-level validation (validate_file_blocks).
+
+Verifies that the shared .3dm is downloaded and parsed once for all its
+blocks, that only the per-block part of the graph runs per
+block, that reports/statuses are committed in one batch, and that
+register_3dm_blocks enqueues one task per chunk of blocks.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+FV = 'src.agent.tasks.file_validation'
+
+
+def _outcome(is_valid=True, tipologia='dovela'):
+    return {
+        'is_valid': is_valid,
+        'overall_status': 'validated' if is_valid else 'rejected',
+        'semantic': {'tipologia': tipologia},
+        'classification_method': None,
+        'errors': [],
+        'metadata': {'classification': {'tipologia': tipologia}},
+    }
+
+
+@pytest.fixture
+def file_services():
+    """Download / parse / metadata doubles shared by every block of the file."""
+    download = MagicMock()
+    download.download_from_s3.return_value = (True, '/tmp/model.3dm', None)
+    parser = MagicMock()
+    parser.parse_file.return_value = MagicMock(success=True, layers=[], file_metadata={})
+    model = MagicMock()
+    with patch(f'{FV}.FileDownloadService', return_value=download), \
+         patch(f'{FV}.RhinoParserService', return_value=parser), \
+         patch('src.agent.graph.nodes.build_initial_geometry_metadata',
+               return_value={'rhino_model': model, 'file_exists_in_storage': True, 'iso_code': None,
+                             'content_hash': 'abc'}), \
+         patch('src.agent.graph.batch_classification.classify_blocks_batch', return_value={}) as mock_batch, \
+         patch(f'{FV}._update_blocks_status_batch') as mock_status, \
+         patch(f'{FV}._save_validation_results_batch') as mock_save, \
+         patch(f'{FV}.schedule_file_lod_assets', return_value='file') as mock_schedule, \
+         patch(f'{FV}.celery_app') as mock_celery:
+        yield {'download': download, 'parser': parser, 'status': mock_status, 'batch': mock_batch,
+               'save': mock_save, 'schedule': mock_schedule, 'celery': mock_celery}
+
+
+class TestValidateFileBlocks:
+    """File-wide work once, per-block graph for each block, one commit."""
+
+    def test_parses_once_and_commits_in_one_batch(self, file_services):
+        from src.agent.tasks.file_validation import validate_file_blocks
+
+        blocks = [['b1', 'ISO-1'], ['b2', 'ISO-2'], ['b3', 'ISO-3']]
+        outcomes = {'b1': _outcome(), 'b2': _outcome(is_valid=False), 'b3': _outcome(tipologia='capitel')}
+        with patch(f'{FV}._run_block_graph',
+                   side_effect=lambda bid, meta, parse, retries: outcomes[bid]) as mock_graph:
+            result = validate_file_blocks('uploads/facade.3dm', blocks)
+
+        assert file_services['download'].download_from_s3.call_count == 1
+        assert file_services['parser'].parse_file.call_count == 1
+        file_services['status'].assert_called_once_with(['b1', 'b2', 'b3'], 'processing')
+
+        metadata = [call.args[1] for call in mock_graph.call_args_list]
+        assert [m['iso_code'] for m in metadata] == ['ISO-1', 'ISO-2', 'ISO-3']
+        assert all(m['content_hash'] == 'abc' for m in metadata)  # keys the memoized validation
+
+        file_services['save'].assert_called_once()
+        rows = file_services['save'].call_args.args[0]
+        assert [(r['part_id'], r['status'], r.get('tipologia')) for r in rows] == [
+            ('b1', 'validated', 'dovela'), ('b2', 'error_processing', None), ('b3', 'validated', 'capitel')]
+        assert rows[0]['validation_report']['is_valid'] is True
+
+        file_services['schedule'].assert_called_once_with('uploads/facade.3dm', 'b1')
+        assert file_services['celery'].send_task.call_count == 2  # embeddings of b1, b3
+        assert result == {'success': True, 'file_key': 'uploads/facade.3dm',
+                          'validated': 2, 'rejected': 1, 'failed': {}}
+
+    def test_batch_classifications_reach_their_blocks(self, file_services):
+        from src.agent.tasks.file_validation import validate_file_blocks
+
+        classification = {'tipologia': 'dovela', 'confidence': 0.9, 'reasoning': 'batch'}
+        file_services['batch'].return_value = {'b1': classification}
+        with patch(f'{FV}._run_block_graph', return_value=_outcome()) as mock_graph:
+            validate_file_blocks('uploads/facade.3dm', [['b1', 'ISO-1'], ['b2', 'ISO-2']])
+
+        file_services['batch'].assert_called_once()
+        assert file_services['batch'].call_args.args[1] == [['b1', 'ISO-1'], ['b2', 'ISO-2']]
+        metadata = [call.args[1] for call in mock_graph.call_args_list]
+        assert [m['llm_classification'] for m in metadata] == [classification, None]
+
+    def test_permanent_download_error_fails_every_block(self, file_services):
+        from src.agent.tasks.file_validation import validate_file_blocks
+
+        file_services['download'].download_from_s3.return_value = (False, None, 'S3 download failed: File not found')
+        with patch(f'{FV}._run_block_graph') as mock_graph:
+            result = validate_file_blocks('uploads/missing.3dm', [['b1', 'ISO-1'], ['b2', 'ISO-2']])
+
+        mock_graph.assert_not_called()
+        rows = file_services['save'].call_args.args[0]
+        assert [(r['part_id'], r['status']) for r in rows] == [('b1', 'error_processing'), ('b2', 'error_processing')]
+        assert rows[0]['validation_report']['errors'][0]['category'] == 'io'
+        assert result['success'] is False and set(result['failed']) == {'b1', 'b2'}
+
+    def test_transient_block_error_retries_only_that_block(self, file_services):
+        from celery.exceptions import Retry
+        from src.agent.tasks.file_validation import validate_file_blocks
+
+        def run(block_id, meta, parse, retries):
+            if block_id == 'b2':
+                raise ConnectionError('connection reset')
+            return _outcome()
+
+        with patch(f'{FV}._run_block_graph', side_effect=run), \
+             patch.object(validate_file_blocks, 'retry', side_effect=Retry()) as mock_retry:
+            with pytest.raises(Retry):
+                validate_file_blocks('uploads/facade.3dm', [['b1', 'ISO-1'], ['b2', 'ISO-2']])
+
+        rows = file_services['save'].call_args.args[0]
+        assert [r['part_id'] for r in rows] == ['b1']  # committed before the retry
+        assert mock_retry.call_args.kwargs['args'] == ['uploads/facade.3dm', [['b2', 'ISO-2']]]
+
+
+class TestPrecomputedGeometryValidation:
+    """ValidateGeometry reuses the file-level result instead of re-validating the model."""
+
+    def test_node_uses_preloaded_errors(self):
+        from src.agent.graph.nodes import node_validate_geometry
+        from src.agent.graph.state import make_initial_state
+
+        state = make_initial_state('b1')
+        state['geometry_metadata'] = {'rhino_model': MagicMock(), 'geometry_validation_errors': []}
+        with patch('src.agent.services.geometry_validator.GeometryValidator') as mock_validator:
+            result = node_validate_geometry(state)
+
+        mock_validator.assert_not_called()
+        assert result['geometry_valid'] is True
+
+
+class TestRegisterEnqueuesFileValidation:
+    """register_3dm_blocks enqueues one validate_file_blocks per chunk."""
+
+    def test_one_task_per_chunk(self):
+        from src.agent.constants import TASK_VALIDATE_FILE_BLOCKS
+        from src.agent.tasks.file_validation import register_3dm_blocks
+
+        new_blocks = [{'id': f"b{i}", 'iso_code': f"ISO-{i}"} for i in range(5)]
+        download = MagicMock()
+        download.download_from_s3.return_value = (True, '/tmp/model.3dm', None)
+        file3dm = MagicMock()
+        file3dm.InstanceDefinitions = [MagicMock() for _ in new_blocks]
+        db = MagicMock()
+        db.register_blocks_for_iso_codes.return_value = new_blocks
+        cache = MagicMock()
+        cache.read_model.return_value = file3dm
+        with patch(f'{FV}.FileDownloadService', return_value=download), \
+             patch(f'{FV}.DBService', return_value=db), \
+             patch(f'{FV}.get_model_cache', return_value=cache), \
+             patch(f'{FV}.VALIDATE_FILE_BATCH_BLOCKS', 2), \
+             patch(f'{FV}.celery_app') as mock_celery:
+            result = register_3dm_blocks('uploads/facade.3dm')
+
+        calls = mock_celery.send_task.call_args_list
+        assert [call.args[0] for call in calls] == [TASK_VALIDATE_FILE_BLOCKS] * 3
+        assert [len(call.kwargs['args'][1]) for call in calls] == [2, 2, 1]
+        assert calls[0].kwargs['args'] == ['uploads/facade.3dm', [['b0', 'ISO-0'], ['b1', 'ISO-1']]]
+        assert result['registered'] == 5
@@ -0,0 +1,254 @@
+"""
+Unit tests for content-addressed LOD reuse (geometry fingerprint + LOD cache).
+
+Verifies that the fingerprint is placement- and model-unit-independent
+and stable under float round-off, that an indexed block reuses its assets
+without decimating or uploading, that a translated duplicate gets the
+cached assets re-placed, that misses are indexed once committed (with a
+TTL), and that translated duplicates reuse the decimated levels of the
+same worker.
+"""
+
+import json
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.tasks import geometry_processing as gp
+from src.agent.services.glb_export_service import GLBExportService
+from src.agent.services.lod_container import read_lod_chunk
+from src.agent.tasks.geometry_processing import (
+    BlockGeometry,
+    _decimate_with_cache,
+    _encode_lod_assets,
+    _geometry_fingerprint,
+    _store_lod_cache,
+    _translate_obj,
+    get_lod_cache_stats,
+)
+
+GP = 'src.agent.tasks.geometry_processing'
+WORLD_OFFSET = np.array([431_250.0, 4_582_730.0, 32_150.0])
+
+
+@pytest.fixture
+def block_mesh():
+    mesh = trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+    mesh.apply_translation(WORLD_OFFSET)
+    return mesh
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    gp._decimation_cache.clear()
+    gp._lod_cache_stats.clear()
+    yield
+    gp._decimation_cache.clear()
+    gp._lod_cache_stats.clear()
+
+
+def _fingerprint(mesh, face_layers=None, unit_scale=gp.DEFAULT_UNIT_SCALE):
+    if face_layers is None:
+        face_layers = np.zeros(len(mesh.faces), dtype=np.int32)
+    return _geometry_fingerprint(mesh.vertices, mesh.faces, face_layers, unit_scale)
+
+
+def _geometry(mesh):
+    face_layers = np.zeros(len(mesh.faces), dtype=np.int32)
+    return BlockGeometry(
+        mesh=mesh, face_layers=face_layers, bbox=None, matched_idef=None,
+        original_faces_count=len(mesh.faces),
+        fingerprint=_fingerprint(mesh, face_layers),
+    )
+
+
+class TestGeometryFingerprint:
+    """Stable hash of quantized vertex/face/layer arrays."""
+
+    def test_translation_invariant(self, block_mesh):
+        moved = block_mesh.copy()
+        moved.apply_translation([1200.0, -350.0, 4.5])
+        assert _fingerprint(moved) == _fingerprint(block_mesh)
+
+    def test_stable_under_float_round_off(self, block_mesh):
+        noisy = block_mesh.copy()
+        noise = np.random.default_rng(0).uniform(-1e-9, 1e-9, noisy.vertices.shape)
+        noisy.vertices = noisy.vertices + noise
+        assert _fingerprint(noisy) == _fingerprint(block_mesh)
+
+    def test_changes_with_geometry(self, block_mesh):
+        scaled = block_mesh.copy()
+        scaled.apply_scale(1.01)
+        assert _fingerprint(scaled) != _fingerprint(block_mesh)
+
+    def test_changes_with_layers(self, block_mesh):
+        layers = np.zeros(len(block_mesh.faces), dtype=np.int32)
+        layers[:10] = 3
+        assert _fingerprint(block_mesh, layers) != _fingerprint(block_mesh)
+
+    def test_same_block_in_meters_and_millimeters(self, block_mesh):
+        in_meters = block_mesh.copy()
+        in_meters.apply_scale(0.001)
+        assert _fingerprint(in_meters, unit_scale=1.0) == _fingerprint(block_mesh)
+
+
+class TestLodAssetCache:
+    """_process_block_geometry reuses indexed assets of identical blocks."""
+
+    def _process(self, mesh, redis_client):
+        from src.agent.tasks.geometry_processing import _process_block_geometry
+
+        with patch(f'{GP}.get_redis_client', return_value=redis_client), \
+             patch(f'{GP}._extract_all_user_strings', return_value={}), \
+             patch(f'{GP}._extract_block_geometry', return_value=_geometry(mesh)), \
+             patch(f'{GP}._generate_lod_objs') as mock_generate:
+            mock_generate.return_value = {'low_poly_url': 'https://cdn/new.glb'}
+            result = _process_block_geometry(MagicMock(), 'block-2', 'ISO-2')
+        return result, mock_generate
+
+    def test_hit_skips_decimation_and_upload(self, block_mesh):
+        cached = {'high_poly_url': 'https://cdn/high.glb', 'mid_poly_url': 'https://cdn/mid.glb',
+                  'low_poly_url': 'https://cdn/low.glb', 'face_counts': {'low': 500},
+                  'asset_origin': block_mesh.bounds.mean(axis=0).tolist()}
+        redis_client = MagicMock()
+        redis_client.get.return_value = json.dumps(cached)
+
+        result, mock_generate = self._process(block_mesh, redis_client)
+
+        mock_generate.assert_not_called()
+        assert result['cache_hit'] is True
+        assert result['lod_data']['low_poly_url'] == 'https://cdn/low.glb'
+        assert result['lod_cache_key'].startswith(result['fingerprint'] + '/')
+        redis_client.hincrby.assert_called_with(gp.LOD_CACHE_STATS_KEY, 'asset_hit', 1)
+
+    def test_miss_generates_under_content_address(self, block_mesh):
+        redis_client = MagicMock()
+        redis_client.get.return_value = None
+
+        result, mock_generate = self._process(block_mesh, redis_client)
+
+        assert result['cache_hit'] is False
+        kwargs = mock_generate.call_args.kwargs
+        assert kwargs['asset_id'].startswith(result['lod_cache_key'] + '/')
+        assert kwargs['fingerprint'] == result['fingerprint']
+        redis_client.hincrby.assert_called_with(gp.LOD_CACHE_STATS_KEY, 'asset_miss', 1)
+
+    def test_placement_changes_asset_id_not_cache_key(self, block_mesh):
+        redis_client = MagicMock()
+        redis_client.get.return_value = None
+        moved = block_mesh.copy()
+        moved.apply_translation([5000.0, 0.0, 0.0])
+
+        first, first_generate = self._process(block_mesh, redis_client)
+        second, second_generate = self._process(moved, redis_client)
+
+        assert first['lod_cache_key'] == second['lod_cache_key']
+        assert first_generate.call_args.kwargs['asset_id'] != second_generate.call_args.kwargs['asset_id']
+
+    def test_translated_duplicate_gets_cached_assets_replaced(self, block_mesh):
+        with patch(f'{GP}.LOD_CONTAINER', True):
+            lod_data, assets = _encode_lod_assets(block_mesh, 'block-1')
+        stored = {f"{level}-poly/fp/v1/a.{asset_format}": data
+                  for level, asset_format, data in assets if level != 'container'}
+        cached = {**lod_data, **{f"{key.split('-')[0]}_poly_url": f"https://x.supabase.co/storage/v1/object/public/"
+                                 f"processed-geometry/{key}" for key in stored}}
+        redis_client = MagicMock()
+        redis_client.get.return_value = json.dumps(cached)
+        storage = MagicMock()
+        storage.download.side_effect = lambda key: stored[key]
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        moved = block_mesh.copy()
+        moved.apply_translation([5000.0, 0.0, 0.0])
+
+        with patch(f'{GP}.get_supabase_client') as mock_client:
+            mock_client.return_value.storage.from_.return_value = storage
+            result, mock_generate = self._process(moved, redis_client)
+
+        mock_generate.assert_not_called()
+        assert result['cache_hit'] is True
+        uploaded = {call.args[0]: call.args[1] for call in storage.upload.call_args_list}
+        assert sorted(key.split('/')[0] for key in uploaded) == ['high-poly', 'low-poly', 'mid-poly', 'progressive']
+        assert all(f"/{result['lod_cache_key']}/" in key for key in uploaded)
+        low = GLBExportService.decode(uploaded[_storage_key_of(result['lod_data']['low_poly_url'])])
+        original = GLBExportService.decode(stored['low-poly/fp/v1/a.glb'])
+        np.testing.assert_allclose(low.vertices, original.vertices + [5000.0, 0.0, 0.0], atol=1e-6)
+        np.testing.assert_allclose(result['lod_data']['asset_origin'], moved.bounds.mean(axis=0))
+        container = uploaded[_storage_key_of(result['lod_data']['lod_container_url'])]
+        assert read_lod_chunk(container, 'low')[1] == uploaded[_storage_key_of(result['lod_data']['low_poly_url'])]
+        assert result['lod_data']['lod_container']['levels']['low']['faces'] == \
+            lod_data['lod_container']['levels']['low']['faces']
+        redis_client.set.assert_not_called()  # the entry keeps its own placement
+
+    def test_file_task_indexes_committed_misses_only(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        def process(rhino_file, block_id, iso_code, **kwargs):
+            return {
+                'lod_data': {'high_poly_url': 'h', 'mid_poly_url': 'm', 'low_poly_url': 'l',
+                             'mtl_url': None, 'face_counts': {}},
+                'bbox': None, 'rhino_metadata': {}, 'original_faces': 1,
+                'fingerprint': 'fp', 'lod_cache_key': f'fp/{block_id}',
+                'cache_hit': block_id == 'b1',
+            }
+
+        with patch(f'{GP}._fetch_pending_blocks_for_file',
+                   return_value=[('b1', 'ISO-1'), ('b2', 'ISO-2')]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry', side_effect=process), \
+             patch(f'{GP}._update_blocks_lod_urls_batch'), \
+             patch(f'{GP}._store_lod_cache') as mock_store:
+            result = generate_file_lod_assets('uploads/facade.3dm')
+
+        mock_store.assert_called_once()
+        assert mock_store.call_args.args[0] == 'fp/b2'
+        assert result['cache'] == {'asset_hits': 1, 'asset_misses': 1}
+
+
+def _storage_key_of(url):
+    return url.removeprefix("https://cdn/")
+
+
+class TestLodCacheEntry:
+    """Redis entries expire; OBJ levels are re-placed line by line."""
+
+    def test_entry_is_stored_with_ttl(self):
+        redis_client = MagicMock()
+        with patch(f'{GP}.get_redis_client', return_value=redis_client):
+            _store_lod_cache('fp/v1', {'low_poly_url': 'https://cdn/low.glb'})
+
+        assert redis_client.set.call_args.kwargs['ex'] == gp.LOD_CACHE_TTL_SECONDS
+
+    def test_obj_vertices_translated_other_lines_kept(self):
+        data = b"mtllib a.mtl\nv 1.000000 2.000000 3.000000\nusemtl stone\nf 1 1 1"
+        moved = _translate_obj(data, np.array([10.0, 0.0, -1.5]))
+        assert moved == b"mtllib a.mtl\nv 11.000000 2.000000 1.500000\nusemtl stone\nf 1 1 1"
+
+
+class TestDecimationCache:
+    """Translated duplicates reuse decimated levels within a worker."""
+
+    def test_translated_duplicate_decimated_once(self, block_mesh):
+        moved = block_mesh.copy()
+        moved.apply_translation([2500.0, 0.0, 0.0])
+        targets = {'mid': 2000, 'low': 500}
+
+        with patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.LODDecimationService', wraps=gp.LODDecimationService) as mock_service:
+            first, _ = _decimate_with_cache(block_mesh, targets, 'b1', _fingerprint(block_mesh))
+            second, report = _decimate_with_cache(moved, targets, 'b2', _fingerprint(moved))
+
+        assert mock_service.call_count == 1
+        assert report['low']['source'] == 'cache'
+        np.testing.assert_allclose(second['low'].vertices, first['low'].vertices + [2500.0, 0.0, 0.0])
+        assert get_lod_cache_stats() == {'decimation_miss': 1, 'decimation_hit': 1}
+
+    def test_without_fingerprint_always_decimates(self, block_mesh):
+        with patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.LODDecimationService', wraps=gp.LODDecimationService) as mock_service:
+            _decimate_with_cache(block_mesh, {'low': 500}, 'b1', None)
+            _decimate_with_cache(block_mesh, {'low': 500}, 'b1', None)
+
+        assert mock_service.call_count == 2
@@ -0,0 +1,203 @@
+"""
+Unit tests for GLBExportService (binary LOD assets).
+
+Verifies the GLB container layout, local-origin positions with the world
+offset in the node translation, int16 quantization, index width, optional
+normals, and that _generate_lod_objs uploads GLB or legacy OBJ according to
+LOD_ASSET_FORMAT.
+"""
+
+import io
+import json
+import struct
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.glb_export_service import GLBExportService
+
+GP = 'src.agent.tasks.geometry_processing'
+WORLD_OFFSET = np.array([431_250.0, 4_582_730.0, 32_150.0])
+
+
+def _parse_glb(data: bytes) -> tuple[dict, bytes]:
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+    assert magic == b"glTF" and version == 2 and length == len(data)
+    json_len, json_type = struct.unpack_from("<II", data, 12)
+    assert json_type == 0x4E4F534A and json_len % 4 == 0
+    gltf = json.loads(data[20:20 + json_len])
+    bin_len, bin_type = struct.unpack_from("<II", data, 20 + json_len)
+    assert bin_type == 0x004E4942 and bin_len % 4 == 0
+    return gltf, data[28 + json_len:28 + json_len + bin_len]
+
+
+def _load_vertices(data: bytes) -> np.ndarray:
+    scene = trimesh.load(io.BytesIO(data), file_type='glb')
+    return scene.to_geometry().vertices
+
+
+@pytest.fixture
+def world_mesh():
+    """~1.3k-face block placed at typical site coordinates (mm)."""
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=300.0)
+    mesh.apply_translation(WORLD_OFFSET)
+    return mesh
+
+
+class TestGLBContainer:
+    """Header, chunks and glTF JSON of the written asset."""
+
+    def test_valid_container_and_buffer_length(self, world_mesh):
+        asset = GLBExportService(quantize=False).encode(world_mesh)
+        gltf, binary = _parse_glb(asset.data)
+
+        assert gltf["asset"]["version"] == "2.0"
+        assert gltf["buffers"][0]["byteLength"] == len(binary)
+        for view in gltf["bufferViews"]:
+            assert view["byteOffset"] % 4 == 0
+
+    def test_positions_are_local_with_world_offset_in_node(self, world_mesh):
+        asset = GLBExportService(quantize=False).encode(world_mesh)
+        gltf, _ = _parse_glb(asset.data)
+
+        node = gltf["nodes"][0]
+        np.testing.assert_allclose(node["translation"], asset.origin)
+        np.testing.assert_allclose(asset.origin, WORLD_OFFSET, atol=1e-6)
+        position = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["attributes"]["POSITION"]]
+        assert max(abs(v) for v in position["max"] + position["min"]) <= 300.0 + 1e-3
+
+        # Loaded scene lands back at absolute coordinates
+        np.testing.assert_allclose(
+            np.sort(_load_vertices(asset.data), axis=0), np.sort(world_mesh.vertices, axis=0), atol=1e-3
+        )
+
+    def test_shared_origin_is_used_verbatim(self, world_mesh):
+        origin = (WORLD_OFFSET - 1000.0).tolist()
+        asset = GLBExportService().encode(world_mesh, origin=origin)
+        assert asset.origin == origin
+
+
+class TestQuantization:
+    """KHR_mesh_quantization int16 positions."""
+
+    def test_int16_positions_within_precision(self, world_mesh):
+        asset = GLBExportService(quantize=True).encode(world_mesh)
+        gltf, _ = _parse_glb(asset.data)
+
+        assert asset.quantized
+        assert "KHR_mesh_quantization" in gltf["extensionsRequired"]
+        position = gltf["accessors"][0]
+        assert position["componentType"] == 5122  # SHORT
+        assert gltf["bufferViews"][position["bufferView"]]["byteStride"] == 8
+
+        step = 300.0 / 32767
+        np.testing.assert_allclose(
+            np.sort(_load_vertices(asset.data), axis=0), np.sort(world_mesh.vertices, axis=0), atol=step
+        )
+
+    def test_quantized_is_smaller_than_float(self, world_mesh):
+        float_size = len(GLBExportService(quantize=False).encode(world_mesh).data)
+        quantized_size = len(GLBExportService(quantize=True).encode(world_mesh).data)
+        assert quantized_size < float_size
+
+
+class TestIndicesAndNormals:
+    """Index width and optional normals."""
+
+    def test_uint16_indices_for_small_meshes(self, world_mesh):
+        gltf, _ = _parse_glb(GLBExportService().encode(world_mesh).data)
+        indices = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["indices"]]
+        assert indices["componentType"] == 5123
+        assert indices["count"] == len(world_mesh.faces) * 3
+
+    def test_uint32_indices_above_65535_vertices(self):
+        vertices = np.random.default_rng(0).random((70_000, 3)) * 1000
+        faces = np.array([[0, 1, 69_999], [2, 3, 4]])
+        mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+        gltf, _ = _parse_glb(GLBExportService().encode(mesh).data)
+        indices = gltf["accessors"][gltf["meshes"][0]["primitives"][0]["indices"]]
+        assert indices["componentType"] == 5125
+
+    @pytest.mark.parametrize("quantize", [False, True])
+    def test_normals_only_when_requested(self, world_mesh, quantize):
+        without = _parse_glb(GLBExportService(quantize=quantize, normals=False).encode(world_mesh).data)[0]
+        with_normals = _parse_glb(GLBExportService(quantize=quantize, normals=True).encode(world_mesh).data)[0]
+
+        assert "NORMAL" not in without["meshes"][0]["primitives"][0]["attributes"]
+        assert "NORMAL" in with_normals["meshes"][0]["primitives"][0]["attributes"]
+
+
+class TestDecode:
+    """decode() reads an encoded asset back in absolute coordinates."""
+
+    @pytest.mark.parametrize("quantize", [True, False])
+    def test_round_trip(self, world_mesh, quantize):
+        asset = GLBExportService(quantize=quantize, normals=True).encode(world_mesh)
+        mesh = GLBExportService.decode(asset.data)
+
+        tolerance = 0.01 if quantize else 1e-3  # int16 step ~0.009 mm on a 600 mm block
+        assert np.abs(mesh.vertices - world_mesh.vertices).max() < tolerance
+        assert np.array_equal(mesh.faces, world_mesh.faces)
+
+    def test_rejects_non_glb(self):
+        with pytest.raises(ValueError):
+            GLBExportService.decode(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n")
+
+
+class TestCompressionSetting:
+    """Draco is optional and validated."""
+
+    def test_unknown_compression_rejected(self):
+        with pytest.raises(ValueError):
+            GLBExportService(compression="zip")
+
+    def test_draco_without_encoder_falls_back_to_plain_glb(self, world_mesh):
+        with patch('src.agent.services.glb_export_service.DracoPy', None):
+            service = GLBExportService(compression="draco")
+        asset = service.encode(world_mesh)
+        assert asset.compression == "none"
+        assert "KHR_draco_mesh_compression" not in asset.extensions
+
+    def test_draco_skips_empty_mesh(self):
+        with patch('src.agent.services.glb_export_service.DracoPy') as mock_draco:
+            asset = GLBExportService(compression="draco").encode(trimesh.Trimesh())
+
+        mock_draco.encode.assert_not_called()
+        assert asset.compression == "none" and asset.faces == 0
+        assert len(GLBExportService.decode(asset.data).faces) == 0
+
+
+class TestLodAssetFormat:
+    """_generate_lod_objs writes GLB by default and OBJ behind the setting."""
+
+    def _run(self, mesh, asset_format):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}?"
+        with patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_ASSET_FORMAT', asset_format):
+            mock_client.return_value.storage.from_.return_value = storage
+            result = _generate_lod_objs(mesh, "block-1")
+        uploads = {call.args[0]: call.args[2]['content-type'] for call in storage.upload.call_args_list}
+        return result, uploads
+
+    def test_glb_assets_share_block_origin(self, world_mesh):
+        result, uploads = self._run(world_mesh, 'glb')
+
+        assert uploads == {
+            f"{prefix}-poly/block-1.glb": 'model/gltf-binary' for prefix in ('high', 'mid', 'low')
+        }
+        assert result['asset_format'] == 'glb'
+        assert result['low_poly_url'] == "https://cdn/low-poly/block-1.glb"
+        np.testing.assert_allclose(result['asset_origin'], WORLD_OFFSET, atol=1e-6)
+
+    def test_obj_setting_keeps_legacy_assets(self, world_mesh):
+        result, uploads = self._run(world_mesh, 'obj')
+
+        assert set(uploads) == {f"{prefix}-poly/block-1.obj" for prefix in ('high', 'mid', 'low')}
+        assert set(uploads.values()) == {'model/obj'}
+        assert result['asset_format'] == 'obj'
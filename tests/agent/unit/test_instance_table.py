@@ -0,0 +1,215 @@
+"""
+Unit tests for GPU-instanced output of repeated geometry (InstanceTable).
+
+Verifies placement matrices (reference Xform @ translation to the block
+center), the column-major packing served to the viewer, the grouping of
+blocks by geometry fingerprint, and that generate_file_lod_assets uploads
+ONE shared mesh per group and writes each member's transform table.
+"""
+
+import numpy as np
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.instance_table import (
+    InstanceTable,
+    pack_matrices,
+    placement_matrices,
+    xform_matrix,
+)
+from src.agent.tasks.geometry_processing import BlockGeometry, _geometry_fingerprint
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+def _xform(matrix):
+    """rhino3dm-like Transform exposing M00..M33."""
+    xform = MagicMock()
+    for row in range(4):
+        for col in range(4):
+            setattr(xform, f"M{row}{col}", float(matrix[row][col]))
+    return xform
+
+
+def _translation(offset):
+    matrix = np.eye(4)
+    matrix[:3, 3] = offset
+    return matrix
+
+
+class TestPlacementMatrices:
+    """Matrices that map the local-frame mesh to Rhino world coordinates."""
+
+    def test_xform_read_from_rhino_fields(self):
+        rotation = np.array([[0, -1, 0, 5], [1, 0, 0, 6], [0, 0, 1, 7], [0, 0, 0, 1]], dtype=float)
+        assert np.array_equal(xform_matrix(_xform(rotation)), rotation)
+
+    def test_unreadable_xform_is_identity(self):
+        assert np.array_equal(xform_matrix(MagicMock()), np.eye(4))  # MagicMock fields, not numbers
+        bad = _xform(np.eye(4))
+        bad.M03 = float('nan')
+        assert np.array_equal(xform_matrix(bad), np.eye(4))
+
+    def test_block_without_references_is_placed_at_its_center(self):
+        matrices = placement_matrices([], [10.0, 20.0, 30.0])
+        assert matrices.shape == (1, 4, 4)
+        assert np.array_equal(matrices[0], _translation([10, 20, 30]))
+
+    def test_reference_xform_applied_after_centering(self):
+        reference = _translation([1000, 0, 0])
+        matrices = placement_matrices([_xform(reference), _xform(np.eye(4))], [1.0, 2.0, 3.0])
+
+        local_origin = np.array([0, 0, 0, 1.0])
+        assert np.allclose(matrices[0] @ local_origin, [1001, 2, 3, 1])
+        assert np.allclose(matrices[1] @ local_origin, [1, 2, 3, 1])
+
+    def test_packing_is_column_major(self):
+        packed = pack_matrices(placement_matrices([], [1.25, -2.0, 3.0000004]))
+        assert len(packed) == 1 and len(packed[0]) == 16
+        assert packed[0][12:15] == [1.25, -2.0, 3.0]  # translation in the last column
+        assert packed[0][15] == 1.0
+
+
+class TestInstanceTable:
+    """Blocks grouped by geometry fingerprint."""
+
+    def test_groups_blocks_sharing_a_fingerprint(self):
+        table = InstanceTable()
+        table.add('b0', 'fp-a', placement_matrices([], [0, 0, 0]))
+        table.add('b1', 'fp-b', placement_matrices([], [5, 0, 0]))
+        table.add('b2', 'fp-a', placement_matrices([], [9, 0, 0]))
+
+        groups = table.groups(min_instances=2)
+
+        assert [group.fingerprint for group in groups] == ['fp-a']
+        assert groups[0].block_ids == ['b0', 'b2']
+        assert groups[0].canonical_block == 'b0'
+        assert groups[0].instance_count == 2
+
+    def test_one_block_with_several_references_is_a_group(self):
+        table = InstanceTable()
+        table.add('b0', 'fp-a', np.stack([_translation([x, 0, 0]) for x in (0, 10, 20)]))
+        assert [group.instance_count for group in table.groups(min_instances=2)] == [3]
+        assert table.groups(min_instances=4) == []
+
+    def test_blocks_without_fingerprint_or_matrices_are_ignored(self):
+        table = InstanceTable()
+        table.add('b0', None, placement_matrices([], [0, 0, 0]))
+        table.add('b1', 'fp-a', None)
+        assert table.groups(min_instances=1) == []
+
+
+class TestBlockInstanceMatrices:
+    """_block_instance_matrices reads the InstanceReferences of the block's idef."""
+
+    def _geometry(self, matched_idef):
+        mesh = trimesh.creation.box(extents=[2.0, 2.0, 2.0])
+        mesh.apply_translation([100.0, 0.0, 0.0])
+        return BlockGeometry(mesh=mesh, face_layers=np.zeros(len(mesh.faces), dtype=np.int32),
+                             original_faces_count=len(mesh.faces), bbox={}, matched_idef=matched_idef)
+
+    def test_one_matrix_per_reference(self):
+        from src.agent.tasks.geometry_processing import _block_instance_matrices
+
+        idef = MagicMock()
+        idef.Name = 'ISO-1'
+        references = [MagicMock(), MagicMock()]
+        references[0].Geometry.Xform = _xform(_translation([0, 500, 0]))
+        references[1].Geometry.Xform = _xform(_translation([0, 900, 0]))
+        rhino_file = MagicMock()
+        rhino_file.Objects = [MagicMock(), *references]
+        index = MagicMock()
+        index.idef_by_name = {'ISO-1': 0}
+        index.reference_rows.return_value = np.array([1, 2])
+
+        with patch(f'{GP}.get_object_index', return_value=index):
+            matrices = _block_instance_matrices(rhino_file, self._geometry(idef))
+
+        index.reference_rows.assert_called_once_with(0)
+        assert np.allclose(matrices[:, :3, 3], [[100, 500, 0], [100, 900, 0]])
+
+    def test_block_without_idef_is_placed_once(self):
+        from src.agent.tasks.geometry_processing import _block_instance_matrices
+
+        matrices = _block_instance_matrices(MagicMock(), self._geometry(None))
+        assert np.allclose(matrices, [_translation([100, 0, 0])])
+
+
+def _prepared(block_id, offset, radius):
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=radius)
+    mesh.apply_translation([offset, 0.0, 0.0])
+    face_layers = np.zeros(len(mesh.faces), dtype=np.int32)
+    geometry = BlockGeometry(
+        mesh=mesh, face_layers=face_layers, original_faces_count=len(mesh.faces),
+        bbox={"min": mesh.bounds[0].tolist(), "max": mesh.bounds[1].tolist()},
+        fingerprint=_geometry_fingerprint(mesh.vertices, mesh.faces, face_layers),
+    )
+    return {'rhino_metadata': {}, 'geometry': geometry, 'lod_cache_key': f"fp/{block_id}",
+            'lod_asset_id': f"fp/{block_id}",
+            'cache_hit': False, 'lod_data': None,
+            'instance_matrices': placement_matrices([], [offset, 0.0, 0.0])}
+
+
+class TestFileInstancing:
+    """generate_file_lod_assets emits one shared mesh per group of identical blocks."""
+
+    # b0 and b2 are the same sphere at different positions, b1 is bigger
+    BLOCKS = {'b0': (0.0, 300.0), 'b1': (2000.0, 450.0), 'b2': (4000.0, 300.0)}
+
+    def _run(self, instancing=True):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        prepared = {block_id: _prepared(block_id, *args) for block_id, args in self.BLOCKS.items()}
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        with patch(f'{GP}._fetch_pending_blocks_for_file',
+                   return_value=[(block_id, f'ISO-{block_id}') for block_id in self.BLOCKS]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._prepare_block_geometry',
+                   side_effect=lambda rhino_file, block_id, iso_code: prepared[block_id]), \
+             patch(f'{GP}._extract_block_geometry',
+                   side_effect=lambda rhino_file, block_id, iso_code: prepared[block_id]['geometry']), \
+             patch(f'{GP}._file_lod_pool', return_value=None), \
+             patch(f'{GP}.LOD_INSTANCING', instancing), \
+             patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch:
+            mock_client.return_value.storage.from_.return_value = storage
+            result = generate_file_lod_assets('uploads/facade.3dm')
+        uploaded = [call.args[0] for call in storage.upload.call_args_list]
+        return result, mock_batch.call_args, uploaded, prepared
+
+    def test_shared_mesh_uploaded_once_with_transform_tables(self):
+        result, batch_call, uploaded, prepared = self._run()
+        fingerprint = prepared['b0']['geometry'].fingerprint
+
+        instanced_keys = [key for key in uploaded if f"instanced/{fingerprint}/" in key]
+        assert len(instanced_keys) == 3  # high / mid / low of the shared mesh
+        assert result['status'] == 'success' and result['processed'] == 3
+
+        rows = {row['block_id']: row for row in batch_call.args[0]}
+        assert rows['b0']['instance_group'] == rows['b2']['instance_group'] == fingerprint
+        assert 'instance_group' not in rows['b1']
+        assert rows['b2']['instance_transforms'][0][12:15] == [4000.0, 0.0, 0.0]
+        assert result['blocks']['b2']['instance_group'] == fingerprint
+
+        (mesh_row,) = batch_call.args[1]
+        assert mesh_row['instance_group'] == fingerprint
+        assert mesh_row['instance_count'] == 2
+        assert f"instanced/{fingerprint}/" in mesh_row['high_poly_url']
+
+    def test_shared_mesh_is_in_local_frame(self):
+        from src.agent.tasks.geometry_processing import _encode_lod_assets
+
+        with patch(f'{GP}._encode_lod_assets', wraps=_encode_lod_assets) as mock_encode:
+            self._run()
+        (call,) = [c for c in mock_encode.call_args_list if c.kwargs.get('origin') == [0.0, 0.0, 0.0]]
+        local_mesh = call.args[0]
+        assert np.allclose(local_mesh.bounds.mean(axis=0), 0.0, atol=1e-6)
+
+    def test_disabled_instancing_writes_per_block_rows_only(self):
+        result, batch_call, uploaded, _ = self._run(instancing=False)
+        assert not any('instanced/' in key for key in uploaded)
+        assert batch_call.args[1] == []
+        assert all('instance_group' not in row for row in batch_call.args[0])
@@ -0,0 +1,146 @@
+"""
+Unit tests for batched multi-block LLM classification.
+
+Runs LLMClient end to end against the local fake LLM server
+(tests/fixtures/fake_llm_server.py): one request classifies N blocks, with
+per-block results, partial failures left to the single-block path, and the
+same answers as the single-block baseline.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fixtures.fake_llm_server import FakeLLMServer
+from src.agent.graph.llm_client import LLMClient
+
+BBOX = {"min": [0.0, 0.0, 0.0], "max": [1.0, 1.0, 2.0]}
+LAYERS = ["SF-C12-D-001", "SF-C12-K-002"]
+VOLUMES = [0.1, 0.4, 0.9, 1.8, 3.2]
+
+
+class CountingRateLimiter:
+    """Enabled rate limiter that always grants, counting tokens and slots."""
+
+    enabled = True
+
+    def __init__(self):
+        self.tokens = 0
+        self.slots_in_use = 0
+
+    def acquire_token(self, *args, **kwargs):
+        self.tokens += 1
+        return True
+
+    def acquire_concurrent_slot(self, *args, **kwargs):
+        self.slots_in_use += 1
+        return True
+
+    def release_concurrent_slot(self, *args, **kwargs):
+        self.slots_in_use -= 1
+
+
+def _blocks(count):
+    return [{"iso_code": f"SF-C12-D-{i:03d}", "volume": VOLUMES[i % len(VOLUMES)],
+             "bbox": BBOX, "vertices_count": 1000 + i} for i in range(count)]
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Fake server + LLMClient pointed at it; yields (server, client, rate_limiter)."""
+    with FakeLLMServer(drop={"SF-C12-D-003"}, corrupt={"SF-C12-D-004"}) as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-fake")
+        rate_limiter = CountingRateLimiter()
+        yield server, LLMClient(rate_limiter=rate_limiter), rate_limiter
+
+
+class TestClassifyTipologiaBatch:
+    """One structured-output request per N blocks of a file."""
+
+    def test_requests_and_tokens_fall_with_same_answers(self, fake_llm):
+        server, client, rate_limiter = fake_llm
+        blocks = [block for block in _blocks(23) if block["iso_code"] not in ("SF-C12-D-003", "SF-C12-D-004")]
+
+        baseline = [client.classify_tipologia(layers=LAYERS, **block) for block in blocks]
+        single_tokens = server.prompt_tokens
+        batched = client.classify_tipologia_batch(blocks, LAYERS)
+
+        assert len(server.requests) == len(blocks) + 1
+        assert rate_limiter.tokens == len(blocks) + 1 and rate_limiter.slots_in_use == 0
+        assert server.prompt_tokens - single_tokens < single_tokens / 5
+        assert client.usage["requests"] == len(blocks) + 1
+        assert client.usage["prompt_tokens"] == server.prompt_tokens
+
+        agreement = sum(b["tipologia"] == s["tipologia"] for b, s in zip(batched, baseline)) / len(blocks)
+        assert agreement == 1.0
+
+    def test_partial_failure_only_loses_those_blocks(self, fake_llm):
+        _, client, _ = fake_llm
+
+        results = client.classify_tipologia_batch(_blocks(5), LAYERS)
+
+        assert [r["tipologia"] if r else None for r in results] == ["clave", "dovela", "imposta", None, None]
+        assert all(0.0 <= r["confidence"] <= 1.0 and r["classified_at"] for r in results[:3])
+        assert client.classify_tipologia_batch([], LAYERS) == []
+
+
+class TestClassifyBlocksBatch:
+    """validate_file_blocks pre-classification: dedup, cache, fallback to the node."""
+
+    @pytest.fixture
+    def graph_env(self, fake_llm):
+        from test_classification_cache import FakeRedis
+
+        server, client, _ = fake_llm
+        breaker = MagicMock()
+        breaker.is_open.return_value = False
+        redis = FakeRedis()
+        with patch("infra.redis_client.get_redis_client", return_value=redis), \
+                patch("src.agent.graph.llm_client.get_llm_client", return_value=client), \
+                patch("src.agent.graph.circuit_breaker.get_circuit_breaker", return_value=breaker):
+            yield server, breaker
+
+    def test_batches_unique_blocks_and_caches_results(self, graph_env):
+        from src.agent.graph.batch_classification import classify_blocks_batch
+
+        server, breaker = graph_env
+        metadata = {"volume": 0.4, "bbox": BBOX, "layers": LAYERS, "vertices_count": 1000}
+        blocks = [[f"b{i}", f"GLPER.{chr(65 + i % 3)}-PAE0720.07{i:02d}"] for i in range(6)]
+
+        results = classify_blocks_batch(metadata, blocks, batch_size=2)
+
+        assert len(server.requests) == 2  # 3 naming patterns → 3 unique blocks, 2 per request
+        assert sorted(results) == [f"b{i}" for i in range(6)]
+        assert {r["tipologia"] for r in results.values()} == {"dovela"}
+        assert breaker.record_success.call_count == 2
+
+        assert len(classify_blocks_batch(metadata, blocks)) == 6  # re-ingest: all from the cache
+        assert len(server.requests) == 2
+
+    def test_failed_request_leaves_blocks_to_the_node(self, graph_env):
+        from src.agent.graph.batch_classification import classify_blocks_batch
+        from src.agent.graph.llm_client import get_llm_client
+
+        _, breaker = graph_env
+        metadata = {"volume": 0.4, "bbox": BBOX, "layers": LAYERS, "vertices_count": 1000}
+        with patch.object(get_llm_client(), "classify_tipologia_batch", side_effect=RuntimeError("boom")):
+            assert classify_blocks_batch(metadata, [["b1", "SF-1"], ["b2", "SF-2"]]) == {}
+        breaker.record_failure.assert_called_once()
+
+    def test_node_uses_batch_result_without_llm_call(self, graph_env):
+        from src.agent.graph.nodes import node_classify_tipologia
+        from src.agent.graph.state import ClassificationMethod, make_initial_state
+
+        server, breaker = graph_env
+        state = make_initial_state("b1")
+        state["geometry_metadata"] = {"volume": 0.4, "bbox": BBOX, "layers": LAYERS, "vertices_count": 1000,
+                                      "iso_code": "SF-1", "llm_classification": {
+                                          "tipologia": "dovela", "confidence": 0.9, "reasoning": "batch"}}
+        with patch("src.agent.graph.nodes.insert_event"):
+            result = node_classify_tipologia(state)
+
+        assert server.requests == []
+        breaker.record_success.assert_not_called()
+        assert result["classification_method"] == ClassificationMethod.LLM_GPT4
+        assert result["semantic_data"]["reasoning"] == "batch"
@@ -0,0 +1,130 @@
+"""
+Unit tests for in-memory LOD export and concurrent uploads (LODAssetUploader).
+
+Verifies that the assets of a block are uploaded concurrently through the
+bounded pool, that each object is retried on its own, that a persistent
+upload failure surfaces, and that the file-level task only commits blocks
+whose assets all reached storage.
+"""
+
+import threading
+import time
+
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+def _storage(upload=None):
+    storage = MagicMock()
+    storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}?"
+    if upload is not None:
+        storage.upload.side_effect = upload
+    return storage
+
+
+@pytest.fixture
+def block_mesh():
+    return trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+
+
+class TestLODAssetUploader:
+    """Bounded concurrency + per-object retry."""
+
+    def test_block_assets_upload_concurrently(self, block_mesh):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        in_flight, peak, lock = 0, 0, threading.Lock()
+
+        def slow_upload(key, data, options):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.2)
+            with lock:
+                in_flight -= 1
+
+        storage = _storage(slow_upload)
+        with patch(f'{GP}.get_supabase_client') as mock_client:
+            mock_client.return_value.storage.from_.return_value = storage
+            result = _generate_lod_objs(block_mesh, "block-1")
+
+        assert storage.upload.call_count == 3
+        assert peak > 1
+        assert result['low_poly_url'].startswith("https://cdn/low-poly/block-1.")
+
+    def test_failed_object_is_retried_alone(self, block_mesh):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        attempts = {}
+
+        def flaky_upload(key, data, options):
+            attempts[key] = attempts.get(key, 0) + 1
+            if key.startswith("mid-poly/") and attempts[key] == 1:
+                raise ConnectionError("connection reset")
+
+        storage = _storage(flaky_upload)
+        with patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_UPLOAD_RETRY_BACKOFF_SECONDS', 0):
+            mock_client.return_value.storage.from_.return_value = storage
+            _generate_lod_objs(block_mesh, "block-1")
+
+        assert sorted(attempts.values()) == [1, 1, 2]
+
+    def test_persistent_failure_is_raised(self, block_mesh):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        def broken_upload(key, data, options):
+            if key.startswith("low-poly/"):
+                raise ConnectionError("storage unavailable")
+
+        storage = _storage(broken_upload)
+        with patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_UPLOAD_RETRY_BACKOFF_SECONDS', 0), \
+             pytest.raises(ConnectionError):
+            mock_client.return_value.storage.from_.return_value = storage
+            _generate_lod_objs(block_mesh, "block-1")
+
+        assert storage.upload.call_count == 2 + 3  # high + mid once, low every attempt
+
+
+class TestFileBatchUploads:
+    """generate_file_lod_assets shares one uploader across blocks."""
+
+    def test_block_with_failed_upload_is_not_committed(self):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        def process(rhino_file, block_id, iso_code, uploader):
+            url = uploader.submit(block_id, f"low-poly/{block_id}.glb", b"glb", "model/gltf-binary")
+            return {
+                'lod_data': {
+                    'high_poly_url': url, 'mid_poly_url': url, 'low_poly_url': url,
+                    'mtl_url': None, 'face_counts': {},
+                },
+                'bbox': None, 'rhino_metadata': {}, 'original_faces': 1,
+            }
+
+        def upload(key, data, options):
+            if key == "low-poly/b2.glb":
+                raise ValueError("payload rejected")
+
+        storage = _storage(upload)
+        with patch(f'{GP}._fetch_pending_blocks_for_file',
+                   return_value=[('b1', 'ISO-1'), ('b2', 'ISO-2')]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._process_block_geometry', side_effect=process), \
+             patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_UPLOAD_RETRY_BACKOFF_SECONDS', 0), \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch, \
+             patch(f'{GP}._update_block_status_error') as mock_status_error:
+            mock_client.return_value.storage.from_.return_value = storage
+            result = generate_file_lod_assets('uploads/facade.3dm')
+
+        assert [u['block_id'] for u in mock_batch.call_args.args[0]] == ['b1']
+        assert list(result['failed']) == ['b2']
+        assert list(result['blocks']) == ['b1']
+        mock_status_error.assert_called_once()
@@ -0,0 +1,98 @@
+"""
+Unit tests for the progressive LOD container (services/lod_container.py).
+
+Verifies the byte layout (coarse-to-fine, aligned chunks, index readable from
+the header alone), that every chunk decodes on its own, and that the LOD
+pipeline uploads the container next to the level files with an index that
+matches them byte for byte.
+"""
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.glb_export_service import GLBExportService
+from src.agent.services.lod_container import (
+    CONTAINER_ALIGNMENT,
+    pack_lod_container,
+    read_lod_chunk,
+    read_lod_container_index,
+)
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+class TestPackLodContainer:
+    """Layout and index of pack_lod_container."""
+
+    def test_chunks_are_coarse_to_fine_and_aligned(self):
+        data, index = pack_lod_container([
+            ('high', 'obj', b'h' * 1001), ('mtl', 'mtl', b'newmtl x'), ('mid', 'glb', b'm' * 50),
+            ('low', 'glb', b'l' * 7),
+        ])
+
+        assert list(index['levels']) == ['low', 'mid', 'high']  # MTL left out
+        assert index['size'] == len(data)
+        offsets = [chunk['offset'] for chunk in index['levels'].values()]
+        assert offsets == sorted(offsets) and offsets[0] == index['header_length']
+        assert all(offset % CONTAINER_ALIGNMENT == 0 for offset in offsets)
+        for level, chunk in index['levels'].items():
+            assert data[chunk['offset']:chunk['offset'] + chunk['length']] == level[0].encode() * chunk['length']
+
+    def test_index_is_readable_from_the_header_alone(self):
+        data, index = pack_lod_container([('low', 'glb', b'l' * 10), ('mid', 'glb', b'm' * 20)])
+
+        entries = read_lod_container_index(data[:index['header_length']])
+        assert {e['level']: e['offset'] for e in entries} == \
+               {level: chunk['offset'] for level, chunk in index['levels'].items()}
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            read_lod_container_index(b'glTF' + b'\x00' * 32)
+        with pytest.raises(KeyError):
+            read_lod_chunk(pack_lod_container([('low', 'glb', b'x')])[0], 'high')
+
+
+class TestPipelineContainer:
+    """_generate_lod_objs uploads the container and returns its index."""
+
+    def test_container_chunks_match_level_files(self):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        mesh = trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+        mesh.apply_translation([5000.0, 2000.0, 100.0])
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        with patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_CONTAINER', True):
+            mock_client.return_value.storage.from_.return_value = storage
+            result = _generate_lod_objs(mesh, "block-1")
+
+        uploads = {call.args[0]: call.args[1] for call in storage.upload.call_args_list}
+        container = uploads["progressive/block-1.sflc"]
+        assert result['lod_container_url'] == "https://cdn/progressive/block-1.sflc"
+        assert result['lod_container']['size'] == len(container)
+        for level in ('low', 'mid', 'high'):
+            chunk = result['lod_container']['levels'][level]
+            asset_format, data = read_lod_chunk(container, level)
+            assert data == uploads[f"{level}-poly/block-1.{asset_format}"]
+            assert chunk['faces'] == result['face_counts'][level]
+
+        # A range request on the coarse chunk is a complete asset in world coordinates
+        low = result['lod_container']['levels']['low']
+        decoded = GLBExportService.decode(container[low['offset']:low['offset'] + low['length']])
+        np.testing.assert_allclose(decoded.bounds, mesh.bounds, atol=5.0)
+
+    def test_disabled_by_setting(self):
+        from src.agent.tasks.geometry_processing import _generate_lod_objs
+
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        with patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}.LOD_CONTAINER', False):
+            mock_client.return_value.storage.from_.return_value = storage
+            result = _generate_lod_objs(trimesh.creation.box(extents=[100.0] * 3), "block-1")
+
+        assert storage.upload.call_count == 3
+        assert result['lod_container'] is None and 'lod_container_url' not in result
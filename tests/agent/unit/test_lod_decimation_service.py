@@ -0,0 +1,265 @@
+"""
+Unit tests for LODDecimationService (sequential / cascade / parallel modes)
+and its per-level quality and latency report, plus the vertex-clustering
+fallback, the hard face / file size ceilings and the screen-space-error
+adaptive targets.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import patch
+
+from src.agent.services.lod_decimation_service import (
+    LODDecimationService,
+    apply_quadric_decimation,
+    apply_vertex_clustering,
+    decimate_to_target,
+    lod_face_targets,
+    surface_deviation,
+)
+
+LDS = 'src.agent.services.lod_decimation_service'
+
+TARGETS = {'mid': 2000, 'low': 500}
+
+
+@pytest.fixture
+def sphere():
+    # 20,480 faces, radius 1000 mm
+    return trimesh.creation.icosphere(subdivisions=5, radius=1000.0)
+
+
+class TestQuadricDecimation:
+
+    def test_reaches_target_face_count(self, sphere):
+        decimated, faces = apply_quadric_decimation(sphere, 500, "block")
+
+        assert faces == len(decimated.faces)
+        assert faces <= 500
+
+    def test_below_target_is_untouched(self, sphere):
+        decimated, faces = apply_quadric_decimation(sphere, 50_000, "block")
+
+        assert decimated is sphere
+        assert faces == len(sphere.faces)
+
+
+class TestLODDecimationService:
+
+    @pytest.mark.parametrize("mode", ["sequential", "cascade", "parallel"])
+    def test_every_mode_meets_targets(self, sphere, mode):
+        meshes, report = LODDecimationService(mode=mode, max_workers=2).generate(sphere, TARGETS, "block")
+
+        for level, target in TARGETS.items():
+            assert len(meshes[level].faces) <= target
+            entry = report[level]
+            assert entry['target_faces'] == target
+            assert entry['faces'] == len(meshes[level].faces)
+            assert entry['latency_ms'] >= 0
+            assert 0 <= entry['deviation_mm'] < 200
+            assert entry['reduction_pct'] > 90
+
+    def test_cascade_derives_low_from_mid(self, sphere):
+        _, report = LODDecimationService(mode="cascade").generate(sphere, TARGETS, "block")
+
+        assert report['mid']['source'] == 'full'
+        assert report['low']['source'] == 'mid'
+
+    def test_sequential_derives_every_level_from_full(self, sphere):
+        _, report = LODDecimationService(mode="sequential").generate(sphere, TARGETS, "block")
+
+        assert {entry['source'] for entry in report.values()} == {'full'}
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            LODDecimationService(mode="gpu")
+
+    def test_deviation_zero_for_identical_meshes(self, sphere):
+        assert surface_deviation(sphere, sphere.copy()) == 0.0
+
+    def test_deviation_is_point_to_surface(self):
+        # Same plane, 2 vs 8192 triangles: far apart vertex-to-vertex, no surface deviation
+        coarse = trimesh.creation.box(extents=[1000.0, 1000.0, 1000.0])
+        fine = coarse.subdivide().subdivide().subdivide().subdivide().subdivide()
+
+        assert surface_deviation(coarse, fine) < 1e-6
+
+    def test_deviation_applies_model_unit_scale(self, sphere):
+        clustered, _ = apply_vertex_clustering(sphere, 500, "block")
+
+        in_mm = surface_deviation(sphere, clustered)
+        assert surface_deviation(sphere, clustered, unit_scale=1.0) == pytest.approx(in_mm * 1000)
+
+
+def _triangle_soup(count=5000):
+    """Disconnected triangles: quadric decimation can barely collapse them."""
+    vertices = np.random.default_rng(0).random((count * 3, 3)) * 1000.0
+    return trimesh.Trimesh(vertices=vertices, faces=np.arange(count * 3).reshape(count, 3), process=False)
+
+
+class TestVertexClustering:
+
+    @pytest.mark.parametrize("target, max_deviation", [(2000, 150), (500, 300), (50, 1000)])
+    def test_face_count_never_exceeds_target(self, sphere, target, max_deviation):
+        clustered, faces = apply_vertex_clustering(sphere, target, "block")
+
+        assert faces == len(clustered.faces)
+        assert target / 4 < faces <= target
+        assert surface_deviation(sphere, clustered) < max_deviation
+
+    def test_result_is_clean(self, sphere):
+        clustered, _ = apply_vertex_clustering(sphere, 500, "block")
+
+        faces = np.asarray(clustered.faces)
+        assert (faces[:, 0] != faces[:, 1]).all() and (faces[:, 1] != faces[:, 2]).all()
+        assert len(np.unique(np.sort(faces, axis=1), axis=0)) == len(faces)
+        assert len(np.unique(faces)) == len(clustered.vertices)  # no orphan vertices
+
+    def test_below_target_is_untouched(self, sphere):
+        clustered, faces = apply_vertex_clustering(sphere, 50_000, "block")
+        assert clustered is sphere
+
+
+class TestDecimateToTarget:
+
+    def test_quadric_when_it_meets_the_target(self, sphere):
+        _, faces, method = decimate_to_target(sphere, 500, "block")
+        assert method == 'quadric' and faces <= 500
+
+    def test_oversized_input_skips_quadric(self, sphere):
+        with patch(f'{LDS}.VERTEX_CLUSTERING_MIN_FACES', 10_000), \
+             patch(f'{LDS}.apply_quadric_decimation') as mock_quadric:
+            _, faces, method = decimate_to_target(sphere, 500, "block")
+
+        mock_quadric.assert_not_called()
+        assert method == 'vertex_clustering' and faces <= 500
+
+    def test_failed_quadric_falls_back_to_clustering(self, sphere):
+        with patch.object(trimesh.Trimesh, 'simplify_quadric_decimation', side_effect=RuntimeError("boom")):
+            _, faces, method = decimate_to_target(sphere, 500, "block")
+
+        assert method == 'vertex_clustering' and faces <= 500
+
+    def test_quadric_without_enough_progress_is_finished_by_clustering(self):
+        soup = _triangle_soup()
+        _, faces, method = decimate_to_target(soup, 500, "block")
+
+        assert method == 'quadric+vertex_clustering'
+        assert 0 < faces <= 500
+
+    def test_service_reports_method(self, sphere):
+        _, report = LODDecimationService(mode="cascade").generate(_triangle_soup(), TARGETS, "block")
+        assert all(entry['faces'] <= TARGETS[level] for level, entry in report.items())
+        assert report['mid']['method'].endswith('vertex_clustering')
+
+
+class TestLowPolySizeLimit:
+    """A decimated level is re-simplified until it fits MAX_GLB_SIZE_KB."""
+
+    def test_low_poly_asset_fits_size_limit(self, sphere):
+        from src.agent.tasks.geometry_processing import _encode_lod_assets
+
+        limits = {'high': 800, 'mid': 8, 'low': 4}
+        with patch('src.agent.tasks.geometry_processing.MAX_GLB_SIZE_KB', limits):
+            results, assets = _encode_lod_assets(sphere, "block")
+
+        sizes = {level: len(data) for level, _, data in assets}
+        assert sizes['low'] <= 4 * 1024 and sizes['mid'] <= 8 * 1024
+        assert results['face_counts']['low'] < TARGETS['low']
+        assert results['decimation_report']['low']['size_capped'] is True
+
+    def test_collapsed_mesh_becomes_bbox_proxy(self, sphere):
+        from src.agent.tasks.geometry_processing import _serialize_within_size_limit
+
+        report = {}
+        with patch('src.agent.tasks.geometry_processing.MAX_GLB_SIZE_KB', {'low': 4}), \
+             patch('src.agent.tasks.geometry_processing.apply_vertex_clustering',
+                   return_value=(trimesh.Trimesh(), {})) as mock_cluster:
+            mesh, _, data = _serialize_within_size_limit(sphere, "block", 'low', None, report)
+
+        assert mock_cluster.call_args.args[1] >= 12  # never asks for fewer faces than the floor
+        assert len(mesh.faces) == 12 and 0 < len(data) <= 4 * 1024
+        np.testing.assert_allclose(mesh.bounds, sphere.bounds)
+        assert report == {'faces': 12, 'method': 'bbox_proxy', 'size_capped': True}
+
+    def test_level_that_cannot_fit_is_an_error(self, sphere):
+        from src.agent.tasks.geometry_processing import _serialize_within_size_limit
+
+        with patch('src.agent.tasks.geometry_processing.MAX_GLB_SIZE_KB', {'low': 0}), \
+             pytest.raises(ValueError, match="bbox proxy"):
+            _serialize_within_size_limit(sphere, "block", 'low', None)
+
+
+class TestAdaptiveTargets:
+    """Per-block targets follow bbox size and the error tolerance, not piece count."""
+
+    def test_small_ornament_gets_fewer_faces_than_large_drum(self):
+        ornament = trimesh.creation.icosphere(subdivisions=4, radius=25.0)    # 5 cm
+        drum = trimesh.creation.cylinder(radius=800.0, height=1000.0, sections=256)  # 1.6 m column drum
+
+        small, large = lod_face_targets(ornament), lod_face_targets(drum)
+
+        assert small['mid'] < large['mid'] and small['low'] < large['low']
+        assert small == {'mid': 78, 'low': 16}  # 1.8 x 86.6 mm diagonal / tolerance
+        assert large['mid'] > 2000  # more than the fixed target at 2 mm tolerance
+
+    def test_target_scales_with_size_over_tolerance(self):
+        box = trimesh.creation.box(extents=[300.0, 400.0, 0.0])  # 500 mm diagonal
+
+        with patch(f'{LDS}.LOD_ERROR_TOLERANCE_MM', {'mid': 1.0, 'low': 5.0}):
+            targets = lod_face_targets(box)
+
+        assert targets == {'mid': 900, 'low': 180}  # 1.8 x 500 / tolerance
+
+    def test_meter_model_gets_same_targets_as_mm(self):
+        drum_mm = trimesh.creation.cylinder(radius=800.0, height=1000.0, sections=256)
+        drum_m = drum_mm.copy()
+        drum_m.apply_scale(0.001)  # the same drum in a file modelled in meters
+
+        in_m = lod_face_targets(drum_m, unit_scale=1.0)
+
+        assert in_m == lod_face_targets(drum_mm)
+        assert in_m['low'] > 12  # not collapsed to the face floor
+
+    def test_encode_sizes_targets_in_model_units(self):
+        from src.agent.tasks.geometry_processing import _encode_lod_assets
+
+        sphere_m = trimesh.creation.icosphere(subdivisions=5, radius=1.0)  # 1 m radius, modelled in meters
+        results, _ = _encode_lod_assets(sphere_m, "block", unit_scale=1.0)
+
+        assert results['face_counts']['low'] > 100
+
+    def test_fixed_mode_uses_legacy_targets(self, sphere):
+        assert lod_face_targets(sphere, mode="fixed") == TARGETS
+
+    def test_unknown_mode_rejected(self, sphere):
+        with pytest.raises(ValueError):
+            lod_face_targets(sphere, mode="sse")
+
+    def test_achieved_error_reported_per_level(self, sphere):
+        from src.agent.tasks.geometry_processing import _encode_lod_assets
+
+        results, _ = _encode_lod_assets(sphere, "block")
+
+        errors = results['lod_errors_mm']
+        assert errors['high'] == 0.0
+        assert 0 < errors['mid'] < errors['low']
+        assert errors['low'] == results['decimation_report']['low']['deviation_mm']
+
+
+class TestLeafImport:
+    """Importing the service from the repo root does not run the other services."""
+
+    def test_leaf_import_skips_geometry_validator(self):
+        code = ("import sys, src.agent.services.lod_decimation_service; "
+                "assert 'src.agent.services.geometry_validator' not in sys.modules")
+        root = Path(__file__).resolve().parents[3]
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}  # as run from a shell
+        result = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
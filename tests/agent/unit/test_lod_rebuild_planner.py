@@ -0,0 +1,230 @@
+"""
+Unit tests for versioned LOD outputs and selective rebuilds (lod_rebuild_planner).
+
+Verifies that each level's params hash only moves with the settings that
+level depends on, that the planner lists exactly the stale levels per block
+(batched per .3dm, with a dry-run cost estimate), and that
+rebuild_lod_levels only re-encodes and uploads the stale levels, repacking
+the container with the kept chunks.
+"""
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.lod_container import read_lod_chunk
+from src.agent.services.lod_rebuild_planner import (
+    lod_level_hashes,
+    lod_params_hash,
+    plan_lod_rebuild,
+)
+
+PL = 'src.agent.services.lod_rebuild_planner'
+GP = 'src.agent.tasks.geometry_processing'
+
+
+@pytest.fixture(autouse=True)
+def lod_container_enabled():
+    """The container level is planned and rebuilt only when LOD_CONTAINER is on."""
+    with patch(f'{PL}.LOD_CONTAINER', True), patch(f'{GP}.LOD_CONTAINER', True):
+        yield
+
+
+def _row(block_id, file_key='uploads/a.3dm', levels=None, faces=20000):
+    stamp = None if levels is None else {'version': 2, 'levels': levels, 'face_counts': {'original': faces}}
+    return {'id': block_id, 'iso_code': f"ISO-{block_id}", 'url_original': file_key, 'lod_build': stamp,
+            'high_poly_url': 'https://cdn/high.obj', 'mid_poly_url': 'https://cdn/mid.glb',
+            'low_poly_url': 'https://cdn/low.glb'}
+
+
+class TestLevelHashes:
+    """A level's hash only depends on the settings that level uses."""
+
+    def test_low_tolerance_only_invalidates_low_and_container(self):
+        before = lod_level_hashes()
+        with patch(f'{PL}.LOD_TARGET_MODE', 'adaptive'), \
+             patch(f'{PL}.LOD_ERROR_TOLERANCE_MM', {'mid': 2.0, 'low': 25.0}):
+            after = lod_level_hashes()
+
+        assert {level for level in before if before[level] != after[level]} == {'low', 'container'}
+
+    def test_version_bump_invalidates_every_level(self):
+        before = lod_level_hashes()
+        with patch(f'{PL}.LOD_CACHE_VERSION', 99):
+            after = lod_level_hashes()
+
+        assert all(before[level] != after[level] for level in before)
+        assert lod_params_hash(before) != lod_params_hash(after)
+
+    def test_cascaded_low_depends_on_mid(self):
+        changed = {}
+        for mode in ('cascade', 'parallel'):
+            with patch(f'{PL}.LOD_DECIMATION_MODE', mode), patch(f'{PL}.LOD_TARGET_MODE', 'adaptive'):
+                before = lod_level_hashes()
+                with patch(f'{PL}.LOD_ERROR_TOLERANCE_MM', {'mid': 5.0, 'low': 10.0}):
+                    after = lod_level_hashes()
+            changed[mode] = {level for level in before if before[level] != after[level]}
+
+        assert changed['cascade'] == {'mid', 'low', 'container'}  # low is decimated from mid
+        assert changed['parallel'] == {'mid', 'container'}
+
+    @pytest.mark.parametrize('setting, value', [
+        ('MAX_GLB_SIZE_KB', {'mid': 1, 'low': 1}),
+        ('LOD_SSE_FACES_PER_ERROR', 1.0),
+        ('LOD_ADAPTIVE_MIN_FACES', 1),
+        ('LOD_ADAPTIVE_MAX_FACES', {'mid': 1, 'low': 1}),
+        ('VERTEX_CLUSTERING_MIN_FACES', 1),
+    ])
+    def test_stamp_and_cache_key_move_together(self, setting, value):
+        from src.agent.tasks.geometry_processing import _lod_pipeline_signature
+
+        with patch(f'{PL}.LOD_TARGET_MODE', 'adaptive'):
+            before = (lod_level_hashes(), _lod_pipeline_signature())
+            with patch(f'{PL}.{setting}', value):
+                after = (lod_level_hashes(), _lod_pipeline_signature())
+
+        assert before[0]['low'] != after[0]['low']
+        assert before[1] != after[1]
+
+
+class TestPlanLodRebuild:
+    """Stale levels per block, batches per file, dry-run cost."""
+
+    def test_only_changed_levels_are_planned(self):
+        current = lod_level_hashes()
+        stored = {**current, 'low': 'old-low-hash'}
+        plan = plan_lod_rebuild([_row('b1', levels=stored), _row('b2', levels=current)], current)
+
+        assert [(b.block_id, b.levels) for b in plan.blocks] == [('b1', ['low', 'container'])]
+        assert plan.up_to_date == 1
+        assert plan.level_counts == {'high': 0, 'mid': 0, 'low': 1, 'container': 1}
+
+    def test_unstamped_block_and_missing_url_are_stale(self):
+        current = lod_level_hashes()
+        no_mid = {**_row('b2', levels=current), 'mid_poly_url': None}
+        plan = plan_lod_rebuild([_row('b1'), no_mid], current)
+
+        levels = {b.block_id: b.levels for b in plan.blocks}
+        assert levels == {'b1': ['high', 'mid', 'low', 'container'], 'b2': ['mid', 'container']}
+
+    def test_batches_group_blocks_by_file_longest_first(self):
+        current = lod_level_hashes()
+        rows = [_row(f"a{i}", 'uploads/a.3dm') for i in range(5)] + \
+               [_row('big', 'uploads/b.3dm', levels={}, faces=500000)]
+        plan = plan_lod_rebuild(rows, current, batch_blocks=2)
+
+        assert [(b.file_key, len(b.blocks)) for b in plan.batches] == \
+               [('uploads/b.3dm', 1), ('uploads/a.3dm', 2), ('uploads/a.3dm', 2), ('uploads/a.3dm', 1)]
+        costs = [batch.estimated_seconds for batch in plan.batches]
+        assert costs == sorted(costs, reverse=True)
+        file_key, block_levels = plan.batches[0].task_args()
+        assert file_key == 'uploads/b.3dm' and block_levels == {'big': ['high', 'mid', 'low', 'container']}
+
+    def test_dry_run_cost_estimate(self):
+        current = lod_level_hashes()
+        full = plan_lod_rebuild([_row('b1')], current).summary()
+        low_only = plan_lod_rebuild([_row('b1', levels={**current, 'low': 'x'})], current).summary()
+
+        assert full['stale_blocks'] == 1 and full['files'] == 1
+        assert full['estimated_worker_seconds'] > low_only['estimated_worker_seconds'] > 0
+
+
+class TestRebuildLodLevels:
+    """rebuild_lod_levels re-encodes only the stale levels of a block."""
+
+    @pytest.fixture
+    def block(self):
+        from src.agent.tasks.geometry_processing import BlockGeometry, _encode_lod_assets
+
+        mesh = trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+        geometry = BlockGeometry(
+            mesh=mesh, face_layers=np.zeros(len(mesh.faces), dtype=np.int32),
+            original_faces_count=len(mesh.faces),
+            bbox={'min': mesh.bounds[0].tolist(), 'max': mesh.bounds[1].tolist()},
+            fingerprint='fp',
+        )
+        prepared = {'rhino_metadata': {}, 'geometry': geometry, 'lod_cache_key': 'fp/v2',
+                    'lod_asset_id': 'fp/v2',
+                    'cache_hit': False, 'lod_data': None, 'instance_matrices': None,
+                    'layer_palette': None, 'lod_iso_code': None}
+        lod_data, assets = _encode_lod_assets(mesh, 'b1')
+        container = next(data for level, _, data in assets if level == 'container')
+        current = lod_level_hashes()
+        row = {**_row('b1', levels={**current, 'low': 'old-low-hash'}),
+               'mtl_url': None,
+               'lod_container': {'url': 'https://x.supabase.co/storage/v1/object/public/processed-geometry/'
+                                        'progressive/fp/v1.sflc', **lod_data['lod_container']}}
+        return prepared, row, container
+
+    def _run(self, prepared, row, container):
+        from src.agent.tasks.geometry_processing import rebuild_lod_levels
+
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        storage.download.return_value = container
+        client = MagicMock()
+        client.storage.from_.return_value = storage
+        with patch(f'{GP}._fetch_rebuild_blocks', return_value=[row]), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._prepare_block_for_lods', return_value=prepared), \
+             patch(f'{GP}._encode_lod_assets', wraps=_encode()) as mock_encode, \
+             patch(f'{GP}._update_blocks_lod_levels_batch') as mock_update, \
+             patch(f'{GP}._store_lod_cache') as mock_store, \
+             patch(f'{GP}.schedule_scene_tiles'), \
+             patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.get_supabase_client', return_value=client):
+            result = rebuild_lod_levels('uploads/a.3dm', {'b1': ['low', 'container']})
+        return result, storage, mock_encode, mock_update, mock_store
+
+    def test_only_stale_level_is_rebuilt_and_container_repacked(self, block):
+        prepared, row, container = block
+        result, storage, mock_encode, mock_update, mock_store = self._run(prepared, row, container)
+
+        assert result['status'] == 'success' and result['rebuilt'] == {'b1': ['low', 'container']}
+        assert mock_encode.call_args.kwargs['levels'] == ['low']
+        uploaded = [call.args[0] for call in storage.upload.call_args_list]
+        assert sorted(key.split('/')[0] for key in uploaded) == ['low-poly', 'progressive']
+        mock_store.assert_not_called()  # partial set: not indexed in the LOD cache
+
+        update = mock_update.call_args.args[0][0]
+        assert 'high_poly_url' not in update and 'mid_poly_url' not in update
+        assert update['low_poly_url'] == "https://cdn/low-poly/fp/v2.glb"
+        assert set(update['lod_errors_mm']) == {'low'}
+        assert update['lod_build']['levels'] == lod_level_hashes()
+
+        new_container = storage.upload.call_args_list[uploaded.index('progressive/fp/v2.sflc')].args[1]
+        for level in ('high', 'mid'):  # kept chunks, byte for byte
+            assert read_lod_chunk(new_container, level) == read_lod_chunk(container, level)
+        assert set(update['lod_container']['levels']) == {'high', 'mid', 'low'}
+
+    def test_up_to_date_block_is_skipped_on_retry(self, block):
+        prepared, row, container = block
+        row['lod_build']['levels'] = lod_level_hashes()
+        result, storage, mock_encode, mock_update, _ = self._run(prepared, row, container)
+
+        assert result['status'] == 'skipped' and result['up_to_date'] == 1
+        mock_encode.assert_not_called()
+        storage.upload.assert_not_called()
+
+
+class TestBuildStamp:
+    """Full LOD runs stamp the row with the current hashes."""
+
+    def test_stamp_columns(self):
+        from src.agent.tasks.geometry_processing import _lod_build_columns, _lod_build_stamp
+
+        stamp = _lod_build_stamp({'face_counts': {'original': 100, 'low': 12}, 'lod_container': {'size': 1}})
+        version, params_hash, lod_build = _lod_build_columns(stamp)
+
+        assert stamp['levels'] == lod_level_hashes() and version == stamp['version']
+        assert params_hash == lod_params_hash(lod_level_hashes())
+        assert _lod_build_stamp({'face_counts': {}})['levels'].keys() == {'high', 'mid', 'low'}
+        assert _lod_build_columns(None) == (None, None, None)
+
+
+def _encode():
+    from src.agent.tasks.geometry_processing import _encode_lod_assets
+    return _encode_lod_assets
+
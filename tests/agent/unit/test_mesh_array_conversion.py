@@ -0,0 +1,85 @@
+"""
+Unit tests for the bulk rhino3dm → NumPy mesh conversion used by
+_extract_and_merge_meshes (vertex table, quad splitting, mock fallback),
+plus a smoke run of infra/benchmark_mesh_conversion.py from the repo root.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import rhino3dm
+from unittest.mock import MagicMock
+
+from src.agent.tasks.geometry_processing import (
+    _mesh_vertices_to_array,
+    _mesh_faces_to_array,
+    _split_quad_faces,
+)
+
+
+def _quad_and_triangle_mesh():
+    mesh = rhino3dm.Mesh()
+    for x, y in [(0, 0), (1, 0), (1, 1), (0, 1), (2, 0)]:
+        mesh.Vertices.Add(float(x), float(y), 0.5)
+    mesh.Faces.AddFace(0, 1, 2, 3)  # quad
+    mesh.Faces.AddFace(1, 4, 2)     # triangle (stored as 1, 4, 2, 2)
+    return mesh
+
+
+class TestBulkMeshConversion:
+
+    def test_vertices_are_contiguous_float64(self):
+        vertices = _mesh_vertices_to_array(_quad_and_triangle_mesh().Vertices)
+
+        assert vertices.dtype == np.float64
+        assert vertices.shape == (5, 3)
+        assert vertices.flags['C_CONTIGUOUS']
+        np.testing.assert_allclose(vertices[2], [1.0, 1.0, 0.5])
+
+    def test_quads_split_in_face_order(self):
+        faces = _mesh_faces_to_array(_quad_and_triangle_mesh().Faces)
+
+        assert faces.dtype == np.int32
+        np.testing.assert_array_equal(faces, [[0, 1, 2], [0, 2, 3], [1, 4, 2]])
+
+    def test_split_matches_face_by_face_walk(self):
+        rng = np.random.default_rng(0)
+        table = rng.integers(0, 1000, size=(500, 4))
+        table[::3, 3] = table[::3, 2]  # every third face is a triangle
+
+        expected = []
+        for a, b, c, d in table:
+            expected.append([a, b, c])
+            if c != d:
+                expected.append([a, c, d])
+
+        np.testing.assert_array_equal(_split_quad_faces(table), expected)
+
+    def test_mock_faces_use_compatibility_path(self):
+        quad = MagicMock(IsQuad=True, A=0, B=1, C=2, D=3)
+        tri = MagicMock(IsQuad=False, A=1, B=4, C=2)
+
+        faces = _mesh_faces_to_array([quad, tri])
+
+        np.testing.assert_array_equal(faces, [[0, 1, 2], [0, 2, 3], [1, 4, 2]])
+
+    def test_empty_tables(self):
+        assert _mesh_vertices_to_array([]).shape == (0, 3)
+        assert _mesh_faces_to_array([]).shape == (0, 3)
+
+
+class TestBenchmarkScript:
+    """The documented benchmark command runs from the repo root."""
+
+    def test_runs_from_repo_root(self):
+        root = Path(__file__).resolve().parents[3]
+        result = subprocess.run(
+            [sys.executable, "infra/benchmark_mesh_conversion.py", "--sizes", "200", "--repeat", "1"],
+            cwd=root, capture_output=True, text=True, timeout=120,
+            env={k: v for k, v in os.environ.items() if k != "PYTHONPATH"},
+        )
+        assert result.returncode == 0, result.stderr
+        assert "speed-up" in result.stdout
@@ -0,0 +1,98 @@
+"""
+Unit tests for per-block mesh metrics (services/mesh_metrics.py).
+
+Verifies volume, area and oriented bounding box against analytic shapes,
+the model-unit conversion to meters, and that the extraction attaches the
+metrics to the block so they reach the blocks.mesh_* columns.
+"""
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import rhino3dm
+import trimesh
+
+from src.agent.services.mesh_metrics import compute_mesh_metrics, model_unit_scale
+
+FIXTURE = Path(__file__).parents[2] / 'fixtures' / 'test-model.3dm'
+
+
+class TestComputeMeshMetrics:
+    """Measures of closed and open triangle meshes."""
+
+    def test_rotated_box_far_from_origin(self):
+        box = trimesh.creation.box(extents=[2000.0, 1000.0, 500.0])
+        box.apply_transform(trimesh.transformations.rotation_matrix(0.5, [1, 2, 3]))
+        box.apply_translation([1e5, 2e5, 3e4])
+
+        metrics = compute_mesh_metrics(box.vertices, box.faces, unit_scale=1e-3)
+
+        assert metrics['volume_m3'] == pytest.approx(1.0)
+        assert metrics['area_m2'] == pytest.approx(7.0)
+        assert metrics['watertight'] is True
+        assert metrics['dimensions_m'] == pytest.approx([2.0, 1.0, 0.5])
+        assert metrics['obb']['center'] == pytest.approx([100.0, 200.0, 30.0])
+        axes = np.asarray(metrics['obb']['axes'])
+        assert axes @ axes.T == pytest.approx(np.eye(3))
+
+    def test_sphere_matches_trimesh(self):
+        sphere = trimesh.creation.icosphere(subdivisions=3, radius=0.4)
+
+        metrics = compute_mesh_metrics(sphere.vertices, sphere.faces)
+
+        assert metrics['volume_m3'] == pytest.approx(sphere.volume)
+        assert metrics['area_m2'] == pytest.approx(sphere.area)
+
+    def test_open_mesh_is_flagged_and_inverted_winding_keeps_volume_positive(self):
+        box = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+
+        inverted = compute_mesh_metrics(box.vertices, box.faces[:, ::-1])
+        open_box = compute_mesh_metrics(box.vertices, box.faces[:-2])
+
+        assert inverted['volume_m3'] == pytest.approx(1.0)
+        assert open_box['watertight'] is False
+        assert open_box['area_m2'] == pytest.approx(5.0)
+
+    def test_empty_mesh(self):
+        metrics = compute_mesh_metrics(np.empty((0, 3)), np.empty((0, 3), dtype=np.int64))
+
+        assert metrics['volume_m3'] == 0.0 and metrics['dimensions_m'] == [0.0, 0.0, 0.0]
+
+
+class TestModelUnits:
+    """Model unit system -> meters."""
+
+    def test_unit_scale(self):
+        meters = MagicMock()
+        meters.Settings.ModelUnitSystem = rhino3dm.UnitSystem.Meters
+        unset = MagicMock()
+        unset.Settings.ModelUnitSystem = rhino3dm.UnitSystem.Unset
+
+        assert model_unit_scale(meters) == 1.0
+        assert model_unit_scale(unset) == 1e-3  # pipeline's mm convention
+
+
+class TestExtractionMetrics:
+    """_extract_block_geometry attaches the metrics of the merged mesh."""
+
+    def test_block_geometry_carries_metrics(self):
+        from src.agent.tasks.geometry_processing import (
+            _extract_block_geometry, _mesh_metrics_columns,
+        )
+
+        rhino_file = rhino3dm.File3dm.Read(str(FIXTURE))
+        iso_code = rhino_file.InstanceDefinitions[0].Name
+        geometry = _extract_block_geometry(rhino_file, 'b1', iso_code)
+
+        metrics = geometry.metrics
+        dimensions = np.asarray(geometry.bbox['max']) - np.asarray(geometry.bbox['min'])
+        assert metrics['area_m2'] == pytest.approx(geometry.mesh.area)  # file units are meters
+        assert 0 < metrics['volume_m3'] <= dimensions.prod()
+        assert metrics['dimensions_m'] == sorted(metrics['dimensions_m'], reverse=True)
+
+        columns = _mesh_metrics_columns(metrics)
+        assert columns[:3] == (metrics['volume_m3'], metrics['area_m2'], metrics['watertight'])
+        assert list(columns[3:6]) == metrics['dimensions_m']
+        assert _mesh_metrics_columns(None) == (None,) * 7
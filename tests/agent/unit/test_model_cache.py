@@ -0,0 +1,244 @@
+"""
+Unit tests for ModelCacheService (worker-local .3dm cache).
+
+Disk tier: one download per (key, size, ETag), re-upload invalidation, LRU
+byte budget, hard-linked task copies. Parsed tier: one File3dm read per file,
+LRU entry budget, release hooks and RSS trim. Callers: FileDownloadService,
+_download_3dm_from_s3 + _parse_rhino_file, build_initial_geometry_metadata.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.model_cache_service import ModelCacheService
+from src.agent.services.streaming_download_service import StreamingDownloadService
+
+GP = 'src.agent.tasks.geometry_processing'
+MCS = 'src.agent.services.model_cache_service'
+
+
+class _Storage(ThreadingHTTPServer):
+    """Serves named objects with an ETag; counts full-body GETs per object."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.objects: dict[str, tuple[bytes, str]] = {}
+        self.body_gets: dict[str, int] = {}
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/{name}?token=t"
+
+    def put(self, name: str, data: bytes, etag: str):
+        self.objects[name] = (data, etag)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        name = self.path.split("?")[0].lstrip("/")
+        if name not in self.server.objects:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data, etag = self.server.objects[name]
+        if self.headers.get("Range") == "bytes=0-0":
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes 0-0/{len(data)}")
+            body = data[:1]
+        else:
+            self.server.body_gets[name] = self.server.body_gets.get(name, 0) + 1
+            self.send_response(200)
+            body = data
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def storage():
+    server = _Storage()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with patch(f'{MCS}.get_redis_client', return_value=None):
+        yield ModelCacheService(cache_dir=str(tmp_path / "cache"), disk_budget_bytes=10_000,
+                                max_models=2, downloader=StreamingDownloadService())
+
+
+def _supabase(storage):
+    supabase = MagicMock()
+    supabase.storage.from_.return_value.create_signed_url.side_effect = (
+        lambda key, ttl: {"signedURL": storage.url(key)}
+    )
+    return supabase
+
+
+class TestDiskTier:
+    """Raw files keyed by storage key + size/ETag."""
+
+    def test_second_fetch_is_served_from_disk(self, storage, cache):
+        storage.put("a.3dm", b"x" * 1000, '"v1"')
+
+        first = cache.fetch_url(storage.url("a.3dm"))
+        second = cache.fetch_url(storage.url("a.3dm"))
+
+        assert (first.disk_hit, second.disk_hit) == (False, True)
+        assert first.path == second.path
+        assert storage.body_gets["a.3dm"] == 1
+        assert cache.stats["disk_bytes_saved"] == 1000
+
+    def test_reupload_under_same_key_is_a_new_entry(self, storage, cache):
+        storage.put("a.3dm", b"x" * 1000, '"v1"')
+        first = cache.fetch_url(storage.url("a.3dm"))
+        storage.put("a.3dm", b"y" * 1000, '"v2"')
+        second = cache.fetch_url(storage.url("a.3dm"))
+
+        assert second.path != first.path and not second.disk_hit
+        assert open(second.path, "rb").read() == b"y" * 1000
+
+    def test_lru_byte_budget(self, storage, cache):
+        for name in ("a", "b", "c"):
+            storage.put(f"{name}.3dm", name.encode() * 4000, f'"{name}"')
+        a = cache.fetch_url(storage.url("a.3dm"))
+        b = cache.fetch_url(storage.url("b.3dm"))
+        os.utime(b.path, (1, 1))  # b is now the least recently used entry
+        cache.fetch_url(storage.url("c.3dm"))
+
+        assert os.path.exists(a.path) and not os.path.exists(b.path)
+        assert cache.stats["disk_evictions"] == 1
+
+    def test_materialized_copy_is_owned_by_caller(self, storage, cache, tmp_path):
+        storage.put("a.3dm", b"x" * 100, '"v1"')
+        cached = cache.fetch_url(storage.url("a.3dm"))
+        local = tmp_path / "task.3dm"
+
+        cache.materialize(cached, str(local))
+        os.remove(local)
+
+        assert os.path.exists(cached.path)
+        assert cache.owns(cached.path) and not cache.owns(str(local))
+
+
+class TestParsedTier:
+    """File3dm models memoized per file identity."""
+
+    def test_same_file_read_once(self, cache, tmp_path):
+        path = tmp_path / "m.3dm"
+        path.write_bytes(b"3dm")
+        loader = MagicMock(return_value=object())
+
+        assert cache.read_model(str(path), loader) is cache.read_model(str(path), loader)
+        loader.assert_called_once()
+
+    def test_hard_link_shares_parsed_model(self, cache, tmp_path):
+        path = tmp_path / "m.3dm"
+        path.write_bytes(b"3dm")
+        os.link(path, tmp_path / "link.3dm")
+        loader = MagicMock(return_value=object())
+
+        cache.read_model(str(path), loader)
+        cache.read_model(str(tmp_path / "link.3dm"), loader)
+
+        loader.assert_called_once()
+
+    def test_failed_read_not_cached(self, cache, tmp_path):
+        path = tmp_path / "bad.3dm"
+        path.write_bytes(b"not a model")
+        loader = MagicMock(return_value=None)
+
+        cache.read_model(str(path), loader)
+        cache.read_model(str(path), loader)
+
+        assert loader.call_count == 2
+
+    def test_lru_eviction_runs_release_hooks(self, cache, tmp_path):
+        released = []
+        cache.add_release_hook(lambda key, model: released.append(model))
+        loader = MagicMock(side_effect=lambda p: f"model:{os.path.basename(p)}")
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.3dm").write_bytes(name.encode())
+            cache.read_model(str(tmp_path / f"{name}.3dm"), loader)
+
+        assert released == ["model:a.3dm"]
+        assert cache.stats["parsed_released"] == 1
+
+    def test_trim_releases_models_above_rss_budget(self, cache, tmp_path):
+        (tmp_path / "a.3dm").write_bytes(b"a")
+        cache.read_model(str(tmp_path / "a.3dm"), MagicMock(return_value=object()))
+        cache.max_rss_bytes = 1
+
+        with patch(f'{MCS}._current_rss_bytes', return_value=2):
+            assert cache.trim() == 1
+        assert cache.trim() == 0
+
+
+class TestCacheCallers:
+    """Tasks and services open .3dm files through the cache."""
+
+    def test_file_download_service_reuses_download(self, storage, cache):
+        from src.agent.services.file_download_service import FileDownloadService
+
+        storage.put("uploads/f.3dm", b"x" * 500, '"v1"')
+        with patch('src.agent.services.file_download_service.get_supabase_client',
+                   return_value=_supabase(storage)), \
+             patch('src.agent.services.file_download_service.get_model_cache', return_value=cache):
+            service = FileDownloadService()
+            first = service.download_from_s3('uploads/f.3dm', task_id='t1')
+            service.cleanup_temp_file(first[1])
+            second = service.download_from_s3('uploads/f.3dm', task_id='t2')
+
+        assert first[0] and second[0] and first[1] == second[1]
+        assert os.path.exists(second[1])
+        assert storage.body_gets["uploads/f.3dm"] == 1
+
+    def test_block_tasks_share_download_and_parse(self, storage, cache, tmp_path):
+        from src.agent.tasks.geometry_processing import _download_3dm_from_s3, _parse_rhino_file
+
+        storage.put("uploads/f.3dm", b"x" * 500, '"v1"')
+        model = MagicMock()
+        with patch(f'{GP}.get_supabase_client', return_value=_supabase(storage)), \
+             patch(f'{GP}.get_model_cache', return_value=cache), \
+             patch('rhino3dm.File3dm.Read', return_value=model) as mock_read:
+            for block in ("b1", "b2"):
+                local = str(tmp_path / f"{block}.3dm")
+                _download_3dm_from_s3('uploads/f.3dm', local)
+                assert _parse_rhino_file(local, block) is model
+                os.remove(local)
+
+        assert storage.body_gets["uploads/f.3dm"] == 1
+        mock_read.assert_called_once()
+
+    def test_initial_metadata_reuses_parsed_model(self, cache, tmp_path):
+        from src.agent.graph.nodes import build_initial_geometry_metadata
+        from src.agent.services.rhino_parser_service import RhinoParserService
+
+        path = tmp_path / "m.3dm"
+        path.write_bytes(b"3dm")
+        model = MagicMock()
+        model.Objects = []
+        model.Layers = []
+        with patch('src.agent.services.rhino_parser_service.get_model_cache', return_value=cache), \
+             patch(f'{MCS}._model_cache', cache), \
+             patch('rhino3dm.File3dm.Read', return_value=model) as mock_read:
+            parse_result = RhinoParserService().parse_file(str(path))
+            metadata = build_initial_geometry_metadata(str(path), parse_result, "ISO-1")
+
+        mock_read.assert_called_once()
+        assert metadata["rhino_model"] is model
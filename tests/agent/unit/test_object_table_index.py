@@ -0,0 +1,177 @@
+"""
+Unit tests for ObjectTableIndex (columnar index of a File3dm object table).
+
+Verifies the per-object columns, the idef → object / reference row maps,
+lazy bboxes, memoization per model, and that the callers (user strings,
+block extraction, layer counts, geometry metadata) read the object table
+once per file instead of once per block / layer.
+"""
+
+import numpy as np
+import rhino3dm
+from unittest.mock import MagicMock, PropertyMock
+
+from src.agent.services.object_table_index import ObjectTableIndex, get_object_index
+
+
+def _bbox(lo, hi, valid=True):
+    bbox = MagicMock()
+    bbox.IsValid = valid
+    bbox.Min.X, bbox.Min.Y, bbox.Min.Z = lo
+    bbox.Max.X, bbox.Max.Y, bbox.Max.Z = hi
+    return bbox
+
+
+def _mesh(offset, layer_index, object_id):
+    geometry = MagicMock()
+    geometry.ObjectType = rhino3dm.ObjectType.Mesh
+    geometry.Vertices = [MagicMock(X=x + offset, Y=y, Z=0.0) for x, y in [(0, 0), (1, 0), (1, 1)]]
+    geometry.Faces = [(0, 1, 2, 2)]
+    geometry.GetBoundingBox.return_value = _bbox((offset, 0, 0), (offset + 1, 1, 0))
+    obj = MagicMock()
+    obj.Attributes.Id = object_id
+    obj.Attributes.LayerIndex = layer_index
+    obj.Attributes.IsInstanceDefinitionObject = True
+    obj.Geometry = geometry
+    return obj
+
+
+def _reference(idef_id, user_strings):
+    obj = MagicMock()
+    obj.Geometry.ObjectType = rhino3dm.ObjectType.InstanceReference
+    obj.Geometry.ParentIdefId = idef_id
+    obj.Geometry.GetBoundingBox.return_value = _bbox((0, 0, 0), (0, 0, 0), valid=False)
+    del obj.Geometry.Vertices
+    del obj.Geometry.Faces
+    obj.Attributes.Id = f"ref-{idef_id}-{len(user_strings)}"
+    obj.Attributes.LayerIndex = 2
+    obj.Attributes.IsInstanceDefinitionObject = False
+    obj.Attributes.GetUserStrings.return_value = tuple(user_strings)
+    return obj
+
+
+def _idef(name, idef_id, object_ids):
+    idef = MagicMock()
+    idef.Name = name
+    idef.Id = idef_id
+    idef.GetObjectIds.return_value = object_ids
+    return idef
+
+
+def _rhino_file():
+    """Two InstanceDefinitions (2 meshes / 1 mesh), each placed by references."""
+    rhino_file = MagicMock()
+    rhino_file.InstanceDefinitions = [
+        _idef("ISO-A", "AAAA", ["A-2", "A-1"]),
+        _idef("ISO-B", "bbbb", ["B-1"]),
+    ]
+    rhino_file.Objects = [
+        _mesh(0.0, 0, "A-1"),
+        _reference("bbbb", [("Codi", "ISO-B")]),
+        _mesh(10.0, 1, "B-1"),
+        _mesh(20.0, 0, "A-2"),
+        _reference("aaaa", [("Codi", "ISO-A"), ("Material", "Montjuïc")]),
+        _reference("aaaa", [("Codi", "ignored")]),
+    ]
+    return rhino_file
+
+
+class TestObjectTableIndex:
+    """Columns and row maps built in one pass."""
+
+    def test_columns(self):
+        index = ObjectTableIndex(_rhino_file())
+
+        np.testing.assert_array_equal(index.layer_index, [0, 2, 1, 0, 2, 2])
+        np.testing.assert_array_equal(index.is_idef_object, [True, False, True, True, False, False])
+        np.testing.assert_array_equal(index.parent_idef, [-1, 1, -1, -1, 0, 0])
+        np.testing.assert_array_equal(index.rows_of_type('InstanceReference'), [1, 4, 5])
+        assert index.row_by_id["b-1"] == 2
+
+    def test_idef_rows_in_table_order(self):
+        index = ObjectTableIndex(_rhino_file())
+
+        np.testing.assert_array_equal(index.idef_object_rows[0], [0, 3])
+        np.testing.assert_array_equal(index.reference_rows(0), [4, 5])
+        np.testing.assert_array_equal(index.reference_rows(1), [1])
+        assert index.idef_by_name == {"ISO-A": 0, "ISO-B": 1}
+
+    def test_layer_counts(self):
+        index = ObjectTableIndex(_rhino_file())
+        np.testing.assert_array_equal(index.layer_object_counts(3), [2, 1, 3])
+
+    def test_bounds_skip_invalid_bboxes(self):
+        index = ObjectTableIndex(_rhino_file())
+
+        np.testing.assert_array_equal(index.bounds(), [[0, 0, 0], [21, 1, 0]])
+        np.testing.assert_array_equal(index.bounds(index.idef_object_rows[1]), [[10, 0, 0], [11, 1, 0]])
+        assert int(index.vertex_count.sum()) == 9 and int(index.face_count.sum()) == 3
+
+    def test_bboxes_computed_lazily(self):
+        rhino_file = _rhino_file()
+        ObjectTableIndex(rhino_file)
+        rhino_file.Objects[0].Geometry.GetBoundingBox.assert_not_called()
+
+    def test_memoized_per_model_and_rebuilt_on_change(self):
+        rhino_file = _rhino_file()
+        first = get_object_index(rhino_file)
+
+        assert get_object_index(rhino_file) is first
+        rhino_file.Objects.append(_mesh(30.0, 0, "C-1"))
+        assert get_object_index(rhino_file).object_count == 7
+
+
+class TestIndexCallers:
+    """Hot paths go through the shared index."""
+
+    def _counting_file(self):
+        """_rhino_file() whose object table counts full iterations."""
+        rhino_file = _rhino_file()
+        objects = rhino_file.Objects
+        scans = []
+
+        class _Table(list):
+            def __iter__(self):
+                scans.append(1)
+                return super().__iter__()
+
+        table = _Table(objects)
+        type(rhino_file).Objects = PropertyMock(return_value=table)
+        return rhino_file, scans
+
+    def test_user_strings_from_first_matching_reference(self):
+        from src.agent.tasks.geometry_processing import _extract_all_user_strings
+
+        rhino_file = _rhino_file()
+        strings = _extract_all_user_strings(rhino_file, "block-a", "ISO-A")
+
+        assert strings == {"Codi": "ISO-A", "Material": "Montjuïc"}
+
+    def test_blocks_of_one_file_scan_objects_once(self):
+        from src.agent.tasks.geometry_processing import _extract_all_user_strings, _extract_block_geometry
+
+        rhino_file, scans = self._counting_file()
+        for iso_code in ("ISO-A", "ISO-B"):
+            _extract_all_user_strings(rhino_file, "block", iso_code)
+            geometry = _extract_block_geometry(rhino_file, "block", iso_code)
+
+        assert len(scans) == 1
+        assert geometry.bbox == {"min": [10.0, 0.0, 0.0], "max": [11.0, 1.0, 0.0]}
+
+    def test_extraction_keeps_table_order(self):
+        from src.agent.tasks.geometry_processing import _extract_block_geometry
+
+        geometry = _extract_block_geometry(_rhino_file(), "block-a", "ISO-A")
+
+        assert geometry.idef_object_ids == {"a-1", "a-2"}
+        assert geometry.mesh.vertices[:, 0].min() == 0.0  # A-1 (row 0) merged first
+        assert geometry.bbox["max"][0] == 21.0
+
+    def test_geometry_summary(self):
+        from src.agent.graph.nodes import _summarize_model_geometry
+
+        summary = _summarize_model_geometry(_rhino_file())
+
+        assert summary["bbox"]["dimensions"] == [21.0, 1.0, 0.0]
+        assert summary["vertices_count"] == 9
+        assert summary["faces_count"] == 3
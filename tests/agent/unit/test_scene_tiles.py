@@ -0,0 +1,306 @@
+"""
+Unit tests for hierarchical scene tiles (scene_octree + build_scene_tiles).
+
+Verifies the grid-snapped octree (leaf size, containment, stable addresses
+when blocks are added), the 3D Tiles style manifest, and that
+build_scene_tiles merges each leaf into one GLB, gives parents simplified
+HLOD content, reuses unchanged tiles on the next run, only re-merges the
+tiles whose members changed, commits in chunks and deletes superseded
+tile objects.
+"""
+
+import numpy as np
+import pytest
+import trimesh
+from celery.exceptions import SoftTimeLimitExceeded
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.glb_export_service import GLBExportService
+from src.agent.services.scene_octree import (
+    TileBlock,
+    build_octree,
+    manifest_contents,
+    merge_meshes,
+    octree_root_cube,
+    tileset_manifest,
+)
+
+ST = 'src.agent.tasks.scene_tiles'
+GP = 'src.agent.tasks.geometry_processing'
+PUBLIC = "https://x.supabase.co/storage/v1/object/public/processed-geometry/"
+
+
+def _block(block_id, center, size=400.0, version=1):
+    center = np.asarray(center, dtype=np.float64)
+    bounds = np.stack([center - size / 2, center + size / 2])
+    return TileBlock(block_id=block_id, bounds=bounds,
+                     content_url=f"https://x.supabase.co/storage/v1/object/public/processed-geometry/"
+                                 f"low-poly/{block_id}-v{version}.glb")
+
+
+def _branch(blocks, block_id):
+    """Tiles from the leaf holding `block_id` up to the root (rebuilt when it changes)."""
+    path, stack = [], [(build_octree(blocks, 4, 12, 1000.0), [])]
+    while stack:
+        node, ancestors = stack.pop()
+        if any(b.block_id == block_id for b in node.blocks):
+            path = ancestors + [node]
+        stack.extend((child, ancestors + [node]) for child in node.children)
+    return path
+
+
+def _wall(count=40, spacing=1000.0):
+    """Blocks along a facade, two courses high."""
+    return [_block(f"b{i:03d}", [(i // 2) * spacing, 0.0, (i % 2) * spacing]) for i in range(count)]
+
+
+class TestOctree:
+    """Spatial split over the stored bboxes."""
+
+    def test_root_cube_is_grid_snapped_power_of_two(self):
+        low, edge = octree_root_cube(np.array([[1200.0, -300.0, 0.0], [5100.0, 800.0, 900.0]]), 1000.0)
+        assert low.tolist() == [1000.0, -1000.0, 0.0]
+        assert edge == 8000.0
+
+    def test_leaves_respect_max_blocks_and_bounds_nest(self):
+        root = build_octree(_wall(), max_blocks=6, max_depth=12, grid_mm=1000.0)
+        leaves = list(root.leaves())
+
+        assert sum(len(leaf.blocks) for leaf in leaves) == 40
+        assert all(len(leaf.blocks) <= 6 for leaf in leaves)
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                assert (child.bounds[0] >= node.bounds[0]).all() and (child.bounds[1] <= node.bounds[1]).all()
+                assert len(node.children) > 1  # single-child chains are collapsed
+            stack.extend(node.children)
+
+    def test_adding_a_block_only_changes_its_leaf(self):
+        blocks = _wall()
+        before = {leaf.address: leaf.content_hash
+                  for leaf in build_octree(blocks, 6, 12, 1000.0).leaves()}
+        after = {leaf.address: leaf.content_hash
+                 for leaf in build_octree(blocks + [_block("new", [3000.0, 0.0, 0.0])], 6, 12, 1000.0).leaves()}
+
+        changed = {address for address in after if before.get(address) != after[address]}
+        assert 1 <= len(changed) <= 2  # the leaf receiving the block (split at most once)
+        assert len(set(before) & set(after)) >= len(before) - 1
+
+    def test_empty_scene(self):
+        assert build_octree([], 6, 12, 1000.0) is None
+        assert tileset_manifest(None, {}, "test")["root"] is None
+
+
+class TestManifest:
+    """3D Tiles style JSON and the reuse index read back from it."""
+
+    def test_leaf_content_and_reuse_index(self):
+        root = build_octree(_wall(12), max_blocks=4, max_depth=12, grid_mm=1000.0)
+        contents = {
+            leaf.address: {'uri': f"https://cdn/{leaf.address}.glb", 'content_hash': leaf.content_hash,
+                           'block_ids': [b.block_id for b in leaf.blocks],
+                           'face_ranges': [[0, 12]] * len(leaf.blocks)}
+            for leaf in root.leaves()
+        }
+        manifest = tileset_manifest(root, contents, "test")
+
+        assert manifest["asset"]["version"] == "1.1"
+        assert manifest["root"]["refine"] == "REPLACE"
+        assert len(manifest["root"]["boundingVolume"]["box"]) == 12
+        assert manifest["geometricError"] > 0
+        assert {entry['content_hash'] for entry in manifest_contents(manifest).values()} == \
+               {leaf.content_hash for leaf in root.leaves()}
+
+    def test_parent_content_carries_its_error(self):
+        root = build_octree(_wall(12), max_blocks=4, max_depth=12, grid_mm=1000.0)
+        contents = {root.address: {'uri': "https://cdn/root.glb", 'content_hash': "h",
+                                   'block_ids': [], 'face_ranges': [], 'geometric_error': 35.0}}
+        manifest = tileset_manifest(root, contents, "test")
+
+        assert manifest["geometricError"] == 35.0
+        assert manifest["root"]["content"]["uri"] == "https://cdn/root.glb"
+        assert "block_ids" not in manifest["root"]["extras"]
+        assert manifest_contents(manifest)["h"]["geometric_error"] == 35.0
+
+        bare = tileset_manifest(root, {}, "test")["root"]
+        assert bare["geometricError"] == pytest.approx(np.linalg.norm(root.bounds[1] - root.bounds[0]))
+        assert all(child["geometricError"] == 0.0 for child in bare["children"] if "children" not in child)
+
+    def test_merge_keeps_face_ranges(self):
+        meshes = [trimesh.creation.box(), trimesh.creation.icosphere(subdivisions=1)]
+        merged, ranges = merge_meshes(meshes)
+        assert ranges == [[0, 12], [12, 80]]
+        assert len(merged.faces) == 92
+        assert np.allclose(merged.vertices[merged.faces[12:]], meshes[1].vertices[meshes[1].faces])
+
+
+class TestBuildSceneTiles:
+    """build_scene_tiles merges leaves into GLBs and rebuilds incrementally."""
+
+    @pytest.fixture
+    def storage(self):
+        def download(key):
+            mesh = trimesh.creation.box(extents=[400.0, 400.0, 400.0])
+            block_id = key.rsplit('/', 1)[-1].split('-v')[0]
+            index = int(block_id[1:]) if block_id[1:].isdigit() else 0
+            mesh.apply_translation([(index // 2) * 1000.0, 0.0, (index % 2) * 1000.0])
+            return GLBExportService().encode(mesh).data
+
+        bucket = MagicMock()
+        bucket.download.side_effect = download
+        bucket.get_public_url.side_effect = lambda key: f"{PUBLIC}{key}"
+        return bucket
+
+    def _run(self, storage, blocks, previous=None, **settings):
+        from src.agent.tasks.scene_tiles import build_scene_tiles
+
+        mock_store = settings.get('store') or MagicMock()
+        client = MagicMock()
+        client.storage.from_.return_value = storage
+        with patch(f'{ST}._fetch_tile_blocks', return_value=blocks), \
+             patch(f'{ST}._fetch_tileset', return_value=previous), \
+             patch(f'{ST}.SCENE_TILE_MAX_BLOCKS', 4), \
+             patch(f'{ST}.SCENE_TILE_HLOD_MAX_FACES', settings.get('hlod_max_faces', 20000)), \
+             patch(f'{ST}.SCENE_TILES_BATCH_TILES', settings.get('batch_tiles', 25)), \
+             patch(f'{ST}._store_tileset', mock_store), \
+             patch(f'{ST}.get_supabase_client', return_value=client), \
+             patch(f'{GP}.get_supabase_client', return_value=client):
+            result = build_scene_tiles('default')
+        return result, mock_store.call_args.args[1]
+
+    @staticmethod
+    def _uploaded(storage, uri):
+        keys = [call.args[0] for call in storage.upload.call_args_list]
+        return storage.upload.call_args_list[[f"{PUBLIC}{k}" for k in keys].index(uri)].args[1]
+
+    def test_every_tile_becomes_one_merged_glb(self, storage):
+        blocks = _wall(12)
+        result, manifest = self._run(storage, blocks)
+
+        nodes = list(build_octree(blocks, 4, 12, 1000.0).post_order())
+        assert result['status'] == 'success'
+        assert result['tiles'] == result['rebuilt'] == len(nodes)
+        tile_keys = [call.args[0] for call in storage.upload.call_args_list]
+        assert len(tile_keys) == len(nodes) and all(key.startswith('tiles/default/') for key in tile_keys)
+
+        tile = next(entry for entry in manifest_contents(manifest).values() if entry['block_ids'])
+        data = self._uploaded(storage, tile['uri'])
+        assert len(GLBExportService.decode(data).faces) == 12 * len(tile['block_ids'])
+
+    def test_parent_tiles_get_simplified_hlod_content(self, storage):
+        blocks = _wall(12)
+        result, manifest = self._run(storage, blocks, hlod_max_faces=60)
+
+        root = manifest["root"]
+        assert root["content"]["uri"] and "block_ids" not in root["extras"]
+        assert len(GLBExportService.decode(self._uploaded(storage, root["content"]["uri"])).faces) <= 60
+        assert root["geometricError"] > 0
+        for child in root["children"]:  # REPLACE: a parent never claims less error than its children
+            assert child["geometricError"] <= root["geometricError"]
+
+    def test_second_run_reuses_tiles_and_rebuilds_changed_branch(self, storage):
+        blocks = _wall(12)
+        _, manifest = self._run(storage, blocks)
+        storage.upload.reset_mock()
+
+        result, _ = self._run(storage, blocks, previous=manifest)
+        assert result['rebuilt'] == 0 and storage.upload.call_count == 0
+        storage.remove.assert_not_called()
+
+        blocks[5] = _block("b005", blocks[5].center, version=2)  # new geometry -> new URL
+        result, _ = self._run(storage, blocks, previous=manifest)
+        changed = len(_branch(blocks, "b005"))
+        assert changed > 1
+        assert result['rebuilt'] == changed and result['reused'] == result['tiles'] - changed
+
+    def test_superseded_tiles_are_deleted(self, storage):
+        blocks = _wall(12)
+        _, manifest = self._run(storage, blocks)
+
+        blocks[5] = _block("b005", blocks[5].center, version=2)
+        result, new_manifest = self._run(storage, blocks, previous=manifest)
+
+        removed = set(storage.remove.call_args.args[0])
+        old = {entry['uri'].removeprefix(PUBLIC) for entry in manifest_contents(manifest).values()}
+        new = {entry['uri'].removeprefix(PUBLIC) for entry in manifest_contents(new_manifest).values()}
+        assert removed == old - new and len(removed) == result['deleted'] == result['rebuilt']
+        assert 'superseded_tiles' not in new_manifest.get('extras', {})
+
+    def test_chunked_commits_and_continuation_on_time_limit(self, storage):
+        from src.agent.constants import TASK_BUILD_SCENE_TILES
+
+        blocks = _wall(12)
+        nodes = list(build_octree(blocks, 4, 12, 1000.0).post_order())
+        download = storage.download.side_effect
+        calls = []
+
+        def download_until_time_limit(key):
+            calls.append(key)
+            if len(calls) > 6:
+                raise SoftTimeLimitExceeded()
+            return download(key)
+
+        storage.download.side_effect = download_until_time_limit
+        with patch(f'{ST}.celery_app.send_task') as mock_send, \
+             patch(f'{ST}._store_tileset') as mock_store, \
+             pytest.raises(SoftTimeLimitExceeded):
+            self._run(storage, blocks, batch_tiles=1, store=mock_store)
+        mock_send.assert_called_once_with(TASK_BUILD_SCENE_TILES, args=['default'])
+        assert mock_store.call_count > 1  # one commit per batch, plus the one on the time limit
+        partial = mock_store.call_args.args[1]
+        committed = manifest_contents(partial)
+        assert 0 < len(committed) < len(nodes)
+
+        storage.download.side_effect = download
+        storage.upload.reset_mock()
+        result, _ = self._run(storage, blocks, previous=partial)
+        assert result['status'] == 'success' and result['tiles'] == len(nodes)
+        assert result['reused'] == len(committed) and storage.upload.call_count == len(nodes) - len(committed)
+
+    def test_unreadable_block_is_left_out_and_retried(self, storage):
+        blocks = _wall(12)
+        download = storage.download.side_effect
+
+        def flaky_download(key):
+            if 'b003' in key:
+                raise IOError("404 Not Found")
+            return download(key)
+
+        storage.download.side_effect = flaky_download
+        result, manifest = self._run(storage, blocks)
+
+        assert result['status'] == 'partial' and result['skipped_blocks'] == 1
+        tile_ids = [b for entry in manifest_contents(manifest).values() for b in entry['block_ids']]
+        assert 'b003' not in tile_ids and len(tile_ids) == 11
+
+        # The partial tile's hash does not match its full membership: rebuilt next time
+        # (still unreadable: same content as before, so its parents are reused)
+        result, _ = self._run(storage, blocks, previous=manifest)
+        assert result['rebuilt'] == 1
+
+
+class TestScheduleSceneTiles:
+    """LOD runs schedule one debounced tileset rebuild."""
+
+    def test_debounced_through_redis(self):
+        from src.agent.tasks.geometry_processing import schedule_scene_tiles
+        from src.agent.constants import TASK_BUILD_SCENE_TILES
+
+        redis_client = MagicMock()
+        redis_client.set.side_effect = [True, None]
+        with patch(f'{GP}.get_redis_client', return_value=redis_client), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            assert schedule_scene_tiles() is True
+            assert schedule_scene_tiles() is False
+
+        mock_send.assert_called_once()
+        assert mock_send.call_args.args[0] == TASK_BUILD_SCENE_TILES
+
+    def test_without_redis_nothing_is_scheduled(self):
+        from src.agent.tasks.geometry_processing import schedule_scene_tiles
+
+        with patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.celery_app.send_task') as mock_send:
+            assert schedule_scene_tiles() is False
+        mock_send.assert_not_called()
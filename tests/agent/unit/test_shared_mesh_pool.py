@@ -0,0 +1,167 @@
+"""
+Unit tests for intra-file parallelism (SharedMeshPool).
+
+Verifies that job arrays reach the workers through shared memory (and the
+segments are freed before the result is returned), that the host-wide slot
+budget limits the jobs in flight across pools, that the pool starts from a
+daemonic process (Celery prefork child), and that generate_file_lod_assets
+encodes a file's blocks in the pool with the same output as the in-process
+path, falling back to it when no pool can be started.
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.shared_mesh_pool import SharedMeshPool
+from src.agent.tasks.geometry_processing import BlockGeometry, _geometry_fingerprint
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+def _checksum(arrays, scale):
+    """Pool job: summary of the received arrays (module level, pickled by reference)."""
+    return {name: (array.shape, array.dtype.str, float(array.sum()) * scale) for name, array in arrays.items()}
+
+
+def _timed_sleep(arrays, seconds):
+    start = time.monotonic()
+    time.sleep(seconds)
+    return start, time.monotonic()
+
+
+def _shm_segments():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def make(**kwargs):
+        pool = SharedMeshPool(**{"max_workers": 2, "slot_dir": str(tmp_path / "slots"), **kwargs})
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+class TestSharedMeshPool:
+    """Shared-memory transport and memory budget."""
+
+    def test_arrays_round_trip_through_shared_memory(self, make_pool):
+        pool = make_pool()
+        vertices = np.random.default_rng(0).random((1000, 3))
+        faces = np.arange(3000, dtype=np.int32).reshape(1000, 3)
+        pool.start()
+        before = _shm_segments()
+
+        result = pool.submit(_checksum, {"vertices": vertices, "faces": faces}, scale=2.0).result()
+
+        assert result["vertices"] == ((1000, 3), vertices.dtype.str, float(vertices.sum()) * 2.0)
+        assert result["faces"][:2] == ((1000, 3), faces.dtype.str)
+        # Segment and slots are released before the future resolves
+        assert not _shm_segments() - before
+        assert pool._jobs == {}
+
+    def test_memory_budget_serializes_large_jobs(self, make_pool):
+        arrays = {"vertices": np.zeros((1000, 3))}  # 24 KB -> 192 KB charged
+        tight = make_pool(worker_memory_bytes=120_000)  # 240 KB for both workers
+        roomy = make_pool(worker_memory_bytes=10_000_000)
+
+        for pool, overlap in ((tight, False), (roomy, True)):
+            futures = [pool.submit(_timed_sleep, arrays, seconds=0.3) for _ in range(2)]
+            (start_a, end_a), (start_b, end_b) = [f.result() for f in futures]
+            assert (start_b < end_a and start_a < end_b) is overlap
+
+    def test_budget_is_shared_by_every_pool_of_the_host(self, make_pool):
+        """Two prefork children with one pool each: 2 host slots, not 2 per child."""
+        arrays = {"vertices": np.zeros((10, 3))}
+        pools = [make_pool(), make_pool()]
+
+        futures = [pool.submit(_timed_sleep, arrays, seconds=0.3) for pool in pools for _ in range(2)]
+        spans = sorted(f.result() for f in futures)
+
+        running = max(sum(start <= s < end for s, _ in spans) for start, end in spans)
+        assert running == 2
+
+    def test_starts_from_daemonic_process(self, make_pool):
+        """Celery prefork children are daemonic: ProcessPoolExecutor would raise there."""
+        import multiprocessing
+
+        pool = make_pool()
+        process = multiprocessing.current_process()
+        with patch.dict(process._config, {"daemon": True}):
+            pool.start()
+            result = pool.submit(_checksum, {"faces": np.ones((4, 3))}, scale=1.0).result()
+
+        assert result["faces"][2] == 12.0
+
+
+def _prepared(block_id, offset):
+    mesh = trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+    mesh.apply_translation([offset, 0.0, 0.0])
+    face_layers = np.zeros(len(mesh.faces), dtype=np.int32)
+    geometry = BlockGeometry(
+        mesh=mesh, face_layers=face_layers, original_faces_count=len(mesh.faces),
+        bbox={"min": mesh.bounds[0].tolist(), "max": mesh.bounds[1].tolist()},
+        fingerprint=_geometry_fingerprint(mesh.vertices, mesh.faces, face_layers),
+    )
+    return {'rhino_metadata': {}, 'geometry': geometry, 'lod_cache_key': f"fp/{block_id}",
+            'lod_asset_id': f"fp/{block_id}",
+            'cache_hit': False, 'lod_data': None}
+
+
+class TestFileBlocksInPool:
+    """generate_file_lod_assets spreads the LOD encoding of a file over the pool."""
+
+    PENDING = [(f'b{i}', f'ISO-{i}') for i in range(4)]
+
+    def _run(self, pool):
+        from src.agent.tasks.geometry_processing import generate_file_lod_assets
+
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        offsets = {block_id: 1000.0 * i for i, (block_id, _) in enumerate(self.PENDING)}
+        with patch(f'{GP}._fetch_pending_blocks_for_file', return_value=self.PENDING), \
+             patch(f'{GP}._download_3dm_from_s3'), \
+             patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+             patch(f'{GP}._prepare_block_geometry',
+                   side_effect=lambda rhino_file, block_id, iso_code: _prepared(block_id, offsets[block_id])), \
+             patch(f'{GP}.get_shared_mesh_pool', return_value=pool), \
+             patch(f'{GP}.get_redis_client', return_value=None), \
+             patch(f'{GP}.get_supabase_client') as mock_client, \
+             patch(f'{GP}._update_blocks_lod_urls_batch') as mock_batch:
+            mock_client.return_value.storage.from_.return_value = storage
+            result = generate_file_lod_assets('uploads/facade.3dm')
+        uploaded = sorted(call.args[0] for call in storage.upload.call_args_list)
+        return result, mock_batch.call_args.args[0], uploaded
+
+    def test_pool_output_matches_in_process_path(self, make_pool):
+        pool = make_pool()
+        with patch.object(pool, 'submit', wraps=pool.submit) as mock_submit:
+            pooled, pooled_rows, pooled_keys = self._run(pool)
+        inline, inline_rows, inline_keys = self._run(make_pool(max_workers=1))
+
+        assert mock_submit.call_count == 4  # the pooled run really used the pool
+        assert pool._executor is None  # shut down with the file task
+        assert pooled['status'] == 'success' and pooled['processed'] == 4
+        assert pooled_keys == inline_keys and len(pooled_keys) == 12
+        assert {b: r['face_counts'] for b, r in pooled['blocks'].items()} == \
+               {b: r['face_counts'] for b, r in inline['blocks'].items()}
+        assert sorted(r['block_id'] for r in pooled_rows) == ['b0', 'b1', 'b2', 'b3']
+
+    def test_falls_back_when_pool_cannot_start(self, make_pool):
+        pool = make_pool()
+        with patch.object(pool, 'start', side_effect=AssertionError("daemonic processes")), \
+             patch(f'{GP}._encode_lod_assets_worker') as mock_worker:
+            result, rows, _ = self._run(pool)
+
+        mock_worker.assert_not_called()
+        assert result['processed'] == 4 and len(rows) == 4
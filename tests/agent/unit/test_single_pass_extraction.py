@@ -0,0 +1,121 @@
+"""
+Unit tests for single-pass block geometry extraction (BlockGeometry) and
+the per-layer high-poly OBJ + MTL written from it.
+"""
+
+import numpy as np
+import rhino3dm
+from unittest.mock import MagicMock, patch
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+def _mock_mesh(offset):
+    mesh = MagicMock()
+    mesh.Vertices = [MagicMock(X=x + offset, Y=y, Z=0.0) for x, y in [(0, 0), (1, 0), (1, 1), (0, 1)]]
+    mesh.Faces = [(0, 1, 2, 3)]  # one quad → 2 triangles
+    return mesh
+
+
+def _obj(object_id, layer_index, geometry):
+    obj = MagicMock()
+    obj.Attributes.Id = object_id
+    obj.Attributes.LayerIndex = layer_index
+    obj.Geometry = geometry
+    return obj
+
+
+def _rhino_file():
+    """Block with one Mesh on layer 0 and one 2-face Brep on layer 1."""
+    mesh_geom = _mock_mesh(0.0)
+    mesh_geom.ObjectType = rhino3dm.ObjectType.Mesh
+
+    brep_faces = [MagicMock(), MagicMock()]
+    brep_faces[0].GetMesh.return_value = _mock_mesh(10.0)
+    brep_faces[1].GetMesh.return_value = _mock_mesh(20.0)
+    brep = MagicMock()
+    brep.ObjectType = rhino3dm.ObjectType.Brep
+    brep.Faces = brep_faces
+
+    idef = MagicMock()
+    idef.Name = "ISO-1"
+    idef.GetObjectIds.return_value = ["mesh-id", "brep-id"]
+
+    layer0, layer1 = MagicMock(Color=(255, 0, 0, 255)), MagicMock(Color=(0, 0, 255, 255))
+    layer0.Name, layer1.Name = "Pedra Base", "Junta"
+
+    rhino_file = MagicMock()
+    rhino_file.InstanceDefinitions = [idef]
+    rhino_file.Objects = [_obj("mesh-id", 0, mesh_geom), _obj("brep-id", 1, brep),
+                          _obj("other-id", 0, _mock_mesh(99.0))]
+    rhino_file.Layers = [layer0, layer1]
+    return rhino_file, brep_faces
+
+
+class TestExtractBlockGeometry:
+
+    def test_single_pass_yields_aligned_face_layers(self):
+        from src.agent.tasks.geometry_processing import _extract_block_geometry
+
+        rhino_file, brep_faces = _rhino_file()
+        geometry = _extract_block_geometry(rhino_file, "block-1", "ISO-1")
+
+        assert geometry.original_faces_count == 6
+        assert len(geometry.mesh.faces) == len(geometry.face_layers) == 6
+        np.testing.assert_array_equal(geometry.face_layers, [0, 0, 1, 1, 1, 1])
+        assert geometry.bbox == {"min": [0.0, 0.0, 0.0], "max": [21.0, 1.0, 0.0]}
+        for face in brep_faces:
+            face.GetMesh.assert_called_once()
+
+    def test_tuple_view_kept_for_existing_callers(self):
+        from src.agent.tasks.geometry_processing import _extract_and_merge_meshes
+
+        rhino_file, _ = _rhino_file()
+        mesh, faces, bbox, idef, ids = _extract_and_merge_meshes(rhino_file, "block-1", "ISO-1")
+
+        assert faces == 6
+        assert idef.Name == "ISO-1"
+        assert ids == {"mesh-id", "brep-id"}
+
+
+class TestLayeredHighPoly:
+
+    def test_obj_groups_faces_per_layer(self):
+        from src.agent.tasks.geometry_processing import (
+            _extract_block_geometry, _generate_obj_mtl_with_layers,
+        )
+
+        rhino_file, _ = _rhino_file()
+        geometry = _extract_block_geometry(rhino_file, "block-1", "ISO-1")
+        obj, mtl = _generate_obj_mtl_with_layers(
+            geometry.mesh, geometry.face_layers,
+            {0: (255, 0, 0), 1: (0, 0, 255)}, "block-1", {0: "Pedra_Base", 1: "Junta"},
+        )
+
+        lines = obj.splitlines()
+        assert lines[0] == "mtllib block-1.mtl"
+        assert sum(line.startswith("v ") for line in lines) == len(geometry.mesh.vertices)
+        assert sum(line.startswith("f ") for line in lines) == 6
+        base, junta = lines.index("usemtl Pedra_Base"), lines.index("usemtl Junta")
+        assert sum(line.startswith("f ") for line in lines[base:junta]) == 2
+        assert "newmtl Junta" in mtl and "Kd 0.0000 0.0000 1.0000" in mtl
+
+    def test_high_poly_uploaded_once_with_mtl(self):
+        from src.agent.tasks.geometry_processing import _extract_block_geometry, _generate_lod_objs
+
+        rhino_file, _ = _rhino_file()
+        geometry = _extract_block_geometry(rhino_file, "block-1", "ISO-1")
+
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}?"
+        with patch(f'{GP}.get_supabase_client') as mock_client:
+            mock_client.return_value.storage.from_.return_value = storage
+            result = _generate_lod_objs(
+                geometry.mesh, "block-1", rhino_file=rhino_file,
+                matched_idef=geometry.matched_idef, face_layers=geometry.face_layers,
+            )
+
+        uploaded_keys = [call.args[0] for call in storage.upload.call_args_list]
+        assert uploaded_keys.count("high-poly/block-1.obj") == 1
+        assert "materials/block-1.mtl" in uploaded_keys
+        assert result['mtl_url'] == "https://cdn/materials/block-1.mtl"
@@ -0,0 +1,150 @@
+"""
+Unit tests for stage checkpoints (StageCheckpoint) and resumed retries.
+
+Verifies that stages round-trip through disk (meta, arrays, blobs), that a
+checkpoint of another pipeline version or past its TTL is never resumed, and
+that a generate_low_poly_glb retry after a failed upload neither re-parses
+nor re-decimates the block and only uploads the objects that are missing.
+"""
+
+import functools
+import os
+
+import numpy as np
+import pytest
+import trimesh
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.stage_checkpoint import StageCheckpoint
+
+GP = 'src.agent.tasks.geometry_processing'
+
+
+class TestStageCheckpoint:
+    """Disk layout, versioning and expiry."""
+
+    def test_stage_round_trip(self, tmp_path):
+        checkpoint = StageCheckpoint('block-1', 'signature-v1', root=str(tmp_path))
+        faces = np.arange(12, dtype=np.int64).reshape(4, 3)
+
+        checkpoint.save('encoded', {'faces': np.int64(4), 'levels': ['low']},
+                        arrays={'faces': faces}, blobs={'0-low.glb': b'glTF...'})
+        stage = checkpoint.load('encoded')
+
+        assert stage.meta == {'faces': 4, 'levels': ['low']}
+        np.testing.assert_array_equal(stage.arrays['faces'], faces)
+        assert stage.blobs == {'0-low.glb': b'glTF...'}
+        assert checkpoint.load('uploaded') is None
+
+    def test_other_pipeline_version_is_not_resumed_and_dropped(self, tmp_path):
+        old = StageCheckpoint('block-1', 'signature-v1', root=str(tmp_path))
+        old.save('prepared', {'v': 1})
+        new = StageCheckpoint('block-1', 'signature-v2', root=str(tmp_path))
+
+        assert new.load('prepared') is None
+        new.save('prepared', {'v': 2})
+        assert old.load('prepared') is None
+        assert os.listdir(tmp_path / 'block-1') == [new.version]
+
+    def test_expired_stage_is_ignored(self, tmp_path):
+        checkpoint = StageCheckpoint('block-1', 'signature-v1', root=str(tmp_path), ttl_seconds=60)
+        checkpoint.save('prepared', {'v': 1})
+        meta = os.path.join(checkpoint.path, 'prepared', 'meta.json')
+        os.utime(meta, (0, 0))
+
+        assert checkpoint.load('prepared') is None
+
+    def test_clear(self, tmp_path):
+        checkpoint = StageCheckpoint('block-1', 'signature-v1', root=str(tmp_path))
+        checkpoint.save('prepared', {'v': 1})
+        checkpoint.clear()
+        assert checkpoint.load('prepared') is None and not os.path.exists(checkpoint.block_dir)
+
+
+class TestResumedRetry:
+    """generate_low_poly_glb resumes from the last completed stage."""
+
+    @pytest.fixture
+    def prepared(self):
+        from src.agent.tasks.geometry_processing import BlockGeometry
+
+        mesh = trimesh.creation.icosphere(subdivisions=4, radius=300.0)
+        geometry = BlockGeometry(
+            mesh=mesh, face_layers=np.zeros(len(mesh.faces), dtype=np.int32),
+            original_faces_count=len(mesh.faces),
+            bbox={'min': mesh.bounds[0].tolist(), 'max': mesh.bounds[1].tolist()},
+            fingerprint='fp',
+        )
+        return {'rhino_metadata': {'Codi': 'ISO-1'}, 'geometry': geometry, 'lod_cache_key': 'fp/v1',
+                'lod_asset_id': 'fp/v1',
+                'cache_hit': False, 'lod_data': None, 'instance_matrices': None,
+                'layer_palette': None, 'lod_iso_code': None}
+
+    def _attempt(self, tmp_path, prepared, storage, retries):
+        from src.agent.tasks.geometry_processing import generate_low_poly_glb
+
+        client = MagicMock()
+        client.storage.from_.return_value = storage
+        generate_low_poly_glb.push_request(retries=retries)
+        try:
+            with patch(f'{GP}.StageCheckpoint', functools.partial(StageCheckpoint, root=str(tmp_path))), \
+                 patch(f'{GP}._fetch_block_metadata', return_value=('uploads/a.3dm', 'ISO-1', None)), \
+                 patch(f'{GP}._download_3dm_from_s3'), \
+                 patch(f'{GP}._parse_rhino_file', return_value=MagicMock()), \
+                 patch(f'{GP}._prepare_block_for_lods', return_value=prepared) as mock_prepare, \
+                 patch(f'{GP}._encode_lod_assets', wraps=_encode()) as mock_encode, \
+                 patch(f'{GP}._update_block_lod_urls') as mock_update, \
+                 patch(f'{GP}._update_block_status_error'), \
+                 patch(f'{GP}.get_redis_client', return_value=None), \
+                 patch(f'{GP}.get_supabase_client', return_value=client), \
+                 patch(f'{GP}.LOD_UPLOAD_RETRY_BACKOFF_SECONDS', 0):
+                try:
+                    result = generate_low_poly_glb.run('block-1')  # keeps the pushed request
+                except ConnectionError as e:
+                    result = e
+        finally:
+            generate_low_poly_glb.pop_request()
+        return result, mock_prepare, mock_encode, mock_update
+
+    def test_retry_after_failed_upload_only_uploads_the_missing_objects(self, tmp_path, prepared):
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+        uploads, outage = [], {'low-poly'}
+
+        def upload(key, data, options):
+            uploads.append(key)
+            if key.split('/')[0] in outage:
+                raise ConnectionError("503 Service Unavailable")
+
+        storage.upload.side_effect = upload
+        first, prepare_1, encode_1, update_1 = self._attempt(tmp_path, prepared, storage, retries=0)
+        assert isinstance(first, ConnectionError)
+        assert prepare_1.call_count == 1 and encode_1.call_count == 1
+        update_1.assert_not_called()
+
+        uploads.clear()
+        outage.clear()
+        second, prepare_2, encode_2, update_2 = self._attempt(tmp_path, prepared, storage, retries=1)
+
+        assert second['status'] == 'success'
+        prepare_2.assert_not_called()  # geometry from stage 'prepared'
+        encode_2.assert_not_called()   # assets from stage 'encoded'
+        assert [key.split('/')[0] for key in uploads] == ['low-poly']  # ledger skips the rest
+        assert second['low_poly_url'] == "https://cdn/low-poly/fp/v1.glb"
+        assert update_2.call_args.args[2] == "https://cdn/mid-poly/fp/v1.glb"  # from the ledger
+        assert not os.path.exists(tmp_path / 'block-1')  # dropped once committed
+
+    def test_first_attempt_never_resumes(self, tmp_path, prepared):
+        StageCheckpoint('block-1', 'stale', root=str(tmp_path)).save('prepared', {'v': 1})
+        storage = MagicMock()
+        storage.get_public_url.side_effect = lambda key: f"https://cdn/{key}"
+
+        result, mock_prepare, _, _ = self._attempt(tmp_path, prepared, storage, retries=0)
+
+        assert result['status'] == 'success'
+        mock_prepare.assert_called_once()
+
+
+def _encode():
+    from src.agent.tasks.geometry_processing import _encode_lod_assets
+    return _encode_lod_assets
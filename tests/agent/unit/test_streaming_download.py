@@ -0,0 +1,272 @@
+"""
+Unit tests for StreamingDownloadService (.3dm download to disk).
+
+A local HTTP server stands in for Supabase Storage (signed URL endpoint with
+Range support). Verifies byte-identical parallel ranged downloads, the
+single-stream path for servers without Range, the size limit (announced and
+enforced mid-stream), not-found handling, per-range retry, bounded memory,
+and both callers (_download_3dm_from_s3 and FileDownloadService, through
+the worker model cache).
+"""
+
+import os
+import re
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.agent.services.model_cache_service import ModelCacheService
+from src.agent.services.streaming_download_service import (
+    DownloadTooLargeError,
+    StreamingDownloadService,
+)
+
+GP = 'src.agent.tasks.geometry_processing'
+MiB = 1024 * 1024
+
+
+class _StorageStandIn(ThreadingHTTPServer):
+    """Serves one object; records the Range header of every GET."""
+
+    daemon_threads = True
+
+    def __init__(self, payload: bytes, ranges: bool = True, content_length: bool = True):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.payload = memoryview(payload)
+        self.ranges = ranges
+        self.content_length = content_length
+        self.requests: list[str | None] = []
+        self.fail_once: set[str] = set()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/object/sign/raw-uploads/model.3dm?token=t"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if not self.path.startswith("/object/sign/raw-uploads/model.3dm"):
+            self._send(400, b'{"statusCode":"404","error":"not_found"}')
+            return
+        range_header = self.headers.get("Range")
+        with server.lock:
+            server.requests.append(range_header)
+            fail = range_header in server.fail_once
+            server.fail_once.discard(range_header)
+        if fail:
+            self._send(503, b"unavailable")
+            return
+
+        data, status, headers = server.payload, 200, {}
+        match = re.match(r"bytes=(\d+)-(\d+)", range_header or "")
+        if match and server.ranges:
+            start, end = int(match.group(1)), int(match.group(2))
+            data = server.payload[start:end + 1]
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(server.payload)}"
+        self._send(status, data, headers)
+
+    def _send(self, status, data, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if self.server.content_length or status != 200:
+            self.send_header("Content-Length", str(len(data)))
+        else:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for offset in range(0, len(data), 64 * 1024):
+                self.wfile.write(data[offset:offset + 64 * 1024])
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        if not self.server.content_length and status == 200:
+            self.close_connection = True
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(payload, **kwargs):
+        server = _StorageStandIn(payload, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def payload():
+    return os.urandom(3 * MiB + 12345)
+
+
+def _service(**kwargs):
+    params = dict(chunk_size=64 * 1024, range_size=MiB, max_parallel=4, parallel_threshold=MiB)
+    params.update(kwargs)
+    return StreamingDownloadService(**params)
+
+
+class TestStreamingDownload:
+    """Ranged / streamed paths and their limits."""
+
+    def test_parallel_ranges_rebuild_identical_file(self, serve, payload, tmp_path):
+        server = serve(payload)
+        target = tmp_path / "model.3dm"
+
+        written = _service().download(server.url, str(target))
+
+        assert written == len(payload)
+        assert target.read_bytes() == payload
+        ranges = [r for r in server.requests if r != "bytes=0-0"]
+        assert len(ranges) == 4  # ceil(3.01 MiB / 1 MiB)
+
+    def test_server_without_range_support_streams_once(self, serve, payload, tmp_path):
+        server = serve(payload, ranges=False)
+        target = tmp_path / "model.3dm"
+
+        _service().download(server.url, str(target))
+
+        assert target.read_bytes() == payload
+        assert server.requests == ["bytes=0-0", None]
+
+    def test_small_object_uses_single_stream(self, serve, tmp_path):
+        server = serve(b"3dm" * 1000)
+        _service().download(server.url, str(tmp_path / "small.3dm"))
+        assert server.requests == ["bytes=0-0", None]
+
+    def test_announced_size_over_limit_rejected_before_body(self, serve, payload, tmp_path):
+        server = serve(payload)
+        target = tmp_path / "model.3dm"
+
+        with pytest.raises(DownloadTooLargeError):
+            _service(max_bytes=MiB).download(server.url, str(target))
+
+        assert server.requests == ["bytes=0-0"]
+        assert not target.exists()
+
+    def test_limit_enforced_while_streaming_without_length(self, serve, payload, tmp_path):
+        server = serve(payload, ranges=False, content_length=False)
+        target = tmp_path / "model.3dm"
+
+        with pytest.raises(DownloadTooLargeError):
+            _service(max_bytes=MiB).download(server.url, str(target))
+
+        assert not target.exists()
+
+    def test_missing_object_raises_not_found(self, serve, tmp_path):
+        server = serve(b"")
+        with pytest.raises(FileNotFoundError):
+            _service().download(server.url.replace("model.3dm", "missing.3dm"), str(tmp_path / "x.3dm"))
+
+    def test_failed_range_is_refetched_alone(self, serve, payload, tmp_path):
+        server = serve(payload)
+        server.fail_once.add(f"bytes={MiB}-{2 * MiB - 1}")
+        target = tmp_path / "model.3dm"
+
+        _service().download(server.url, str(target))
+
+        assert target.read_bytes() == payload
+        assert server.requests.count(f"bytes={MiB}-{2 * MiB - 1}") == 2
+        assert server.requests.count("bytes=0-1048575") == 1
+
+    def test_memory_bounded_by_chunks_not_file_size(self, serve, tmp_path):
+        server = serve(os.urandom(24 * MiB))
+        service = _service(chunk_size=256 * 1024, range_size=4 * MiB)
+
+        tracemalloc.start()
+        try:
+            service.download(server.url, str(tmp_path / "big.3dm"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 6 * MiB
+
+
+class TestDownloadCallers:
+    """Agent entry points stream through the signed storage URL."""
+
+    @pytest.fixture
+    def model_cache(self, tmp_path):
+        def build(**downloader_kwargs):
+            cache = ModelCacheService(cache_dir=str(tmp_path / "cache"),
+                                      downloader=StreamingDownloadService(**downloader_kwargs))
+            for target in (GP, 'src.agent.services.file_download_service'):
+                patcher = patch(f'{target}.get_model_cache', return_value=cache)
+                patcher.start()
+                patchers.append(patcher)
+            return cache
+
+        patchers = []
+        with patch('src.agent.services.model_cache_service.get_redis_client', return_value=None):
+            yield build
+        for patcher in patchers:
+            patcher.stop()
+
+    def _supabase(self, url):
+        supabase = MagicMock()
+        supabase.storage.from_.return_value.create_signed_url.return_value = {"signedURL": url}
+        return supabase
+
+    def test_download_3dm_from_s3_streams_storage_object(self, serve, payload, tmp_path, model_cache):
+        from src.agent.tasks.geometry_processing import _download_3dm_from_s3
+
+        model_cache()
+        server = serve(payload)
+        target = tmp_path / "model.3dm"
+        supabase = self._supabase(server.url)
+        with patch(f'{GP}.get_supabase_client', return_value=supabase):
+            _download_3dm_from_s3('uploads/model.3dm', str(target))
+
+        assert target.read_bytes() == payload
+        supabase.storage.from_.return_value.download.assert_not_called()
+
+    def test_download_3dm_from_s3_size_limit_propagates(self, serve, payload, tmp_path, model_cache):
+        from src.agent.tasks.geometry_processing import _download_3dm_from_s3
+
+        model_cache(max_bytes=MiB)
+        server = serve(payload)
+        with patch(f'{GP}.get_supabase_client', return_value=self._supabase(server.url)), \
+             pytest.raises(ValueError, match="exceeds limit"):
+            _download_3dm_from_s3('uploads/model.3dm', str(tmp_path / "model.3dm"))
+
+    def test_file_download_service(self, serve, payload, model_cache):
+        from src.agent.services.file_download_service import FileDownloadService
+
+        model_cache()
+        server = serve(payload)
+        with patch('src.agent.services.file_download_service.get_supabase_client',
+                   return_value=self._supabase(server.url)):
+            success, local_path, error = FileDownloadService().download_from_s3('uploads/model.3dm', task_id='t1')
+
+        assert success and error == ""
+        assert open(local_path, 'rb').read() == payload
+
+    def test_file_download_service_missing_object_is_permanent(self, serve, model_cache):
+        from src.agent.services.file_download_service import FileDownloadService
+
+        model_cache()
+        server = serve(b"")
+        supabase = self._supabase(server.url.replace("model.3dm", "missing.3dm"))
+        with patch('src.agent.services.file_download_service.get_supabase_client', return_value=supabase), \
+             patch('src.agent.services.file_download_service.time.sleep') as mock_sleep:
+            success, _, error = FileDownloadService().download_from_s3('uploads/missing.3dm')
+
+        assert not success
+        assert "File not found" in error
+        mock_sleep.assert_not_called()
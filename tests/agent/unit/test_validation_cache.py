@@ -0,0 +1,127 @@
+"""
+Unit tests for memoized geometry validation (services/validation_cache.py).
+
+Verifies that validation is scoped to the block's InstanceDefinition, that
+the file-wide rules run once for all the blocks of a file, and that results
+are shared across workers through Redis and invalidated by a validator
+version bump.
+"""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import rhino3dm
+
+from src.agent.services.geometry_validator import GeometryValidator
+
+VC = 'src.agent.services.validation_cache'
+
+FIXTURE = Path(__file__).parents[2] / 'fixtures' / 'test-model.3dm'
+
+
+class FakeRedis:
+    """The get/set/hincrby subset used by the cache, in memory."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def hincrby(self, key, field, amount):
+        self.data.setdefault(key, {})
+        self.data[key][field] = self.data[key].get(field, 0) + amount
+
+
+@pytest.fixture
+def model():
+    return rhino3dm.File3dm.Read(str(FIXTURE))
+
+
+@pytest.fixture
+def fresh_cache():
+    """Empty process-wide cache, no Redis."""
+    from src.agent.services.validation_cache import ValidationCache
+
+    cache = ValidationCache()
+    with patch(f'{VC}._cache', cache), patch(f'{VC}.get_redis_client', return_value=None):
+        yield cache
+
+
+class TestScopedValidation:
+    """validate_block only checks the block's own instances and definition."""
+
+    def test_block_scope(self, model):
+        validator = GeometryValidator()
+        iso_code = model.InstanceDefinitions[2].Name
+
+        with patch.object(validator, '_check_instance', wraps=validator._check_instance) as spy:
+            errors = validator.validate_block(model, iso_code)
+
+        assert errors == []
+        assert spy.call_count == 1  # the single placed instance of this definition, not all 6
+        assert validator.validate_block(model, 'NOT-A-BLOCK') is None
+        assert validator.validate_model_rules(model) == []
+
+
+class TestMemoizedValidation:
+    """File-wide rules once per file, per-block checks once per block."""
+
+    def test_blocks_of_a_file_share_the_model_scan(self, model, fresh_cache):
+        from src.agent.services.validation_cache import validate_block_geometry
+
+        validator = MagicMock(wraps=GeometryValidator())
+        iso_codes = [idef.Name for idef in model.InstanceDefinitions]
+        for iso_code in iso_codes + iso_codes:
+            assert validate_block_geometry(model, 'sha-1', iso_code, validator) == []
+
+        assert validator.validate_model_rules.call_count == 1
+        assert validator.validate_block.call_count == len(iso_codes)
+        validator.validate_geometry.assert_not_called()
+        assert fresh_cache.stats['miss'] == 1 + len(iso_codes)
+
+    def test_unknown_block_and_unhashed_model_fall_back_to_full_validation(self, model, fresh_cache):
+        from src.agent.services.validation_cache import validate_block_geometry
+
+        validator = MagicMock(wraps=GeometryValidator())
+        validate_block_geometry(model, 'sha-1', 'NOT-A-BLOCK', validator)
+        validate_block_geometry(model, 'sha-1', None, validator)
+        validate_block_geometry(model, None, model.InstanceDefinitions[0].Name, validator)
+        validate_block_geometry(model, None, model.InstanceDefinitions[0].Name, validator)
+
+        assert validator.validate_geometry.call_count == 1  # "all" scope memoized
+        assert validator.validate_model_rules.call_count == 2  # no content hash: no memo
+
+    def test_redis_tier_shared_across_workers_and_versioned(self):
+        from src.agent.services.validation_cache import ValidationCache, ValidationErrorItem
+
+        redis = FakeRedis()
+        error = ValidationErrorItem(category='geometry', target='obj-1', message='Geometry is null or missing')
+        with patch(f'{VC}.get_redis_client', return_value=redis):
+            ValidationCache().put('sha-1', 'block:ISO-1', [error])
+
+            other_worker = ValidationCache()
+            assert other_worker.get('sha-1', 'block:ISO-1') == [error]
+            assert other_worker.get('sha-1', 'block:ISO-1') == [error]
+            assert (other_worker.stats['redis_hit'], other_worker.stats['local_hit']) == (1, 1)
+
+            assert ValidationCache(version=99).get('sha-1', 'block:ISO-1') is None
+        assert redis.data['geometry:validation_cache_stats'] == {'redis_hit': 1, 'local_hit': 1, 'miss': 1}
+
+    def test_node_validates_only_its_block(self, model, fresh_cache):
+        from src.agent.graph.nodes import node_validate_geometry
+        from src.agent.graph.state import make_initial_state
+
+        state = make_initial_state('b1')
+        state['geometry_metadata'] = {'rhino_model': model, 'content_hash': 'sha-1',
+                                      'iso_code': model.InstanceDefinitions[0].Name}
+        with patch.object(GeometryValidator, 'validate_geometry') as full_scan:
+            result = node_validate_geometry(state)
+
+        full_scan.assert_not_called()
+        assert result['geometry_valid'] is True
+        assert fresh_cache.get('sha-1', 'model') == []
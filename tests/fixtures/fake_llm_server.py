@@ -0,0 +1,170 @@
+"""
+Local fake LLM server (OpenAI Chat Completions API) for classification tests.
+
+Answers POST .../chat/completions for the single-block prompt
+(CLASSIFICATION_PROMPTS) and the batch prompt (CLASSIFICATION_BATCH_PROMPTS)
+with a deterministic volume-based tipologia, so LLMClient runs end to end
+(ChatOpenAI → HTTP → parsing/validation) without tokens or network. Records
+every request with its estimated prompt tokens, and reports the same
+estimate in the response `usage`.
+
+Partial failures of a batch answer can be injected per iso_code:
+    drop:    the block has no result entry
+    corrupt: the block's entry has an invalid confidence
+
+Usage:
+    with FakeLLMServer() as server:
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        client = LLMClient(rate_limiter=...)
+
+Standalone (e.g. for infra/benchmark_llm_batch_classification.py --base-url):
+    python tests/fixtures/fake_llm_server.py --port 8765
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_BLOCKS_SECTION = re.compile(r"\*\*Blocks \(JSON, one object per block\):\*\*\n(.+)\n")
+_SINGLE_VOLUME = re.compile(r"- Volume: (\S+) m³")
+_SINGLE_ISO_CODE = re.compile(r"- ISO Code: (.*)")
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token (OpenAI rule of thumb for English/JSON)."""
+    return math.ceil(len(text) / 4)
+
+
+def classify_by_volume(volume) -> dict:
+    """The fake model: tipologia from the volume ranges the prompt describes."""
+    try:
+        volume = float(volume)
+    except (TypeError, ValueError):
+        return {"tipologia": "other", "confidence": 0.4, "reasoning": "No usable volume"}
+    if volume < 0.3:
+        tipologia = "clave"
+    elif volume < 0.5:
+        tipologia = "dovela"
+    elif volume < 1.5:
+        tipologia = "imposta"
+    elif volume <= 2.0:
+        tipologia = "capitel"
+    else:
+        tipologia = "columna"
+    return {"tipologia": tipologia, "confidence": 0.9, "reasoning": f"Volume {volume:g} m³ fits {tipologia}"}
+
+
+class FakeLLMServer:
+    """Threaded HTTP server speaking the Chat Completions API."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, drop=(), corrupt=()):
+        self.drop = set(drop)
+        self.corrupt = set(corrupt)
+        self.requests = []  # [{"prompt", "prompt_tokens", "blocks"}]
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(request["prompt_tokens"] for request in self.requests)
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def answer(self, prompt: str) -> tuple:
+        """(content, blocks) of the reply to one prompt."""
+        batch = _BLOCKS_SECTION.search(prompt)
+        if batch:
+            blocks = json.loads(batch.group(1))
+            results = []
+            for block in blocks:
+                if block.get("iso_code") in self.drop:
+                    continue
+                entry = {"id": block["id"], **classify_by_volume(block.get("volume"))}
+                if block.get("iso_code") in self.corrupt:
+                    entry["confidence"] = "very high"
+                results.append(entry)
+            return json.dumps({"results": results}), len(blocks)
+
+        volume = _SINGLE_VOLUME.search(prompt)
+        return json.dumps(classify_by_volume(volume.group(1) if volume else None)), 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []))
+                content, blocks = server.answer(prompt)
+                prompt_tokens = estimate_tokens(prompt)
+                with server._lock:
+                    server.requests.append({"prompt": prompt, "prompt_tokens": prompt_tokens, "blocks": blocks})
+
+                payload = json.dumps({
+                    "id": f"chatcmpl-fake-{len(server.requests)}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "logprobs": None,
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": estimate_tokens(content),
+                        "total_tokens": prompt_tokens + estimate_tokens(content),
+                    },
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass  # Keep test output clean
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI Chat Completions server for classification tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeLLMServer(args.host, args.port)
+    print(f"Fake LLM server on {fake.base_url} (Ctrl+C to stop)")
+    try:
+        fake._httpd.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
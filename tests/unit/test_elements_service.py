@@ -598,3 +598,163 @@ def test_cdn_url_transformation_applied():
         f"Expected CloudFront URL, got {elem.low_poly_url}"
     assert "supabase.co" not in elem.low_poly_url, \
         "URL should be transformed to CDN, not Supabase Storage"
+
+
+def test_lod_container_url_is_cdn_transformed(monkeypatch):
+    """
+    The progressive LOD container keeps its chunk index; only its URL goes through the CDN.
+    """
+    try:
+        from config import settings
+    except ModuleNotFoundError:
+        from src.backend.config import settings
+    monkeypatch.setattr(settings, "USE_CDN", True, raising=False)
+    monkeypatch.setattr(settings, "CDN_BASE_URL", "https://d1.cloudfront.net", raising=False)
+
+    row = {
+        "id": str(uuid4()),
+        "iso_code": "GLPER.B-PAE0720.0709",
+        "status": "validated",
+        "low_poly_url": "https://x.supabase.co/storage/v1/object/public/processed-geometry/low-poly/b.glb",
+        "bbox": {"min": [0, 0, 0], "max": [1, 1, 1]},
+        "lod_container": {
+            "url": "https://x.supabase.co/storage/v1/object/public/processed-geometry/progressive/b.sflc",
+            "version": 1, "size": 4096, "header_length": 200,
+            "levels": {"low": {"offset": 200, "length": 900, "format": "glb", "faces": 120},
+                       "high": {"offset": 1104, "length": 2992, "format": "obj", "faces": 5000}},
+        },
+    }
+
+    element = ElementsService(MagicMock())._transform_row_to_element(row)
+
+    assert element.lod_container.url == "https://d1.cloudfront.net/progressive/b.sflc"
+    assert element.lod_container.levels["low"].offset == 200
+    assert element.lod_container.levels["high"].format == "obj"
+
+
+# ===== INSTANCED MESHES =====
+
+def test_list_instances_aligns_element_ids_with_transforms():
+    """
+    list_instances() joins blocks.instance_transforms with instanced_meshes.
+
+    GIVEN two elements of one instance group (the first placed twice)
+    WHEN list_instances() is called
+    THEN one group is returned with one element_id per transform row
+    """
+    element_a, element_b = str(uuid4()), str(uuid4())
+    translation = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0]
+    members = [
+        {"id": element_a, "instance_group": "fp-a",
+         "instance_transforms": [translation + [0, 0, 0, 1], translation + [10, 0, 0, 1]]},
+        {"id": element_b, "instance_group": "fp-a",
+         "instance_transforms": [translation + [20, 0, 0, 1]]},
+    ]
+    meshes = [{"instance_group": "fp-a", "high_poly_url": "https://cdn/high.glb",
+               "mid_poly_url": "https://cdn/mid.glb", "low_poly_url": "https://cdn/low.glb",
+               "face_counts": {"high": 1280, "mid": 400, "low": 80}}]
+
+    mock_supabase = MagicMock()
+    blocks_table, meshes_table = MagicMock(), MagicMock()
+    mock_supabase.table.side_effect = lambda name: blocks_table if name == "blocks" else meshes_table
+    blocks_table.select.return_value.eq.return_value.not_.is_.return_value \
+        .order.return_value.order.return_value.range.return_value.execute.return_value.data = members
+    meshes_table.select.return_value.in_.return_value.execute.return_value.data = meshes
+
+    result = ElementsService(mock_supabase).list_instances()
+
+    (group,) = result.groups
+    assert group.instance_group == "fp-a"
+    assert group.instance_count == 3
+    assert [str(element_id) for element_id in group.element_ids] == [element_a, element_a, element_b]
+    assert group.transforms[2][12] == 20
+    assert group.face_counts["low"] == 80
+    assert result.meta == {"groups": 1, "instances": 3}
+    meshes_table.select.return_value.in_.assert_called_once_with("instance_group", ["fp-a"])
+
+
+def test_list_instances_without_instanced_elements_skips_mesh_query():
+    mock_supabase = MagicMock()
+    mock_supabase.table.return_value.select.return_value.eq.return_value.not_.is_.return_value \
+        .order.return_value.order.return_value.range.return_value.execute.return_value.data = []
+
+    result = ElementsService(mock_supabase).list_instances()
+
+    assert result.groups == []
+    mock_supabase.table.assert_called_once_with("blocks")
+
+
+def test_list_instances_pages_past_max_rows(monkeypatch):
+    """
+    list_instances() reads every member page instead of one truncated select.
+
+    GIVEN 5 instanced elements and a page size of 2
+    WHEN list_instances() is called
+    THEN pages [0-1], [2-3], [4-5] are requested and every placement is returned
+    """
+    try:
+        import services.elements_service as elements_service_module
+    except ModuleNotFoundError:
+        import src.backend.services.elements_service as elements_service_module
+    monkeypatch.setattr(elements_service_module, "INSTANCES_PAGE_SIZE", 2)
+    monkeypatch.setattr(elements_service_module, "INSTANCE_GROUPS_PER_QUERY", 2)
+    identity = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+    members = [{"id": str(uuid4()), "instance_group": f"fp-{i}", "instance_transforms": [identity]}
+               for i in range(5)]
+
+    mock_supabase = MagicMock()
+    blocks_table, meshes_table = MagicMock(), MagicMock()
+    mock_supabase.table.side_effect = lambda name: blocks_table if name == "blocks" else meshes_table
+    ranged = blocks_table.select.return_value.eq.return_value.not_.is_.return_value \
+        .order.return_value.order.return_value.range
+    ranged.side_effect = lambda start, end: Mock(execute=Mock(return_value=Mock(data=members[start:end + 1])))
+    meshes_table.select.return_value.in_.side_effect = lambda column, groups: Mock(execute=Mock(
+        return_value=Mock(data=[{"instance_group": group, "face_counts": {}} for group in groups])))
+
+    result = ElementsService(mock_supabase).list_instances()
+
+    assert [call.args for call in ranged.call_args_list] == [(0, 1), (2, 3), (4, 5)]
+    assert meshes_table.select.return_value.in_.call_count == 3
+    assert sorted(group.instance_group for group in result.groups) == [f"fp-{i}" for i in range(5)]
+    assert result.meta == {"groups": 5, "instances": 5}
+
+
+# ===== SCENE TILESET =====
+
+def test_get_tileset_applies_cdn_to_tile_content(monkeypatch):
+    """
+    get_tileset() returns the stored manifest with CDN-transformed tile URIs.
+    """
+    try:
+        from config import settings
+    except ModuleNotFoundError:
+        from src.backend.config import settings
+    monkeypatch.setattr(settings, "USE_CDN", True, raising=False)
+    monkeypatch.setattr(settings, "CDN_BASE_URL", "https://d1.cloudfront.net", raising=False)
+
+    storage_url = "https://x.supabase.co/storage/v1/object/public/processed-geometry/tiles/abc.glb"
+    manifest = {
+        "asset": {"version": "1.1"},
+        "geometricError": 5000.0,
+        "root": {"boundingVolume": {"box": [0] * 12}, "geometricError": 5000.0, "refine": "ADD",
+                 "children": [{"boundingVolume": {"box": [0] * 12}, "geometricError": 0.0,
+                               "refine": "ADD", "content": {"uri": storage_url},
+                               "extras": {"address": "0-1", "block_ids": ["b1"]}}]},
+    }
+    mock_supabase = MagicMock()
+    mock_supabase.table.return_value.select.return_value.eq.return_value.limit.return_value \
+        .execute.return_value.data = [{"manifest": manifest, "updated_at": "2026-10-19T10:00:00+00:00"}]
+
+    tileset = ElementsService(mock_supabase).get_tileset()
+
+    assert tileset.root["children"][0]["content"]["uri"] == "https://d1.cloudfront.net/tiles/abc.glb"
+    assert tileset.geometricError == 5000.0
+
+
+def test_get_tileset_not_built_returns_none():
+    mock_supabase = MagicMock()
+    mock_supabase.table.return_value.select.return_value.eq.return_value.limit.return_value \
+        .execute.return_value.data = []
+
+    assert ElementsService(mock_supabase).get_tileset() is None
+
@@ -210,6 +210,38 @@ class TestPrometheusServiceLabels:
         assert '121.0' in output   # fallback_regex count
 
 
+    def test_worker_cache_events_labels_created(self, mock_metrics_service, sample_metrics_response):
+        """HP-06: Worker cache counters are exported per cache and event."""
+        # Arrange
+        mock_metrics_service.get_langgraph_metrics.return_value = (
+            True, sample_metrics_response, None
+        )
+        mock_metrics_service.get_worker_cache_stats.return_value = {
+            "model": {"disk_hit": 7, "disk_bytes_saved": 1048576},
+            "lod": {"asset_hit": 3},
+        }
+        service = PrometheusService(mock_metrics_service)
+
+        # Act
+        service.update_metrics()
+
+        # Assert
+        output = generate_latest(service.registry).decode('utf-8')
+        assert 'agent_worker_cache_events{cache="model",event="disk_hit"} 7.0' in output
+        assert 'agent_worker_cache_events{cache="model",event="disk_bytes_saved"} 1.048576e+06' in output
+        assert 'agent_worker_cache_events{cache="lod",event="asset_hit"} 3.0' in output
+
+    def test_worker_cache_failure_does_not_fail_scrape(self, mock_metrics_service, sample_metrics_response):
+        """EC-06: Redis errors in worker cache stats leave the LangGraph metrics intact."""
+        mock_metrics_service.get_langgraph_metrics.return_value = (
+            True, sample_metrics_response, None
+        )
+        mock_metrics_service.get_worker_cache_stats.side_effect = ConnectionError("redis down")
+        service = PrometheusService(mock_metrics_service)
+
+        assert service.update_metrics() is True
+
+
 class TestPrometheusServiceResetMetrics:
     """Test reset_metrics() utility method."""
     